@@ -8,7 +8,6 @@ Credenciais padrão para primeiro acesso:
 ⚠️  IMPORTANTE: Altere a senha após o primeiro login!
 """
 
-import os
 from dotenv import load_dotenv
 from flask import Flask
 from flask_cors import CORS
@@ -24,11 +23,17 @@ from routes import (
     cliente_bp, 
     funcionario_bp, 
     produto_bp,
+    imagem_bp,
+    imagem_estatica_bp,
     fornecedor_bp,
     pedido_compra_bp,
     pedido_venda_bp
 )
 
+from backend import backend
+from service.json_provider import ProvedorJSON
+from service.compressao import compressao
+
 # Importar inicialização dos bancos
 from dao_sqlite.db import init_db as init_sqlite, close_db_connection
 from dao_mysql.db_pythonanywhere import init_db as init_mysql
@@ -48,9 +53,11 @@ def create_app():
     """
     app = Flask(__name__)
     
+    # JSON: orjson quando instalado, Decimal como número e datas em ISO 8601 (sem ordenar chaves)
+    app.json = ProvedorJSON(app)
+    
     # Configurações
     app.config['SECRET_KEY'] = 'sua-chave-secreta-aqui'  # TODO: Mover para variável de ambiente
-    app.config['JSON_SORT_KEYS'] = False
     
     # Configurações JWT
     app.config['JWT_SECRET_KEY'] = 'jwt-secret-key-autopek-2025'  # TODO: Mover para variável de ambiente
@@ -65,7 +72,7 @@ def create_app():
     def check_if_token_revoked(jwt_header, jwt_payload):
         from service.auth_service import AuthService
         jti = jwt_payload['jti']
-        return AuthService.token_esta_na_blacklist(jti)
+        return AuthService.token_esta_na_blacklist(jti, jwt_payload.get('exp'))
     
     # Handlers de erro JWT
     @jwt.invalid_token_loader
@@ -84,10 +91,8 @@ def create_app():
     def revoked_token_callback(jwt_header, jwt_payload):
         return {'message': 'Token foi revogado (logout realizado)'}, 401
     
-    # Inicializar bancos de dados
-    usar_mysql = os.getenv('USE_MYSQL', 'true').lower() == 'true'
-    
-    if usar_mysql:
+    # Inicializar banco de dados do backend selecionado (DB_BACKEND ou USE_MYSQL)
+    if backend.usa_mysql:
         try:
             init_mysql()  # Tenta MySQL primeiro (produção)
             # Testar conexão
@@ -99,12 +104,18 @@ def create_app():
         except Exception as e:
             print(f"⚠️  MySQL não disponível, usando SQLite")
             print(f"   Erro: {e}")
-            init_sqlite()  # Fallback para SQLite (desenvolvimento)
-    else:
-       #print("ℹ️  Usando SQLite (USE_MYSQL=false no .env)")
-        #init_sqlite()
-
-        pass
+            backend.selecionar('sqlite')
+    
+    if not backend.usa_mysql:
+        init_sqlite()  # SQLite (desenvolvimento ou fallback)
+        # DAOs SQLite fora de paridade com os MySQL quebram as rotas em tempo de execução
+        diferencas = backend.verificar_paridade()
+        if diferencas:
+            raise RuntimeError(
+                "DAOs SQLite fora de paridade com os MySQL: "
+                f"{', '.join(sorted(diferencas))}. "
+                "Rode scripts/verificar_paridade_daos.py para ver os detalhes."
+            )
     
     # Registrar teardown para fechar conexão ao fim da requisição
     app.teardown_appcontext(close_db_connection)
@@ -112,11 +123,16 @@ def create_app():
     # Habilitar CORS
     CORS(app)
     
+    # Compressão gzip/brotli das respostas de texto
+    compressao.init_app(app)
+    
     # Registrar blueprints
     app.register_blueprint(auth_bp)
     app.register_blueprint(cliente_bp)
     app.register_blueprint(funcionario_bp)
     app.register_blueprint(produto_bp)
+    app.register_blueprint(imagem_bp)
+    app.register_blueprint(imagem_estatica_bp)
     app.register_blueprint(fornecedor_bp)
     app.register_blueprint(pedido_compra_bp)
     app.register_blueprint(pedido_venda_bp)
@@ -132,6 +148,7 @@ def create_app():
                 'clientes': '/api/clientes',
                 'funcionarios': '/api/funcionarios',
                 'produtos': '/api/produtos',
+                'imagens': '/api/imagens',
                 'fornecedores': '/api/fornecedores',
                 'pedidos_compra': '/api/pedidos-compra',
                 'pedidos_venda': '/api/pedidos-venda'
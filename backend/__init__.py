@@ -0,0 +1,13 @@
+"""
+Pacote de Backend
+Seleção do banco (MySQL ou SQLite) e registro dos DAOs usados pelas rotas.
+"""
+
+from .registro import RegistroBackend, backend, backend_configurado, BACKENDS
+
+__all__ = [
+    'RegistroBackend',
+    'backend',
+    'backend_configurado',
+    'BACKENDS'
+]
@@ -0,0 +1,190 @@
+"""
+Registro do Backend de Armazenamento
+Um único lugar decide se a API usa MySQL ou SQLite. As rotas pedem os DAOs ao
+registro (backend.dao('ProdutoDAO')) em vez de importar de dao_mysql/dao_sqlite.
+
+Seleção:
+- DB_BACKEND=mysql|sqlite (tem prioridade)
+- sem DB_BACKEND: USE_MYSQL=true -> mysql, USE_MYSQL=false -> sqlite
+- create_app() chama backend.selecionar('sqlite') quando o MySQL não responde
+
+As rotas instanciam os DAOs na importação, antes de create_app() testar o MySQL;
+por isso backend.dao() devolve um DAO adiado, que só resolve a classe do backend
+selecionado na primeira chamada de método.
+"""
+
+import os
+import inspect
+import importlib
+import threading
+
+BACKENDS = ('mysql', 'sqlite')
+
+# Pacote de DAOs e módulo de conexão de cada backend
+PACOTES_DAO = {
+    'mysql': 'dao_mysql',
+    'sqlite': 'dao_sqlite'
+}
+MODULOS_DB = {
+    'mysql': 'dao_mysql.db_pythonanywhere',
+    'sqlite': 'dao_sqlite.db'
+}
+
+# Classe DAO -> módulo (mesmo nome nos dois pacotes)
+DAOS = {
+    'UsuarioDAO': 'usuario_dao',
+    'ClienteDAO': 'cliente_dao',
+    'FuncionarioDAO': 'funcionario_dao',
+    'ProdutoDAO': 'produto_dao',
+    'NivelAcessoDAO': 'nivel_acesso_dao',
+    'FornecedorDAO': 'fornecedor_dao',
+    'PedidoCompraDAO': 'pedido_compra_dao',
+    'ItemPedidoCompraDAO': 'item_pedido_compra_dao',
+    'PedidoVendaDAO': 'pedido_venda_dao',
+    'ItemPedidoVendaDAO': 'item_pedido_venda_dao',
+    'DepartamentoDAO': 'departamento_dao',
+    'TokenBlacklistDAO': 'token_blacklist_dao'
+}
+
+
+def backend_configurado():
+    """Backend definido pelas variáveis de ambiente (DB_BACKEND ou USE_MYSQL)"""
+    nome = os.getenv('DB_BACKEND', '').strip().lower()
+    if nome:
+        return nome
+    return 'mysql' if os.getenv('USE_MYSQL', 'true').lower() == 'true' else 'sqlite'
+
+
+class _DAOAdiado:
+    """DAO cuja classe só é resolvida no primeiro uso, pelo backend selecionado"""
+
+    def __init__(self, registro, nome_dao):
+        self._registro = registro
+        self._nome_dao = nome_dao
+
+    def __getattr__(self, atributo):
+        return getattr(self._registro.instancia(self._nome_dao), atributo)
+
+    def __repr__(self):
+        return f"<{self._nome_dao} ({self._registro.nome})>"
+
+
+class RegistroBackend:
+    """Resolve DAOs e funções de conexão do backend selecionado"""
+
+    def __init__(self, nome=None):
+        self._lock = threading.Lock()
+        self._instancias = {}
+        self.nome = None
+        self.selecionar(nome or backend_configurado())
+
+    def selecionar(self, nome):
+        """
+        Define o backend ativo ('mysql' ou 'sqlite').
+
+        Raises:
+            ValueError: Backend desconhecido
+        """
+        nome = (nome or '').strip().lower()
+        if nome not in BACKENDS:
+            raise ValueError(f"Backend inválido: '{nome}'. Use: {', '.join(BACKENDS)}")
+        with self._lock:
+            self.nome = nome
+
+    @property
+    def usa_mysql(self):
+        return self.nome == 'mysql'
+
+    # ---------- Resolução ----------
+
+    @staticmethod
+    def classe(nome_dao, nome_backend):
+        """Classe DAO de um backend específico"""
+        if nome_dao not in DAOS:
+            raise KeyError(f"DAO não registrado: {nome_dao}")
+        modulo = importlib.import_module(f"{PACOTES_DAO[nome_backend]}.{DAOS[nome_dao]}")
+        return getattr(modulo, nome_dao)
+
+    def instancia(self, nome_dao):
+        """Instância (uma por processo) do DAO no backend ativo"""
+        chave = (self.nome, nome_dao)
+        dao = self._instancias.get(chave)
+        if dao is None:
+            with self._lock:
+                dao = self._instancias.get(chave)
+                if dao is None:
+                    dao = self.classe(nome_dao, chave[0])()
+                    self._instancias[chave] = dao
+        return dao
+
+    def dao(self, nome_dao):
+        """
+        DAO para uso nas rotas (resolvido no primeiro uso).
+
+        Raises:
+            KeyError: DAO não registrado
+        """
+        if nome_dao not in DAOS:
+            raise KeyError(f"DAO não registrado: {nome_dao}")
+        return _DAOAdiado(self, nome_dao)
+
+    def modulo_db(self):
+        """Módulo de conexão do backend ativo (init_db, get_cursor...)"""
+        return importlib.import_module(MODULOS_DB[self.nome])
+
+    def get_cursor(self, commit=True):
+        """get_cursor() do backend ativo"""
+        return self.modulo_db().get_cursor(commit=commit)
+
+    def unidade_de_trabalho(self):
+        """Unidade de trabalho do backend ativo (ver service/unidade_de_trabalho.py)"""
+        return self.modulo_db().unidade_de_trabalho()
+
+    def estatisticas_pool(self):
+        """Contadores do pool de conexões do backend ativo (None se o backend não os expõe)"""
+        estatisticas = getattr(self.modulo_db(), 'estatisticas_pool', None)
+        return estatisticas() if estatisticas else None
+
+    # ---------- Paridade ----------
+
+    @staticmethod
+    def _metodos(classe):
+        return {
+            nome: inspect.signature(metodo)
+            for nome, metodo in inspect.getmembers(classe, inspect.isfunction)
+            if not nome.startswith('_')
+        }
+
+    @staticmethod
+    def verificar_paridade():
+        """
+        Compara os métodos públicos de cada DAO nos dois backends.
+
+        Returns:
+            dict: {nome_dao: {'somente_mysql': [...], 'somente_sqlite': [...],
+                   'assinaturas': [{'metodo', 'mysql', 'sqlite'}]}} apenas dos DAOs com diferenças
+        """
+        diferencas = {}
+        for nome_dao in DAOS:
+            mysql = RegistroBackend._metodos(RegistroBackend.classe(nome_dao, 'mysql'))
+            sqlite = RegistroBackend._metodos(RegistroBackend.classe(nome_dao, 'sqlite'))
+
+            assinaturas = [
+                {'metodo': metodo, 'mysql': str(mysql[metodo]), 'sqlite': str(sqlite[metodo])}
+                for metodo in sorted(mysql.keys() & sqlite.keys())
+                if list(mysql[metodo].parameters) != list(sqlite[metodo].parameters)
+            ]
+            somente_mysql = sorted(mysql.keys() - sqlite.keys())
+            somente_sqlite = sorted(sqlite.keys() - mysql.keys())
+
+            if somente_mysql or somente_sqlite or assinaturas:
+                diferencas[nome_dao] = {
+                    'somente_mysql': somente_mysql,
+                    'somente_sqlite': somente_sqlite,
+                    'assinaturas': assinaturas
+                }
+        return diferencas
+
+
+# Instância global usada pelas rotas e serviços
+backend = RegistroBackend()
@@ -0,0 +1,15 @@
+"""
+Pacote de Cache
+Caches em memória do processo (não compartilhados entre workers) e cache de
+imagens redimensionadas em disco.
+"""
+
+from .catalogo_cache import CatalogoCache, catalogo_cache
+from .imagem_cache import ImagemCache, imagem_cache
+
+__all__ = [
+    'CatalogoCache',
+    'catalogo_cache',
+    'ImagemCache',
+    'imagem_cache'
+]
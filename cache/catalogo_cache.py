@@ -0,0 +1,167 @@
+"""
+Cache do Catálogo de Produtos
+Guarda as respostas JSON já serializadas de GET /api/produtos e GET /api/produtos/<id>.
+
+- Detalhes ficam indexados por (id_produto, host); listas por query string.
+- Detalhes e listas têm tamanho máximo (CATALOGO_CACHE_MAX_DETALHES / CATALOGO_CACHE_MAX_LISTAS):
+  as entradas menos usadas saem primeiro, e entradas expiradas saem ao serem consultadas.
+- As escritas nos DAOs (produto e estoque dos pedidos) invalidam o cache após o commit.
+- Cada entrada expira após CATALOGO_CACHE_TTL_SEGUNDOS (padrão 60; 0 desativa o cache),
+  limitando o atraso das alterações feitas por outros workers.
+- Cada entrada tem um dicionário `comprimidos` ({codificação: bytes}) preenchido pela
+  camada de compressão, para que acertos não comprimam o mesmo corpo de novo.
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+
+# Máximo de listas distintas (query strings) guardadas; as menos usadas saem primeiro
+LISTAS_MAXIMO_PADRAO = 128
+
+# Máximo de respostas de detalhe guardadas (produto x host); as menos usadas saem primeiro
+DETALHES_MAXIMO_PADRAO = 2048
+
+
+class CatalogoCache:
+    """
+    Snapshot do catálogo em memória com invalidação na escrita.
+
+    Para evitar guardar dados antigos lidos antes de um commit concorrente, quem
+    consulta o banco captura `versao()` antes da leitura e a repassa ao armazenar:
+    se houve invalidação no meio tempo, a resposta não é guardada.
+    """
+
+    def __init__(self, ttl_segundos=60, listas_maximo=LISTAS_MAXIMO_PADRAO,
+                 detalhes_maximo=DETALHES_MAXIMO_PADRAO):
+        self.ttl_segundos = ttl_segundos
+        self.listas_maximo = listas_maximo
+        self.detalhes_maximo = detalhes_maximo
+        self._lock = threading.Lock()
+        self._versao = 0
+        self._detalhes = OrderedDict() # (id_produto, host) -> (corpo, expira_em, comprimidos)
+        self._listas = OrderedDict() # (host, query) -> (corpo, expira_em, comprimidos)
+        self._hits = 0
+        self._misses = 0
+        self._invalidacoes = 0
+
+    @property
+    def ativo(self):
+        return self.ttl_segundos > 0
+
+    def versao(self):
+        """Versão atual do cache (incrementada a cada invalidação)"""
+        return self._versao
+
+    def _obter(self, entradas, chave):
+        """Entrada válida de `entradas` (LRU); expiradas são removidas"""
+        entrada = entradas.get(chave)
+        if entrada is None or entrada[1] < time.monotonic():
+            if entrada is not None:
+                del entradas[chave]
+            self._misses += 1
+            return None
+        self._hits += 1
+        entradas.move_to_end(chave)
+        return entrada[0], entrada[2]
+
+    @staticmethod
+    def _guardar(entradas, chave, entrada, maximo):
+        entradas[chave] = entrada
+        entradas.move_to_end(chave)
+        while len(entradas) > maximo:
+            entradas.popitem(last=False)
+
+    def obter_detalhe(self, id_produto, host):
+        """Retorna (corpo, comprimidos) da resposta de detalhe ou None"""
+        if not self.ativo:
+            return None
+        with self._lock:
+            return self._obter(self._detalhes, (id_produto, host))
+
+    def obter_lista(self, host, query):
+        """Retorna (corpo, comprimidos) da resposta de listagem ou None"""
+        if not self.ativo:
+            return None
+        with self._lock:
+            return self._obter(self._listas, (host, query))
+
+    def armazenar_detalhe(self, id_produto, host, corpo, versao):
+        """
+        Guarda a resposta de detalhe se nenhuma escrita ocorreu desde `versao`.
+        Retorna o dicionário `comprimidos` da nova entrada (None se não guardou).
+        """
+        if not self.ativo:
+            return None
+        with self._lock:
+            if versao != self._versao:
+                return None
+            comprimidos = {}
+            self._guardar(self._detalhes, (id_produto, host),
+                          (corpo, time.monotonic() + self.ttl_segundos, comprimidos),
+                          self.detalhes_maximo)
+            return comprimidos
+
+    def armazenar_lista(self, host, query, corpo, versao):
+        """
+        Guarda a resposta de listagem se nenhuma escrita ocorreu desde `versao`.
+        Retorna o dicionário `comprimidos` da nova entrada (None se não guardou).
+        """
+        if not self.ativo:
+            return None
+        with self._lock:
+            if versao != self._versao:
+                return None
+            comprimidos = {}
+            self._guardar(self._listas, (host, query),
+                          (corpo, time.monotonic() + self.ttl_segundos, comprimidos),
+                          self.listas_maximo)
+            return comprimidos
+
+    def invalidar(self, id_produto=None):
+        """
+        Invalida o cache após uma escrita.
+
+        Args:
+            id_produto (int, optional): Produto alterado. Sem ID, descarta todos os detalhes.
+                Listas são sempre descartadas (filtros e ordenação podem mudar).
+        """
+        with self._lock:
+            self._versao += 1
+            self._invalidacoes += 1
+            if id_produto is None:
+                self._detalhes.clear()
+            else:
+                for chave in [chave for chave in self._detalhes if chave[0] == id_produto]:
+                    del self._detalhes[chave]
+            self._listas.clear()
+
+    def invalidar_listas(self):
+        """Invalida apenas as listagens (ex: produto novo, que ainda não tem detalhe em cache)"""
+        with self._lock:
+            self._versao += 1
+            self._invalidacoes += 1
+            self._listas.clear()
+
+    def estatisticas(self):
+        """Contadores de uso do cache"""
+        with self._lock:
+            consultas = self._hits + self._misses
+            return {
+                'ativo': self.ativo,
+                'ttl_segundos': self.ttl_segundos,
+                'hits': self._hits,
+                'misses': self._misses,
+                'taxa_acerto': round(self._hits / consultas, 4) if consultas else 0.0,
+                'invalidacoes': self._invalidacoes,
+                'detalhes': len(self._detalhes),
+                'listas': len(self._listas)
+            }
+
+
+catalogo_cache = CatalogoCache(
+    ttl_segundos=int(os.getenv('CATALOGO_CACHE_TTL_SEGUNDOS', 60)),
+    listas_maximo=int(os.getenv('CATALOGO_CACHE_MAX_LISTAS', LISTAS_MAXIMO_PADRAO)),
+    detalhes_maximo=int(os.getenv('CATALOGO_CACHE_MAX_DETALHES', DETALHES_MAXIMO_PADRAO))
+)
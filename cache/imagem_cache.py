@@ -0,0 +1,162 @@
+"""
+Cache em Disco de Imagens Redimensionadas
+Guarda as variantes geradas sob demanda por GET /api/produtos/<id>/imagem.
+
+- O tamanho total do diretório é limitado (IMAGEM_CACHE_MAX_MB, padrão 256); ao
+  ultrapassar, os arquivos usados há mais tempo são removidos (LRU).
+- Requisições simultâneas para a mesma variante são agrupadas: apenas uma gera o
+  arquivo e as demais aguardam o resultado.
+- O índice LRU é reconstruído a partir do diretório ao iniciar (ordem pelo mtime,
+  atualizado a cada acerto). Outros workers podem remover arquivos do índice; nesse
+  caso a entrada é tratada como ausente e gerada de novo.
+"""
+
+import os
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class ImagemCache:
+    """Cache LRU de arquivos em disco limitado por tamanho total (bytes)"""
+
+    def __init__(self, diretorio, max_bytes):
+        self.diretorio = diretorio
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._arquivos = None        # nome -> tamanho (do menos para o mais recente)
+        self._total_bytes = 0
+        self._em_andamento = {}      # nome -> Future com o caminho gerado
+        self._hits = 0
+        self._misses = 0
+        self._agrupadas = 0
+        self._remocoes = 0
+
+    def _carregar_indice(self):
+        """Lê o diretório uma vez para montar o índice (chamado com o lock)"""
+        if self._arquivos is not None:
+            return
+        os.makedirs(self.diretorio, exist_ok=True)
+
+        entradas = []
+        for nome in os.listdir(self.diretorio):
+            if nome.endswith('.tmp'):
+                continue
+            try:
+                estado = os.stat(os.path.join(self.diretorio, nome))
+            except OSError:
+                continue
+            entradas.append((estado.st_mtime, nome, estado.st_size))
+
+        self._arquivos = OrderedDict()
+        for _, nome, tamanho in sorted(entradas):
+            self._arquivos[nome] = tamanho
+        self._total_bytes = sum(self._arquivos.values())
+
+    def _caminho(self, nome):
+        return os.path.join(self.diretorio, nome)
+
+    def _remover_excedente(self):
+        """Remove os arquivos menos usados até caber em max_bytes (chamado com o lock)"""
+        while self._total_bytes > self.max_bytes and len(self._arquivos) > 1:
+            nome, tamanho = self._arquivos.popitem(last=False)
+            self._total_bytes -= tamanho
+            self._remocoes += 1
+            try:
+                os.remove(self._caminho(nome))
+            except OSError:
+                pass
+
+    def _obter_existente(self, nome):
+        """Caminho do arquivo se estiver no cache, marcando-o como recente (chamado com o lock)"""
+        if nome not in self._arquivos:
+            return None
+
+        caminho = self._caminho(nome)
+        try:
+            os.utime(caminho)
+        except OSError:
+            # Removido por outro worker
+            self._total_bytes -= self._arquivos.pop(nome)
+            return None
+
+        self._arquivos.move_to_end(nome)
+        return caminho
+
+    def obter_ou_gerar(self, nome, gerar):
+        """
+        Retorna o caminho do arquivo em cache, gerando-o se necessário.
+
+        Args:
+            nome (str): Nome do arquivo no cache (identifica a variante)
+            gerar (callable): Recebe o caminho de destino e grava o arquivo nele
+
+        Returns:
+            tuple: (caminho, status) com status 'HIT', 'MISS' ou 'COALESCED'
+        """
+        with self._lock:
+            self._carregar_indice()
+
+            caminho = self._obter_existente(nome)
+            if caminho:
+                self._hits += 1
+                return caminho, 'HIT'
+
+            futuro = self._em_andamento.get(nome)
+            responsavel = futuro is None
+            if responsavel:
+                futuro = Future()
+                self._em_andamento[nome] = futuro
+                self._misses += 1
+            else:
+                self._agrupadas += 1
+
+        if not responsavel:
+            return futuro.result(), 'COALESCED'
+
+        caminho = self._caminho(nome)
+        temporario = f"{caminho}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            gerar(temporario)
+            os.replace(temporario, caminho)
+            tamanho = os.path.getsize(caminho)
+        except BaseException as e:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            with self._lock:
+                del self._em_andamento[nome]
+            futuro.set_exception(e)
+            raise
+
+        with self._lock:
+            self._total_bytes += tamanho - self._arquivos.pop(nome, 0)
+            self._arquivos[nome] = tamanho
+            self._remover_excedente()
+            del self._em_andamento[nome]
+        futuro.set_result(caminho)
+
+        return caminho, 'MISS'
+
+    def estatisticas(self):
+        """Contadores de uso do cache"""
+        with self._lock:
+            self._carregar_indice()
+            consultas = self._hits + self._misses + self._agrupadas
+            return {
+                'diretorio': self.diretorio,
+                'max_bytes': self.max_bytes,
+                'total_bytes': self._total_bytes,
+                'arquivos': len(self._arquivos),
+                'hits': self._hits,
+                'misses': self._misses,
+                'agrupadas': self._agrupadas,
+                'remocoes': self._remocoes,
+                'taxa_acerto': round((self._hits + self._agrupadas) / consultas, 4) if consultas else 0.0
+            }
+
+
+imagem_cache = ImagemCache(
+    diretorio=os.getenv('IMAGEM_CACHE_DIR', 'uploads/cache_imagens'),
+    max_bytes=int(float(os.getenv('IMAGEM_CACHE_MAX_MB', 256)) * 1024 * 1024)
+)
@@ -3,27 +3,56 @@ DAO para Cliente - Apenas operações de banco de dados
 Nova modelagem: Cliente herda de Usuario (1-para-1 via id_usuario)
 Regras de negócio devem estar no módulo service
 """
-from .db_pythonanywhere import get_cursor
+from .db_pythonanywhere import get_cursor, colunas_select, iterar_consulta
 
 class ClienteDAO:
     """DAO para operações CRUD na tabela Cliente"""
     
-    def listar_todos(self):
-        """Retorna todos os clientes com dados do usuário"""
+    # Campos das listagens (projeção de ?fields=): campo -> expressão SQL
+    COLUNAS_LISTAGEM = {
+        'id_cliente': 'c.id_cliente',
+        'id_usuario': 'c.id_usuario',
+        'data_cadastro': 'c.data_cadastro',
+        'origem_cadastro': 'c.origem_cadastro',
+        'nome': 'u.nome',
+        'cpf': 'u.cpf',
+        'email': 'u.email',
+        'telefone': 'u.telefone',
+        'ativo': 'u.ativo',
+        'data_criacao': 'u.data_criacao',
+        'data_nascimento': 'u.data_nascimento',
+        'ultimo_login': 'u.ultimo_login',
+        'cep': 'u.cep',
+        'logradouro': 'u.logradouro',
+        'numero': 'u.numero',
+        'bairro': 'u.bairro',
+        'cidade': 'u.cidade',
+        'estado': 'u.estado',
+        'nivel_acesso_nome': 'na.nome'
+    }
+    
+    def _sql_listagem(self, apenas_ativos, campos=None):
+        """SELECT da listagem de clientes (compartilhado com iterar_todos)"""
+        sql = f"""
+            SELECT {colunas_select(self.COLUNAS_LISTAGEM, campos)}
+            FROM Cliente c
+            JOIN usuario u ON c.id_usuario = u.id_usuario
+            JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
+        """
+        if apenas_ativos:
+            sql += " WHERE u.ativo = 1"
+        return sql + " ORDER BY u.nome"
+    
+    def listar_todos(self, campos=None):
+        """Retorna todos os clientes com dados do usuário (campos: projeção opcional)"""
         with get_cursor() as cur:
-            cur.execute("""
-                SELECT c.id_cliente, c.id_usuario, c.data_cadastro, c.origem_cadastro,
-                       u.nome, u.cpf, u.email, u.telefone, u.ativo, u.data_criacao,
-                       u.data_nascimento, u.ultimo_login,
-                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
-                       na.nome as nivel_acesso_nome
-                FROM Cliente c
-                JOIN usuario u ON c.id_usuario = u.id_usuario
-                JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
-                ORDER BY u.nome
-            """)
+            cur.execute(self._sql_listagem(False, campos))
             return cur.fetchall()
     
+    def iterar_todos(self, apenas_ativos=True, campos=None):
+        """Gera os clientes um a um, sem carregar a lista inteira (listagem em streaming)"""
+        return iterar_consulta(self._sql_listagem(apenas_ativos, campos))
+    
     def buscar_por_id(self, id_cliente):
         """Busca cliente por ID"""
         with get_cursor() as cur:
@@ -132,21 +161,10 @@ class ClienteDAO:
             result = cur.fetchone()
             return result['total'] > 0
     
-    def listar_clientes_ativos(self):
-        """Retorna apenas clientes com usuários ativos"""
+    def listar_clientes_ativos(self, campos=None):
+        """Retorna apenas clientes com usuários ativos (campos: projeção opcional)"""
         with get_cursor() as cur:
-            cur.execute("""
-                SELECT c.id_cliente, c.id_usuario, c.data_cadastro, c.origem_cadastro,
-                       u.nome, u.cpf, u.email, u.telefone, u.ativo, u.data_criacao,
-                       u.data_nascimento, u.ultimo_login,
-                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
-                       na.nome as nivel_acesso_nome
-                FROM Cliente c
-                JOIN usuario u ON c.id_usuario = u.id_usuario
-                JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
-                WHERE u.ativo = 1
-                ORDER BY u.nome
-            """)
+            cur.execute(self._sql_listagem(True, campos))
             return cur.fetchall()
     
     def listar_por_origem_cadastro(self, origem_cadastro):
@@ -1,10 +1,14 @@
 import os
+import threading
 from contextlib import contextmanager
 import mysql.connector
 from mysql.connector import pooling
 
 _pool = None
 
+# Unidade de trabalho ativa na thread atual (ver unidade_de_trabalho)
+_local = threading.local()
+
 def init_db(db_config: dict = None, minconn: int = 1, maxconn: int = 3):
     """Inicializa o pool de conexões MySQL otimizado para PythonAnywhere
     
@@ -59,6 +63,23 @@ def get_cursor(commit: bool = True):
     if _pool is None:
         raise RuntimeError("Connection pool não inicializado. Chame init_db() primeiro.")
 
+    unidade = getattr(_local, 'unidade', None)
+    if unidade is not None:
+        # Dentro de unidade_de_trabalho(): mesma conexão e transação, sem commit aqui
+        cur = unidade['conn'].cursor(dictionary=True, buffered=True)
+        try:
+            yield cur
+        except Exception:
+            # O DAO pode engolir a exceção: a unidade inteira será desfeita
+            unidade['falhou'] = True
+            raise
+        finally:
+            try:
+                cur.close()
+            except:
+                pass
+        return
+
     conn = None
     cur = None
     try:
@@ -94,6 +115,132 @@ def get_cursor(commit: bool = True):
                 pass
 
 
+@contextmanager
+def unidade_de_trabalho():
+    """Unidade de trabalho: uma conexão e uma transação para várias chamadas de DAO.
+    
+    Todo get_cursor() executado na mesma thread dentro do bloco reutiliza a conexão
+    retirada do pool uma única vez e não faz commit próprio. No fim do bloco:
+      - commit, se nenhum cursor falhou;
+      - rollback, se o bloco lançou exceção ou algum cursor falhou (mesmo que o DAO
+        tenha capturado o erro e retornado None/False).
+    Blocos aninhados participam da unidade mais externa. Funções registradas com
+    apos_commit() rodam só depois do commit. iterar_consulta() usa conexão própria.
+    
+    Uso:
+      with unidade_de_trabalho():
+          id_pedido = pedido_dao.criar(...)
+          item_dao.criar(id_pedido, ...)
+    """
+    externa = getattr(_local, 'unidade', None)
+    if externa is not None:
+        try:
+            yield
+        except Exception:
+            # Falha em um bloco aninhado desfaz a unidade inteira
+            externa['falhou'] = True
+            raise
+        return
+
+    if _pool is None:
+        raise RuntimeError("Connection pool não inicializado. Chame init_db() primeiro.")
+
+    conn = _pool.get_connection()
+    unidade = {'conn': conn, 'falhou': False, 'apos_commit': []}
+    _local.unidade = unidade
+    try:
+        yield
+        if unidade['falhou']:
+            conn.rollback()
+        else:
+            conn.commit()
+    except Exception:
+        try:
+            conn.rollback()
+        except:
+            pass
+        raise
+    finally:
+        _local.unidade = None
+        try:
+            conn.close()
+        except:
+            pass
+
+    if not unidade['falhou']:
+        for funcao, args in unidade['apos_commit']:
+            funcao(*args)
+
+
+def apos_commit(funcao, *args):
+    """Executa `funcao(*args)` após o commit da unidade de trabalho ativa, ou na hora
+    se não houver uma (ex: invalidar o cache do catálogo só com os dados já gravados)."""
+    unidade = getattr(_local, 'unidade', None)
+    if unidade is None:
+        funcao(*args)
+    else:
+        unidade['apos_commit'].append((funcao, args))
+
+
+def iterar_consulta(sql, params=(), tamanho_lote=500):
+    """Executa um SELECT e devolve as linhas aos poucos (respostas em streaming).
+    
+    Usa cursor sem buffer: o MySQL envia as linhas conforme são lidas, em lotes de
+    `tamanho_lote`, então a memória não cresce com o tamanho do resultado. A conexão
+    fica ocupada até o gerador terminar ou ser fechado (ex: cliente desconectou).
+    
+    Uso:
+      for linha in iterar_consulta("SELECT ... WHERE status = %s", (status,)):
+          ...
+    """
+    if _pool is None:
+        raise RuntimeError("Connection pool não inicializado. Chame init_db() primeiro.")
+
+    conn = _pool.get_connection()
+    cur = None
+    try:
+        cur = conn.cursor(dictionary=True, buffered=False)
+        cur.execute(sql, params)
+        while True:
+            linhas = cur.fetchmany(tamanho_lote)
+            if not linhas:
+                break
+            yield from linhas
+    finally:
+        # Descarta linhas não lidas para a conexão voltar limpa ao pool
+        try:
+            conn.consume_results()
+        except:
+            pass
+        if cur:
+            try:
+                cur.close()
+            except:
+                pass
+        try:
+            conn.close()
+        except:
+            pass
+
+
+def colunas_select(colunas, campos=None):
+    """Monta a lista de colunas do SELECT a partir de {campo: expressão SQL}.
+    
+    Com `campos` (projeção de ?fields=), seleciona apenas esses campos, na ordem de `colunas`.
+    Ex: colunas_select({'id_cliente': 'c.id_cliente', 'nome': 'u.nome'}, ['nome'])
+        -> "u.nome"
+    """
+    selecionadas = []
+    for campo, expressao in colunas.items():
+        if campos is not None and campo not in campos:
+            continue
+        if expressao == campo or expressao.endswith('.' + campo):
+            selecionadas.append(expressao)
+        else:
+            selecionadas.append(f"{expressao} AS {campo}")
+    return ", ".join(selecionadas)
+
+
 def close_pool():
     """Fecha o pool de conexões"""
     global _pool
@@ -1,4 +1,4 @@
-from .db_pythonanywhere import get_cursor
+from .db_pythonanywhere import get_cursor, colunas_select
 
 class FuncionarioDAO:
     """
@@ -11,19 +11,41 @@ class FuncionarioDAO:
     def __init__(self):
         pass
 
-    def listar_todos(self, apenas_ativos=True):
+    # Campos das listagens (projeção de ?fields=): campo -> expressão SQL
+    COLUNAS_LISTAGEM = {
+        'id_funcionario': 'f.id_funcionario',
+        'id_usuario': 'f.id_usuario',
+        'cargo': 'f.cargo',
+        'salario': 'f.salario',
+        'data_contratacao': 'f.data_contratacao',
+        'id_departamento': 'f.id_departamento',
+        'nome': 'u.nome',
+        'cpf': 'u.cpf',
+        'email': 'u.email',
+        'telefone': 'u.telefone',
+        'ativo': 'u.ativo',
+        'data_criacao': 'u.data_criacao',
+        'data_nascimento': 'u.data_nascimento',
+        'ultimo_login': 'u.ultimo_login',
+        'cep': 'u.cep',
+        'logradouro': 'u.logradouro',
+        'numero': 'u.numero',
+        'bairro': 'u.bairro',
+        'cidade': 'u.cidade',
+        'estado': 'u.estado',
+        'nivel_acesso_nome': 'na.nome',
+        'departamento_nome': 'd.nome',
+        'centro_custo': 'd.centro_custo'
+    }
+    
+    def listar_todos(self, apenas_ativos=True, campos=None):
         """
         Lista todos os funcionários com JOIN em usuario, nivel_acesso e departamento.
+        campos: projeção opcional (chaves de COLUNAS_LISTAGEM).
         """
         with get_cursor() as cur:
-            query = """
-                SELECT f.id_funcionario, f.id_usuario, f.cargo, f.salario, f.data_contratacao,
-                       f.id_departamento,
-                       u.nome, u.cpf, u.email, u.telefone, u.ativo, u.data_criacao,
-                       u.data_nascimento, u.ultimo_login,
-                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
-                       na.nome as nivel_acesso_nome,
-                       d.nome as departamento_nome, d.centro_custo
+            query = f"""
+                SELECT {colunas_select(self.COLUNAS_LISTAGEM, campos)}
                 FROM Funcionario f
                 JOIN usuario u ON f.id_usuario = u.id_usuario
                 JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
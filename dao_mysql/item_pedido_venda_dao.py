@@ -71,6 +71,29 @@ class ItemPedidoVendaDAO:
         except Exception as e:
             return None
 
+    # Máximo de IDs por consulta em listar_por_pedidos
+    LOTE_IN = 500
+
+    # SELECT dos itens com dados do produto (filtrado por pedido em cada consulta)
+    _SQL_ITENS = """
+        SELECT 
+            ipv.id_item_venda as id_item_pedido_venda,
+            ipv.id_pedido_venda,
+            ipv.id_produto,
+            ipv.quantidade,
+            ipv.preco_unitario_venda,
+            p.nome as produto_nome,
+            p.sku as produto_sku,
+            p.descricao as produto_descricao,
+            p.estoque_atual as produto_estoque,
+            p.preco_custo_medio as produto_custo,
+            (ipv.quantidade * ipv.preco_unitario_venda) as subtotal,
+            (ipv.quantidade * p.preco_custo_medio) as custo_total,
+            ((ipv.quantidade * ipv.preco_unitario_venda) - (ipv.quantidade * p.preco_custo_medio)) as lucro
+        FROM Item_Pedido_Venda ipv
+        JOIN Produto p ON ipv.id_produto = p.id_produto
+    """
+
     def listar_por_pedido(self, id_pedido_venda: int) -> List[dict]:
         """
         Lista todos os itens de um pedido de venda
@@ -83,32 +106,47 @@ class ItemPedidoVendaDAO:
         """
         try:
             with get_cursor(commit=False) as cursor:
-                cursor.execute("""
-                    SELECT 
-                        ipv.id_item_venda as id_item_pedido_venda,
-                        ipv.id_pedido_venda,
-                        ipv.id_produto,
-                        ipv.quantidade,
-                        ipv.preco_unitario_venda,
-                        p.nome as produto_nome,
-                        p.sku as produto_sku,
-                        p.descricao as produto_descricao,
-                        p.estoque_atual as produto_estoque,
-                        p.preco_custo_medio as produto_custo,
-                        (ipv.quantidade * ipv.preco_unitario_venda) as subtotal,
-                        (ipv.quantidade * p.preco_custo_medio) as custo_total,
-                        ((ipv.quantidade * ipv.preco_unitario_venda) - (ipv.quantidade * p.preco_custo_medio)) as lucro
-                    FROM Item_Pedido_Venda ipv
-                    JOIN Produto p ON ipv.id_produto = p.id_produto
-                    WHERE ipv.id_pedido_venda = %s
-                    ORDER BY p.nome
-                """, (id_pedido_venda,))
+                cursor.execute(
+                    self._SQL_ITENS + " WHERE ipv.id_pedido_venda = %s ORDER BY p.nome",
+                    (id_pedido_venda,)
+                )
                 
                 rows = cursor.fetchall()
                 return [dict(row) for row in rows]
         except Exception as e:
             return []
 
+    def listar_por_pedidos(self, ids_pedidos: List[int]) -> dict:
+        """
+        Lista os itens de vários pedidos de venda de uma vez (?include=itens)
+        
+        Args:
+            ids_pedidos: IDs dos pedidos
+        
+        Returns:
+            Dicionário {id_pedido_venda: [itens]} (pedidos sem itens ficam com lista vazia)
+        
+        Uma única consulta (IN) para até LOTE_IN pedidos, em vez de uma por pedido.
+        """
+        itens_por_pedido = {id_pedido: [] for id_pedido in ids_pedidos}
+        if not ids_pedidos:
+            return itens_por_pedido
+        
+        ids = list(itens_por_pedido)
+        with get_cursor(commit=False) as cursor:
+            # Lotes limitam o número de parâmetros do IN
+            for inicio in range(0, len(ids), self.LOTE_IN):
+                lote = ids[inicio:inicio + self.LOTE_IN]
+                marcadores = ", ".join(["%s"] * len(lote))
+                cursor.execute(
+                    self._SQL_ITENS + f" WHERE ipv.id_pedido_venda IN ({marcadores}) ORDER BY p.nome",
+                    tuple(lote)
+                )
+                for row in cursor.fetchall():
+                    item = dict(row)
+                    itens_por_pedido[item['id_pedido_venda']].append(item)
+        return itens_por_pedido
+
     def listar_por_produto(self, id_produto: int) -> List[dict]:
         """
         Lista todos os itens de pedido que contêm um produto específico
@@ -6,7 +6,8 @@ COM LOGS DE DEBUG (print)
 import sys
 from typing import List, Optional
 from datetime import datetime
-from .db_pythonanywhere import get_cursor
+from .db_pythonanywhere import get_cursor, colunas_select, apos_commit
+from cache import catalogo_cache
 
 
 class PedidoCompraDAO:
@@ -78,24 +79,28 @@ class PedidoCompraDAO:
             print(f"[ERRO DAO] Erro ao buscar PedidoCompra {id_pedido_compra}: {e}", file=sys.stderr)
             return None
 
-    def listar_todos(self, status: str = None) -> List[dict]:
+    # Campos das listagens (projeção de ?fields=): campo -> expressão SQL
+    COLUNAS_LISTAGEM = {
+        'id_pedido_compra': 'pc.id_pedido_compra',
+        'id_fornecedor': 'pc.id_fornecedor',
+        'id_funcionario': 'pc.id_funcionario',
+        'data_pedido': 'pc.data_pedido',
+        'status': 'pc.status',
+        'total': 'pc.total',
+        'fornecedor_nome': 'f.nome_fantasia',
+        'funcionario_nome': 'u.nome'
+    }
+
+    def listar_todos(self, status: str = None, campos: List[str] = None) -> List[dict]:
         """
-        Lista todos os pedidos de compra
+        Lista todos os pedidos de compra (campos: projeção opcional, chaves de COLUNAS_LISTAGEM)
         """
         print(f"[LOG DAO] Listando todos PedidoCompra. Filtro Status: {status}")
         try:
             with get_cursor(commit=False) as cursor:
                 params = []
-                sql_base = """
-                    SELECT 
-                        pc.id_pedido_compra,
-                        pc.id_fornecedor,
-                        pc.id_funcionario,
-                        pc.data_pedido,
-                        pc.status,
-                        pc.total,
-                        f.nome_fantasia as fornecedor_nome,
-                        u.nome as funcionario_nome
+                sql_base = f"""
+                    SELECT {colunas_select(self.COLUNAS_LISTAGEM, campos)}
                     FROM Pedido_Compra pc
                     JOIN Fornecedor f ON pc.id_fornecedor = f.id_fornecedor
                     LEFT JOIN Funcionario func ON pc.id_funcionario = func.id_funcionario
@@ -293,7 +298,8 @@ class PedidoCompraDAO:
                         cursor.execute("""
                             UPDATE Produto
                             SET estoque_atual = %s,
-                                preco_custo_medio = %s
+                                preco_custo_medio = %s,
+                                versao = versao + 1
                             WHERE id_produto = %s
                         """, (novo_estoque, novo_custo_medio, id_produto))
                     else:
@@ -313,6 +319,9 @@ class PedidoCompraDAO:
             print(f"[ERRO DAO] Erro ao receber PedidoCompra {id_pedido_compra}: {e}", file=sys.stderr)
             print("[ERRO DAO] Transação será revertida (rollback).")
             return False
+        finally:
+            # Estoque alterado: descarta o snapshot do catálogo (após o commit)
+            apos_commit(catalogo_cache.invalidar)
 
     def cancelar_pedido(self, id_pedido_compra: int) -> bool:
         """
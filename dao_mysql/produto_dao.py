@@ -1,20 +1,120 @@
-from .db_pythonanywhere import get_cursor
+from decimal import Decimal
+from .db_pythonanywhere import get_cursor, colunas_select, iterar_consulta, apos_commit
+from cache import catalogo_cache
+
+# Colunas aceitas para ordenação na listagem paginada (todas indexadas)
+COLUNAS_ORDENACAO = ('nome', 'preco_venda', 'estoque_atual')
+
+# Campos das listagens (projeção de ?fields=): campo -> expressão SQL
+COLUNAS_LISTAGEM = {
+    'id_produto': 'id_produto',
+    'nome': 'nome',
+    'descricao': 'descricao',
+    'sku': 'sku',
+    'preco_venda': 'preco_venda',
+    'preco_custo_medio': 'preco_custo_medio',
+    'estoque_atual': 'estoque_atual',
+    'nome_imagem': 'nome_imagem',
+    'versao': 'versao'
+}
+
+# Limite de preço de venda (mesmo de ProdutoService.validar_preco)
+PRECO_MAXIMO = 999999.99
+
 
 class ProdutoDAO:
+    # Produtos por comando nos ajustes em massa
+    LOTE_AJUSTE = 500
+
+    # Colunas gravadas pela atualização parcial (PATCH)
+    COLUNAS_ATUALIZAVEIS = ('nome', 'descricao', 'sku', 'preco_venda', 'preco_custo_medio', 'estoque_atual')
+
     def __init__(self):
         pass
 
-    def listar_produtos(self):
-        """Lista todos os produtos"""
+    def listar_produtos(self, campos=None):
+        """Lista todos os produtos (campos: projeção opcional, chaves de COLUNAS_LISTAGEM)"""
         with get_cursor(commit=False) as cur:
-            sql = "SELECT id_produto, nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem FROM Produto"
+            sql = f"SELECT {colunas_select(COLUNAS_LISTAGEM, campos)} FROM Produto"
             cur.execute(sql)
             rows = cur.fetchall()
             return rows
     
-    def listar_todos(self):
+    def listar_todos(self, campos=None):
         """Alias para listar_produtos (compatibilidade)"""
-        return self.listar_produtos()
+        return self.listar_produtos(campos)
+
+    def iterar_produtos(self, campos=None):
+        """Gera os produtos um a um, sem carregar a lista inteira (listagem em streaming)"""
+        return iterar_consulta(f"SELECT {colunas_select(COLUNAS_LISTAGEM, campos)} FROM Produto")
+
+    def listar_nomes_skus(self):
+        """Lista apenas id, nome e SKU de todos os produtos (carga do índice de autocomplete)"""
+        with get_cursor(commit=False) as cur:
+            cur.execute("SELECT id_produto, nome, sku FROM Produto")
+            return cur.fetchall()
+
+    def listar_paginado(self, limite, ordenar_por='nome', ordem='asc', apos=None,
+                        preco_min=None, preco_max=None, estoque_min=None, estoque_max=None, campos=None):
+        """
+        Lista produtos usando paginação por cursor (keyset).
+        
+        A página seguinte é obtida a partir da última linha da página anterior
+        (valor da coluna de ordenação + id_produto), sem OFFSET, então o custo
+        de cada página não cresce com o tamanho da tabela.
+        
+        Args:
+            limite: Quantidade máxima de produtos retornados
+            ordenar_por: 'nome', 'preco_venda' ou 'estoque_atual'
+            ordem: 'asc' ou 'desc'
+            apos: Tupla (valor, id_produto) da última linha da página anterior
+            preco_min, preco_max: Faixa de preço de venda (opcional)
+            estoque_min, estoque_max: Faixa de estoque (opcional)
+            campos: Projeção (chaves de COLUNAS_LISTAGEM); deve incluir id_produto e `ordenar_por`
+        
+        Returns:
+            Lista de dicionários com até `limite` produtos
+        """
+        if ordenar_por not in COLUNAS_ORDENACAO:
+            raise ValueError(f"Coluna de ordenação inválida: {ordenar_por}")
+        
+        descendente = ordem == 'desc'
+        condicoes = []
+        params = []
+        
+        if preco_min is not None:
+            condicoes.append("preco_venda >= %s")
+            params.append(Decimal(str(preco_min)))
+        if preco_max is not None:
+            condicoes.append("preco_venda <= %s")
+            params.append(Decimal(str(preco_max)))
+        if estoque_min is not None:
+            condicoes.append("estoque_atual >= %s")
+            params.append(estoque_min)
+        if estoque_max is not None:
+            condicoes.append("estoque_atual <= %s")
+            params.append(estoque_max)
+        
+        if apos is not None:
+            valor, id_produto = apos
+            if ordenar_por == 'preco_venda':
+                valor = Decimal(str(valor))
+            operador = '<' if descendente else '>'
+            condicoes.append(
+                f"({ordenar_por} {operador} %s OR ({ordenar_por} = %s AND id_produto {operador} %s))"
+            )
+            params.extend([valor, valor, id_produto])
+        
+        direcao = 'DESC' if descendente else 'ASC'
+        sql = f"SELECT {colunas_select(COLUNAS_LISTAGEM, campos)} FROM Produto"
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        sql += f" ORDER BY {ordenar_por} {direcao}, id_produto {direcao} LIMIT %s"
+        params.append(limite)
+        
+        with get_cursor(commit=False) as cur:
+            cur.execute(sql, tuple(params))
+            return cur.fetchall()
 
     def inserir_produto(self, id_produto, nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem=None):
         with get_cursor() as cur:
@@ -25,11 +125,12 @@ class ProdutoDAO:
                 """,
                 (id_produto, nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem),
             )
+        apos_commit(catalogo_cache.invalidar, id_produto)
 
     def buscar_produto(self, id_produto):
         """Busca um produto específico pelo ID"""
         with get_cursor(commit=False) as cur:
-            sql = "SELECT id_produto, nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem FROM Produto WHERE id_produto = %s"
+            sql = "SELECT id_produto, nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem, versao FROM Produto WHERE id_produto = %s"
             cur.execute(sql, (id_produto,))
             row = cur.fetchone()
             return row
@@ -42,7 +143,7 @@ class ProdutoDAO:
         """Busca produtos por nome (case-insensitive, busca parcial)"""
         with get_cursor(commit=False) as cur:
             sql = """
-                SELECT id_produto, nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem 
+                SELECT id_produto, nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem, versao
                 FROM Produto 
                 WHERE nome LIKE %s
             """
@@ -50,22 +151,134 @@ class ProdutoDAO:
             rows = cur.fetchall()
             return [dict(row) for row in rows]
 
+    def buscar_texto(self, termos, limite, offset=0):
+        """
+        Busca full-text ranqueada em nome, descrição e SKU (índice FULLTEXT ft_produto_busca).
+        
+        A collation utf8mb4_unicode_ci já ignora acentos e maiúsculas; cada termo
+        é tratado como prefixo obrigatório, em qualquer ordem.
+        O InnoDB não indexa termos menores que innodb_ft_min_token_size (padrão 3):
+        esses termos são exigidos por LIKE, como prefixo de uma palavra de nome,
+        descrição ou SKU, e não contam na relevância.
+        
+        Args:
+            termos: Lista de termos já normalizados (sem acento, minúsculos)
+            limite: Quantidade máxima de resultados
+            offset: Deslocamento (paginação)
+        
+        Returns:
+            Lista de dicionários ordenada por relevância (campo 'relevancia')
+        """
+        if not termos:
+            return []
+        
+        consulta = ' '.join(f'+{termo}*' for termo in termos if len(termo) >= 3)
+        curtos = [termo for termo in termos if len(termo) < 3]
+        
+        condicoes = []
+        params = []
+        if consulta:
+            relevancia = "MATCH(nome, descricao, sku) AGAINST (%s IN BOOLEAN MODE)"
+            params_relevancia = (consulta,)
+            condicoes.append(relevancia)
+            params.append(consulta)
+        else:
+            relevancia = "0"
+            params_relevancia = ()
+        for termo in curtos:
+            # Início do campo ou início de uma palavra (termos só têm letras e dígitos)
+            condicoes.append(
+                "(" + " OR ".join(f"{coluna} LIKE %s OR {coluna} LIKE %s"
+                                  for coluna in ('nome', 'descricao', 'sku')) + ")"
+            )
+            params.extend([f"{termo}%", f"% {termo}%"] * 3)
+        
+        with get_cursor(commit=False) as cur:
+            sql = f"""
+                SELECT id_produto, nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem, versao,
+                       {relevancia} AS relevancia
+                FROM Produto
+                WHERE {' AND '.join(condicoes)}
+                ORDER BY relevancia DESC, id_produto ASC
+                LIMIT %s OFFSET %s
+            """
+            cur.execute(sql, params_relevancia + tuple(params) + (limite, offset))
+            rows = cur.fetchall()
+            return [dict(row) for row in rows]
+
     def atualizar_produto(self, id_produto, nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem=None):
         with get_cursor() as cur:
             cur.execute(
                 """
-                UPDATE Produto SET nome = %s, descricao = %s, sku = %s, preco_venda = %s, preco_custo_medio = %s, estoque_atual = %s, nome_imagem = %s
+                UPDATE Produto SET nome = %s, descricao = %s, sku = %s, preco_venda = %s, preco_custo_medio = %s, estoque_atual = %s, nome_imagem = %s, versao = versao + 1
                 WHERE id_produto = %s
                 """,
                 (nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem, id_produto),
             )
+        apos_commit(catalogo_cache.invalidar, id_produto)
         
         # Buscar e retornar o produto atualizado
         return self.buscar_por_id(id_produto)
 
+    def atualizar_parcial(self, id_produto, campos, versao):
+        """
+        Atualização parcial (PATCH) com controle de concorrência otimista.
+        
+        Grava apenas as colunas de `campos`, e só se o produto ainda estiver na `versao`
+        informada; a versão é incrementada na mesma escrita.
+        O MySQL não tem RETURNING: a linha é lida logo em seguida, na mesma conexão
+        e transação do UPDATE.
+        
+        Args:
+            id_produto: ID do produto
+            campos: Dict {coluna: valor} com chaves de COLUNAS_ATUALIZAVEIS
+            versao: Versão do produto lida pelo cliente
+        
+        Returns:
+            Tupla (produto, versao_atual):
+            - (produto atualizado, nova versão) se gravou
+            - (None, versão atual) se outra escrita alterou o produto antes (conflito)
+            - (None, None) se o produto não existe
+        """
+        colunas = [coluna for coluna in self.COLUNAS_ATUALIZAVEIS if coluna in campos]
+        atribuicoes = [f"{coluna} = %s" for coluna in colunas] + ["versao = versao + 1"]
+        params = tuple(campos[coluna] for coluna in colunas) + (id_produto, versao)
+        
+        with get_cursor() as cur:
+            cur.execute(
+                f"UPDATE Produto SET {', '.join(atribuicoes)} WHERE id_produto = %s AND versao = %s",
+                params
+            )
+            gravou = cur.rowcount > 0
+            
+            # Mesma conexão e transação: a linha gravada (ou a versão atual, no conflito)
+            cur.execute(f"SELECT {colunas_select(COLUNAS_LISTAGEM)} FROM Produto WHERE id_produto = %s", (id_produto,))
+            produto = cur.fetchone()
+        
+        if not gravou:
+            return None, produto['versao'] if produto else None
+        
+        apos_commit(catalogo_cache.invalidar, id_produto)
+        return produto, produto['versao']
+
+    def atualizar_nome_imagem(self, id_produto, nome_imagem):
+        """Atualiza apenas o nome base da imagem (usado pelo worker de imagens)"""
+        with get_cursor() as cur:
+            cur.execute("UPDATE Produto SET nome_imagem = %s, versao = versao + 1 WHERE id_produto = %s", (nome_imagem, id_produto))
+            atualizado = cur.rowcount > 0
+        apos_commit(catalogo_cache.invalidar, id_produto)
+        return atualizado
+
+    def contar_referencias_imagem(self, nome_imagem):
+        """Conta quantos produtos usam a imagem (contagem de referências das variantes em disco)"""
+        with get_cursor(commit=False) as cur:
+            cur.execute("SELECT COUNT(*) AS total FROM Produto WHERE nome_imagem = %s", (nome_imagem,))
+            return cur.fetchone()['total']
+
     def deletar_produto(self, id_produto):
         with get_cursor() as cur:
             cur.execute("DELETE FROM Produto WHERE id_produto = %s;", (id_produto,))
+        apos_commit(catalogo_cache.invalidar, id_produto)
     
     def deletar(self, id_produto):
         """Alias para deletar_produto (compatibilidade)"""
@@ -87,41 +300,228 @@ class ProdutoDAO:
     def criar_produto(self, dados):
         """
         Cria um novo produto sem especificar ID (auto-increment)
-        Retorna o produto criado com o ID gerado
+        Retorna o produto criado com o ID gerado, montado a partir dos valores gravados
+        (uma única escrita, sem reler a linha)
         """
+        produto = {
+            'id_produto': None,
+            'nome': dados['nome'],
+            'descricao': dados.get('descricao', ''),
+            'sku': dados['sku'],
+            'preco_venda': dados['preco_venda'],
+            'preco_custo_medio': dados.get('preco_custo_medio', 0),
+            'estoque_atual': dados['estoque_atual'],
+            'nome_imagem': dados.get('nome_imagem'),
+            'versao': 1
+        }
+        
         try:
             with get_cursor() as cur:
-                # INSERT do produto
-                sql_insert = """
-                INSERT INTO Produto (nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """
-                params = (
-                    dados['nome'], 
-                    dados.get('descricao', ''), 
-                    dados['sku'],
-                    dados['preco_venda'], 
-                    dados.get('preco_custo_medio', 0),
-                    dados['estoque_atual'], 
-                    dados.get('nome_imagem')
+                cur.execute(
+                    """
+                    INSERT INTO Produto (nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    """,
+                    (
+                        produto['nome'],
+                        produto['descricao'],
+                        produto['sku'],
+                        produto['preco_venda'],
+                        produto['preco_custo_medio'],
+                        produto['estoque_atual'],
+                        produto['nome_imagem']
+                    )
                 )
                 
-                cur.execute(sql_insert, params)
-                
                 # Obter o ID do produto criado
-                produto_id = cur.lastrowid
+                produto['id_produto'] = cur.lastrowid
+            
+            return produto
+        finally:
+            # Após o commit (saída do with); produto novo só afeta as listagens
+            apos_commit(catalogo_cache.invalidar_listas)
+
+    def importar_lote(self, linhas):
+        """
+        Grava um lote da importação em massa (POST /api/produtos/import) em uma transação.
+        
+        Produtos são identificados pelo SKU: SKUs novos são inseridos e os existentes
+        atualizados. `descricao` e `preco_custo_medio` None mantêm o valor atual
+        (em produtos novos viram '' e 70% do preço de venda).
+        
+        Args:
+            linhas: Lista de dicts com sku, nome, descricao, preco_venda, preco_custo_medio e estoque_atual
+        
+        Returns:
+            Tupla (inseridos, atualizados)
+        """
+        if not linhas:
+            return 0, 0
+        
+        try:
+            with get_cursor() as cur:
+                skus = list({linha['sku'] for linha in linhas})
+                cur.execute(
+                    f"SELECT sku FROM Produto WHERE sku IN ({', '.join(['%s'] * len(skus))})",
+                    tuple(skus)
+                )
+                # utf8mb4_unicode_ci compara SKUs sem diferenciar maiúsculas
+                existentes = {row['sku'].upper() for row in cur.fetchall()}
+                
+                novos, atualizacoes = [], []
+                for linha in linhas:
+                    if linha['sku'].upper() in existentes:
+                        atualizacoes.append(linha)
+                    else:
+                        # SKU repetido no mesmo lote: a linha seguinte vira atualização
+                        existentes.add(linha['sku'].upper())
+                        novos.append(linha)
                 
-                # Buscar o produto na MESMA transação
-                sql_select = "SELECT id_produto, nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem FROM Produto WHERE id_produto = %s"
+                if novos:
+                    cur.executemany(
+                        """
+                        INSERT INTO Produto (nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual)
+                        VALUES (%s, %s, %s, %s, %s, %s)
+                        """,
+                        [
+                            (
+                                linha['nome'],
+                                linha['descricao'] if linha['descricao'] is not None else '',
+                                linha['sku'],
+                                linha['preco_venda'],
+                                linha['preco_custo_medio'] if linha['preco_custo_medio'] is not None
+                                else round(linha['preco_venda'] * 0.7, 2),
+                                linha['estoque_atual']
+                            )
+                            for linha in novos
+                        ]
+                    )
                 
-                cur.execute(sql_select, (produto_id,))
-                row = cur.fetchone()
+                if atualizacoes:
+                    # INSERT ... ON DUPLICATE KEY vira um único comando multi-VALUES no executemany
+                    cur.executemany(
+                        """
+                        INSERT INTO Produto (sku, nome, descricao, preco_venda, preco_custo_medio, estoque_atual)
+                        VALUES (%s, %s, %s, %s, %s, %s)
+                        ON DUPLICATE KEY UPDATE
+                            nome = VALUES(nome),
+                            descricao = COALESCE(VALUES(descricao), descricao),
+                            preco_venda = VALUES(preco_venda),
+                            preco_custo_medio = COALESCE(VALUES(preco_custo_medio), preco_custo_medio),
+                            estoque_atual = VALUES(estoque_atual),
+                            versao = versao + 1
+                        """,
+                        [
+                            (linha['sku'], linha['nome'], linha['descricao'], linha['preco_venda'],
+                             linha['preco_custo_medio'], linha['estoque_atual'])
+                            for linha in atualizacoes
+                        ]
+                    )
                 
-                if row:
-                    produto_criado = row
-                    return produto_criado
-                else:
-                    return None
+                return len(novos), len(atualizacoes)
+        finally:
+            # Após o commit (saída do with); atualizações mudam listas e detalhes
+            apos_commit(catalogo_cache.invalidar)
+
+    def ajustar_lote(self, ajustes):
+        """
+        Ajuste em massa de preço/estoque (POST /api/produtos/bulk) em uma transação.
+        
+        Cada bloco de até LOTE_AJUSTE produtos é um único UPDATE com JOIN nos valores
+        informados (set-based), em vez de ler, mesclar e regravar produto a produto.
+        
+        Args:
+            ajustes: Lista de dicts com id_produto e, opcionais (None não altera),
+                     preco_venda, estoque_atual e delta_estoque
+        
+        Returns:
+            Lista dos produtos ajustados, já com os novos valores
+        
+        Raises:
+            ValueError: Se algum produto ficaria com estoque negativo ou preço acima do
+                        máximo (a transação é desfeita)
+        """
+        if not ajustes:
+            return []
+        
+        ids = [ajuste['id_produto'] for ajuste in ajustes]
+        try:
+            with get_cursor() as cur:
+                for inicio in range(0, len(ajustes), self.LOTE_AJUSTE):
+                    lote = ajustes[inicio:inicio + self.LOTE_AJUSTE]
+                    params = []
+                    for ajuste in lote:
+                        params.extend((ajuste['id_produto'], ajuste.get('preco_venda'),
+                                       ajuste.get('estoque_atual'), ajuste.get('delta_estoque')))
+                    valores = ' UNION ALL '.join(
+                        ['SELECT %s AS id_produto, %s AS preco_venda, %s AS estoque_atual, %s AS delta_estoque']
+                        + ['SELECT %s, %s, %s, %s'] * (len(lote) - 1)
+                    )
+                    cur.execute(
+                        f"""
+                        UPDATE Produto p
+                        JOIN ({valores}) a ON a.id_produto = p.id_produto
+                        SET p.preco_venda = COALESCE(a.preco_venda, p.preco_venda),
+                            p.estoque_atual = COALESCE(a.estoque_atual, p.estoque_atual + COALESCE(a.delta_estoque, 0)),
+                            p.versao = p.versao + 1
+                        """,
+                        tuple(params)
+                    )
                 
-        except Exception as e:
-            raise e
\ No newline at end of file
+                produtos = []
+                for inicio in range(0, len(ids), self.LOTE_AJUSTE):
+                    lote = ids[inicio:inicio + self.LOTE_AJUSTE]
+                    produtos.extend(self._ler_ajustados(cur, f"id_produto IN ({', '.join(['%s'] * len(lote))})", tuple(lote)))
+                return produtos
+        finally:
+            # Após o commit (ou rollback) da saída do with
+            apos_commit(catalogo_cache.invalidar)
+
+    def ajustar_por_regra(self, sku_padrao, fator_preco=None, delta_estoque=None):
+        """
+        Ajuste em massa por regra: um único UPDATE nos produtos com sku LIKE sku_padrao.
+        
+        Args:
+            sku_padrao: Padrão LIKE do SKU (ex: 'BRO-%')
+            fator_preco: Multiplicador do preço de venda (ex: 1.08 para +8%), arredondado em 2 casas
+            delta_estoque: Quantidade somada ao estoque (negativa para baixar)
+        
+        Returns:
+            Lista dos produtos ajustados, já com os novos valores
+        
+        Raises:
+            ValueError: Se algum produto ficaria com estoque negativo ou preço acima do máximo
+        """
+        atribuicoes, params = [], []
+        if fator_preco is not None:
+            atribuicoes.append("preco_venda = ROUND(preco_venda * %s, 2)")
+            params.append(Decimal(str(fator_preco)))
+        if delta_estoque is not None:
+            atribuicoes.append("estoque_atual = estoque_atual + %s")
+            params.append(delta_estoque)
+        if not atribuicoes:
+            return []
+        atribuicoes.append("versao = versao + 1")
+        
+        try:
+            with get_cursor() as cur:
+                cur.execute(
+                    f"UPDATE Produto SET {', '.join(atribuicoes)} WHERE sku LIKE %s",
+                    (*params, sku_padrao)
+                )
+                return self._ler_ajustados(cur, "sku LIKE %s", (sku_padrao,))
+        finally:
+            apos_commit(catalogo_cache.invalidar)
+
+    def _ler_ajustados(self, cur, condicao, params):
+        """Lê os produtos ajustados (na mesma transação) e valida os limites de preço e estoque"""
+        cur.execute(f"SELECT {colunas_select(COLUNAS_LISTAGEM)} FROM Produto WHERE {condicao}", params)
+        produtos = cur.fetchall()
+        
+        negativos = [produto['id_produto'] for produto in produtos if (produto['estoque_atual'] or 0) < 0]
+        if negativos:
+            raise ValueError(f"Estoque ficaria negativo nos produtos: {', '.join(map(str, negativos[:20]))}")
+        acima = [produto['id_produto'] for produto in produtos if produto['preco_venda'] > PRECO_MAXIMO]
+        if acima:
+            raise ValueError(f"Preço acima do máximo (999999.99) nos produtos: {', '.join(map(str, acima[:20]))}")
+        return produtos
@@ -0,0 +1,40 @@
+from .db_pythonanywhere import get_cursor
+
+class TokenBlacklistDAO:
+    """
+    DAO para operações na tabela token_blacklist (JWTs revogados no logout).
+    Contém apenas operações de banco de dados.
+    Cache e sincronização entre workers ficam em service/revogacao_service.py.
+    """
+    
+    def __init__(self):
+        pass
+
+    def inserir(self, jti, expira_em):
+        """
+        Registra o JTI como revogado até expira_em (timestamp Unix).
+        JTIs já registrados são ignorados.
+        """
+        with get_cursor() as cur:
+            cur.execute(
+                "INSERT INTO token_blacklist (jti, expira_em) VALUES (%s, FROM_UNIXTIME(%s)) "
+                "ON DUPLICATE KEY UPDATE jti=jti",
+                (jti, int(expira_em))
+            )
+
+    def existe(self, jti):
+        """
+        Verifica se o JTI está na blacklist.
+        """
+        with get_cursor(commit=False) as cur:
+            cur.execute("SELECT 1 FROM token_blacklist WHERE jti = %s", (jti,))
+            return cur.fetchone() is not None
+
+    def deletar_expirados(self):
+        """
+        Remove as revogações de tokens já expirados.
+        Retorna a quantidade de linhas removidas.
+        """
+        with get_cursor() as cur:
+            cur.execute("DELETE FROM token_blacklist WHERE expira_em < NOW()")
+            return cur.rowcount
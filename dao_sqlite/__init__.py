@@ -13,6 +13,8 @@ from .pedido_compra_dao import PedidoCompraDAO
 from .item_pedido_compra_dao import ItemPedidoCompraDAO
 from .pedido_venda_dao import PedidoVendaDAO
 from .item_pedido_venda_dao import ItemPedidoVendaDAO
+from .departamento_dao import DepartamentoDAO
+from .token_blacklist_dao import TokenBlacklistDAO
 
 __all__ = [
     'UsuarioDAO',
@@ -24,5 +26,7 @@ __all__ = [
     'PedidoCompraDAO',
     'ItemPedidoCompraDAO',
     'PedidoVendaDAO',
-    'ItemPedidoVendaDAO'
+    'ItemPedidoVendaDAO',
+    'DepartamentoDAO',
+    'TokenBlacklistDAO'
 ]
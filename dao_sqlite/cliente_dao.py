@@ -3,47 +3,64 @@ DAO para Cliente - Apenas operações de banco de dados (SQLite)
 Nova modelagem: Cliente herda de Usuario (1-para-1 via id_usuario)
 Regras de negócio devem estar no módulo service
 """
-from .db import get_cursor
+from .db import get_cursor, colunas_select, iterar_consulta
 
 class ClienteDAO:
     """DAO para operações CRUD na tabela Cliente"""
     
-    def listar_todos(self, apenas_ativos=True):
-        """Retorna todos os clientes com dados do usuário
-        
-        Args:
-            apenas_ativos (bool): Se True, retorna apenas clientes ativos. Default: True
+    # Campos das listagens (projeção de ?fields=): campo -> expressão SQL
+    COLUNAS_LISTAGEM = {
+        'id_cliente': 'c.id_cliente',
+        'id_usuario': 'c.id_usuario',
+        'data_cadastro': 'c.data_cadastro',
+        'origem_cadastro': 'c.origem_cadastro',
+        'nome': 'u.nome',
+        'cpf': 'u.cpf',
+        'email': 'u.email',
+        'telefone': 'u.telefone',
+        'ativo': 'u.ativo',
+        'data_criacao': 'u.data_criacao',
+        'data_nascimento': 'u.data_nascimento',
+        'ultimo_login': 'u.ultimo_login',
+        'cep': 'u.cep',
+        'logradouro': 'u.logradouro',
+        'numero': 'u.numero',
+        'bairro': 'u.bairro',
+        'cidade': 'u.cidade',
+        'estado': 'u.estado',
+        'nivel_acesso_nome': 'na.nome'
+    }
+    
+    def _sql_listagem(self, apenas_ativos, campos=None):
+        """SELECT da listagem de clientes (compartilhado com iterar_todos)"""
+        sql = f"""
+            SELECT {colunas_select(self.COLUNAS_LISTAGEM, campos)}
+            FROM Cliente c
+            JOIN usuario u ON c.id_usuario = u.id_usuario
+            JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
         """
+        if apenas_ativos:
+            sql += " WHERE u.ativo = 1"
+        return sql + " ORDER BY u.nome"
+    
+    def listar_todos(self, campos=None):
+        """Retorna todos os clientes com dados do usuário (campos: projeção opcional)"""
         with get_cursor() as cur:
-            if apenas_ativos:
-                cur.execute("""
-                    SELECT c.id_cliente, c.id_usuario, c.cpf, c.endereco,
-                           u.nome, u.email, u.telefone, u.ativo, u.data_criacao,
-                           na.nome as nivel_acesso_nome
-                    FROM Cliente c
-                    JOIN usuario u ON c.id_usuario = u.id_usuario
-                    JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
-                    WHERE u.ativo = 1
-                    ORDER BY u.nome
-                """)
-            else:
-                cur.execute("""
-                    SELECT c.id_cliente, c.id_usuario, c.cpf, c.endereco,
-                           u.nome, u.email, u.telefone, u.ativo, u.data_criacao,
-                           na.nome as nivel_acesso_nome
-                    FROM Cliente c
-                    JOIN usuario u ON c.id_usuario = u.id_usuario
-                    JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
-                    ORDER BY u.nome
-                """)
+            cur.execute(self._sql_listagem(False, campos))
             return [dict(row) for row in cur.fetchall()]
     
+    def iterar_todos(self, apenas_ativos=True, campos=None):
+        """Gera os clientes um a um, sem carregar a lista inteira (listagem em streaming)"""
+        return iterar_consulta(self._sql_listagem(apenas_ativos, campos))
+    
     def buscar_por_id(self, id_cliente):
         """Busca cliente por ID"""
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             cur.execute("""
-                SELECT c.id_cliente, c.id_usuario, c.cpf, c.endereco,
-                       u.nome, u.email, u.telefone, u.ativo, u.data_criacao,
+                SELECT c.id_cliente, c.id_usuario, c.data_cadastro, c.origem_cadastro,
+                       u.nome, u.cpf, u.email, u.telefone, u.ativo, u.data_criacao,
+                       u.data_nascimento, u.ultimo_login,
+                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
                        na.nome as nivel_acesso_nome
                 FROM Cliente c
                 JOIN usuario u ON c.id_usuario = u.id_usuario
@@ -55,10 +72,12 @@ class ClienteDAO:
     
     def buscar_por_usuario(self, id_usuario):
         """Busca cliente pelo ID do usuário"""
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             cur.execute("""
-                SELECT c.id_cliente, c.id_usuario, c.cpf, c.endereco,
-                       u.nome, u.email, u.telefone, u.ativo, u.data_criacao,
+                SELECT c.id_cliente, c.id_usuario, c.data_cadastro, c.origem_cadastro,
+                       u.nome, u.cpf, u.email, u.telefone, u.ativo, u.data_criacao,
+                       u.data_nascimento, u.ultimo_login,
+                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
                        na.nome as nivel_acesso_nome
                 FROM Cliente c
                 JOIN usuario u ON c.id_usuario = u.id_usuario
@@ -69,26 +88,30 @@ class ClienteDAO:
             return dict(row) if row else None
     
     def buscar_por_cpf(self, cpf):
-        """Busca cliente por CPF"""
-        with get_cursor() as cur:
+        """Busca cliente por CPF (agora CPF está na tabela usuario)"""
+        with get_cursor(commit=False) as cur:
             cur.execute("""
-                SELECT c.id_cliente, c.id_usuario, c.cpf, c.endereco,
-                       u.nome, u.email, u.telefone, u.ativo, u.data_criacao,
+                SELECT c.id_cliente, c.id_usuario, c.data_cadastro, c.origem_cadastro,
+                       u.nome, u.cpf, u.email, u.telefone, u.ativo, u.data_criacao,
+                       u.data_nascimento, u.ultimo_login,
+                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
                        na.nome as nivel_acesso_nome
                 FROM Cliente c
                 JOIN usuario u ON c.id_usuario = u.id_usuario
                 JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
-                WHERE c.cpf = ?
+                WHERE u.cpf = ?
             """, (cpf,))
             row = cur.fetchone()
             return dict(row) if row else None
     
     def buscar_por_email(self, email):
         """Busca cliente por email (via usuario)"""
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             cur.execute("""
-                SELECT c.id_cliente, c.id_usuario, c.cpf, c.endereco,
-                       u.nome, u.email, u.telefone, u.ativo, u.data_criacao,
+                SELECT c.id_cliente, c.id_usuario, c.data_cadastro, c.origem_cadastro,
+                       u.nome, u.cpf, u.email, u.telefone, u.ativo, u.data_criacao,
+                       u.data_nascimento, u.ultimo_login,
+                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
                        na.nome as nivel_acesso_nome
                 FROM Cliente c
                 JOIN usuario u ON c.id_usuario = u.id_usuario
@@ -98,26 +121,23 @@ class ClienteDAO:
             row = cur.fetchone()
             return dict(row) if row else None
     
-    def inserir(self, id_usuario, cpf, endereco=None):
+    def inserir(self, id_usuario, origem_cadastro='loja_fisica'):
         """Insere novo cliente vinculado a um usuário"""
         with get_cursor() as cur:
             cur.execute("""
-                INSERT INTO Cliente (id_usuario, cpf, endereco)
-                VALUES (?, ?, ?)
-            """, (id_usuario, cpf, endereco))
+                INSERT INTO Cliente (id_usuario, data_cadastro, origem_cadastro)
+                VALUES (?, CURRENT_TIMESTAMP, ?)
+            """, (id_usuario, origem_cadastro))
             return cur.lastrowid
     
-    def atualizar(self, id_cliente, cpf=None, endereco=None):
-        """Atualiza dados específicos do cliente (nome, email, telefone são atualizados via usuario)"""
+    def atualizar(self, id_cliente, origem_cadastro=None):
+        """Atualiza dados específicos do cliente (nome, cpf, email, telefone, endereço são atualizados via usuario)"""
         campos = []
         valores = []
         
-        if cpf is not None:
-            campos.append("cpf = ?")
-            valores.append(cpf)
-        if endereco is not None:
-            campos.append("endereco = ?")
-            valores.append(endereco)
+        if origem_cadastro is not None:
+            campos.append("origem_cadastro = ?")
+            valores.append(origem_cadastro)
         
         if not campos:
             return 0
@@ -135,25 +155,9 @@ class ClienteDAO:
             cur.execute("DELETE FROM Cliente WHERE id_cliente = ?", (id_cliente,))
             return cur.rowcount
     
-    def verificar_cpf_existe(self, cpf, excluir_id=None):
-        """Verifica se CPF já existe (útil para validação)"""
-        with get_cursor() as cur:
-            if excluir_id:
-                cur.execute(
-                    "SELECT COUNT(*) as total FROM Cliente WHERE cpf = ? AND id_cliente != ?",
-                    (cpf, excluir_id)
-                )
-            else:
-                cur.execute(
-                    "SELECT COUNT(*) as total FROM Cliente WHERE cpf = ?",
-                    (cpf,)
-                )
-            result = cur.fetchone()
-            return dict(result)['total'] > 0
-    
     def verificar_usuario_ja_cliente(self, id_usuario):
         """Verifica se um usuário já está cadastrado como cliente"""
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             cur.execute(
                 "SELECT COUNT(*) as total FROM Cliente WHERE id_usuario = ?",
                 (id_usuario,)
@@ -161,17 +165,42 @@ class ClienteDAO:
             result = cur.fetchone()
             return dict(result)['total'] > 0
     
-    def listar_clientes_ativos(self):
-        """Retorna apenas clientes com usuários ativos"""
+    def listar_clientes_ativos(self, campos=None):
+        """Retorna apenas clientes com usuários ativos (campos: projeção opcional)"""
         with get_cursor() as cur:
+            cur.execute(self._sql_listagem(True, campos))
+            return [dict(row) for row in cur.fetchall()]
+    
+    def listar_por_origem_cadastro(self, origem_cadastro):
+        """Retorna clientes filtrados por origem de cadastro"""
+        with get_cursor(commit=False) as cur:
             cur.execute("""
-                SELECT c.id_cliente, c.id_usuario, c.cpf, c.endereco,
-                       u.nome, u.email, u.telefone, u.ativo, u.data_criacao,
+                SELECT c.id_cliente, c.id_usuario, c.data_cadastro, c.origem_cadastro,
+                       u.nome, u.cpf, u.email, u.telefone, u.ativo, u.data_criacao,
+                       u.data_nascimento, u.ultimo_login,
+                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
                        na.nome as nivel_acesso_nome
                 FROM Cliente c
                 JOIN usuario u ON c.id_usuario = u.id_usuario
                 JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
-                WHERE u.ativo = 1
-                ORDER BY u.nome
+                WHERE c.origem_cadastro = ?
+                ORDER BY c.data_cadastro DESC
+            """, (origem_cadastro,))
+            return [dict(row) for row in cur.fetchall()]
+    
+    def obter_estatisticas_por_origem(self):
+        """Retorna estatísticas de clientes por origem de cadastro"""
+        with get_cursor(commit=False) as cur:
+            cur.execute("""
+                SELECT 
+                    c.origem_cadastro,
+                    COUNT(c.id_cliente) as total_clientes,
+                    COUNT(DISTINCT CASE WHEN u.ativo = 1 THEN c.id_cliente END) as clientes_ativos,
+                    MIN(c.data_cadastro) as primeira_data,
+                    MAX(c.data_cadastro) as ultima_data
+                FROM Cliente c
+                JOIN usuario u ON c.id_usuario = u.id_usuario
+                GROUP BY c.origem_cadastro
+                ORDER BY total_clientes DESC
             """)
             return [dict(row) for row in cur.fetchall()]
@@ -1,12 +1,244 @@
 import os
+import time
 import sqlite3
 import threading
+from urllib.parse import quote
 from contextlib import contextmanager
 from flask import g, has_request_context
 
+from .escritor import EscritorUnico
+
 # Configuração global
 _db_path = None
 _db_lock = threading.Lock()
+_pool = None
+_pool_leitura = None
+_escritor = None
+_local = threading.local()  # Unidade de trabalho ativa em cada thread
+
+# Conexões ociosas mantidas abertas para reuso (acima disso, são fechadas ao devolver)
+POOL_MAXIMO_OCIOSAS = int(os.getenv('SQLITE_POOL_MAXIMO', 8))
+
+# Checkpoint do WAL em segundo plano: intervalo entre verificações (0 volta ao
+# checkpoint automático do SQLite no commit) e tamanho do WAL que dispara o checkpoint
+CHECKPOINT_INTERVALO_SEGUNDOS = float(os.getenv('SQLITE_CHECKPOINT_INTERVALO_SEGUNDOS', 5))
+CHECKPOINT_WAL_BYTES = int(os.getenv('SQLITE_CHECKPOINT_WAL_BYTES', 4 * 1024 * 1024))
+
+# Conexões somente leitura para get_cursor(commit=False) (false usa a conexão de escrita)
+LEITURA_SEPARADA = os.getenv('SQLITE_LEITURA_SEPARADA', 'true').lower() == 'true'
+
+# Conexões de leitura: arquivo mapeado em memória e cache de páginas maior (em KiB)
+LEITURA_MMAP_BYTES = int(os.getenv('SQLITE_MMAP_BYTES', 256 * 1024 * 1024))
+LEITURA_CACHE_KB = int(os.getenv('SQLITE_CACHE_LEITURA_KB', 32 * 1024))
+
+# Todas as escritas do processo por uma única conexão, em fila (ver dao_sqlite/escritor.py)
+ESCRITOR_UNICO = os.getenv('SQLITE_ESCRITOR_UNICO', 'false').lower() == 'true'
+
+
+def _conectar(caminho, timeout=30.0, checkpoint_automatico=True, somente_leitura=False):
+    """Abre uma conexão e aplica as configurações (uma vez por conexão)"""
+    if somente_leitura:
+        # mode=ro: o arquivo é aberto sem permissão de escrita; query_only barra
+        # escritas também em tabelas temporárias
+        uri = f"file:{quote(os.path.abspath(caminho))}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only=ON")
+        conn.execute(f"PRAGMA mmap_size={LEITURA_MMAP_BYTES}")
+        conn.execute(f"PRAGMA cache_size=-{LEITURA_CACHE_KB}")
+        conn.execute("PRAGMA temp_store=memory")
+        return conn
+
+    conn = sqlite3.connect(caminho, timeout=timeout, isolation_level='DEFERRED', check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=10000")
+    conn.execute("PRAGMA temp_store=memory")
+    if not checkpoint_automatico:
+        conn.execute("PRAGMA wal_autocheckpoint=0")
+    return conn
+
+
+class PoolConexoes:
+    """
+    Pool de conexões SQLite de longa duração.
+    
+    Cada requisição (ou get_cursor fora do Flask) retira uma conexão já configurada e a
+    devolve no fim; a conexão fica com a thread enquanto estiver em uso. Com o
+    checkpoint em segundo plano ativo, as conexões do pool não fazem checkpoint no
+    commit: uma thread verifica o tamanho do WAL a cada CHECKPOINT_INTERVALO_SEGUNDOS.
+    
+    Com somente_leitura=True, as conexões são abertas com mode=ro e query_only (sem
+    checkpoint): no WAL, leitores nunca bloqueiam nem são bloqueados pelo escritor.
+    
+    Após um fork (gunicorn com preload), o processo filho descarta as conexões herdadas.
+    """
+    
+    def __init__(self, caminho, maximo_ociosas=POOL_MAXIMO_OCIOSAS,
+                 checkpoint_intervalo=CHECKPOINT_INTERVALO_SEGUNDOS,
+                 checkpoint_wal_bytes=CHECKPOINT_WAL_BYTES, somente_leitura=False):
+        self.caminho = caminho
+        self.maximo_ociosas = maximo_ociosas
+        self.somente_leitura = somente_leitura
+        self.checkpoint_intervalo = 0 if somente_leitura else checkpoint_intervalo
+        self.checkpoint_wal_bytes = checkpoint_wal_bytes
+        self._lock = threading.Lock()
+        self._ociosas = []
+        self._pid = os.getpid()
+        self._em_uso = 0
+        self._criadas = 0
+        self._retiradas = 0
+        self._reutilizadas = 0
+        self._checkpoints = 0
+        self._paginas_checkpoint = 0
+        self._checkpointer = None
+        self._parar = threading.Event()
+    
+    @property
+    def checkpoint_em_segundo_plano(self):
+        return self.checkpoint_intervalo > 0
+    
+    def _verificar_fork(self):
+        """Deve ser chamado com _lock"""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._ociosas = []
+            self._em_uso = 0
+            self._checkpointer = None
+    
+    def obter(self):
+        """Retira uma conexão do pool (ou abre uma nova, já configurada)"""
+        with self._lock:
+            self._verificar_fork()
+            self._retiradas += 1
+            self._em_uso += 1
+            if self._ociosas:
+                self._reutilizadas += 1
+                return self._ociosas.pop()
+            if self.checkpoint_em_segundo_plano and self._checkpointer is None:
+                self._iniciar_checkpointer()
+        try:
+            conn = _conectar(self.caminho, checkpoint_automatico=not self.checkpoint_em_segundo_plano,
+                             somente_leitura=self.somente_leitura)
+        except Exception:
+            with self._lock:
+                self._em_uso -= 1
+            raise
+        with self._lock:
+            self._criadas += 1
+        return conn
+    
+    def devolver(self, conn):
+        """Devolve a conexão ao pool, desfazendo transação deixada aberta"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except Exception:
+            self._descartar(conn)
+            return
+        
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            self._em_uso -= 1
+            if len(self._ociosas) < self.maximo_ociosas:
+                self._ociosas.append(conn)
+                return
+        try:
+            conn.close()
+        except Exception:
+            pass
+    
+    def _descartar(self, conn):
+        with self._lock:
+            if self._pid == os.getpid():
+                self._em_uso -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+    
+    # ---------- Checkpoint do WAL em segundo plano ----------
+    
+    def _iniciar_checkpointer(self):
+        """Deve ser chamado com _lock"""
+        self._parar = threading.Event()
+        self._checkpointer = threading.Thread(target=self._executar_checkpoints, args=(self._parar,),
+                                              name='sqlite-checkpoint', daemon=True)
+        self._checkpointer.start()
+    
+    def _executar_checkpoints(self, parar):
+        conn = None
+        try:
+            while not parar.wait(self.checkpoint_intervalo):
+                try:
+                    tamanho_wal = os.path.getsize(self.caminho + '-wal')
+                except OSError:
+                    continue
+                if tamanho_wal < self.checkpoint_wal_bytes:
+                    continue
+                try:
+                    if conn is None:
+                        # Timeout curto: o checkpoint não deve segurar os escritores
+                        conn = _conectar(self.caminho, timeout=1.0)
+                    self.checkpoint(conn)
+                except sqlite3.Error as e:
+                    print(f"⚠️  Erro no checkpoint do WAL: {e}")
+        finally:
+            if conn is not None:
+                conn.close()
+    
+    def checkpoint(self, conn):
+        """
+        Copia o WAL para o banco sem bloquear leitores e escritores (PASSIVE). Se
+        todas as páginas foram copiadas, trunca o arquivo WAL (TRUNCATE).
+        
+        Returns:
+            int: Páginas copiadas para o banco
+        """
+        ocupado, paginas_log, paginas_copiadas = conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+        if not ocupado and paginas_log == paginas_copiadas:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        with self._lock:
+            self._checkpoints += 1
+            self._paginas_checkpoint += max(paginas_copiadas, 0)
+        return paginas_copiadas
+    
+    def fechar(self):
+        """Fecha as conexões ociosas e para o checkpoint em segundo plano"""
+        with self._lock:
+            ociosas, self._ociosas = self._ociosas, []
+            self._parar.set()
+            self._checkpointer = None
+        for conn in ociosas:
+            try:
+                conn.close()
+            except Exception:
+                pass
+    
+    def estatisticas(self):
+        """Contadores do pool e do checkpoint"""
+        try:
+            tamanho_wal = os.path.getsize(self.caminho + '-wal')
+        except OSError:
+            tamanho_wal = 0
+        with self._lock:
+            return {
+                'caminho': self.caminho,
+                'somente_leitura': self.somente_leitura,
+                'ociosas': len(self._ociosas),
+                'em_uso': self._em_uso,
+                'maximo_ociosas': self.maximo_ociosas,
+                'criadas': self._criadas,
+                'retiradas': self._retiradas,
+                'reutilizadas': self._reutilizadas,
+                'taxa_reuso': round(self._reutilizadas / self._retiradas, 4) if self._retiradas else 0.0,
+                'checkpoint_em_segundo_plano': self.checkpoint_em_segundo_plano,
+                'checkpoints': self._checkpoints,
+                'paginas_checkpoint': self._paginas_checkpoint,
+                'wal_bytes': tamanho_wal
+            }
 
 
 def init_db(db_config: dict = None, minconn: int = 1, maxconn: int = 5):
@@ -16,9 +248,12 @@ def init_db(db_config: dict = None, minconn: int = 1, maxconn: int = 5):
       Exemplo: {'database': 'app_sqlite.db'}
     Se db_config for None, usa variável de ambiente SQLITE_DB ou padrão 'banco_api.sqlite'.
     
-    Os parâmetros minconn e maxconn são ignorados (compatibilidade com interface PostgreSQL).
+    Os parâmetros minconn e maxconn são ignorados (compatibilidade com interface PostgreSQL);
+    o pool é configurado por SQLITE_POOL_MAXIMO e SQLITE_CHECKPOINT_*, e as conexões
+    somente leitura por SQLITE_LEITURA_SEPARADA, SQLITE_MMAP_BYTES e SQLITE_CACHE_LEITURA_KB.
+    Com SQLITE_ESCRITOR_UNICO=true, as escritas passam pela fila do escritor único.
     """
-    global _db_path
+    global _db_path, _pool, _pool_leitura, _escritor
     if _db_path is not None:
         return
     
@@ -26,12 +261,19 @@ def init_db(db_config: dict = None, minconn: int = 1, maxconn: int = 5):
         _db_path = os.getenv('SQLITE_DB', 'banco_api.sqlite')
     else:
         _db_path = db_config.get('database', 'banco_api.sqlite')
+    _pool = PoolConexoes(_db_path)
+    # Banco em memória não pode ser reaberto por outra conexão
+    if LEITURA_SEPARADA and _db_path != ':memory:':
+        _pool_leitura = PoolConexoes(_db_path, somente_leitura=True)
+    if ESCRITOR_UNICO:
+        caminho = _db_path
+        _escritor = EscritorUnico(lambda: _conectar(caminho))
 
 
 def get_db_connection():
     """
     Obtém a conexão do banco para a requisição atual (Flask g object).
-    Reutiliza a mesma conexão durante toda a requisição.
+    Retira a conexão do pool na primeira chamada e a reutiliza durante toda a requisição.
     
     Returns:
         sqlite3.Connection: Conexão ativa do SQLite
@@ -42,43 +284,62 @@ def get_db_connection():
     # Se estamos em contexto de requisição Flask, usar g
     if has_request_context():
         if 'db_conn' not in g:
-            # Criar nova conexão para esta requisição
-            # isolation_level='DEFERRED' para controle explícito mas com transações normais
-            conn = sqlite3.connect(_db_path, timeout=30.0, isolation_level='DEFERRED', check_same_thread=False)
-            conn.row_factory = sqlite3.Row
-            
-            # Configurações para melhor performance
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA synchronous=NORMAL")
-            conn.execute("PRAGMA cache_size=10000")
-            conn.execute("PRAGMA temp_store=memory")
-            
-            g.db_conn = conn
+            g.db_conn = _pool.obter()
         
         return g.db_conn
     else:
         # Fora de contexto Flask (scripts, testes unitários)
-        # Criar conexão temporária
-        conn = sqlite3.connect(_db_path, timeout=30.0, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA synchronous=NORMAL")
-        conn.execute("PRAGMA cache_size=10000")
-        conn.execute("PRAGMA temp_store=memory")
-        return conn
+        # Conexão temporária (fora do pool), fechada por quem chamou
+        return _conectar(_db_path)
+
+
+def _obter_leitura():
+    """
+    Retira uma conexão somente leitura. Se não for possível abri-la (ex: arquivo
+    ainda não existe), desativa a separação e retorna None (usa a de escrita).
+    """
+    global _pool_leitura
+    pool = _pool_leitura
+    if pool is None:
+        return None
+    try:
+        return pool.obter()
+    except sqlite3.Error as e:
+        print(f"⚠️  Conexões somente leitura indisponíveis, usando a de escrita: {e}")
+        _pool_leitura = None
+        return None
+
+
+def _leitura_na_requisicao():
+    """
+    Conexão somente leitura da requisição (Flask g), ou None para usar a de escrita.
+    Com uma transação aberta na conexão de escrita, a leitura fica nela para
+    enxergar o que ainda não foi confirmado.
+    """
+    escrita = g.get('db_conn')
+    if escrita is not None and escrita.in_transaction:
+        return None
+    if 'db_conn_leitura' not in g:
+        conn = _obter_leitura()
+        if conn is None:
+            return None
+        g.db_conn_leitura = conn
+    return g.db_conn_leitura
 
 
 def close_db_connection(error=None):
     """
-    Fecha a conexão do banco ao fim da requisição Flask.
+    Devolve as conexões da requisição aos pools ao fim da requisição Flask.
     Deve ser registrada como teardown_appcontext no Flask.
     """
     conn = g.pop('db_conn', None)
     if conn is not None:
-        try:
-            conn.close()
-        except Exception:
-            pass
+        _pool.devolver(conn)
+    conn = g.pop('db_conn_leitura', None)
+    if conn is not None and _pool_leitura is not None:
+        _pool_leitura.devolver(conn)
+    elif conn is not None:
+        conn.close()
 
 
 @contextmanager
@@ -86,7 +347,13 @@ def get_cursor(commit: bool = True):
     """Context manager que fornece um cursor SQLite da mesma conexão.
     
     Durante uma requisição Flask, REUTILIZA a mesma conexão (Flask g object).
-    Fora do Flask (scripts), cria conexão isolada com modo transação normal.
+    Fora do Flask (scripts, threads de fundo), retira uma conexão do pool e a devolve no fim.
+    
+    Com commit=False, usa uma conexão somente leitura (pool separado), exceto quando
+    a conexão de escrita da requisição tem uma transação aberta.
+    
+    No modo escritor único (SQLITE_ESCRITOR_UNICO=true), com commit=True o bloco usa a
+    conexão do escritor na vez da fila e só termina após o commit (em grupo).
     
     Uso:
       from dao_sqlite.db import get_cursor
@@ -98,6 +365,54 @@ def get_cursor(commit: bool = True):
     """
     in_flask_context = has_request_context()
     
+    unidade = getattr(_local, 'unidade', None)
+    if unidade is not None:
+        # ===== UNIDADE DE TRABALHO: mesma conexão e transação, sem commit aqui =====
+        cur = unidade['conn'].cursor()
+        try:
+            yield cur
+        except Exception:
+            # O DAO pode engolir a exceção: a unidade inteira será desfeita
+            unidade['falhou'] = True
+            raise
+        finally:
+            try:
+                cur.close()
+            except Exception:
+                pass
+        return
+    
+    if _escritor is not None and (commit or _escritor.em_transacao()):
+        # ===== ESCRITOR ÚNICO: transação na fila (leituras aninhadas participam dela) =====
+        with _escritor.transacao() as cur:
+            yield cur
+        return
+    
+    if not commit:
+        if in_flask_context:
+            conn_leitura = _leitura_na_requisicao()
+        else:
+            if _db_path is None:
+                raise RuntimeError("Database path não inicializado. Chame init_db(...) primeiro.")
+            conn_leitura = _obter_leitura()
+        
+        if conn_leitura is not None:
+            # ===== LEITURA: conexão somente leitura (sem commit/rollback) =====
+            cur = conn_leitura.cursor()
+            try:
+                yield cur
+            finally:
+                try:
+                    cur.close()
+                except Exception:
+                    pass
+                if not in_flask_context:
+                    if _pool_leitura is not None:
+                        _pool_leitura.devolver(conn_leitura)
+                    else:
+                        conn_leitura.close()
+            return
+    
     if in_flask_context:
         # ===== DENTRO DE FLASK: usar pool de conexões =====
         conn = get_db_connection()
@@ -106,13 +421,9 @@ def get_cursor(commit: bool = True):
             cur = conn.cursor()
             yield cur
             
-            # Commit se solicitado (usa commit() normal do sqlite3)
+            # Commit se solicitado (o checkpoint do WAL fica com o pool)
             if commit:
                 conn.commit()
-                try:
-                    conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
-                except:
-                    pass
                 
         except Exception:
             try:
@@ -127,20 +438,11 @@ def get_cursor(commit: bool = True):
                 pass
     
     else:
-        # ===== FORA DE FLASK: conexão isolada para scripts =====
+        # ===== FORA DE FLASK: conexão do pool para scripts =====
         if _db_path is None:
             raise RuntimeError("Database path não inicializado. Chame init_db(...) primeiro.")
         
-        # Criar conexão com modo transação normal (não autocommit)
-        conn = sqlite3.connect(_db_path, timeout=30.0, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        
-        # Configurações para performance
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA synchronous=NORMAL")
-        conn.execute("PRAGMA cache_size=10000")
-        conn.execute("PRAGMA temp_store=memory")
-        
+        conn = _pool.obter()
         cur = conn.cursor()
         try:
             yield cur
@@ -160,16 +462,145 @@ def get_cursor(commit: bool = True):
                 cur.close()
             except Exception:
                 pass
+            _pool.devolver(conn)
+
+
+class _UnidadeDesfeita(Exception):
+    """Desfaz a transação do escritor único quando um cursor da unidade falhou"""
+
+
+@contextmanager
+def unidade_de_trabalho():
+    """Unidade de trabalho: uma conexão e uma transação para várias chamadas de DAO.
+    
+    Mesmo contrato da versão MySQL (dao_mysql.db_pythonanywhere.unidade_de_trabalho):
+    todo get_cursor() da mesma thread dentro do bloco, de leitura ou escrita, usa a
+    conexão de escrita sem commit próprio. No fim do bloco:
+      - commit, se nenhum cursor falhou;
+      - rollback, se o bloco lançou exceção ou algum cursor falhou.
+    Blocos aninhados participam da unidade mais externa. Funções registradas com
+    apos_commit() rodam só depois do commit. No modo escritor único, a unidade inteira
+    é uma transação da fila do escritor.
+    """
+    externa = getattr(_local, 'unidade', None)
+    if externa is not None:
+        try:
+            yield
+        except Exception:
+            # Falha em um bloco aninhado desfaz a unidade inteira
+            externa['falhou'] = True
+            raise
+        return
+    
+    if _db_path is None:
+        raise RuntimeError("Database path não inicializado. Chame init_db(...) primeiro.")
+    
+    unidade = {'conn': None, 'falhou': False, 'apos_commit': []}
+    
+    if _escritor is not None:
+        try:
+            with _escritor.transacao():
+                unidade['conn'] = _escritor.conexao_atual()
+                _local.unidade = unidade
+                try:
+                    yield
+                finally:
+                    _local.unidade = None
+                if unidade['falhou']:
+                    raise _UnidadeDesfeita()
+        except _UnidadeDesfeita:
+            pass
+    else:
+        # Na requisição Flask, a conexão de g (devolvida no teardown); fora dela, uma do pool
+        conn = get_db_connection() if has_request_context() else _pool.obter()
+        unidade['conn'] = conn
+        _local.unidade = unidade
+        try:
+            yield
+            if unidade['falhou']:
+                conn.rollback()
+            else:
+                conn.commit()
+        except Exception:
             try:
-                conn.close()
+                conn.rollback()
             except Exception:
                 pass
+            raise
+        finally:
+            _local.unidade = None
+            if not has_request_context():
+                _pool.devolver(conn)
+    
+    if not unidade['falhou']:
+        for funcao, args in unidade['apos_commit']:
+            funcao(*args)
 
 
-def close_pool():
-    """Fecha o pool (compatibilidade com interface PostgreSQL).
-    Para SQLite, apenas reseta o caminho do banco.
+def apos_commit(funcao, *args):
+    """Executa `funcao(*args)` após o commit da unidade de trabalho ativa, ou na hora
+    se não houver uma (ex: invalidar o cache do catálogo só com os dados já gravados)."""
+    unidade = getattr(_local, 'unidade', None)
+    if unidade is None:
+        funcao(*args)
+    else:
+        unidade['apos_commit'].append((funcao, args))
+
+
+def iterar_consulta(sql, params=(), tamanho_lote=500):
+    """Executa um SELECT e devolve as linhas (dict) aos poucos (respostas em streaming).
+    
+    O cursor do SQLite já lê sob demanda; as linhas são buscadas em lotes de
+    `tamanho_lote`, então a memória não cresce com o tamanho do resultado.
+    Em uma requisição Flask, use com stream_with_context para manter a conexão de `g`.
     """
-    global _db_path
+    with get_cursor(commit=False) as cur:
+        cur.execute(sql, params)
+        while True:
+            linhas = cur.fetchmany(tamanho_lote)
+            if not linhas:
+                break
+            for linha in linhas:
+                yield dict(linha)
+
+
+def colunas_select(colunas, campos=None):
+    """Monta a lista de colunas do SELECT a partir de {campo: expressão SQL}.
+    
+    Com `campos` (projeção de ?fields=), seleciona apenas esses campos, na ordem de `colunas`.
+    Ex: colunas_select({'id_cliente': 'c.id_cliente', 'nome': 'u.nome'}, ['nome'])
+        -> "u.nome"
+    """
+    selecionadas = []
+    for campo, expressao in colunas.items():
+        if campos is not None and campo not in campos:
+            continue
+        if expressao == campo or expressao.endswith('.' + campo):
+            selecionadas.append(expressao)
+        else:
+            selecionadas.append(f"{expressao} AS {campo}")
+    return ", ".join(selecionadas)
+
+
+def estatisticas_pool():
+    """Contadores dos pools de escrita e de leitura (None se o SQLite não foi inicializado)"""
+    if _pool is None:
+        return None
+    return {
+        'escrita': _pool.estatisticas(),
+        'leitura': _pool_leitura.estatisticas() if _pool_leitura is not None else None,
+        'escritor_unico': _escritor.estatisticas() if _escritor is not None else None
+    }
+
+
+def close_pool():
+    """Fecha as conexões ociosas dos pools e reseta o caminho do banco."""
+    global _db_path, _pool, _pool_leitura, _escritor
+    for pool in (_pool, _pool_leitura):
+        if pool is not None:
+            pool.fechar()
+    _pool = None
+    _pool_leitura = None
+    _escritor = None
     _db_path = None
 
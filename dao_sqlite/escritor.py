@@ -0,0 +1,239 @@
+"""
+Escritor Único do SQLite
+Modo opcional (SQLITE_ESCRITOR_UNICO=true) em que todas as transações de escrita do
+processo passam por uma única conexão, em uma thread dedicada, na ordem de uma fila.
+Sem disputa pelo lock do arquivo entre as threads do worker, não há espera por
+SQLITE_BUSY (até 30 s de timeout) quando vários pedidos são gravados ao mesmo tempo.
+
+- Cada transação roda dentro de um SAVEPOINT: se falhar, só ela é desfeita.
+- Commit em grupo: transações que chegam enquanto outra executa entram no mesmo
+  commit (até SQLITE_ESCRITOR_LOTE por commit).
+- Quem chamou recebe o resultado por um Future, resolvido só depois do commit.
+
+Duas formas de uso:
+  enviar(funcao, *args) -> Future: `funcao(cursor, *args)` roda na thread do escritor.
+  transacao(): context manager usado por get_cursor(); a thread que chamou recebe a
+      conexão do escritor enquanto a fila espera, e o bloco termina após o commit.
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+# Máximo de transações confirmadas no mesmo commit
+ESCRITOR_LOTE = int(os.getenv('SQLITE_ESCRITOR_LOTE', 32))
+
+# Espera máxima pela vez na fila (mesmo timeout das conexões SQLite)
+ESCRITOR_TIMEOUT_SEGUNDOS = 30.0
+
+
+class _Transacao:
+    """Item da fila: função executada na thread do escritor"""
+
+    def __init__(self, funcao=None, args=()):
+        self.funcao = funcao
+        self.args = args
+        self.future = Future()
+        self.resultado = None
+        self.erro = None
+
+    def executar(self, conn):
+        cur = conn.cursor()
+        try:
+            self.resultado = self.funcao(cur, *self.args)
+        finally:
+            cur.close()
+
+
+class _Concessao(_Transacao):
+    """Item da fila que empresta a conexão do escritor à thread que chamou"""
+
+    def __init__(self):
+        super().__init__()
+        self.liberada = threading.Event()
+        self.concluida = threading.Event()
+
+    def executar(self, conn):
+        self.liberada.set()
+        self.concluida.wait()
+        if self.erro is not None:
+            raise self.erro
+
+
+class EscritorUnico:
+    """Fila de transações de escrita executadas por uma única conexão"""
+
+    def __init__(self, conectar, lote_maximo=ESCRITOR_LOTE):
+        """
+        Args:
+            conectar: Função sem argumentos que abre a conexão de escrita já configurada
+            lote_maximo (int): Máximo de transações por commit
+        """
+        self.conectar = conectar
+        self.lote_maximo = lote_maximo
+        self._fila = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._conn = None
+        self._local = threading.local()
+        self._transacoes = 0
+        self._falhas = 0
+        self._commits = 0
+        self._maior_lote = 0
+
+    def _iniciar(self):
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            # Após fork, a thread e a conexão do processo pai não existem aqui
+            self._fila = queue.Queue()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._executar, name='sqlite-escritor', daemon=True)
+            self._thread.start()
+
+    # ---------- Thread do escritor ----------
+
+    def _executar(self):
+        conn = self.conectar()
+        # Transações controladas aqui (BEGIN/SAVEPOINT/COMMIT explícitos)
+        conn.isolation_level = None
+        self._conn = conn
+        while True:
+            item = self._fila.get()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+            except Exception as e:
+                item.erro = e
+                self._resolver([item], None)
+                continue
+
+            lote = []
+            while True:
+                self._processar(conn, item)
+                lote.append(item)
+                if len(lote) >= self.lote_maximo:
+                    break
+                try:
+                    item = self._fila.get_nowait()
+                except queue.Empty:
+                    break
+
+            erro_commit = None
+            try:
+                conn.execute("COMMIT")
+            except Exception as e:
+                erro_commit = e
+                try:
+                    conn.execute("ROLLBACK")
+                except Exception:
+                    pass
+            with self._lock:
+                self._commits += 1
+                self._maior_lote = max(self._maior_lote, len(lote))
+            self._resolver(lote, erro_commit)
+
+    def _processar(self, conn, item):
+        """Executa um item dentro de um SAVEPOINT (desfeito sozinho se falhar)"""
+        conn.execute("SAVEPOINT escrita")
+        try:
+            item.executar(conn)
+            conn.execute("RELEASE escrita")
+        except BaseException as e:
+            conn.execute("ROLLBACK TO escrita")
+            conn.execute("RELEASE escrita")
+            item.erro = e
+            with self._lock:
+                self._falhas += 1
+        with self._lock:
+            self._transacoes += 1
+
+    @staticmethod
+    def _resolver(lote, erro_commit):
+        for item in lote:
+            erro = item.erro or erro_commit
+            if erro is not None:
+                item.future.set_exception(erro)
+            else:
+                item.future.set_result(item.resultado)
+            if isinstance(item, _Concessao):
+                # Acorda quem ainda espera a vez (ex: BEGIN falhou)
+                item.liberada.set()
+
+    # ---------- API ----------
+
+    def enviar(self, funcao, *args):
+        """
+        Enfileira `funcao(cursor, *args)` para a thread do escritor.
+
+        Returns:
+            Future: resultado da função, disponível após o commit
+        """
+        self._iniciar()
+        transacao = _Transacao(funcao, args)
+        self._fila.put(transacao)
+        return transacao.future
+
+    @contextmanager
+    def transacao(self):
+        """
+        Empresta a conexão do escritor para um bloco de escrita (get_cursor).
+        Blocos aninhados na mesma thread participam da transação externa.
+        """
+        cursor_atual = getattr(self._local, 'cursor', None)
+        if cursor_atual is not None:
+            yield cursor_atual
+            return
+
+        self._iniciar()
+        concessao = _Concessao()
+        self._fila.put(concessao)
+        if not concessao.liberada.wait(ESCRITOR_TIMEOUT_SEGUNDOS):
+            # O escritor ainda pode chegar a este item: ele será desfeito
+            concessao.erro = TimeoutError('Tempo esgotado aguardando o escritor do SQLite')
+            concessao.concluida.set()
+            raise concessao.erro
+        if concessao.future.done():
+            # Falhou antes de começar (ex: BEGIN IMMEDIATE)
+            concessao.future.result()
+
+        cur = self._conn.cursor()
+        self._local.cursor = cur
+        try:
+            yield cur
+        except BaseException as e:
+            concessao.erro = e
+            raise
+        finally:
+            self._local.cursor = None
+            try:
+                cur.close()
+            except Exception:
+                pass
+            concessao.concluida.set()
+
+        # Só retorna depois do commit (em grupo) da transação
+        concessao.future.result()
+
+    def em_transacao(self):
+        """True se a thread atual está dentro de transacao()"""
+        return getattr(self._local, 'cursor', None) is not None
+
+    def conexao_atual(self):
+        """Conexão do escritor, se a thread atual está dentro de transacao()"""
+        return self._conn if self.em_transacao() else None
+
+    def estatisticas(self):
+        """Contadores do escritor"""
+        with self._lock:
+            return {
+                'fila': self._fila.qsize(),
+                'transacoes': self._transacoes,
+                'falhas': self._falhas,
+                'commits': self._commits,
+                'media_por_commit': round(self._transacoes / self._commits, 2) if self._commits else 0.0,
+                'maior_lote': self._maior_lote,
+                'lote_maximo': self.lote_maximo
+            }
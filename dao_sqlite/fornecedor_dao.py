@@ -3,7 +3,7 @@ DAO para manipulação da tabela Fornecedor no SQLite
 """
 
 from typing import List, Optional
-from dao_sqlite.db import get_cursor
+from dao_sqlite.db import get_cursor, colunas_select
 
 
 class FornecedorDAO:
@@ -90,33 +90,37 @@ class FornecedorDAO:
         except Exception as e:
             return None
 
-    def listar_todos(self, apenas_ativos: bool = True) -> List[dict]:
+    # Campos das listagens (projeção de ?fields=): campo -> expressão SQL
+    COLUNAS_LISTAGEM = {
+        'id_fornecedor': 'id_fornecedor',
+        'razao_social': 'razao_social',
+        'nome_fantasia': 'nome_fantasia',
+        'cnpj': 'cnpj',
+        'email': 'email',
+        'telefone': 'telefone',
+        'endereco': 'endereco',
+        'ativo': 'ativo',
+        'data_criacao': 'data_criacao'
+    }
+
+    def listar_todos(self, apenas_ativos: bool = True, campos: List[str] = None) -> List[dict]:
         """
         Lista todos os fornecedores
         
         Args:
             apenas_ativos: Se True, lista apenas fornecedores ativos
+            campos: Projeção opcional (chaves de COLUNAS_LISTAGEM)
         
         Returns:
             Lista de dicionários com dados dos fornecedores
         """
         try:
             with get_cursor(commit=False) as cursor:
+                sql = f"SELECT {colunas_select(self.COLUNAS_LISTAGEM, campos)} FROM Fornecedor"
                 if apenas_ativos:
-                    cursor.execute("""
-                        SELECT id_fornecedor, razao_social, nome_fantasia, cnpj, 
-                               email, telefone, endereco, ativo, data_criacao
-                        FROM Fornecedor
-                        WHERE ativo = 1
-                        ORDER BY nome_fantasia
-                    """)
-                else:
-                    cursor.execute("""
-                        SELECT id_fornecedor, razao_social, nome_fantasia, cnpj, 
-                               email, telefone, endereco, ativo, data_criacao
-                        FROM Fornecedor
-                        ORDER BY nome_fantasia
-                    """)
+                    sql += " WHERE ativo = 1"
+                sql += " ORDER BY nome_fantasia"
+                cursor.execute(sql)
                 
                 rows = cursor.fetchall()
                 return [dict(row) for row in rows]
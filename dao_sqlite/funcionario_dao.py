@@ -1,4 +1,4 @@
-from .db import get_cursor
+from .db import get_cursor, colunas_select
 
 class FuncionarioDAO:
     """
@@ -11,18 +11,45 @@ class FuncionarioDAO:
     def __init__(self):
         pass
 
-    def listar_todos(self, apenas_ativos=True):
+    # Campos das listagens (projeção de ?fields=): campo -> expressão SQL
+    COLUNAS_LISTAGEM = {
+        'id_funcionario': 'f.id_funcionario',
+        'id_usuario': 'f.id_usuario',
+        'cargo': 'f.cargo',
+        'salario': 'f.salario',
+        'data_contratacao': 'f.data_contratacao',
+        'id_departamento': 'f.id_departamento',
+        'nome': 'u.nome',
+        'cpf': 'u.cpf',
+        'email': 'u.email',
+        'telefone': 'u.telefone',
+        'ativo': 'u.ativo',
+        'data_criacao': 'u.data_criacao',
+        'data_nascimento': 'u.data_nascimento',
+        'ultimo_login': 'u.ultimo_login',
+        'cep': 'u.cep',
+        'logradouro': 'u.logradouro',
+        'numero': 'u.numero',
+        'bairro': 'u.bairro',
+        'cidade': 'u.cidade',
+        'estado': 'u.estado',
+        'nivel_acesso_nome': 'na.nome',
+        'departamento_nome': 'd.nome',
+        'centro_custo': 'd.centro_custo'
+    }
+    
+    def listar_todos(self, apenas_ativos=True, campos=None):
         """
-        Lista todos os funcionários com JOIN em usuario e nivel_acesso.
+        Lista todos os funcionários com JOIN em usuario, nivel_acesso e departamento.
+        campos: projeção opcional (chaves de COLUNAS_LISTAGEM).
         """
         with get_cursor() as cur:
-            query = """
-                SELECT f.id_funcionario, f.id_usuario, f.cargo, f.salario, f.data_contratacao,
-                       u.nome, u.email, u.telefone, u.ativo, u.data_criacao,
-                       na.nome as nivel_acesso_nome
+            query = f"""
+                SELECT {colunas_select(self.COLUNAS_LISTAGEM, campos)}
                 FROM Funcionario f
                 JOIN usuario u ON f.id_usuario = u.id_usuario
                 JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
+                LEFT JOIN Departamento d ON f.id_departamento = d.id_departamento
             """
             if apenas_ativos:
                 query += " WHERE u.ativo = 1"
@@ -33,16 +60,21 @@ class FuncionarioDAO:
 
     def buscar_por_id(self, id_funcionario):
         """
-        Busca funcionário por id_funcionario com dados completos de usuario.
+        Busca funcionário por id_funcionario com dados completos de usuario e departamento.
         """
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             cur.execute("""
                 SELECT f.id_funcionario, f.id_usuario, f.cargo, f.salario, f.data_contratacao,
-                       u.nome, u.email, u.telefone, u.ativo, u.data_criacao,
-                       na.nome as nivel_acesso_nome
+                       f.id_departamento,
+                       u.nome, u.cpf, u.email, u.telefone, u.ativo, u.data_criacao,
+                       u.data_nascimento, u.ultimo_login,
+                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
+                       na.nome as nivel_acesso_nome,
+                       d.nome as departamento_nome, d.centro_custo
                 FROM Funcionario f
                 JOIN usuario u ON f.id_usuario = u.id_usuario
                 JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
+                LEFT JOIN Departamento d ON f.id_departamento = d.id_departamento
                 WHERE f.id_funcionario = ?
             """, (id_funcionario,))
             row = cur.fetchone()
@@ -52,14 +84,19 @@ class FuncionarioDAO:
         """
         Busca funcionário por id_usuario.
         """
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             cur.execute("""
                 SELECT f.id_funcionario, f.id_usuario, f.cargo, f.salario, f.data_contratacao,
-                       u.nome, u.email, u.telefone, u.ativo, u.data_criacao,
-                       na.nome as nivel_acesso_nome
+                       f.id_departamento,
+                       u.nome, u.cpf, u.email, u.telefone, u.ativo, u.data_criacao,
+                       u.data_nascimento, u.ultimo_login,
+                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
+                       na.nome as nivel_acesso_nome,
+                       d.nome as departamento_nome, d.centro_custo
                 FROM Funcionario f
                 JOIN usuario u ON f.id_usuario = u.id_usuario
                 JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
+                LEFT JOIN Departamento d ON f.id_departamento = d.id_departamento
                 WHERE f.id_usuario = ?
             """, (id_usuario,))
             row = cur.fetchone()
@@ -69,20 +106,25 @@ class FuncionarioDAO:
         """
         Busca funcionário por email (do usuario associado).
         """
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             cur.execute("""
                 SELECT f.id_funcionario, f.id_usuario, f.cargo, f.salario, f.data_contratacao,
-                       u.nome, u.email, u.telefone, u.ativo, u.data_criacao,
-                       na.nome as nivel_acesso_nome
+                       f.id_departamento,
+                       u.nome, u.cpf, u.email, u.telefone, u.ativo, u.data_criacao,
+                       u.data_nascimento, u.ultimo_login,
+                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
+                       na.nome as nivel_acesso_nome,
+                       d.nome as departamento_nome, d.centro_custo
                 FROM Funcionario f
                 JOIN usuario u ON f.id_usuario = u.id_usuario
                 JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
+                LEFT JOIN Departamento d ON f.id_departamento = d.id_departamento
                 WHERE u.email = ?
             """, (email,))
             row = cur.fetchone()
             return dict(row) if row else None
 
-    def inserir(self, id_usuario, cargo, salario, data_contratacao):
+    def inserir(self, id_usuario, cargo, salario, data_contratacao, id_departamento=None):
         """
         Insere um novo funcionário vinculado a um usuario existente.
         O usuario já deve existir na tabela usuario.
@@ -90,15 +132,15 @@ class FuncionarioDAO:
         """
         with get_cursor() as cur:
             cur.execute("""
-                INSERT INTO Funcionario (id_usuario, cargo, salario, data_contratacao)
-                VALUES (?, ?, ?, ?)
-            """, (id_usuario, cargo, salario, data_contratacao))
+                INSERT INTO Funcionario (id_usuario, cargo, salario, data_contratacao, id_departamento)
+                VALUES (?, ?, ?, ?, ?)
+            """, (id_usuario, cargo, salario, data_contratacao, id_departamento))
             return cur.lastrowid
 
-    def atualizar(self, id_funcionario, cargo=None, salario=None, data_contratacao=None):
+    def atualizar(self, id_funcionario, cargo=None, salario=None, data_contratacao=None, id_departamento=None):
         """
         Atualiza campos específicos do funcionário (não mexe em usuario).
-        Para atualizar nome, email, telefone, usar UsuarioDAO.
+        Para atualizar nome, cpf, email, telefone, endereço, usar UsuarioDAO.
         """
         campos = []
         valores = []
@@ -112,6 +154,9 @@ class FuncionarioDAO:
         if data_contratacao is not None:
             campos.append("data_contratacao = ?")
             valores.append(data_contratacao)
+        if id_departamento is not None:
+            campos.append("id_departamento = ?")
+            valores.append(id_departamento)
         
         if not campos:
             return
@@ -135,7 +180,7 @@ class FuncionarioDAO:
         Verifica se o usuario já está associado a um funcionário.
         Retorna True se já existe, False caso contrário.
         """
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             cur.execute("SELECT COUNT(*) as count FROM Funcionario WHERE id_usuario = ?", (id_usuario,))
             result = cur.fetchone()
             return dict(result)['count'] > 0
@@ -144,14 +189,19 @@ class FuncionarioDAO:
         """
         Lista apenas funcionários ativos (usuario.ativo = 1).
         """
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             cur.execute("""
                 SELECT f.id_funcionario, f.id_usuario, f.cargo, f.salario, f.data_contratacao,
-                       u.nome, u.email, u.telefone, u.data_criacao,
-                       na.nome as nivel_acesso_nome
+                       f.id_departamento,
+                       u.nome, u.cpf, u.email, u.telefone, u.data_criacao,
+                       u.data_nascimento, u.ultimo_login,
+                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
+                       na.nome as nivel_acesso_nome,
+                       d.nome as departamento_nome, d.centro_custo
                 FROM Funcionario f
                 JOIN usuario u ON f.id_usuario = u.id_usuario
                 JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
+                LEFT JOIN Departamento d ON f.id_departamento = d.id_departamento
                 WHERE u.ativo = 1
                 ORDER BY u.nome
             """)
@@ -161,18 +211,95 @@ class FuncionarioDAO:
         """
         Lista funcionários por cargo específico.
         """
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             cur.execute("""
                 SELECT f.id_funcionario, f.id_usuario, f.cargo, f.salario, f.data_contratacao,
-                       u.nome, u.email, u.telefone, u.ativo, u.data_criacao,
-                       na.nome as nivel_acesso_nome
+                       f.id_departamento,
+                       u.nome, u.cpf, u.email, u.telefone, u.ativo, u.data_criacao,
+                       u.data_nascimento, u.ultimo_login,
+                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
+                       na.nome as nivel_acesso_nome,
+                       d.nome as departamento_nome, d.centro_custo
                 FROM Funcionario f
                 JOIN usuario u ON f.id_usuario = u.id_usuario
                 JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
+                LEFT JOIN Departamento d ON f.id_departamento = d.id_departamento
                 WHERE f.cargo = ? AND u.ativo = 1
                 ORDER BY u.nome
             """, (cargo,))
             return [dict(row) for row in cur.fetchall()]
+    
+    def listar_por_departamento(self, id_departamento, apenas_ativos=True):
+        """
+        Lista funcionários de um departamento específico.
+        """
+        with get_cursor() as cur:
+            query = """
+                SELECT f.id_funcionario, f.id_usuario, f.cargo, f.salario, f.data_contratacao,
+                       f.id_departamento,
+                       u.nome, u.cpf, u.email, u.telefone, u.ativo, u.data_criacao,
+                       u.data_nascimento, u.ultimo_login,
+                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
+                       na.nome as nivel_acesso_nome,
+                       d.nome as departamento_nome, d.centro_custo
+                FROM Funcionario f
+                JOIN usuario u ON f.id_usuario = u.id_usuario
+                JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
+                LEFT JOIN Departamento d ON f.id_departamento = d.id_departamento
+                WHERE f.id_departamento = ?
+            """
+            if apenas_ativos:
+                query += " AND u.ativo = 1"
+            query += " ORDER BY u.nome"
+            
+            cur.execute(query, (id_departamento,))
+            return [dict(row) for row in cur.fetchall()]
+    
+    def buscar_por_cpf(self, cpf):
+        """
+        Busca funcionário por CPF (agora CPF está na tabela usuario).
+        """
+        with get_cursor(commit=False) as cur:
+            cur.execute("""
+                SELECT f.id_funcionario, f.id_usuario, f.cargo, f.salario, f.data_contratacao,
+                       f.id_departamento,
+                       u.nome, u.cpf, u.email, u.telefone, u.ativo, u.data_criacao,
+                       u.data_nascimento, u.ultimo_login,
+                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
+                       na.nome as nivel_acesso_nome,
+                       d.nome as departamento_nome, d.centro_custo
+                FROM Funcionario f
+                JOIN usuario u ON f.id_usuario = u.id_usuario
+                JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
+                LEFT JOIN Departamento d ON f.id_departamento = d.id_departamento
+                WHERE u.cpf = ?
+            """, (cpf,))
+            row = cur.fetchone()
+            return dict(row) if row else None
+    
+    def obter_estatisticas_por_departamento(self):
+        """
+        Retorna estatísticas de funcionários por departamento.
+        """
+        with get_cursor(commit=False) as cur:
+            cur.execute("""
+                SELECT 
+                    d.id_departamento,
+                    d.nome as departamento_nome,
+                    d.centro_custo,
+                    COUNT(f.id_funcionario) as total_funcionarios,
+                    COUNT(CASE WHEN u.ativo = 1 THEN 1 END) as funcionarios_ativos,
+                    SUM(f.salario) as folha_salarial,
+                    AVG(f.salario) as salario_medio,
+                    MIN(f.data_contratacao) as primeira_contratacao,
+                    MAX(f.data_contratacao) as ultima_contratacao
+                FROM Departamento d
+                LEFT JOIN Funcionario f ON d.id_departamento = f.id_departamento
+                LEFT JOIN usuario u ON f.id_usuario = u.id_usuario
+                GROUP BY d.id_departamento, d.nome, d.centro_custo
+                ORDER BY total_funcionarios DESC
+            """)
+            return [dict(row) for row in cur.fetchall()]
 
     def buscar_funcionario(self, id_funcionario):
         """
@@ -191,4 +318,4 @@ class FuncionarioDAO:
             funcionario.cargo,
             funcionario.salario,
             funcionario.data_contratacao
-        )
+        )
\ No newline at end of file
@@ -71,6 +71,25 @@ class ItemPedidoCompraDAO:
         except Exception as e:
             return None
 
+    # Máximo de IDs por consulta em listar_por_pedidos
+    LOTE_IN = 500
+
+    # SELECT dos itens com dados do produto (filtrado por pedido em cada consulta)
+    _SQL_ITENS = """
+        SELECT 
+            ipc.id_item_compra as id_item_pedido_compra,
+            ipc.id_pedido_compra,
+            ipc.id_produto,
+            ipc.quantidade,
+            ipc.preco_custo_unitario,
+            p.nome as produto_nome,
+            p.sku as produto_sku,
+            p.estoque_atual as produto_estoque,
+            (ipc.quantidade * ipc.preco_custo_unitario) as subtotal
+        FROM Item_Pedido_Compra ipc
+        JOIN Produto p ON ipc.id_produto = p.id_produto
+    """
+
     def listar_por_pedido(self, id_pedido_compra: int) -> List[dict]:
         """
         Lista todos os itens de um pedido de compra
@@ -83,28 +102,47 @@ class ItemPedidoCompraDAO:
         """
         try:
             with get_cursor(commit=False) as cursor:
-                cursor.execute("""
-                    SELECT 
-                        ipc.id_item_compra as id_item_pedido_compra,
-                        ipc.id_pedido_compra,
-                        ipc.id_produto,
-                        ipc.quantidade,
-                        ipc.preco_custo_unitario,
-                        p.nome as produto_nome,
-                        p.sku as produto_sku,
-                        p.estoque_atual as produto_estoque,
-                        (ipc.quantidade * ipc.preco_custo_unitario) as subtotal
-                    FROM Item_Pedido_Compra ipc
-                    JOIN Produto p ON ipc.id_produto = p.id_produto
-                    WHERE ipc.id_pedido_compra = ?
-                    ORDER BY p.nome
-                """, (id_pedido_compra,))
+                cursor.execute(
+                    self._SQL_ITENS + " WHERE ipc.id_pedido_compra = ? ORDER BY p.nome",
+                    (id_pedido_compra,)
+                )
                 
                 rows = cursor.fetchall()
                 return [dict(row) for row in rows]
         except Exception as e:
             return None
 
+    def listar_por_pedidos(self, ids_pedidos: List[int]) -> dict:
+        """
+        Lista os itens de vários pedidos de compra de uma vez (?include=itens)
+        
+        Args:
+            ids_pedidos: IDs dos pedidos
+        
+        Returns:
+            Dicionário {id_pedido_compra: [itens]} (pedidos sem itens ficam com lista vazia)
+        
+        Uma única consulta (IN) para até LOTE_IN pedidos, em vez de uma por pedido.
+        """
+        itens_por_pedido = {id_pedido: [] for id_pedido in ids_pedidos}
+        if not ids_pedidos:
+            return itens_por_pedido
+        
+        ids = list(itens_por_pedido)
+        with get_cursor(commit=False) as cursor:
+            # Lotes limitam o número de parâmetros do IN
+            for inicio in range(0, len(ids), self.LOTE_IN):
+                lote = ids[inicio:inicio + self.LOTE_IN]
+                marcadores = ", ".join(["?"] * len(lote))
+                cursor.execute(
+                    self._SQL_ITENS + f" WHERE ipc.id_pedido_compra IN ({marcadores}) ORDER BY p.nome",
+                    tuple(lote)
+                )
+                for row in cursor.fetchall():
+                    item = dict(row)
+                    itens_por_pedido[item['id_pedido_compra']].append(item)
+        return itens_por_pedido
+
     def listar_por_produto(self, id_produto: int) -> List[dict]:
         """
         Lista todos os itens de pedido que contêm um produto específico
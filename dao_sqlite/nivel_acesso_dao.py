@@ -14,7 +14,7 @@ class NivelAcessoDAO:
         """
         Lista todos os níveis de acesso disponíveis.
         """
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             cur.execute("SELECT id_nivel_acesso, nome FROM nivel_acesso ORDER BY nome")
             return [dict(row) for row in cur.fetchall()]
 
@@ -22,7 +22,7 @@ class NivelAcessoDAO:
         """
         Busca um nível de acesso específico por ID.
         """
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             cur.execute(
                 "SELECT id_nivel_acesso, nome FROM nivel_acesso WHERE id_nivel_acesso = ?",
                 (id_nivel_acesso,),
@@ -34,7 +34,7 @@ class NivelAcessoDAO:
         """
         Busca um nível de acesso específico por nome.
         """
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             cur.execute(
                 "SELECT id_nivel_acesso, nome FROM nivel_acesso WHERE nome = ?",
                 (nome,),
@@ -42,6 +42,12 @@ class NivelAcessoDAO:
             row = cur.fetchone()
             return dict(row) if row else None
 
+    def buscar_por_nome(self, nome):
+        """
+        Alias para buscar_nivel_acesso_por_nome (mesma interface do DAO MySQL).
+        """
+        return self.buscar_nivel_acesso_por_nome(nome)
+
     def inserir(self, nome):
         """
         Insere um novo nível de acesso.
@@ -77,7 +83,7 @@ class NivelAcessoDAO:
         Conta quantos usuários estão associados a este nível de acesso.
         Útil para validar antes de deletar.
         """
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             cur.execute(
                 "SELECT COUNT(*) as count FROM usuario WHERE id_nivel_acesso = ?",
                 (id_nivel_acesso,)
@@ -91,7 +97,7 @@ class NivelAcessoDAO:
         Se id_nivel_acesso_excluir for fornecido, ignora esse registro na verificação.
         Útil para validar duplicatas em atualizações.
         """
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             if id_nivel_acesso_excluir:
                 cur.execute(
                     "SELECT COUNT(*) as count FROM nivel_acesso WHERE nome = ? AND id_nivel_acesso != ?",
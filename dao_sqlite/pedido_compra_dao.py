@@ -5,7 +5,8 @@ DAO para manipulação da tabela Pedido_Compra no SQLite
 from typing import List, Optional
 from datetime import datetime, date
 from decimal import Decimal
-from dao_sqlite.db import get_cursor
+from dao_sqlite.db import get_cursor, colunas_select, apos_commit
+from cache import catalogo_cache
 
 
 class PedidoCompraDAO:
@@ -74,54 +75,45 @@ class PedidoCompraDAO:
         except Exception as e:
             return None
 
-    def listar_todos(self, status: str = None) -> List[dict]:
+    # Campos das listagens (projeção de ?fields=): campo -> expressão SQL
+    COLUNAS_LISTAGEM = {
+        'id_pedido_compra': 'pc.id_pedido_compra',
+        'id_fornecedor': 'pc.id_fornecedor',
+        'id_funcionario': 'pc.id_funcionario',
+        'data_pedido': 'pc.data_pedido',
+        'status': 'pc.status',
+        'total': 'pc.total',
+        'fornecedor_nome': 'f.nome_fantasia',
+        'funcionario_nome': 'u.nome'
+    }
+
+    def listar_todos(self, status: str = None, campos: List[str] = None) -> List[dict]:
         """
         Lista todos os pedidos de compra
         
         Args:
             status: Filtrar por status específico (opcional)
+            campos: Projeção opcional (chaves de COLUNAS_LISTAGEM)
         
         Returns:
             Lista de dicionários com dados dos pedidos
         """
         try:
             with get_cursor(commit=False) as cursor:
+                params = []
+                sql = f"""
+                    SELECT {colunas_select(self.COLUNAS_LISTAGEM, campos)}
+                    FROM Pedido_Compra pc
+                    JOIN Fornecedor f ON pc.id_fornecedor = f.id_fornecedor
+                    JOIN Funcionario func ON pc.id_funcionario = func.id_funcionario
+                    JOIN Usuario u ON func.id_usuario = u.id_usuario
+                """
                 if status:
-                    cursor.execute("""
-                        SELECT 
-                            pc.id_pedido_compra,
-                            pc.id_fornecedor,
-                            pc.id_funcionario,
-                            pc.data_pedido,
-                            pc.status,
-                            pc.total,
-                            f.nome_fantasia as fornecedor_nome,
-                            u.nome as funcionario_nome
-                        FROM Pedido_Compra pc
-                        JOIN Fornecedor f ON pc.id_fornecedor = f.id_fornecedor
-                        JOIN Funcionario func ON pc.id_funcionario = func.id_funcionario
-                        JOIN Usuario u ON func.id_usuario = u.id_usuario
-                        WHERE pc.status = ?
-                        ORDER BY pc.data_pedido DESC
-                    """, (status,))
-                else:
-                    cursor.execute("""
-                        SELECT 
-                            pc.id_pedido_compra,
-                            pc.id_fornecedor,
-                            pc.id_funcionario,
-                            pc.data_pedido,
-                            pc.status,
-                            pc.total,
-                            f.nome_fantasia as fornecedor_nome,
-                            u.nome as funcionario_nome
-                        FROM Pedido_Compra pc
-                        JOIN Fornecedor f ON pc.id_fornecedor = f.id_fornecedor
-                        JOIN Funcionario func ON pc.id_funcionario = func.id_funcionario
-                        JOIN Usuario u ON func.id_usuario = u.id_usuario
-                        ORDER BY pc.data_pedido DESC
-                    """)
+                    sql += " WHERE pc.status = ?"
+                    params.append(status)
+                sql += " ORDER BY pc.data_pedido DESC"
                 
+                cursor.execute(sql, params)
                 rows = cursor.fetchall()
                 return [dict(row) for row in rows]
         except Exception as e:
@@ -300,7 +292,8 @@ class PedidoCompraDAO:
                         cursor.execute("""
                             UPDATE Produto
                             SET estoque_atual = ?,
-                                preco_custo_medio = ?
+                                preco_custo_medio = ?,
+                                versao = versao + 1
                             WHERE id_produto = ?
                         """, (novo_estoque, novo_custo_medio, id_produto))
                 
@@ -314,6 +307,9 @@ class PedidoCompraDAO:
                 return True
         except Exception as e:
             return False
+        finally:
+            # Estoque alterado: descarta o snapshot do catálogo (após o commit)
+            apos_commit(catalogo_cache.invalidar)
 
     def cancelar_pedido(self, id_pedido_compra: int) -> bool:
         """
@@ -5,7 +5,8 @@ DAO para manipulação da tabela Pedido_Venda no SQLite
 from typing import List, Optional
 from datetime import datetime, date
 from decimal import Decimal
-from dao_sqlite.db import get_cursor
+from dao_sqlite.db import get_cursor, colunas_select, iterar_consulta, apos_commit
+from cache import catalogo_cache
 
 
 class PedidoVendaDAO:
@@ -59,7 +60,7 @@ class PedidoVendaDAO:
                         pv.total,
                         u_cliente.nome as cliente_nome,
                         u_cliente.email as cliente_email,
-                        c.cpf as cliente_cpf,
+                        u_cliente.cpf as cliente_cpf,
                         u_func.nome as funcionario_nome
                     FROM Pedido_Venda pv
                     JOIN Cliente c ON pv.id_cliente = c.id_cliente
@@ -76,61 +77,64 @@ class PedidoVendaDAO:
         except Exception as e:
             return None
 
-    def listar_todos(self, status: str = None) -> List[dict]:
+    # Campos das listagens (projeção de ?fields=): campo -> expressão SQL
+    COLUNAS_LISTAGEM = {
+        'id_pedido_venda': 'pv.id_pedido_venda',
+        'id_cliente': 'pv.id_cliente',
+        'id_funcionario': 'pv.id_funcionario',
+        'data_pedido': 'pv.data_pedido',
+        'status': 'pv.status',
+        'total': 'pv.total',
+        'cliente_nome': 'u_cliente.nome',
+        'funcionario_nome': 'u_func.nome'
+    }
+
+    def listar_todos(self, status: str = None, campos: List[str] = None) -> List[dict]:
         """
         Lista todos os pedidos de venda
         
         Args:
             status: Filtrar por status específico (opcional)
+            campos: Projeção opcional (chaves de COLUNAS_LISTAGEM)
         
         Returns:
             Lista de dicionários com dados dos pedidos
         """
         try:
             with get_cursor(commit=False) as cursor:
-                if status:
-                    cursor.execute("""
-                        SELECT 
-                            pv.id_pedido_venda,
-                            pv.id_cliente,
-                            pv.id_funcionario,
-                            pv.data_pedido,
-                            pv.status,
-                            pv.total,
-                            u_cliente.nome as cliente_nome,
-                            u_func.nome as funcionario_nome
-                        FROM Pedido_Venda pv
-                        JOIN Cliente c ON pv.id_cliente = c.id_cliente
-                        JOIN Usuario u_cliente ON c.id_usuario = u_cliente.id_usuario
-                        LEFT JOIN Funcionario f ON pv.id_funcionario = f.id_funcionario
-                        LEFT JOIN Usuario u_func ON f.id_usuario = u_func.id_usuario
-                        WHERE pv.status = ?
-                        ORDER BY pv.data_pedido DESC
-                    """, (status,))
-                else:
-                    cursor.execute("""
-                        SELECT 
-                            pv.id_pedido_venda,
-                            pv.id_cliente,
-                            pv.id_funcionario,
-                            pv.data_pedido,
-                            pv.status,
-                            pv.total,
-                            u_cliente.nome as cliente_nome,
-                            u_func.nome as funcionario_nome
-                        FROM Pedido_Venda pv
-                        JOIN Cliente c ON pv.id_cliente = c.id_cliente
-                        JOIN Usuario u_cliente ON c.id_usuario = u_cliente.id_usuario
-                        LEFT JOIN Funcionario f ON pv.id_funcionario = f.id_funcionario
-                        LEFT JOIN Usuario u_func ON f.id_usuario = u_func.id_usuario
-                        ORDER BY pv.data_pedido DESC
-                    """)
-                
+                cursor.execute(*self._sql_listagem(status, campos))
                 rows = cursor.fetchall()
                 return [dict(row) for row in rows]
         except Exception as e:
             return None
 
+    def iterar_todos(self, status: str = None, campos: List[str] = None):
+        """
+        Gera os pedidos de venda um a um, sem carregar a lista inteira (listagem em streaming)
+        
+        Args:
+            status: Filtrar por status específico (opcional)
+            campos: Projeção opcional (chaves de COLUNAS_LISTAGEM)
+        """
+        return iterar_consulta(*self._sql_listagem(status, campos))
+
+    def _sql_listagem(self, status=None, campos=None):
+        """SELECT e parâmetros da listagem de pedidos (compartilhado com iterar_todos)"""
+        params = []
+        sql = f"""
+            SELECT {colunas_select(self.COLUNAS_LISTAGEM, campos)}
+            FROM Pedido_Venda pv
+            JOIN Cliente c ON pv.id_cliente = c.id_cliente
+            JOIN Usuario u_cliente ON c.id_usuario = u_cliente.id_usuario
+            LEFT JOIN Funcionario f ON pv.id_funcionario = f.id_funcionario
+            LEFT JOIN Usuario u_func ON f.id_usuario = u_func.id_usuario
+        """
+        if status:
+            sql += " WHERE pv.status = ?"
+            params.append(status)
+        sql += " ORDER BY pv.data_pedido DESC"
+        return sql, tuple(params)
+
     def listar_por_cliente(self, id_cliente: int) -> List[dict]:
         """
         Lista pedidos de venda de um cliente específico
@@ -294,7 +298,7 @@ class PedidoVendaDAO:
                     
                     cursor.execute("""
                         UPDATE Produto
-                        SET estoque_atual = estoque_atual - ?
+                        SET estoque_atual = estoque_atual - ?, versao = versao + 1
                         WHERE id_produto = ?
                     """, (quantidade, id_produto))
                 
@@ -308,6 +312,9 @@ class PedidoVendaDAO:
                 return True
         except Exception as e:
             return False
+        finally:
+            # Estoque alterado: descarta o snapshot do catálogo (após o commit)
+            apos_commit(catalogo_cache.invalidar)
 
     def cancelar_pedido(self, id_pedido_venda: int, devolver_estoque: bool = False) -> bool:
         """
@@ -350,7 +357,7 @@ class PedidoVendaDAO:
                     for item in itens:
                         cursor.execute("""
                             UPDATE Produto
-                            SET estoque_atual = estoque_atual + ?
+                            SET estoque_atual = estoque_atual + ?, versao = versao + 1
                             WHERE id_produto = ?
                         """, (item['quantidade'], item['id_produto']))
                 
@@ -364,6 +371,9 @@ class PedidoVendaDAO:
                 return cursor.rowcount > 0
         except Exception as e:
             return False
+        finally:
+            # Estoque alterado: descarta o snapshot do catálogo (após o commit)
+            apos_commit(catalogo_cache.invalidar)
 
     def deletar(self, id_pedido_venda: int) -> bool:
         """
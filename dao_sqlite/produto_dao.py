@@ -1,13 +1,40 @@
-from .db import get_cursor
+from .db import get_cursor, colunas_select, iterar_consulta, apos_commit
+from cache import catalogo_cache
+
+# Colunas aceitas para ordenação na listagem paginada (todas indexadas)
+COLUNAS_ORDENACAO = ('nome', 'preco_venda', 'estoque_atual')
+
+# Campos das listagens (projeção de ?fields=): campo -> expressão SQL
+COLUNAS_LISTAGEM = {
+    'id_produto': 'id_produto',
+    'nome': 'nome',
+    'descricao': 'descricao',
+    'sku': 'sku',
+    'preco_venda': 'preco_venda',
+    'preco_custo_medio': 'preco_custo_medio',
+    'estoque_atual': 'estoque_atual',
+    'nome_imagem': 'nome_imagem',
+    'versao': 'versao'
+}
+
+# Limite de preço de venda (mesmo de ProdutoService.validar_preco)
+PRECO_MAXIMO = 999999.99
+
 
 class ProdutoDAO:
+    # Produtos por comando nos ajustes em massa
+    LOTE_AJUSTE = 500
+
+    # Colunas gravadas pela atualização parcial (PATCH)
+    COLUNAS_ATUALIZAVEIS = ('nome', 'descricao', 'sku', 'preco_venda', 'preco_custo_medio', 'estoque_atual')
+
     def __init__(self):
         pass
 
-    def listar_produtos(self):
-        """Lista todos os produtos"""
-        with get_cursor() as cur:
-            sql = "SELECT id_produto, nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem FROM Produto"
+    def listar_produtos(self, campos=None):
+        """Lista todos os produtos (campos: projeção opcional, chaves de COLUNAS_LISTAGEM)"""
+        with get_cursor(commit=False) as cur:
+            sql = f"SELECT {colunas_select(COLUNAS_LISTAGEM, campos)} FROM Produto"
             cur.execute(sql)
             rows = cur.fetchall()
             return [dict(row) for row in rows]
@@ -21,11 +48,12 @@ class ProdutoDAO:
                 """,
                 (id_produto, nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem),
             )
+        apos_commit(catalogo_cache.invalidar, id_produto)
 
     def buscar_produto(self, id_produto):
         """Busca um produto específico pelo ID"""
-        with get_cursor() as cur:
-            sql = "SELECT id_produto, nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem FROM Produto WHERE id_produto = ?"
+        with get_cursor(commit=False) as cur:
+            sql = "SELECT id_produto, nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem, versao FROM Produto WHERE id_produto = ?"
             cur.execute(sql, (id_produto,))
             row = cur.fetchone()
             return dict(row) if row else None
@@ -34,18 +62,77 @@ class ProdutoDAO:
         with get_cursor() as cur:
             cur.execute(
                 """
-                UPDATE Produto SET nome = ?, descricao = ?, sku = ?, preco_venda = ?, preco_custo_medio = ?, estoque_atual = ?, nome_imagem = ?
+                UPDATE Produto SET nome = ?, descricao = ?, sku = ?, preco_venda = ?, preco_custo_medio = ?, estoque_atual = ?, nome_imagem = ?, versao = versao + 1
                 WHERE id_produto = ?
                 """,
                 (nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem, id_produto),
             )
+        apos_commit(catalogo_cache.invalidar, id_produto)
         
         # Buscar e retornar o produto atualizado
         return self.buscar_por_id(id_produto)
 
+    def atualizar_parcial(self, id_produto, campos, versao):
+        """
+        Atualização parcial (PATCH) com controle de concorrência otimista.
+        
+        Grava apenas as colunas de `campos`, e só se o produto ainda estiver na `versao`
+        informada; a versão é incrementada na mesma escrita.
+        O produto atualizado volta no próprio UPDATE (RETURNING, SQLite 3.35+).
+        
+        Args:
+            id_produto: ID do produto
+            campos: Dict {coluna: valor} com chaves de COLUNAS_ATUALIZAVEIS
+            versao: Versão do produto lida pelo cliente
+        
+        Returns:
+            Tupla (produto, versao_atual):
+            - (produto atualizado, nova versão) se gravou
+            - (None, versão atual) se outra escrita alterou o produto antes (conflito)
+            - (None, None) se o produto não existe
+        """
+        colunas = [coluna for coluna in self.COLUNAS_ATUALIZAVEIS if coluna in campos]
+        atribuicoes = [f"{coluna} = ?" for coluna in colunas] + ["versao = versao + 1"]
+        params = tuple(campos[coluna] for coluna in colunas) + (id_produto, versao)
+        
+        with get_cursor() as cur:
+            cur.execute(
+                f"""
+                UPDATE Produto SET {', '.join(atribuicoes)}
+                WHERE id_produto = ? AND versao = ?
+                RETURNING {colunas_select(COLUNAS_LISTAGEM)}
+                """,
+                params
+            )
+            rows = cur.fetchall()
+            
+            if not rows:
+                cur.execute("SELECT versao FROM Produto WHERE id_produto = ?", (id_produto,))
+                atual = cur.fetchone()
+                return None, atual['versao'] if atual else None
+        
+        apos_commit(catalogo_cache.invalidar, id_produto)
+        produto = dict(rows[0])
+        return produto, produto['versao']
+
+    def atualizar_nome_imagem(self, id_produto, nome_imagem):
+        """Atualiza apenas o nome base da imagem (usado pelo worker de imagens)"""
+        with get_cursor() as cur:
+            cur.execute("UPDATE Produto SET nome_imagem = ?, versao = versao + 1 WHERE id_produto = ?", (nome_imagem, id_produto))
+            atualizado = cur.rowcount > 0
+        apos_commit(catalogo_cache.invalidar, id_produto)
+        return atualizado
+
+    def contar_referencias_imagem(self, nome_imagem):
+        """Conta quantos produtos usam a imagem (contagem de referências das variantes em disco)"""
+        with get_cursor(commit=False) as cur:
+            cur.execute("SELECT COUNT(*) AS total FROM Produto WHERE nome_imagem = ?", (nome_imagem,))
+            return cur.fetchone()['total']
+
     def deletar_produto(self, id_produto):
         with get_cursor() as cur:
             cur.execute("DELETE FROM Produto WHERE id_produto = ?;", (id_produto,))
+        apos_commit(catalogo_cache.invalidar, id_produto)
 
     def inserir_produto_obj(self, produto):
         return self.inserir_produto(
@@ -62,48 +149,306 @@ class ProdutoDAO:
     def criar_produto(self, dados):
         """
         Cria um novo produto sem especificar ID (auto-increment)
-        Retorna o produto criado com o ID gerado
+        Retorna o produto criado com o ID gerado, montado a partir dos valores gravados
+        (uma única escrita, sem reler a linha)
         """
+        produto = {
+            'id_produto': None,
+            'nome': dados['nome'],
+            'descricao': dados.get('descricao', ''),
+            'sku': dados['sku'],
+            'preco_venda': dados['preco_venda'],
+            'preco_custo_medio': dados.get('preco_custo_medio', 0),
+            'estoque_atual': dados['estoque_atual'],
+            'nome_imagem': dados.get('nome_imagem'),
+            'versao': 1
+        }
+        
         try:
             with get_cursor() as cur:
-                # INSERT do produto
-                sql_insert = """
-                INSERT INTO Produto (nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """
-                params = (
-                    dados['nome'], 
-                    dados.get('descricao', ''), 
-                    dados['sku'],
-                    dados['preco_venda'], 
-                    dados.get('preco_custo_medio', 0),
-                    dados['estoque_atual'], 
-                    dados.get('nome_imagem')
+                cur.execute(
+                    """
+                    INSERT INTO Produto (nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        produto['nome'],
+                        produto['descricao'],
+                        produto['sku'],
+                        produto['preco_venda'],
+                        produto['preco_custo_medio'],
+                        produto['estoque_atual'],
+                        produto['nome_imagem']
+                    )
                 )
                 
-                cur.execute(sql_insert, params)
-                
                 # Obter o ID do produto criado
-                produto_id = cur.lastrowid
+                produto['id_produto'] = cur.lastrowid
+            
+            return produto
+        finally:
+            # Após o commit (saída do with); produto novo só afeta as listagens
+            apos_commit(catalogo_cache.invalidar_listas)
+
+    def importar_lote(self, linhas):
+        """
+        Grava um lote da importação em massa (POST /api/produtos/import) em uma transação.
+        
+        Produtos são identificados pelo SKU: SKUs novos são inseridos e os existentes
+        atualizados. `descricao` e `preco_custo_medio` None mantêm o valor atual
+        (em produtos novos viram '' e 70% do preço de venda).
+        
+        Args:
+            linhas: Lista de dicts com sku, nome, descricao, preco_venda, preco_custo_medio e estoque_atual
+        
+        Returns:
+            Tupla (inseridos, atualizados)
+        """
+        if not linhas:
+            return 0, 0
+        
+        try:
+            with get_cursor() as cur:
+                skus = list({linha['sku'] for linha in linhas})
+                cur.execute(
+                    f"SELECT sku FROM Produto WHERE sku IN ({', '.join(['?'] * len(skus))})",
+                    tuple(skus)
+                )
+                existentes = {row['sku'] for row in cur.fetchall()}
                 
-                # Buscar o produto na MESMA transação
-                sql_select = "SELECT id_produto, nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem FROM Produto WHERE id_produto = ?"
+                novos, atualizacoes = [], []
+                for linha in linhas:
+                    if linha['sku'] in existentes:
+                        atualizacoes.append(linha)
+                    else:
+                        # SKU repetido no mesmo lote: a linha seguinte vira atualização
+                        existentes.add(linha['sku'])
+                        novos.append(linha)
                 
-                cur.execute(sql_select, (produto_id,))
-                row = cur.fetchone()
+                if novos:
+                    cur.executemany(
+                        """
+                        INSERT INTO Produto (nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        """,
+                        [
+                            (
+                                linha['nome'],
+                                linha['descricao'] if linha['descricao'] is not None else '',
+                                linha['sku'],
+                                linha['preco_venda'],
+                                linha['preco_custo_medio'] if linha['preco_custo_medio'] is not None
+                                else round(linha['preco_venda'] * 0.7, 2),
+                                linha['estoque_atual']
+                            )
+                            for linha in novos
+                        ]
+                    )
                 
-                if row:
-                    produto_criado = dict(row)
-                    return produto_criado
-                else:
-                    return None
+                if atualizacoes:
+                    cur.executemany(
+                        """
+                        UPDATE Produto
+                        SET nome = ?,
+                            descricao = COALESCE(?, descricao),
+                            preco_venda = ?,
+                            preco_custo_medio = COALESCE(?, preco_custo_medio),
+                            estoque_atual = ?,
+                            versao = versao + 1
+                        WHERE sku = ?
+                        """,
+                        [
+                            (linha['nome'], linha['descricao'], linha['preco_venda'],
+                             linha['preco_custo_medio'], linha['estoque_atual'], linha['sku'])
+                            for linha in atualizacoes
+                        ]
+                    )
                 
-        except Exception as e:
-            raise e
+                return len(novos), len(atualizacoes)
+        finally:
+            # Após o commit (saída do with); atualizações mudam listas e detalhes
+            apos_commit(catalogo_cache.invalidar)
 
-    def listar_todos(self):
+    def ajustar_lote(self, ajustes):
+        """
+        Ajuste em massa de preço/estoque (POST /api/produtos/bulk) em uma transação.
+        
+        Cada bloco de até LOTE_AJUSTE produtos é um único UPDATE com JOIN nos valores
+        informados (set-based), em vez de ler, mesclar e regravar produto a produto.
+        
+        Args:
+            ajustes: Lista de dicts com id_produto e, opcionais (None não altera),
+                     preco_venda, estoque_atual e delta_estoque
+        
+        Returns:
+            Lista dos produtos ajustados, já com os novos valores
+        
+        Raises:
+            ValueError: Se algum produto ficaria com estoque negativo ou preço acima do
+                        máximo (a transação é desfeita)
+        """
+        if not ajustes:
+            return []
+        
+        ids = [ajuste['id_produto'] for ajuste in ajustes]
+        try:
+            with get_cursor() as cur:
+                for inicio in range(0, len(ajustes), self.LOTE_AJUSTE):
+                    lote = ajustes[inicio:inicio + self.LOTE_AJUSTE]
+                    params = []
+                    for ajuste in lote:
+                        params.extend((ajuste['id_produto'], ajuste.get('preco_venda'),
+                                       ajuste.get('estoque_atual'), ajuste.get('delta_estoque')))
+                    # UPDATE ... FROM (requer SQLite 3.33+). O comando precisa começar com UPDATE
+                    # (não WITH) para o sqlite3 abrir a transação. Colunas do VALUES:
+                    # column1=id_produto, column2=preco_venda, column3=estoque_atual, column4=delta_estoque
+                    cur.execute(
+                        f"""
+                        UPDATE Produto
+                        SET preco_venda = COALESCE(ajuste.column2, Produto.preco_venda),
+                            estoque_atual = COALESCE(ajuste.column3, Produto.estoque_atual + COALESCE(ajuste.column4, 0)),
+                            versao = Produto.versao + 1
+                        FROM (VALUES {', '.join(['(?, ?, ?, ?)'] * len(lote))}) AS ajuste
+                        WHERE ajuste.column1 = Produto.id_produto
+                        """,
+                        tuple(params)
+                    )
+                
+                produtos = []
+                for inicio in range(0, len(ids), self.LOTE_AJUSTE):
+                    lote = ids[inicio:inicio + self.LOTE_AJUSTE]
+                    produtos.extend(self._ler_ajustados(cur, f"id_produto IN ({', '.join(['?'] * len(lote))})", tuple(lote)))
+                return produtos
+        finally:
+            # Após o commit (ou rollback) da saída do with
+            apos_commit(catalogo_cache.invalidar)
+
+    def ajustar_por_regra(self, sku_padrao, fator_preco=None, delta_estoque=None):
+        """
+        Ajuste em massa por regra: um único UPDATE nos produtos com sku LIKE sku_padrao.
+        
+        Args:
+            sku_padrao: Padrão LIKE do SKU (ex: 'BRO-%')
+            fator_preco: Multiplicador do preço de venda (ex: 1.08 para +8%), arredondado em 2 casas
+            delta_estoque: Quantidade somada ao estoque (negativa para baixar)
+        
+        Returns:
+            Lista dos produtos ajustados, já com os novos valores
+        
+        Raises:
+            ValueError: Se algum produto ficaria com estoque negativo ou preço acima do máximo
+        """
+        atribuicoes, params = [], []
+        if fator_preco is not None:
+            atribuicoes.append("preco_venda = ROUND(preco_venda * ?, 2)")
+            params.append(fator_preco)
+        if delta_estoque is not None:
+            atribuicoes.append("estoque_atual = estoque_atual + ?")
+            params.append(delta_estoque)
+        if not atribuicoes:
+            return []
+        atribuicoes.append("versao = versao + 1")
+        
+        try:
+            with get_cursor() as cur:
+                cur.execute(
+                    f"UPDATE Produto SET {', '.join(atribuicoes)} WHERE sku LIKE ?",
+                    (*params, sku_padrao)
+                )
+                return self._ler_ajustados(cur, "sku LIKE ?", (sku_padrao,))
+        finally:
+            apos_commit(catalogo_cache.invalidar)
+
+    def _ler_ajustados(self, cur, condicao, params):
+        """Lê os produtos ajustados (na mesma transação) e valida os limites de preço e estoque"""
+        cur.execute(f"SELECT {colunas_select(COLUNAS_LISTAGEM)} FROM Produto WHERE {condicao}", params)
+        produtos = [dict(row) for row in cur.fetchall()]
+        
+        negativos = [produto['id_produto'] for produto in produtos if (produto['estoque_atual'] or 0) < 0]
+        if negativos:
+            raise ValueError(f"Estoque ficaria negativo nos produtos: {', '.join(map(str, negativos[:20]))}")
+        acima = [produto['id_produto'] for produto in produtos if produto['preco_venda'] > PRECO_MAXIMO]
+        if acima:
+            raise ValueError(f"Preço acima do máximo (999999.99) nos produtos: {', '.join(map(str, acima[:20]))}")
+        return produtos
+
+    def listar_todos(self, campos=None):
         """Alias para listar_produtos"""
-        return self.listar_produtos()
+        return self.listar_produtos(campos)
+
+    def iterar_produtos(self, campos=None):
+        """Gera os produtos um a um, sem carregar a lista inteira (listagem em streaming)"""
+        return iterar_consulta(f"SELECT {colunas_select(COLUNAS_LISTAGEM, campos)} FROM Produto")
+
+    def listar_nomes_skus(self):
+        """Lista apenas id, nome e SKU de todos os produtos (carga do índice de autocomplete)"""
+        with get_cursor(commit=False) as cur:
+            cur.execute("SELECT id_produto, nome, sku FROM Produto")
+            rows = cur.fetchall()
+            return [dict(row) for row in rows]
+
+    def listar_paginado(self, limite, ordenar_por='nome', ordem='asc', apos=None,
+                        preco_min=None, preco_max=None, estoque_min=None, estoque_max=None, campos=None):
+        """
+        Lista produtos usando paginação por cursor (keyset).
+        
+        A página seguinte é obtida a partir da última linha da página anterior
+        (valor da coluna de ordenação + id_produto), sem OFFSET, então o custo
+        de cada página não cresce com o tamanho da tabela.
+        
+        Args:
+            limite: Quantidade máxima de produtos retornados
+            ordenar_por: 'nome', 'preco_venda' ou 'estoque_atual'
+            ordem: 'asc' ou 'desc'
+            apos: Tupla (valor, id_produto) da última linha da página anterior
+            preco_min, preco_max: Faixa de preço de venda (opcional)
+            estoque_min, estoque_max: Faixa de estoque (opcional)
+            campos: Projeção (chaves de COLUNAS_LISTAGEM); deve incluir id_produto e `ordenar_por`
+        
+        Returns:
+            Lista de dicionários com até `limite` produtos
+        """
+        if ordenar_por not in COLUNAS_ORDENACAO:
+            raise ValueError(f"Coluna de ordenação inválida: {ordenar_por}")
+        
+        descendente = ordem == 'desc'
+        condicoes = []
+        params = []
+        
+        if preco_min is not None:
+            condicoes.append("preco_venda >= ?")
+            params.append(float(preco_min))
+        if preco_max is not None:
+            condicoes.append("preco_venda <= ?")
+            params.append(float(preco_max))
+        if estoque_min is not None:
+            condicoes.append("estoque_atual >= ?")
+            params.append(estoque_min)
+        if estoque_max is not None:
+            condicoes.append("estoque_atual <= ?")
+            params.append(estoque_max)
+        
+        if apos is not None:
+            valor, id_produto = apos
+            if ordenar_por == 'preco_venda':
+                valor = float(valor)
+            operador = '<' if descendente else '>'
+            condicoes.append(
+                f"({ordenar_por} {operador} ? OR ({ordenar_por} = ? AND id_produto {operador} ?))"
+            )
+            params.extend([valor, valor, id_produto])
+        
+        direcao = 'DESC' if descendente else 'ASC'
+        sql = f"SELECT {colunas_select(COLUNAS_LISTAGEM, campos)} FROM Produto"
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        sql += f" ORDER BY {ordenar_por} {direcao}, id_produto {direcao} LIMIT ?"
+        params.append(limite)
+        
+        with get_cursor(commit=False) as cur:
+            cur.execute(sql, tuple(params))
+            rows = cur.fetchall()
+            return [dict(row) for row in rows]
 
     def buscar_por_id(self, id_produto):
         """Alias para buscar_produto"""
@@ -111,9 +456,9 @@ class ProdutoDAO:
 
     def buscar_por_nome(self, nome):
         """Busca produtos por nome (case-insensitive, busca parcial)"""
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             sql = """
-                SELECT id_produto, nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem 
+                SELECT id_produto, nome, descricao, sku, preco_venda, preco_custo_medio, estoque_atual, nome_imagem, versao
                 FROM Produto 
                 WHERE nome LIKE ?
             """
@@ -121,6 +466,42 @@ class ProdutoDAO:
             rows = cur.fetchall()
             return [dict(row) for row in rows]
 
+    def buscar_texto(self, termos, limite, offset=0):
+        """
+        Busca full-text ranqueada em nome, descrição e SKU (tabela FTS5 Produto_busca).
+        
+        O tokenizer unicode61 com remove_diacritics ignora acentos e maiúsculas;
+        cada termo é tratado como prefixo obrigatório, em qualquer ordem.
+        A tabela é mantida em sincronia com Produto por triggers.
+        
+        Args:
+            termos: Lista de termos já normalizados (sem acento, minúsculos)
+            limite: Quantidade máxima de resultados
+            offset: Deslocamento (paginação)
+        
+        Returns:
+            Lista de dicionários ordenada por relevância (campo 'relevancia')
+        """
+        if not termos:
+            return []
+        
+        consulta = ' AND '.join(f'"{termo}"*' for termo in termos)
+        
+        with get_cursor(commit=False) as cur:
+            # bm25: quanto menor, mais relevante. Pesos: nome > sku > descrição
+            sql = """
+                SELECT p.id_produto, p.nome, p.descricao, p.sku, p.preco_venda, p.preco_custo_medio, p.estoque_atual, p.nome_imagem, p.versao,
+                       -bm25(Produto_busca, 10.0, 1.0, 5.0) AS relevancia
+                FROM Produto_busca
+                JOIN Produto p ON p.id_produto = Produto_busca.rowid
+                WHERE Produto_busca MATCH ?
+                ORDER BY relevancia DESC, p.id_produto ASC
+                LIMIT ? OFFSET ?
+            """
+            cur.execute(sql, (consulta, limite, offset))
+            rows = cur.fetchall()
+            return [dict(row) for row in rows]
+
     def deletar(self, id_produto):
         """Alias para deletar_produto"""
         self.deletar_produto(id_produto)
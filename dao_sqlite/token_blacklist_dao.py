@@ -0,0 +1,40 @@
+from .db import get_cursor
+
+class TokenBlacklistDAO:
+    """
+    DAO para operações na tabela token_blacklist (JWTs revogados no logout) (SQLite).
+    Contém apenas operações de banco de dados.
+    Cache e sincronização entre workers ficam em service/revogacao_service.py.
+    """
+    
+    def __init__(self):
+        pass
+
+    def inserir(self, jti, expira_em):
+        """
+        Registra o JTI como revogado até expira_em (timestamp Unix).
+        JTIs já registrados são ignorados.
+        """
+        with get_cursor() as cur:
+            cur.execute(
+                "INSERT OR IGNORE INTO token_blacklist (jti, expira_em) "
+                "VALUES (?, datetime(?, 'unixepoch'))",
+                (jti, int(expira_em))
+            )
+
+    def existe(self, jti):
+        """
+        Verifica se o JTI está na blacklist.
+        """
+        with get_cursor(commit=False) as cur:
+            cur.execute("SELECT 1 FROM token_blacklist WHERE jti = ?", (jti,))
+            return cur.fetchone() is not None
+
+    def deletar_expirados(self):
+        """
+        Remove as revogações de tokens já expirados.
+        Retorna a quantidade de linhas removidas.
+        """
+        with get_cursor() as cur:
+            cur.execute("DELETE FROM token_blacklist WHERE expira_em < CURRENT_TIMESTAMP")
+            return cur.rowcount
@@ -10,12 +10,13 @@ class UsuarioDAO:
     
     def listar_todos(self, apenas_ativos=True):
         """Retorna todos os usuários"""
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             if apenas_ativos:
                 cur.execute("""
-                    SELECT u.id_usuario, u.nome, u.email, u.telefone, 
-                           u.ativo, u.data_criacao, u.id_nivel_acesso,
-                           na.nome as nivel_acesso_nome
+                    SELECT u.id_usuario, u.nome, u.cpf, u.email, u.telefone, 
+                           u.ativo, u.data_criacao, u.data_nascimento, u.ultimo_login,
+                           u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
+                           u.id_nivel_acesso, na.nome as nivel_acesso_nome
                     FROM usuario u
                     JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
                     WHERE u.ativo = 1
@@ -23,9 +24,10 @@ class UsuarioDAO:
                 """)
             else:
                 cur.execute("""
-                    SELECT u.id_usuario, u.nome, u.email, u.telefone, 
-                           u.ativo, u.data_criacao, u.id_nivel_acesso,
-                           na.nome as nivel_acesso_nome
+                    SELECT u.id_usuario, u.nome, u.cpf, u.email, u.telefone, 
+                           u.ativo, u.data_criacao, u.data_nascimento, u.ultimo_login,
+                           u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
+                           u.id_nivel_acesso, na.nome as nivel_acesso_nome
                     FROM usuario u
                     JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
                     ORDER BY u.nome
@@ -34,11 +36,12 @@ class UsuarioDAO:
     
     def buscar_por_id(self, id_usuario):
         """Busca usuário por ID (sem senha para segurança)"""
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             cur.execute("""
-                SELECT u.id_usuario, u.nome, u.email, u.telefone,
-                       u.ativo, u.data_criacao, u.id_nivel_acesso,
-                       na.nome as nivel_acesso_nome
+                SELECT u.id_usuario, u.nome, u.cpf, u.email, u.telefone,
+                       u.ativo, u.data_criacao, u.data_nascimento, u.ultimo_login,
+                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
+                       u.id_nivel_acesso, na.nome as nivel_acesso_nome
                 FROM usuario u
                 JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
                 WHERE u.id_usuario = ?
@@ -48,11 +51,12 @@ class UsuarioDAO:
     
     def buscar_por_id_com_senha(self, id_usuario):
         """Busca usuário por ID incluindo senha_hash (usar apenas para autenticação)"""
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             cur.execute("""
-                SELECT u.id_usuario, u.nome, u.email, u.senha_hash, u.telefone,
-                       u.ativo, u.data_criacao, u.id_nivel_acesso,
-                       na.nome as nivel_acesso_nome
+                SELECT u.id_usuario, u.nome, u.cpf, u.email, u.senha_hash, u.telefone,
+                       u.ativo, u.data_criacao, u.data_nascimento, u.ultimo_login,
+                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
+                       u.id_nivel_acesso, na.nome as nivel_acesso_nome
                 FROM usuario u
                 JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
                 WHERE u.id_usuario = ?
@@ -62,11 +66,12 @@ class UsuarioDAO:
     
     def buscar_por_email(self, email):
         """Busca usuário por email (sem senha)"""
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             cur.execute("""
-                SELECT u.id_usuario, u.nome, u.email, u.telefone,
-                       u.ativo, u.data_criacao, u.id_nivel_acesso,
-                       na.nome as nivel_acesso_nome
+                SELECT u.id_usuario, u.nome, u.cpf, u.email, u.telefone,
+                       u.ativo, u.data_criacao, u.data_nascimento, u.ultimo_login,
+                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
+                       u.id_nivel_acesso, na.nome as nivel_acesso_nome
                 FROM usuario u
                 JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
                 WHERE u.email = ?
@@ -76,11 +81,12 @@ class UsuarioDAO:
     
     def buscar_por_email_com_senha(self, email):
         """Busca usuário por email incluindo senha_hash (usar apenas para autenticação)"""
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             cur.execute("""
-                SELECT u.id_usuario, u.nome, u.email, u.senha_hash, u.telefone,
-                       u.ativo, u.data_criacao, u.id_nivel_acesso,
-                       na.nome as nivel_acesso_nome
+                SELECT u.id_usuario, u.nome, u.cpf, u.email, u.senha_hash, u.telefone,
+                       u.ativo, u.data_criacao, u.data_nascimento, u.ultimo_login,
+                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
+                       u.id_nivel_acesso, na.nome as nivel_acesso_nome
                 FROM usuario u
                 JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
                 WHERE u.email = ?
@@ -88,23 +94,32 @@ class UsuarioDAO:
             row = cur.fetchone()
             return dict(row) if row else None
     
-    def inserir(self, nome, email, senha_hash, telefone, id_nivel_acesso, ativo=1):
+    def inserir(self, nome, cpf, email, senha_hash, telefone, id_nivel_acesso, 
+                data_nascimento=None, cep=None, logradouro=None, numero=None, 
+                bairro=None, cidade=None, estado=None, ativo=1):
         """Insere novo usuário"""
         with get_cursor() as cur:
             cur.execute("""
-                INSERT INTO usuario (nome, email, senha_hash, telefone, ativo, id_nivel_acesso)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (nome, email, senha_hash, telefone, ativo, id_nivel_acesso))
+                INSERT INTO usuario (nome, cpf, email, senha_hash, telefone, ativo, id_nivel_acesso,
+                                   data_nascimento, cep, logradouro, numero, bairro, cidade, estado)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (nome, cpf, email, senha_hash, telefone, ativo, id_nivel_acesso,
+                  data_nascimento, cep, logradouro, numero, bairro, cidade, estado))
             return cur.lastrowid
     
-    def atualizar(self, id_usuario, nome=None, email=None, telefone=None, id_nivel_acesso=None):
-        """Atualiza dados do usuário (exceto senha)"""
+    def atualizar(self, id_usuario, nome=None, cpf=None, email=None, telefone=None, 
+                  id_nivel_acesso=None, data_nascimento=None, cep=None, logradouro=None, 
+                  numero=None, bairro=None, cidade=None, estado=None, ativo=None):
+        """Atualiza dados do usuário (exceto senha e ultimo_login)"""
         campos = []
         valores = []
         
         if nome is not None:
             campos.append("nome = ?")
             valores.append(nome)
+        if cpf is not None:
+            campos.append("cpf = ?")
+            valores.append(cpf)
         if email is not None:
             campos.append("email = ?")
             valores.append(email)
@@ -114,6 +129,30 @@ class UsuarioDAO:
         if id_nivel_acesso is not None:
             campos.append("id_nivel_acesso = ?")
             valores.append(id_nivel_acesso)
+        if data_nascimento is not None:
+            campos.append("data_nascimento = ?")
+            valores.append(data_nascimento)
+        if cep is not None:
+            campos.append("cep = ?")
+            valores.append(cep)
+        if logradouro is not None:
+            campos.append("logradouro = ?")
+            valores.append(logradouro)
+        if numero is not None:
+            campos.append("numero = ?")
+            valores.append(numero)
+        if bairro is not None:
+            campos.append("bairro = ?")
+            valores.append(bairro)
+        if cidade is not None:
+            campos.append("cidade = ?")
+            valores.append(cidade)
+        if estado is not None:
+            campos.append("estado = ?")
+            valores.append(estado)
+        if ativo is not None:
+            campos.append("ativo = ?")
+            valores.append(ativo)
         
         if not campos:
             return 0
@@ -134,6 +173,15 @@ class UsuarioDAO:
             )
             return cur.rowcount
     
+    def atualizar_ultimo_login(self, id_usuario):
+        """Atualiza o timestamp do último login do usuário"""
+        with get_cursor() as cur:
+            cur.execute(
+                "UPDATE usuario SET ultimo_login = CURRENT_TIMESTAMP WHERE id_usuario = ?",
+                (id_usuario,)
+            )
+            return cur.rowcount
+    
     def ativar_desativar(self, id_usuario, ativo):
         """Ativa ou desativa usuário (soft delete)"""
         with get_cursor() as cur:
@@ -151,7 +199,7 @@ class UsuarioDAO:
     
     def verificar_email_existe(self, email, excluir_id=None):
         """Verifica se email já existe (útil para validação)"""
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             if excluir_id:
                 cur.execute(
                     "SELECT COUNT(*) as total FROM usuario WHERE email = ? AND id_usuario != ?",
@@ -165,14 +213,46 @@ class UsuarioDAO:
             result = cur.fetchone()
             return dict(result)['total'] > 0
     
+    def verificar_cpf_existe(self, cpf, excluir_id=None):
+        """Verifica se CPF já existe (útil para validação)"""
+        with get_cursor(commit=False) as cur:
+            if excluir_id:
+                cur.execute(
+                    "SELECT COUNT(*) as total FROM usuario WHERE cpf = ? AND id_usuario != ?",
+                    (cpf, excluir_id)
+                )
+            else:
+                cur.execute(
+                    "SELECT COUNT(*) as total FROM usuario WHERE cpf = ?",
+                    (cpf,)
+                )
+            result = cur.fetchone()
+            return dict(result)['total'] > 0
+    
+    def buscar_por_cpf(self, cpf):
+        """Busca usuário por CPF (sem senha)"""
+        with get_cursor(commit=False) as cur:
+            cur.execute("""
+                SELECT u.id_usuario, u.nome, u.cpf, u.email, u.telefone,
+                       u.ativo, u.data_criacao, u.data_nascimento, u.ultimo_login,
+                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
+                       u.id_nivel_acesso, na.nome as nivel_acesso_nome
+                FROM usuario u
+                JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
+                WHERE u.cpf = ?
+            """, (cpf,))
+            row = cur.fetchone()
+            return dict(row) if row else None
+    
     def buscar_usuarios_por_nivel(self, id_nivel_acesso, apenas_ativos=True):
         """Busca todos os usuários de um determinado nível de acesso"""
-        with get_cursor() as cur:
+        with get_cursor(commit=False) as cur:
             if apenas_ativos:
                 cur.execute("""
-                    SELECT u.id_usuario, u.nome, u.email, u.telefone,
-                           u.ativo, u.data_criacao, u.id_nivel_acesso,
-                           na.nome as nivel_acesso_nome
+                    SELECT u.id_usuario, u.nome, u.cpf, u.email, u.telefone,
+                           u.ativo, u.data_criacao, u.data_nascimento, u.ultimo_login,
+                           u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
+                           u.id_nivel_acesso, na.nome as nivel_acesso_nome
                     FROM usuario u
                     JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
                     WHERE u.id_nivel_acesso = ? AND u.ativo = 1
@@ -180,12 +260,36 @@ class UsuarioDAO:
                 """, (id_nivel_acesso,))
             else:
                 cur.execute("""
-                    SELECT u.id_usuario, u.nome, u.email, u.telefone,
-                           u.ativo, u.data_criacao, u.id_nivel_acesso,
-                           na.nome as nivel_acesso_nome
+                    SELECT u.id_usuario, u.nome, u.cpf, u.email, u.telefone,
+                           u.ativo, u.data_criacao, u.data_nascimento, u.ultimo_login,
+                           u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
+                           u.id_nivel_acesso, na.nome as nivel_acesso_nome
                     FROM usuario u
                     JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
                     WHERE u.id_nivel_acesso = ?
                     ORDER BY u.nome
                 """, (id_nivel_acesso,))
             return [dict(row) for row in cur.fetchall()]
+    
+    def listar_usuarios_inativos_ou_sem_login(self, dias_sem_login=90):
+        """Retorna usuários inativos ou que não fizeram login há muito tempo"""
+        with get_cursor(commit=False) as cur:
+            cur.execute("""
+                SELECT u.id_usuario, u.nome, u.cpf, u.email, u.telefone,
+                       u.ativo, u.data_criacao, u.data_nascimento, u.ultimo_login,
+                       u.cep, u.logradouro, u.numero, u.bairro, u.cidade, u.estado,
+                       u.id_nivel_acesso, na.nome as nivel_acesso_nome,
+                       CAST(julianday('now') - julianday(u.ultimo_login) AS INTEGER) as dias_sem_login,
+                       CASE 
+                           WHEN EXISTS (SELECT 1 FROM cliente WHERE id_usuario = u.id_usuario) THEN 'Cliente'
+                           WHEN EXISTS (SELECT 1 FROM funcionario WHERE id_usuario = u.id_usuario) THEN 'Funcionário'
+                           ELSE 'Sem Tipo'
+                       END as tipo_usuario
+                FROM usuario u
+                JOIN nivel_acesso na ON u.id_nivel_acesso = na.id_nivel_acesso
+                WHERE u.ativo = 0 
+                   OR u.ultimo_login IS NULL 
+                   OR CAST(julianday('now') - julianday(u.ultimo_login) AS INTEGER) > ?
+                ORDER BY dias_sem_login DESC
+            """, (dias_sem_login,))
+            return [dict(row) for row in cur.fetchall()]
@@ -107,11 +107,14 @@ CREATE TABLE Produto (
     preco_custo_medio DECIMAL(10,2) DEFAULT 0.00 COMMENT 'Custo médio ponderado',
     nome_imagem VARCHAR(255),
     url VARCHAR(255),
+    versao INT NOT NULL DEFAULT 1 COMMENT 'Versão da linha (concorrência otimista)',
     
     -- Índices
     KEY idx_produto_sku (sku),
     KEY idx_produto_estoque (estoque_atual),
-    KEY idx_produto_nome (nome)
+    KEY idx_produto_nome (nome),
+    KEY idx_produto_preco (preco_venda),
+    FULLTEXT KEY ft_produto_busca (nome, descricao, sku)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
 COMMENT 'Tabela central de produtos';
 
@@ -251,10 +254,13 @@ COMMENT 'Itens do pedido de venda';
 
 -- Tabela para armazenar tokens JWT revogados (logout)
 -- Necessária para invalidar tokens entre múltiplos workers/processos
+-- Linhas de tokens já expirados (expira_em) são removidas periodicamente pela API
 CREATE TABLE token_blacklist (
     jti VARCHAR(255) PRIMARY KEY COMMENT 'JWT ID (identificador único do token)',
     revoked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT 'Data/hora da revogação',
-    KEY idx_revoked_at (revoked_at)
+    expira_em DATETIME NOT NULL COMMENT 'Expiração do token (claim exp)',
+    KEY idx_revoked_at (revoked_at),
+    KEY idx_expira_em (expira_em)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
 COMMENT 'Tokens JWT revogados (logout) - persistência entre workers';
 
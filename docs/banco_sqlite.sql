@@ -18,6 +18,7 @@ DROP TABLE IF EXISTS Fornecedor;
 DROP TABLE IF EXISTS Produto;
 DROP TABLE IF EXISTS Cliente;
 DROP TABLE IF EXISTS Funcionario;
+DROP TABLE IF EXISTS Departamento;
 DROP TABLE IF EXISTS usuario;
 DROP TABLE IF EXISTS nivel_acesso;
 
@@ -35,17 +36,27 @@ CREATE TABLE nivel_acesso (
 CREATE TABLE usuario (
     id_usuario INTEGER PRIMARY KEY AUTOINCREMENT,
     nome TEXT NOT NULL,
+    cpf TEXT NOT NULL UNIQUE, -- CPF no formato XXX.XXX.XXX-XX
     email TEXT NOT NULL UNIQUE,
     senha_hash TEXT NOT NULL,
     telefone TEXT,
+    cep TEXT, -- Endereço: CEP
+    logradouro TEXT, -- Endereço: Rua/Avenida
+    numero TEXT, -- Endereço: Número
+    bairro TEXT, -- Endereço: Bairro
+    cidade TEXT, -- Endereço: Cidade
+    estado TEXT, -- Endereço: Estado (UF)
+    data_nascimento TEXT, -- Formato: YYYY-MM-DD
     ativo INTEGER DEFAULT 1, -- 1=Ativo, 0=Inativo
     data_criacao TEXT DEFAULT CURRENT_TIMESTAMP,
+    ultimo_login TEXT, -- Data/hora do último login
     id_nivel_acesso INTEGER NOT NULL,
     
     FOREIGN KEY (id_nivel_acesso) REFERENCES nivel_acesso(id_nivel_acesso)
         ON DELETE RESTRICT
 );
 
+CREATE INDEX idx_usuario_cpf ON usuario(cpf);
 CREATE INDEX idx_usuario_email ON usuario(email);
 CREATE INDEX idx_usuario_ativo ON usuario(ativo);
 
@@ -53,14 +64,23 @@ CREATE INDEX idx_usuario_ativo ON usuario(ativo);
 CREATE TABLE Cliente (
     id_cliente INTEGER PRIMARY KEY AUTOINCREMENT,
     id_usuario INTEGER NOT NULL UNIQUE, -- FK para Usuario (1-para-1)
-    cpf TEXT NOT NULL UNIQUE, -- CPF no formato XXX.XXX.XXX-XX
-    endereco TEXT,
+    data_cadastro TEXT DEFAULT CURRENT_TIMESTAMP, -- Data de cadastro no sistema
+    origem_cadastro TEXT DEFAULT 'loja_fisica', -- loja_fisica, site, app_mobile
     
     FOREIGN KEY (id_usuario) REFERENCES usuario(id_usuario)
         ON DELETE CASCADE
 );
 
-CREATE INDEX idx_cliente_cpf ON Cliente(cpf);
+CREATE INDEX idx_cliente_origem ON Cliente(origem_cadastro);
+
+-- Tabela de Departamentos (organiza funcionários por área e centro de custo)
+CREATE TABLE Departamento (
+    id_departamento INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT NOT NULL UNIQUE,
+    centro_custo TEXT UNIQUE -- Código do centro de custo
+);
+
+CREATE INDEX idx_departamento_nome ON Departamento(nome);
 
 -- Tabela de Funcionários (Especialização de Usuario)
 CREATE TABLE Funcionario (
@@ -69,12 +89,16 @@ CREATE TABLE Funcionario (
     cargo TEXT,
     salario REAL,
     data_contratacao TEXT, -- Formato: YYYY-MM-DD
+    id_departamento INTEGER, -- FK para Departamento
     
     FOREIGN KEY (id_usuario) REFERENCES usuario(id_usuario)
-        ON DELETE CASCADE
+        ON DELETE CASCADE,
+    FOREIGN KEY (id_departamento) REFERENCES Departamento(id_departamento)
+        ON DELETE SET NULL
 );
 
 CREATE INDEX idx_funcionario_cargo ON Funcionario(cargo);
+CREATE INDEX idx_funcionario_departamento ON Funcionario(id_departamento);
 
 -- ============================================================
 -- BLOCO 2: ESTOQUE (Produtos)
@@ -89,12 +113,39 @@ CREATE TABLE Produto (
     preco_venda REAL NOT NULL, -- Preço de venda ao cliente
     preco_custo_medio REAL DEFAULT 0.0, -- Custo médio ponderado
     nome_imagem TEXT,
-    url TEXT
+    url TEXT,
+    versao INTEGER NOT NULL DEFAULT 1 -- Versão da linha (concorrência otimista)
 );
 
 CREATE INDEX idx_produto_sku ON Produto(sku);
 CREATE INDEX idx_produto_estoque ON Produto(estoque_atual);
 CREATE INDEX idx_produto_nome ON Produto(nome);
+CREATE INDEX idx_produto_preco ON Produto(preco_venda);
+
+-- Índice de busca full-text (sem acento) sobre nome, descrição e SKU.
+-- Tabela FTS5 de conteúdo externo, mantida em sincronia com Produto por triggers.
+CREATE VIRTUAL TABLE Produto_busca USING fts5(
+    nome, descricao, sku,
+    content='Produto', content_rowid='id_produto',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER trg_produto_busca_insert AFTER INSERT ON Produto BEGIN
+    INSERT INTO Produto_busca(rowid, nome, descricao, sku)
+    VALUES (new.id_produto, new.nome, new.descricao, new.sku);
+END;
+
+CREATE TRIGGER trg_produto_busca_delete AFTER DELETE ON Produto BEGIN
+    INSERT INTO Produto_busca(Produto_busca, rowid, nome, descricao, sku)
+    VALUES ('delete', old.id_produto, old.nome, old.descricao, old.sku);
+END;
+
+CREATE TRIGGER trg_produto_busca_update AFTER UPDATE OF nome, descricao, sku ON Produto BEGIN
+    INSERT INTO Produto_busca(Produto_busca, rowid, nome, descricao, sku)
+    VALUES ('delete', old.id_produto, old.nome, old.descricao, old.sku);
+    INSERT INTO Produto_busca(rowid, nome, descricao, sku)
+    VALUES (new.id_produto, new.nome, new.descricao, new.sku);
+END;
 
 -- ============================================================
 -- BLOCO 3: PROCESSO DE SUPRIMENTOS (Compras - ENTRADA)
@@ -197,12 +248,15 @@ CREATE INDEX idx_item_venda_produto ON Item_Pedido_Venda(id_produto);
 
 -- Tabela para armazenar tokens JWT revogados (logout)
 -- Necessária para invalidar tokens entre múltiplos workers/processos
+-- Linhas de tokens já expirados (expira_em) são removidas periodicamente pela API
 CREATE TABLE token_blacklist (
     jti VARCHAR(255) PRIMARY KEY,
-    revoked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    revoked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expira_em TIMESTAMP NOT NULL
 );
 
 CREATE INDEX idx_token_revoked_at ON token_blacklist(revoked_at);
+CREATE INDEX idx_token_expira_em ON token_blacklist(expira_em);
 
 -- ============================================================
 -- DADOS INICIAIS (Seed Data)
@@ -214,6 +268,11 @@ INSERT INTO nivel_acesso (nome) VALUES
 ('funcionario'),
 ('cliente');
 
+INSERT INTO Departamento (nome, centro_custo) VALUES
+('Administrativo', 'CC-001'),
+('Vendas', 'CC-002'),
+('Compras', 'CC-003');
+
 -- ============================================================
 -- VIEWS ÚTEIS (para facilitar consultas)
 -- ============================================================
@@ -223,18 +282,22 @@ CREATE VIEW vw_usuarios_completos AS
 SELECT 
     u.id_usuario,
     u.nome,
+    u.cpf,
     u.email,
     u.telefone,
+    u.cidade,
+    u.estado,
     u.ativo,
     u.data_criacao,
+    u.ultimo_login,
     na.nome as nivel_acesso,
     c.id_cliente,
-    c.cpf,
-    c.endereco,
+    c.origem_cadastro,
     f.id_funcionario,
     f.cargo,
     f.salario,
     f.data_contratacao,
+    f.id_departamento,
     CASE 
         WHEN c.id_cliente IS NOT NULL THEN 'Cliente'
         WHEN f.id_funcionario IS NOT NULL THEN 'Funcionario'
@@ -268,7 +331,7 @@ SELECT
     c.id_cliente,
     u.nome as cliente_nome,
     u.email,
-    c.cpf,
+    u.cpf,
     COUNT(pv.id_pedido_venda) as total_pedidos,
     SUM(pv.total) as valor_total_gasto,
     AVG(pv.total) as ticket_medio,
@@ -277,7 +340,7 @@ FROM Cliente c
 JOIN usuario u ON c.id_usuario = u.id_usuario
 LEFT JOIN Pedido_Venda pv ON c.id_cliente = pv.id_cliente
 WHERE pv.status IN ('Confirmado', 'Separado', 'Enviado', 'Entregue')
-GROUP BY c.id_cliente, u.nome, u.email, c.cpf;
+GROUP BY c.id_cliente, u.nome, u.email, u.cpf;
 
 -- View: Resumo de compras por fornecedor
 CREATE VIEW vw_compras_por_fornecedor AS
@@ -306,6 +369,7 @@ GROUP BY f.id_fornecedor, f.razao_social, f.nome_fantasia, f.cnpj, f.email, f.te
 -- SELECT * FROM nivel_acesso;
 -- SELECT * FROM usuario;
 -- SELECT * FROM Cliente;
+-- SELECT * FROM Departamento;
 -- SELECT * FROM Funcionario;
 -- SELECT * FROM Produto;
 -- SELECT * FROM Fornecedor;
@@ -7,6 +7,7 @@ from .auth_routes import auth_bp
 from .cliente_routes import cliente_bp
 from .funcionario_routes import funcionario_bp
 from .produto_routes import produto_bp
+from .imagem_routes import imagem_bp, imagem_estatica_bp
 from .fornecedor_routes import fornecedor_bp
 from .pedido_compra_routes import pedido_compra_bp
 from .pedido_venda_routes import pedido_venda_bp
@@ -16,6 +17,8 @@ __all__ = [
     'cliente_bp',
     'funcionario_bp',
     'produto_bp',
+    'imagem_bp',
+    'imagem_estatica_bp',
     'fornecedor_bp',
     'pedido_compra_bp',
     'pedido_venda_bp'
@@ -4,13 +4,13 @@ Endpoints: login, logout, verificação de token
 """
 
 from flask import Blueprint, request, jsonify
-from dao_mysql.usuario_dao import UsuarioDAO
+from backend import backend
 from service.auth_service import AuthService, token_required
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
 # Instanciar DAOs
-usuario_dao = UsuarioDAO()
+usuario_dao = backend.dao('UsuarioDAO')
 
 
 @auth_bp.route('/login', methods=['POST'])
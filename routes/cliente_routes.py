@@ -4,18 +4,18 @@ Endpoints CRUD para clientes com autenticação
 """
 
 from flask import Blueprint, request, jsonify
-from dao_mysql.cliente_dao import ClienteDAO
-from dao_mysql.usuario_dao import UsuarioDAO
-from dao_mysql.nivel_acesso_dao import NivelAcessoDAO
+from backend import backend
 from service.cliente_service import ClienteService
+from service.projecao_service import ProjecaoService
+from routes.streaming import stream_solicitado, resposta_json_stream
 from service.auth_service import token_required, admin_required, funcionario_required
 
 cliente_bp = Blueprint('clientes', __name__, url_prefix='/api/clientes')
 
 # Instanciar DAOs e Service
-cliente_dao = ClienteDAO()
-usuario_dao = UsuarioDAO()
-nivel_acesso_dao = NivelAcessoDAO()
+cliente_dao = backend.dao('ClienteDAO')
+usuario_dao = backend.dao('UsuarioDAO')
+nivel_acesso_dao = backend.dao('NivelAcessoDAO')
 cliente_service = ClienteService(cliente_dao, usuario_dao, nivel_acesso_dao)
 
 
@@ -111,11 +111,26 @@ def listar_clientes(usuario_atual):
     
     Query params:
         apenas_ativos: true/false (padrão: true)
+        fields: campos separados por vírgula (ex: nome,email; id_cliente sempre incluído)
+        stream: true para escrever a lista aos poucos, sem montá-la em memória
     """
     try:
         apenas_ativos = request.args.get('apenas_ativos', 'true').lower() == 'true'
         
-        clientes = cliente_service.listar_clientes(apenas_ativos)
+        projecao = ProjecaoService.ler_campos(
+            request.args.get('fields'), cliente_service.campos_listagem(), ('id_cliente',)
+        )
+        if not projecao['success']:
+            return jsonify(projecao), 400
+        
+        if stream_solicitado(request.args):
+            return resposta_json_stream(
+                'clientes',
+                cliente_service.iterar_clientes(apenas_ativos, projecao['campos']),
+                'listar clientes'
+            )
+        
+        clientes = cliente_service.listar_clientes(apenas_ativos, projecao['campos'])
         
         return jsonify({
             'success': True,
@@ -136,8 +151,17 @@ def buscar_cliente(usuario_atual, id_cliente):
     Busca cliente por ID.
     Cliente pode ver apenas seus próprios dados.
     Funcionário/Admin podem ver qualquer cliente.
+    
+    Query params:
+        fields: campos separados por vírgula (mesmos da listagem)
     """
     try:
+        projecao = ProjecaoService.ler_campos(
+            request.args.get('fields'), cliente_service.campos_listagem(), ('id_cliente',)
+        )
+        if not projecao['success']:
+            return jsonify(projecao), 400
+        
         cliente = cliente_service.buscar_cliente(id_cliente)
         
         if not cliente:
@@ -152,7 +176,7 @@ def buscar_cliente(usuario_atual, id_cliente):
         
         return jsonify({
             'success': True,
-            'cliente': cliente
+            'cliente': ProjecaoService.projetar(cliente, projecao['campos'])
         }), 200
     
     except Exception as e:
@@ -4,14 +4,15 @@ Endpoints: CRUD de fornecedores
 """
 
 from flask import Blueprint, request, jsonify
-from dao_mysql.fornecedor_dao import FornecedorDAO
+from backend import backend
 from service.fornecedor_service import FornecedorService
+from service.projecao_service import ProjecaoService
 from service.auth_service import token_required, funcionario_required, admin_required
 
 fornecedor_bp = Blueprint('fornecedor', __name__, url_prefix='/api/fornecedores')
 
 # Instanciar DAO e Service
-fornecedor_dao = FornecedorDAO()
+fornecedor_dao = backend.dao('FornecedorDAO')
 fornecedor_service = FornecedorService(fornecedor_dao)
 
 
@@ -85,6 +86,9 @@ def listar_fornecedores(usuario_atual):
     Lista todos os fornecedores.
     Requer autenticação e nível funcionario ou superior.
     
+    Query params (opcionais):
+    - fields: campos separados por vírgula (ex: nome_fantasia,cnpj; id_fornecedor sempre incluído)
+    
     Response:
     {
         "success": true,
@@ -92,7 +96,13 @@ def listar_fornecedores(usuario_atual):
     }
     """
     try:
-        fornecedores = fornecedor_service.listar_fornecedores()
+        projecao = ProjecaoService.ler_campos(
+            request.args.get('fields'), fornecedor_service.campos_listagem(), ('id_fornecedor',)
+        )
+        if not projecao['success']:
+            return jsonify(projecao), 400
+        
+        fornecedores = fornecedor_service.listar_fornecedores(campos=projecao['campos'])
         
         return jsonify({
             'success': True,
@@ -115,6 +125,9 @@ def buscar_fornecedor(usuario_atual, id_fornecedor):
     Busca um fornecedor por ID.
     Requer autenticação e nível funcionario ou superior.
     
+    Query params (opcionais):
+    - fields: campos separados por vírgula (mesmos da listagem)
+    
     Response:
     {
         "success": true,
@@ -122,9 +135,16 @@ def buscar_fornecedor(usuario_atual, id_fornecedor):
     }
     """
     try:
+        projecao = ProjecaoService.ler_campos(
+            request.args.get('fields'), fornecedor_service.campos_listagem(), ('id_fornecedor',)
+        )
+        if not projecao['success']:
+            return jsonify(projecao), 400
+        
         resultado = fornecedor_service.buscar_fornecedor(id_fornecedor)
         
         if resultado['success']:
+            resultado['fornecedor'] = ProjecaoService.projetar(resultado['fornecedor'], projecao['campos'])
             return jsonify(resultado), 200
         else:
             return jsonify(resultado), 404
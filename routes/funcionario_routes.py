@@ -4,18 +4,17 @@ Endpoints CRUD para funcionários com autenticação
 """
 
 from flask import Blueprint, request, jsonify
-from dao_mysql.funcionario_dao import FuncionarioDAO
-from dao_mysql.usuario_dao import UsuarioDAO
-from dao_mysql.nivel_acesso_dao import NivelAcessoDAO
+from backend import backend
 from service.funcionario_service import FuncionarioService
+from service.projecao_service import ProjecaoService
 from service.auth_service import token_required, admin_required, funcionario_required
 
 funcionario_bp = Blueprint('funcionarios', __name__, url_prefix='/api/funcionarios')
 
 # Instanciar DAOs e Service
-funcionario_dao = FuncionarioDAO()
-usuario_dao = UsuarioDAO()
-nivel_acesso_dao = NivelAcessoDAO()
+funcionario_dao = backend.dao('FuncionarioDAO')
+usuario_dao = backend.dao('UsuarioDAO')
+nivel_acesso_dao = backend.dao('NivelAcessoDAO')
 funcionario_service = FuncionarioService(funcionario_dao, usuario_dao, nivel_acesso_dao)
 
 
@@ -122,11 +121,18 @@ def listar_funcionarios(usuario_atual):
     
     Query params:
         apenas_ativos: true/false (padrão: true)
+        fields: campos separados por vírgula (ex: nome,cargo; id_funcionario sempre incluído)
     """
     try:
         apenas_ativos = request.args.get('apenas_ativos', 'true').lower() == 'true'
         
-        funcionarios = funcionario_service.listar_funcionarios(apenas_ativos)
+        projecao = ProjecaoService.ler_campos(
+            request.args.get('fields'), funcionario_service.campos_listagem(), ('id_funcionario',)
+        )
+        if not projecao['success']:
+            return jsonify(projecao), 400
+        
+        funcionarios = funcionario_service.listar_funcionarios(apenas_ativos, projecao['campos'])
         
         return jsonify({
             'success': True,
@@ -147,8 +153,17 @@ def buscar_funcionario(usuario_atual, id_funcionario):
     """
     Busca funcionário por ID.
     Requer autenticação de funcionário ou admin.
+    
+    Query params:
+        fields: campos separados por vírgula (mesmos da listagem)
     """
     try:
+        projecao = ProjecaoService.ler_campos(
+            request.args.get('fields'), funcionario_service.campos_listagem(), ('id_funcionario',)
+        )
+        if not projecao['success']:
+            return jsonify(projecao), 400
+        
         funcionario = funcionario_service.buscar_funcionario(id_funcionario)
         
         if not funcionario:
@@ -156,7 +171,7 @@ def buscar_funcionario(usuario_atual, id_funcionario):
         
         return jsonify({
             'success': True,
-            'funcionario': funcionario
+            'funcionario': ProjecaoService.projetar(funcionario, projecao['campos'])
         }), 200
     
     except Exception as e:
@@ -0,0 +1,154 @@
+"""
+Rotas de Imagens
+Endpoints: entrega de imagens de produtos com negociação de formato (AVIF/WebP/PNG)
+e arquivos estáticos de /static/images/produtos com cache HTTP de longa duração.
+"""
+
+import os
+import re
+from flask import Blueprint, request, jsonify, send_file, current_app
+from werkzeug.security import safe_join
+from service.produto_service import IMAGE_RESOLUTIONS, FORMATOS_IMAGEM, IMAGENS_PRODUTOS_DIR
+
+imagem_bp = Blueprint('imagem', __name__, url_prefix='/api/imagens')
+
+# Sem url_prefix: substitui o static do Flask para as imagens de produtos
+imagem_estatica_bp = Blueprint('imagem_estatica', __name__)
+
+# Variantes têm nome único por conteúdo ({sha256} ou Produto_{id}_{uuid}): nunca mudam
+CACHE_IMUTAVEL_SEGUNDOS = 31536000
+
+# Prefixo de uma location "internal" do nginx apontando para a raiz do projeto (ex: /_arquivos/).
+# Quando definido, o nginx envia o arquivo (X-Accel-Redirect) e o worker só monta os headers.
+IMAGEM_X_ACCEL_PREFIXO = os.getenv('IMAGEM_X_ACCEL_PREFIXO', '')
+
+_PADRAO_NOME_IMAGEM = re.compile(r'^[A-Za-z0-9_]+$')
+_PADRAO_VARIANTE = re.compile(r'^[A-Za-z0-9_]+_(?:%s)\.(%s)$' % ('|'.join(IMAGE_RESOLUTIONS), '|'.join(FORMATOS_IMAGEM)))
+
+
+def enviar_imagem(caminho, mimetype, etag, max_age=CACHE_IMUTAVEL_SEGUNDOS, imutavel=True):
+    """
+    Envia um arquivo de imagem com ETag forte, 304 (If-None-Match), Range e Cache-Control.
+    Com IMAGEM_X_ACCEL_PREFIXO, delega o envio ao nginx via X-Accel-Redirect
+    (o 304 continua sendo respondido aqui).
+
+    Args:
+        caminho (str): Caminho do arquivo
+        mimetype (str): Content-Type
+        etag (str): ETag forte (ex: nome do arquivo, quando o conteúdo é imutável)
+        max_age (int): max-age do Cache-Control
+        imutavel (bool): Acrescenta "immutable" ao Cache-Control
+
+    Returns:
+        Response
+    """
+    relativo = os.path.relpath(os.path.abspath(caminho)).replace(os.sep, '/')
+
+    if IMAGEM_X_ACCEL_PREFIXO and not relativo.startswith('../'):
+        if etag in request.if_none_match:
+            resposta = current_app.response_class(status=304)
+        else:
+            resposta = current_app.response_class(mimetype=mimetype)
+            resposta.headers['X-Accel-Redirect'] = f"{IMAGEM_X_ACCEL_PREFIXO.rstrip('/')}/{relativo}"
+        resposta.set_etag(etag)
+    else:
+        resposta = send_file(os.path.abspath(caminho), mimetype=mimetype, etag=etag, max_age=max_age)
+
+    resposta.cache_control.public = True
+    resposta.cache_control.max_age = max_age
+    resposta.cache_control.immutable = imutavel
+    return resposta
+
+
+def formatos_aceitos(extensoes):
+    """
+    Filtra as extensões (em ordem de preferência) pelas aceitas no header Accept.
+    AVIF/WebP só são servidos quando listados explicitamente no Accept
+    (curingas como image/* não garantem suporte); PNG é sempre aceito.
+
+    Returns:
+        list: Extensões aceitas, na ordem recebida
+    """
+    aceitos = {mimetype for mimetype, qualidade in request.accept_mimetypes if qualidade > 0}
+    return [
+        extensao for extensao in extensoes
+        if extensao == 'png' or FORMATOS_IMAGEM[extensao]['mimetype'] in aceitos
+    ]
+
+
+def escolher_formato(nome_imagem, resolucao):
+    """
+    Escolhe o melhor formato existente em disco aceito pelo cliente (PNG é o fallback).
+
+    Returns:
+        tuple: (caminho, mimetype) ou (None, None) se nenhuma variante existir
+    """
+    for extensao in formatos_aceitos(FORMATOS_IMAGEM):
+        caminho = os.path.abspath(os.path.join(IMAGENS_PRODUTOS_DIR, f"{nome_imagem}_{resolucao}.{extensao}"))
+        if os.path.isfile(caminho):
+            return caminho, FORMATOS_IMAGEM[extensao]['mimetype']
+
+    return None, None
+
+
+@imagem_bp.route('/produtos/<nome_imagem>/<resolucao>', methods=['GET'])
+def imagem_produto(nome_imagem, resolucao):
+    """
+    Entrega a imagem do produto no melhor formato aceito pelo cliente.
+    Rota pública (não requer autenticação).
+
+    Preferência: AVIF > WebP > PNG, conforme o header Accept. Produtos com imagens
+    anteriores aos formatos AVIF/WebP recebem o PNG.
+
+    Exemplo: /api/imagens/produtos/3f2c9a.../medium
+             Accept: image/avif,image/webp,*/*  ->  image/avif
+
+    Response: bytes da imagem (Content-Type conforme o formato, Vary: Accept,
+              Cache-Control imutável, ETag, 304 e Range)
+    """
+    if not _PADRAO_NOME_IMAGEM.match(nome_imagem) or resolucao not in IMAGE_RESOLUTIONS:
+        return jsonify({
+            'success': False,
+            'message': 'Imagem não encontrada'
+        }), 404
+
+    caminho, mimetype = escolher_formato(nome_imagem, resolucao)
+
+    if not caminho:
+        return jsonify({
+            'success': False,
+            'message': 'Imagem não encontrada'
+        }), 404
+
+    resposta = enviar_imagem(caminho, mimetype, etag=os.path.basename(caminho))
+    resposta.headers['Vary'] = 'Accept'
+    return resposta
+
+
+@imagem_estatica_bp.route('/static/images/produtos/<nome_arquivo>', methods=['GET'])
+def arquivo_imagem_produto(nome_arquivo):
+    """
+    Entrega os arquivos de static/images/produtos (URLs de produto.imagens).
+    Rota pública (não requer autenticação).
+
+    Variantes ({nome}_{resolução}.{png,webp,avif}) são imutáveis: recebem
+    Cache-Control: public, max-age=31536000, immutable e o nome do arquivo como ETag.
+    Demais arquivos são revalidados a cada uso. Ambos aceitam If-None-Match (304) e Range.
+
+    Response: bytes da imagem
+    """
+    caminho = safe_join(IMAGENS_PRODUTOS_DIR, nome_arquivo)
+
+    if not caminho or not os.path.isfile(caminho):
+        return jsonify({
+            'success': False,
+            'message': 'Imagem não encontrada'
+        }), 404
+
+    variante = _PADRAO_VARIANTE.match(nome_arquivo)
+    if not variante:
+        resposta = send_file(os.path.abspath(caminho), conditional=True)
+        resposta.cache_control.no_cache = True
+        return resposta
+
+    return enviar_imagem(caminho, FORMATOS_IMAGEM[variante.group(1)]['mimetype'], etag=nome_arquivo)
@@ -4,28 +4,26 @@ Endpoints: Gerenciamento de pedidos de compra (entrada de estoque)
 """
 
 from flask import Blueprint, request, jsonify
-from dao_mysql.pedido_compra_dao import PedidoCompraDAO
-from dao_mysql.item_pedido_compra_dao import ItemPedidoCompraDAO
-from dao_mysql.fornecedor_dao import FornecedorDAO
-from dao_mysql.funcionario_dao import FuncionarioDAO
-from dao_mysql.produto_dao import ProdutoDAO
+from backend import backend
 from service.pedido_compra_service import PedidoCompraService
+from service.projecao_service import ProjecaoService
 from service.auth_service import token_required, funcionario_required
 
 pedido_compra_bp = Blueprint('pedido_compra', __name__, url_prefix='/api/pedidos-compra')
 
 # Instanciar DAOs e Service
-pedido_compra_dao = PedidoCompraDAO()
-item_pedido_compra_dao = ItemPedidoCompraDAO()
-fornecedor_dao = FornecedorDAO()
-funcionario_dao = FuncionarioDAO()
-produto_dao = ProdutoDAO()
+pedido_compra_dao = backend.dao('PedidoCompraDAO')
+item_pedido_compra_dao = backend.dao('ItemPedidoCompraDAO')
+fornecedor_dao = backend.dao('FornecedorDAO')
+funcionario_dao = backend.dao('FuncionarioDAO')
+produto_dao = backend.dao('ProdutoDAO')
 
 pedido_compra_service = PedidoCompraService(
     pedido_compra_dao,
     item_pedido_compra_dao,
     fornecedor_dao,
-    produto_dao
+    produto_dao,
+    unidade_de_trabalho=backend.unidade_de_trabalho
 )
 
 
@@ -114,7 +112,10 @@ def listar_pedidos_compra(usuario_atual):
     Query params (opcionais):
     - status: filtra por status (Pendente, Aprovado, Enviado, Recebido, Cancelado)
     
-    Exemplo: /api/pedidos-compra?status=Pendente
+    - fields: campos separados por vírgula (id_pedido_compra sempre incluído)
+    - include: itens (embute os itens de cada pedido)
+    
+    Exemplo: /api/pedidos-compra?status=Pendente&fields=status,total&include=itens
     
     Response:
     {
@@ -125,7 +126,21 @@ def listar_pedidos_compra(usuario_atual):
     try:
         status = request.args.get('status')
         
-        pedidos = pedido_compra_service.listar_pedidos(status)
+        projecao = ProjecaoService.ler_campos(
+            request.args.get('fields'), pedido_compra_service.campos_listagem(), ('id_pedido_compra',)
+        )
+        if not projecao['success']:
+            return jsonify(projecao), 400
+        
+        includes = ProjecaoService.ler_includes(request.args.get('include'), ('itens',))
+        if not includes['success']:
+            return jsonify(includes), 400
+        
+        pedidos = pedido_compra_service.listar_pedidos(
+            status,
+            campos=projecao['campos'],
+            incluir_itens='itens' in includes['includes']
+        )
         
         return jsonify({
             'success': True,
@@ -4,26 +4,26 @@ Endpoints: Gerenciamento de pedidos de venda (saída de estoque)
 """
 
 from flask import Blueprint, request, jsonify
-from dao_mysql.pedido_venda_dao import PedidoVendaDAO
-from dao_mysql.item_pedido_venda_dao import ItemPedidoVendaDAO
-from dao_mysql.cliente_dao import ClienteDAO
-from dao_mysql.produto_dao import ProdutoDAO
+from backend import backend
 from service.pedido_venda_service import PedidoVendaService
+from service.projecao_service import ProjecaoService
+from routes.streaming import stream_solicitado, resposta_json_stream
 from service.auth_service import token_required, funcionario_required
 
 pedido_venda_bp = Blueprint('pedido_venda', __name__, url_prefix='/api/pedidos-venda')
 
 # Instanciar DAOs e Service
-pedido_venda_dao = PedidoVendaDAO()
-item_pedido_venda_dao = ItemPedidoVendaDAO()
-cliente_dao = ClienteDAO()
-produto_dao = ProdutoDAO()
+pedido_venda_dao = backend.dao('PedidoVendaDAO')
+item_pedido_venda_dao = backend.dao('ItemPedidoVendaDAO')
+cliente_dao = backend.dao('ClienteDAO')
+produto_dao = backend.dao('ProdutoDAO')
 
 pedido_venda_service = PedidoVendaService(
     pedido_venda_dao,
     item_pedido_venda_dao,
     cliente_dao,
-    produto_dao
+    produto_dao,
+    unidade_de_trabalho=backend.unidade_de_trabalho
 )
 
 
@@ -105,7 +105,11 @@ def listar_pedidos_venda(usuario_atual):
     Query params (opcionais):
     - status: filtra por status (Pendente, Confirmado, Preparando, Enviado, Entregue, Cancelado)
     
-    Exemplo: /api/pedidos-venda?status=Confirmado
+    - fields: campos separados por vírgula (id_pedido_venda sempre incluído)
+    - include: itens (embute os itens de cada pedido)
+    - stream: true para escrever a lista aos poucos, sem montá-la em memória
+    
+    Exemplo: /api/pedidos-venda?status=Confirmado&fields=status,total&include=itens
     
     Response:
     {
@@ -116,7 +120,32 @@ def listar_pedidos_venda(usuario_atual):
     try:
         status = request.args.get('status')
         
-        pedidos = pedido_venda_service.listar_pedidos(status)
+        projecao = ProjecaoService.ler_campos(
+            request.args.get('fields'), pedido_venda_service.campos_listagem(), ('id_pedido_venda',)
+        )
+        if not projecao['success']:
+            return jsonify(projecao), 400
+        
+        includes = ProjecaoService.ler_includes(request.args.get('include'), ('itens',))
+        if not includes['success']:
+            return jsonify(includes), 400
+        
+        if stream_solicitado(request.args):
+            return resposta_json_stream(
+                'pedidos',
+                pedido_venda_service.iterar_pedidos(
+                    status,
+                    campos=projecao['campos'],
+                    incluir_itens='itens' in includes['includes']
+                ),
+                'listar pedidos de venda'
+            )
+        
+        pedidos = pedido_venda_service.listar_pedidos(
+            status,
+            campos=projecao['campos'],
+            incluir_itens='itens' in includes['includes']
+        )
         
         return jsonify({
             'success': True,
@@ -3,15 +3,57 @@ Rotas de Produtos
 Endpoints: CRUD de produtos + upload de imagens
 """
 
-from flask import Blueprint, request, jsonify, current_app
-from dao_mysql.produto_dao import ProdutoDAO
-from service.produto_service import ProdutoService
+import os
+from flask import Blueprint, request, jsonify, current_app, url_for
+from backend import backend
+from cache import catalogo_cache, imagem_cache
+from service.produto_service import ProdutoService, FORMATOS_IMAGEM, FORMATOS_DISPONIVEIS, CAMPOS_PRODUTO
+from service.projecao_service import ProjecaoService
+from service.importacao_produto_service import ImportacaoProdutoService
+from service.autocomplete_service import AutocompleteService
+from service.imagem_worker import ImagemWorker
 from service.auth_service import token_required, admin_required, funcionario_required
+from routes.imagem_routes import formatos_aceitos, enviar_imagem
+from routes.streaming import stream_solicitado, resposta_json_stream
 
 produto_bp = Blueprint('produto', __name__, url_prefix='/api/produtos')
 
 # Instanciar DAO
-produto_dao = ProdutoDAO()
+produto_dao = backend.dao('ProdutoDAO')
+
+# Parâmetros de query que ativam a listagem paginada por cursor
+PARAMETROS_PAGINACAO = (
+    'limit', 'cursor', 'ordenar_por', 'ordem',
+    'preco_min', 'preco_max', 'estoque_min', 'estoque_max'
+)
+
+# Cache HTTP de GET /<id>/imagem (a URL é por produto, não pelo conteúdo da imagem)
+IMAGEM_REDIMENSIONADA_MAX_AGE = 300
+
+
+def resposta_cache(corpo, comprimidos):
+    """
+    Monta a resposta 200 a partir do JSON já serializado no cache do catálogo.
+    `comprimidos` (da entrada do cache) permite à compressão reutilizar os bytes já comprimidos.
+    """
+    resposta = current_app.response_class(corpo, status=200, mimetype='application/json')
+    resposta.headers['X-Cache'] = 'HIT'
+    resposta.comprimidos = comprimidos
+    return resposta
+
+
+@produto_bp.record_once
+def construir_indice_autocomplete(state):
+    """Carrega o índice de autocomplete em memória ao registrar o blueprint"""
+    try:
+        total = AutocompleteService.construir_indice(produto_dao)
+        print(f"✅ Índice de autocomplete carregado ({total} produtos)")
+    except Exception as e:
+        print(f"⚠️  Índice de autocomplete não carregado: {e}")
+    
+    # Reconstrução periódica: propaga alterações feitas por outros workers
+    intervalo = int(os.getenv('AUTOCOMPLETE_RECONSTRUIR_SEGUNDOS', 300))
+    AutocompleteService.iniciar_reconstrucao_periodica(produto_dao, intervalo)
 
 
 @produto_bp.route('/', methods=['POST'])
@@ -29,21 +71,27 @@ def criar_produto(usuario_atual):
     - estoque: int (obrigatório)
     - imagem: file (opcional) - PNG, JPG ou JPEG
     
-    Response:
+    Sem imagem responde 201. Com imagem responde 202: o produto já existe (com "nome_imagem"
+    = SHA-256 do arquivo), mas as resoluções são geradas em segundo plano. Acompanhe pelo
+    "status_url" (header Location). Imagem já salva para outro produto: 201, sem job.
+    
+    Response (202):
     {
         "success": true,
-        "message": "Produto criado com sucesso",
+        "message": "Produto criado com sucesso. Imagem em processamento",
         "produto": {
             "id_produto": 1,
             "nome": "Nome do Produto",
             "descricao": "Descrição opcional",
             "preco_venda": 99.90,
             "estoque_atual": 10,
-            "imagens": {
-                "thumbnail": "http://localhost:5000/static/images/produtos/Produto_1_abc123_thumbnail.png",
-                "medium": "http://localhost:5000/static/images/produtos/Produto_1_abc123_medium.png",
-                "large": "http://localhost:5000/static/images/produtos/Produto_1_abc123_large.png"
-            }
+            "nome_imagem": "d89982ea...",
+            "imagens": {...}
+        },
+        "imagem_job": {
+            "job_id": "3f2c...",
+            "status": "pendente",
+            "status_url": "http://localhost:5000/api/produtos/imagens/jobs/3f2c..."
         }
     }
     """
@@ -91,8 +139,14 @@ def criar_produto(usuario_atual):
             request_host=request.host_url.rstrip('/')
         )
         
-        if resultado['success']:
+        if resultado['success'] and resultado.get('imagem_job'):
+            status_url = url_for('produto.status_job_imagem', job_id=resultado['imagem_job']['job_id'], _external=True)
+            resultado['imagem_job']['status_url'] = status_url
+            return jsonify(resultado), 202, {'Location': status_url}
+        elif resultado['success']:
             return jsonify(resultado), 201
+        elif resultado.get('fila_cheia'):
+            return jsonify(resultado), 503, {'Retry-After': '5'}
         else:
             return jsonify(resultado), 400
     
@@ -103,12 +157,158 @@ def criar_produto(usuario_atual):
         }), 500
 
 
+@produto_bp.route('/import', methods=['POST'])
+@token_required
+@funcionario_required
+def importar_produtos(usuario_atual):
+    """
+    Importa produtos em massa a partir de um arquivo CSV ou NDJSON.
+    Requer autenticação e nível funcionario ou superior.
+    
+    O arquivo é lido em streaming e gravado em lotes (uma transação por lote).
+    O SKU identifica o produto: SKU existente é atualizado, SKU novo é inserido.
+    
+    Request:
+    - multipart/form-data com o campo "arquivo" (.csv, .ndjson ou .jsonl), ou
+    - corpo bruto com Content-Type text/csv ou application/x-ndjson
+    - formato (query, opcional): csv ou ndjson (quando não dá para deduzir)
+    
+    Colunas: sku, nome, preco, estoque, descricao, preco_custo
+    (preco_venda, estoque_atual e preco_custo_medio também são aceitos)
+    
+    Exemplo CSV (separador ',' ou ';'):
+        sku;nome;preco;estoque
+        BRO-001;Carburador Brosol 2E;1250,00;8
+    
+    Response (200):
+    {
+        "success": true,
+        "total_linhas": 3,
+        "inseridos": 1,
+        "atualizados": 1,
+        "com_erro": 1,
+        "erros": [{"linha": 4, "sku": "BRO-003", "erros": ["Preço não pode ser negativo"]}],
+        "erros_omitidos": 0
+    }
+    """
+    try:
+        arquivo = request.files.get('arquivo')
+        formato = ImportacaoProdutoService.detectar_formato(
+            request.args.get('formato'),
+            arquivo.filename if arquivo else None,
+            arquivo.mimetype if arquivo else request.mimetype
+        )
+        if not formato:
+            return jsonify({
+                'success': False,
+                'message': 'Formato não identificado. Envie um arquivo .csv/.ndjson ou informe ?formato=csv|ndjson'
+            }), 400
+        
+        # Sem multipart, lê direto do corpo da requisição (sem carregá-lo em memória)
+        origem = arquivo.stream if arquivo else request.stream
+        if formato == 'csv':
+            linhas = ImportacaoProdutoService.ler_csv(origem)
+        else:
+            linhas = ImportacaoProdutoService.ler_ndjson(origem)
+        
+        relatorio = ImportacaoProdutoService.importar(produto_dao, linhas)
+        if relatorio['total_linhas'] == 0:
+            return jsonify({'success': False, 'message': 'Arquivo vazio'}), 400
+        
+        return jsonify(relatorio), 200
+    
+    except UnicodeDecodeError:
+        return jsonify({
+            'success': False,
+            'message': 'O arquivo deve estar codificado em UTF-8'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Erro ao importar produtos: {str(e)}'
+        }), 500
+
+
+@produto_bp.route('/bulk', methods=['POST'])
+@token_required
+@funcionario_required
+def ajustar_produtos_em_massa(usuario_atual):
+    """
+    Ajusta preço e/ou estoque de vários produtos em uma única transação.
+    Requer autenticação e nível funcionario ou superior.
+    
+    Request body - por produto (até 5000):
+    {
+        "produtos": [
+            {"id_produto": 1, "preco_venda": 49.90},
+            {"id_produto": 2, "delta_estoque": -3},
+            {"id_produto": 3, "estoque_atual": 40}
+        ]
+    }
+    
+    Request body - por regra (+8% nos SKUs que começam com BRO-):
+    {
+        "regra": {"sku": "BRO-%", "preco_percentual": 8}
+    }
+    
+    Response:
+    {
+        "success": true,
+        "message": "2 produto(s) ajustado(s)",
+        "total": 2,
+        "produtos": [...],
+        "nao_encontrados": []
+    }
+    """
+    try:
+        dados = request.get_json(silent=True)
+        
+        if not dados:
+            return jsonify({'success': False, 'message': 'Dados não fornecidos'}), 400
+        
+        resultado = ProdutoService.ajustar_em_massa(
+            produto_dao,
+            dados,
+            request_host=request.host_url.rstrip('/')
+        )
+        
+        if resultado['success']:
+            return jsonify(resultado), 200
+        return jsonify(resultado), 400
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Erro ao ajustar produtos: {str(e)}'
+        }), 500
+
+
 @produto_bp.route('/', methods=['GET'])
 def listar_produtos():
     """
     Lista todos os produtos.
     Rota pública (não requer autenticação).
     
+    Query params (opcionais) - ativam o modo paginado por cursor:
+    - limit: tamanho da página (padrão 20, máximo 100)
+    - cursor: valor de "next_cursor" da página anterior
+    - ordenar_por: nome, preco_venda ou estoque_atual (padrão: nome)
+    - ordem: asc ou desc (padrão: asc)
+    - preco_min, preco_max: faixa de preço de venda
+    - estoque_min, estoque_max: faixa de estoque
+    
+    Query param "fields" (opcional, em qualquer modo): campos separados por vírgula
+    (id_produto sempre incluído). Apenas essas colunas são lidas do banco.
+    Campos: id_produto, nome, descricao, sku, preco_venda, preco_custo_medio,
+    estoque_atual, nome_imagem, imagens, imagens_negociadas, formatos_imagem
+    
+    Query param "stream" (opcional, sem paginação): stream=true escreve a lista aos
+    poucos a partir do cursor, sem montá-la em memória (não passa pelo cache do catálogo).
+    
+    Exemplo: /api/produtos?limit=20&ordenar_por=preco_venda&ordem=desc&preco_min=100
+             /api/produtos?fields=nome,preco_venda,estoque_atual
+             /api/produtos?stream=true
+    
     Response:
     {
         "success": true,
@@ -120,24 +320,60 @@ def listar_produtos():
                 "estoque": 10,
                 "imagens": {...}
             }
-        ]
+        ],
+        "next_cursor": "eyJvIjoi...",  // apenas no modo paginado (null na última página)
+        "limit": 20                    // apenas no modo paginado
     }
     """
     try:
-        produtos = produto_dao.listar_todos()
-        
         # Obter host da requisição
         request_host = request.host_url.rstrip('/')
+        paginado = any(param in request.args for param in PARAMETROS_PAGINACAO)
         
-        # Processar imagens de cada produto com URLs completas
-        produtos_processados = [
-            ProdutoService.process_product_images(p, request_host) for p in produtos
-        ]
+        if stream_solicitado(request.args) and not paginado:
+            projecao = ProjecaoService.ler_campos(request.args.get('fields'), CAMPOS_PRODUTO, ('id_produto',))
+            if not projecao['success']:
+                return jsonify(projecao), 400
+            return resposta_json_stream(
+                'produtos',
+                ProdutoService.iterar_produtos(produto_dao, projecao['campos'], request_host),
+                'listar produtos'
+            )
         
-        return jsonify({
-            'success': True,
-            'produtos': produtos_processados
-        }), 200
+        # Snapshot do catálogo: resposta já serializada por host + query string
+        query = request.query_string.decode()
+        entrada = catalogo_cache.obter_lista(request_host, query)
+        if entrada is not None:
+            return resposta_cache(*entrada)
+        versao = catalogo_cache.versao()
+        
+        projecao = ProjecaoService.ler_campos(request.args.get('fields'), CAMPOS_PRODUTO, ('id_produto',))
+        if not projecao['success']:
+            return jsonify(projecao), 400
+        
+        if paginado:
+            resultado = ProdutoService.listar_produtos_paginado(
+                produto_dao,
+                limite=request.args.get('limit'),
+                cursor=request.args.get('cursor'),
+                ordenar_por=request.args.get('ordenar_por'),
+                ordem=request.args.get('ordem'),
+                preco_min=request.args.get('preco_min'),
+                preco_max=request.args.get('preco_max'),
+                estoque_min=request.args.get('estoque_min'),
+                estoque_max=request.args.get('estoque_max'),
+                campos=projecao['campos'],
+                request_host=request_host
+            )
+            
+            if not resultado['success']:
+                return jsonify(resultado), 400
+        else:
+            resultado = ProdutoService.listar_produtos(produto_dao, projecao['campos'], request_host)
+        
+        resposta = jsonify(resultado)
+        resposta.comprimidos = catalogo_cache.armazenar_lista(request_host, query, resposta.get_data(), versao)
+        return resposta, 200
     
     except Exception as e:
         return jsonify({
@@ -152,6 +388,9 @@ def buscar_produto(id_produto):
     Busca um produto por ID.
     Rota pública (não requer autenticação).
     
+    Query param "fields" (opcional): mesmos campos da listagem
+    Exemplo: /api/produtos/1?fields=nome,preco_venda
+    
     Response:
     {
         "success": true,
@@ -166,6 +405,21 @@ def buscar_produto(id_produto):
     }
     """
     try:
+        # Obter host da requisição
+        request_host = request.host_url.rstrip('/')
+        
+        projecao = ProjecaoService.ler_campos(request.args.get('fields'), CAMPOS_PRODUTO, ('id_produto',))
+        if not projecao['success']:
+            return jsonify(projecao), 400
+        campos = projecao['campos']
+        
+        # O cache guarda apenas o detalhe completo
+        if campos is None:
+            entrada = catalogo_cache.obter_detalhe(id_produto, request_host)
+            if entrada is not None:
+                return resposta_cache(*entrada)
+        versao = catalogo_cache.versao()
+        
         produto = produto_dao.buscar_por_id(id_produto)
         
         if not produto:
@@ -174,16 +428,16 @@ def buscar_produto(id_produto):
                 'message': 'Produto não encontrado'
             }), 404
         
-        # Obter host da requisição
-        request_host = request.host_url.rstrip('/')
-        
         # Processar imagens com URLs completas
-        produto_processado = ProdutoService.process_product_images(produto, request_host)
+        produto_processado = ProdutoService.preparar_listagem([produto], campos, request_host)[0]
         
-        return jsonify({
+        resposta = jsonify({
             'success': True,
             'produto': produto_processado
-        }), 200
+        })
+        if campos is None:
+            resposta.comprimidos = catalogo_cache.armazenar_detalhe(id_produto, request_host, resposta.get_data(), versao)
+        return resposta, 200
     
     except Exception as e:
         return jsonify({
@@ -251,6 +505,66 @@ def atualizar_produto(usuario_atual, id_produto):
         }), 500
 
 
+
+@produto_bp.route('/<int:id_produto>', methods=['PATCH'])
+@token_required
+@funcionario_required
+def atualizar_produto_parcial(usuario_atual, id_produto):
+    """
+    Atualiza apenas os campos enviados, com controle de concorrência otimista.
+    Requer autenticação e nível funcionario ou superior.
+    
+    "versao" é a versão do produto lida pelo cliente (vem em GET /api/produtos/<id>).
+    Se outra requisição alterou o produto depois dessa leitura, responde 409 e nada é gravado.
+    
+    Request body:
+    {
+        "versao": 3,
+        "preco": 149.90
+    }
+    
+    Response (200):
+    {
+        "success": true,
+        "message": "Produto atualizado com sucesso",
+        "produto": {..., "versao": 4}
+    }
+    
+    Response (409):
+    {
+        "success": false,
+        "conflito": true,
+        "versao_atual": 5,
+        "message": "Produto alterado por outra requisição (versão atual: 5). Recarregue e tente novamente"
+    }
+    """
+    try:
+        dados = request.get_json(silent=True)
+        
+        if not dados or not isinstance(dados, dict):
+            return jsonify({'success': False, 'message': 'Dados não fornecidos'}), 400
+        
+        resultado = ProdutoService.atualizar_produto_parcial(
+            produto_dao,
+            id_produto,
+            dados,
+            request_host=request.host_url.rstrip('/')
+        )
+        
+        if resultado['success']:
+            return jsonify(resultado), 200
+        if resultado.get('conflito'):
+            return jsonify(resultado), 409
+        status_code = 404 if 'não encontrado' in resultado['message'] else 400
+        return jsonify(resultado), status_code
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Erro ao atualizar produto: {str(e)}'
+        }), 500
+
+
 @produto_bp.route('/<int:id_produto>', methods=['DELETE'])
 @token_required
 @admin_required
@@ -278,6 +592,8 @@ def deletar_produto(usuario_atual, id_produto):
         sucesso = produto_dao.deletar(id_produto)
         
         if sucesso:
+            AutocompleteService.remover_produto(id_produto)
+            ProdutoService.liberar_imagem(produto_dao, produto.get('nome_imagem'))
             return jsonify({
                 'success': True,
                 'message': 'Produto deletado com sucesso'
@@ -365,6 +681,151 @@ def upload_imagem(usuario_atual, id_produto):
         }), 500
 
 
+@produto_bp.route('/<int:id_produto>/imagem', methods=['GET'])
+def imagem_redimensionada(id_produto):
+    """
+    Entrega a imagem do produto em qualquer tamanho permitido, gerada sob demanda.
+    Rota pública (não requer autenticação).
+    
+    A variante é derivada da imagem "large" e guardada em um cache LRU em disco
+    (limitado por IMAGEM_CACHE_MAX_MB). Requisições simultâneas para a mesma variante
+    aguardam um único redimensionamento.
+    
+    Query params:
+    - w: largura máxima (16 a 800; arredondada para cima em passos de 10)
+    - h: altura máxima (mesmas regras); informe ao menos w ou h
+    - fmt: avif, webp ou png (opcional; sem fmt, escolhe pelo header Accept)
+    
+    Exemplo: /api/produtos/1/imagem?w=300&fmt=webp
+    
+    Response: bytes da imagem (a proporção é mantida; X-Cache: HIT, MISS ou COALESCED;
+              ETag, 304 e Range; Cache-Control: public, max-age=300)
+    """
+    try:
+        validacao = ProdutoService.validar_dimensoes_imagem(request.args.get('w'), request.args.get('h'))
+        if not validacao['valido']:
+            return jsonify({
+                'success': False,
+                'message': validacao['mensagem']
+            }), 400
+        
+        fmt = request.args.get('fmt')
+        if fmt is None:
+            extensao = formatos_aceitos(FORMATOS_DISPONIVEIS)[0]
+        elif fmt.lower() in FORMATOS_DISPONIVEIS:
+            extensao = fmt.lower()
+        else:
+            return jsonify({
+                'success': False,
+                'message': f'Parâmetro "fmt" inválido. Permitidos: {", ".join(FORMATOS_DISPONIVEIS)}'
+            }), 400
+        
+        produto = produto_dao.buscar_por_id(id_produto)
+        caminho_master = (
+            ProdutoService.caminho_imagem_master(produto['nome_imagem'])
+            if produto and produto.get('nome_imagem') else None
+        )
+        if not caminho_master:
+            return jsonify({
+                'success': False,
+                'message': 'Imagem não encontrada'
+            }), 404
+        
+        # nome_imagem identifica o conteúdo: a variante nunca precisa ser invalidada
+        largura, altura = validacao['largura'], validacao['altura']
+        nome_variante = f"{produto['nome_imagem']}_{largura}x{altura}.{extensao}"
+        caminho, status = imagem_cache.obter_ou_gerar(
+            nome_variante,
+            lambda destino: ProdutoService.redimensionar_imagem(caminho_master, largura, altura, extensao, destino)
+        )
+        
+        # A imagem do produto pode ser trocada: cache curto, revalidado pelo ETag
+        resposta = enviar_imagem(
+            caminho, FORMATOS_IMAGEM[extensao]['mimetype'], etag=nome_variante,
+            max_age=IMAGEM_REDIMENSIONADA_MAX_AGE, imutavel=False
+        )
+        resposta.headers['X-Cache'] = status
+        if fmt is None:
+            resposta.headers['Vary'] = 'Accept'
+        return resposta
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Erro ao redimensionar imagem: {str(e)}'
+        }), 500
+
+
+@produto_bp.route('/imagens/jobs/<job_id>', methods=['GET'])
+@token_required
+@funcionario_required
+def status_job_imagem(usuario_atual, job_id):
+    """
+    Consulta o processamento de imagem iniciado em POST /api/produtos/.
+    Requer autenticação e nível funcionario ou superior.
+    
+    Status: pendente, processando, concluido ou erro
+    
+    Response:
+    {
+        "success": true,
+        "job": {
+            "job_id": "3f2c...",
+            "id_produto": 1,
+            "status": "concluido",
+            "nome_imagem": "Produto_1_abc123",
+            "mensagem": "Imagem processada com sucesso",
+            "criado_em": "2025-11-09T14:30:00",
+            "atualizado_em": "2025-11-09T14:30:02",
+            "imagens": {...}  // apenas quando concluido
+        }
+    }
+    """
+    job = ImagemWorker.consultar_job(job_id)
+    
+    if not job:
+        return jsonify({
+            'success': False,
+            'message': 'Job de imagem não encontrado'
+        }), 404
+    
+    if job['status'] == 'concluido':
+        produto = {'id_produto': job['id_produto'], 'nome_imagem': job['nome_imagem']}
+        job['imagens'] = ProdutoService.process_product_images(produto, request.host_url)['imagens']
+    
+    return jsonify({
+        'success': True,
+        'job': job
+    }), 200
+
+
+@produto_bp.route('/imagens/fila', methods=['GET'])
+@token_required
+@funcionario_required
+def fila_imagens(usuario_atual):
+    """
+    Profundidade da fila de processamento de imagens deste worker.
+    Requer autenticação e nível funcionario ou superior.
+    
+    Response:
+    {
+        "success": true,
+        "fila": {
+            "workers": 2,
+            "capacidade": 32,
+            "pendentes": 3,
+            "processando": 2,
+            "concluidos": 41,
+            "erros": 0
+        }
+    }
+    """
+    return jsonify({
+        'success': True,
+        'fila': ImagemWorker.estatisticas()
+    }), 200
+
+
 @produto_bp.route('/buscar', methods=['GET'])
 def buscar_produtos_por_nome():
     """
@@ -412,3 +873,155 @@ def buscar_produtos_por_nome():
             'success': False,
             'message': f'Erro ao buscar produtos: {str(e)}'
         }), 500
+
+
+@produto_bp.route('/busca', methods=['GET'])
+def busca_produtos():
+    """
+    Busca full-text de produtos em nome, descrição e SKU.
+    Ignora acentos e a ordem das palavras; resultados ordenados por relevância.
+    Cada termo casa com o início de uma palavra. No MySQL, termos com menos de
+    3 caracteres (abaixo do innodb_ft_min_token_size) são buscados por LIKE e não
+    contam na relevância; uma busca só com termos curtos vem com relevancia 0.
+    Rota pública (não requer autenticação).
+    
+    Query params:
+    - q: texto da busca (obrigatório)
+    - limit: tamanho da página (padrão 20, máximo 100)
+    - offset: deslocamento (padrão 0)
+    - fields: campos separados por vírgula, como na listagem (id_produto e relevancia sempre incluídos)
+    
+    Exemplo: /api/produtos/busca?q=carburador brosol
+             /api/produtos/busca?q=carburador&fields=nome,preco_venda
+    
+    Response:
+    {
+        "success": true,
+        "produtos": [{..., "relevancia": 12.5}],
+        "next_offset": 20,  // null na última página
+        "limit": 20
+    }
+    """
+    try:
+        projecao = ProjecaoService.ler_campos(request.args.get('fields'), CAMPOS_PRODUTO, ('id_produto',))
+        if not projecao['success']:
+            return jsonify(projecao), 400
+        
+        resultado = ProdutoService.buscar_produtos(
+            produto_dao,
+            request.args.get('q', ''),
+            limite=request.args.get('limit'),
+            offset=request.args.get('offset'),
+            campos=projecao['campos'],
+            request_host=request.host_url.rstrip('/')
+        )
+        
+        if resultado['success']:
+            return jsonify(resultado), 200
+        else:
+            return jsonify(resultado), 400
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Erro ao buscar produtos: {str(e)}'
+        }), 500
+
+
+@produto_bp.route('/autocomplete', methods=['GET'])
+def autocomplete_produtos():
+    """
+    Sugestões de produtos para campos de busca (typeahead).
+    Responde a partir de um índice em memória sobre nomes e SKUs (sem acessar o banco).
+    Rota pública (não requer autenticação).
+    
+    Query params:
+    - prefix: texto digitado (obrigatório) - ignora acentos, casa com início do nome,
+              de qualquer palavra do nome ou do SKU
+    - limit: máximo de sugestões (padrão 10, máximo 50)
+    
+    Exemplo: /api/produtos/autocomplete?prefix=brosol
+    
+    Response:
+    {
+        "success": true,
+        "sugestoes": [
+            {"id_produto": 1, "nome": "Carburador Brosol 3E Opala 6cc", "sku": "CARB-BROSOL-3E"}
+        ]
+    }
+    """
+    try:
+        resultado = AutocompleteService.sugerir(
+            request.args.get('prefix', ''),
+            limite=request.args.get('limit')
+        )
+        
+        if resultado['success']:
+            return jsonify(resultado), 200
+        else:
+            return jsonify(resultado), 400
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Erro ao buscar sugestões: {str(e)}'
+        }), 500
+
+
+@produto_bp.route('/cache', methods=['GET'])
+@token_required
+@admin_required
+def estatisticas_cache(usuario_atual):
+    """
+    Estatísticas do cache do catálogo (snapshot em memória deste worker), do
+    cache em disco de imagens redimensionadas e dos pools de conexões SQLite de
+    escrita e de leitura (null quando o worker usa MySQL).
+    Requer autenticação e nível admin.
+    
+    Response:
+    {
+        "success": true,
+        "cache": {
+            "ativo": true,
+            "ttl_segundos": 60,
+            "hits": 120,
+            "misses": 8,
+            "taxa_acerto": 0.9375,
+            "invalidacoes": 3,
+            "detalhes": 5,
+            "listas": 2
+        },
+        "cache_imagens": {
+            "max_bytes": 268435456,
+            "total_bytes": 1843200,
+            "arquivos": 42,
+            "hits": 310,
+            "misses": 42,
+            "agrupadas": 6,
+            "remocoes": 0,
+            ...
+        },
+        "pool_sqlite": {
+            "escrita": {
+                "ociosas": 4,
+                "em_uso": 1,
+                "criadas": 5,
+                "retiradas": 1830,
+                "reutilizadas": 1825,
+                "taxa_reuso": 0.9973,
+                "checkpoints": 12,
+                "wal_bytes": 0,
+                ...
+            },
+            "leitura": {"somente_leitura": true, "ociosas": 6, ...},
+            "escritor_unico": null
+        }
+    }
+    """
+    return jsonify({
+        'success': True,
+        'backend': backend.nome,
+        'cache': catalogo_cache.estatisticas(),
+        'cache_imagens': imagem_cache.estatisticas(),
+        'pool_sqlite': backend.estatisticas_pool()
+    }), 200
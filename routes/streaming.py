@@ -0,0 +1,68 @@
+"""
+Respostas JSON em Streaming
+Listagens grandes (?stream=true) são escritas elemento a elemento a partir de um
+gerador do DAO, sem montar a lista inteira nem o JSON completo em memória.
+
+Formato (mesmo da resposta normal; "success" vem no fim, depois da lista):
+    {"produtos":[{...},{...}],"total":2,"success":true}
+
+Como o status 200 já foi enviado quando a lista começa, um erro no meio da leitura
+fecha o JSON com "success": false e "message" (o corpo continua sendo JSON válido).
+"""
+
+from flask import current_app, stream_with_context
+
+# Bytes acumulados antes de cada escrita no socket
+TAMANHO_BLOCO_STREAM = 64 * 1024
+
+# Mesmos separadores compactos do jsonify fora do modo debug
+SEPARADORES_JSON = (',', ':')
+
+
+def stream_solicitado(args):
+    """True se a query string pede a listagem em streaming (?stream=true)"""
+    return args.get('stream', 'false').lower() == 'true'
+
+
+def resposta_json_stream(chave, itens, contexto=''):
+    """
+    Resposta 200 que serializa `itens` incrementalmente em {"<chave>": [...]}.
+
+    Args:
+        chave (str): Nome da lista no JSON (ex: 'produtos')
+        itens (iterable): Gerador de dicts (ex: ProdutoDAO.iterar_produtos)
+        contexto (str): Descrição usada na mensagem de erro (ex: 'listar produtos')
+
+    Returns:
+        Response: Resposta em streaming (application/json)
+    """
+    json = current_app.json
+
+    def gerar():
+        bloco = [f'{{{json.dumps(chave)}:[']
+        tamanho = 0
+        total = 0
+        try:
+            for item in itens:
+                parte = json.dumps(item, separators=SEPARADORES_JSON)
+                bloco.append(parte if total == 0 else ',' + parte)
+                tamanho += len(parte)
+                total += 1
+                if tamanho >= TAMANHO_BLOCO_STREAM:
+                    yield ''.join(bloco)
+                    bloco = []
+                    tamanho = 0
+            bloco.append(f'],"total":{total},"success":true}}')
+        except Exception as e:
+            mensagem = f'Erro ao {contexto}: {str(e)}' if contexto else str(e)
+            bloco.append(f'],"total":{total},"success":false,"message":{json.dumps(mensagem)}}}')
+        finally:
+            # Libera o cursor se o cliente desconectar no meio da resposta
+            fechar = getattr(itens, 'close', None)
+            if fechar:
+                fechar()
+        yield ''.join(bloco)
+
+    resposta = current_app.response_class(stream_with_context(gerar()), status=200, mimetype='application/json')
+    resposta.headers['X-Accel-Buffering'] = 'no'
+    return resposta
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Processamento de Imagens de Produtos
+Compara o pipeline anterior (3x copy + thumbnail a partir da imagem inteira, codificação
+sequencial) com o atual (decodificação única com draft/reduce, pirâmide large → medium →
+thumbnail e codificação em paralelo).
+
+O anterior grava só 3 PNGs; o atual grava também AVIF e WebP. O ganho compara o anterior
+com o atual gravando só os PNGs (mesmo trabalho), e o custo dos formatos extras aparece
+em uma linha própria (atual completo - atual só PNG).
+
+Cada medição roda em um subprocesso separado, para que o pico de memória (RSS) de um
+pipeline não contamine o outro.
+
+Uso:
+  python scripts/benchmark_imagens.py                  # imagens de docs/ + JPEG sintético de 12 MP
+  python scripts/benchmark_imagens.py foto1.jpg ...    # imagens específicas
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import tempfile
+import resource
+import statistics
+import subprocess
+
+# Adicionar o diretório raiz ao path
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+REPETICOES = 3
+
+
+def pipeline_anterior(caminho_imagem):
+    """Pipeline original: decodifica em tamanho integral e redimensiona 3x a partir dele"""
+    from PIL import Image
+    from service.produto_service import IMAGE_RESOLUTIONS, RESAMPLE_FILTER
+
+    os.makedirs('static/images/produtos', exist_ok=True)
+    imagem = Image.open(caminho_imagem)
+
+    if imagem.mode in ('RGBA', 'LA', 'P'):
+        background = Image.new('RGB', imagem.size, (255, 255, 255))
+        if imagem.mode == 'P':
+            imagem = imagem.convert('RGBA')
+        background.paste(imagem, mask=imagem.split()[-1] if imagem.mode == 'RGBA' else None)
+        imagem = background
+    elif imagem.mode != 'RGB':
+        imagem = imagem.convert('RGB')
+
+    for resolucao in ('thumbnail', 'medium', 'large'):
+        variante = imagem.copy()
+        variante.thumbnail(IMAGE_RESOLUTIONS[resolucao], RESAMPLE_FILTER)
+        variante.save(f"static/images/produtos/Produto_0_anterior_{resolucao}.png", 'PNG', optimize=True)
+
+
+def pipeline_atual_png(caminho_imagem):
+    """Etapas do pipeline atual (hash, decodificação única, pirâmide, paralelo), só com os PNGs"""
+    import hashlib
+    from service.produto_service import ProdutoService, FORMATOS_IMAGEM, _RESOLUCOES_DECRESCENTES
+
+    os.makedirs('static/images/produtos', exist_ok=True)
+    with open(caminho_imagem, 'rb') as f:
+        dados = f.read()
+    hashlib.sha256(dados).hexdigest()
+
+    imagem = ProdutoService.abrir_imagem_rgb(io.BytesIO(dados), _RESOLUCOES_DECRESCENTES[0][1])
+    variantes = ProdutoService.gerar_piramide_imagem(imagem)
+    ProdutoService.codificar_variantes([
+        (variante, f"static/images/produtos/Produto_0_atual_png_{resolucao}.png",
+         'PNG', FORMATOS_IMAGEM['png']['opcoes'])
+        for resolucao, variante in variantes.items()
+    ])
+
+
+def pipeline_atual(caminho_imagem):
+    """Pipeline atual do ProdutoService (PNG + AVIF/WebP, se disponíveis)"""
+    from service.produto_service import ProdutoService
+
+    resultado = ProdutoService.gerar_resolucoes_imagem(caminho_imagem)
+    if not resultado['success']:
+        raise RuntimeError(resultado['message'])
+
+    # Remove as variantes para que a próxima repetição não seja servida pela deduplicação
+    for _, _, caminho in ProdutoService.caminhos_imagem(resultado['nome_imagem']):
+        if caminho.exists():
+            caminho.unlink()
+
+
+PIPELINES = {
+    'anterior': pipeline_anterior,
+    'atual_png': pipeline_atual_png,
+    'atual': pipeline_atual
+}
+
+
+def executar_medicao(nome_pipeline, caminho_imagem):
+    """Executado no subprocesso: mede tempo (mediana) e pico de RSS de um upload"""
+    pipeline = PIPELINES[nome_pipeline]
+
+    # Importar dependências antes de medir a memória base
+    from service.produto_service import ProdutoService  # noqa: F401
+    rss_base_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        pipeline(caminho_imagem)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+
+    rss_pico_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(json.dumps({
+        'tempo_ms': statistics.median(tempos),
+        'rss_pico_mb': rss_pico_kb / 1024,
+        'rss_upload_mb': (rss_pico_kb - rss_base_kb) / 1024
+    }))
+
+
+def medir(nome_pipeline, caminho_imagem, diretorio_trabalho):
+    """Roda a medição em um subprocesso isolado"""
+    saida = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--executar', nome_pipeline, caminho_imagem],
+        cwd=diretorio_trabalho, capture_output=True, text=True, check=True
+    )
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def gerar_jpeg_sintetico(diretorio):
+    """Gera um JPEG de 12 MP (4000x3000), tamanho típico de foto de celular"""
+    from PIL import Image
+
+    caminho = os.path.join(diretorio, 'sintetico_12mp.jpg')
+    fractal = Image.effect_mandelbrot((4000, 3000), (-2.0, -1.2, 1.0, 1.2), 100)
+    Image.merge('RGB', (fractal, fractal.rotate(180), fractal.transpose(Image.FLIP_LEFT_RIGHT))).save(
+        caminho, 'JPEG', quality=90
+    )
+    return caminho
+
+
+def main():
+    diretorio_trabalho = tempfile.mkdtemp(prefix='benchmark_imagens_')
+
+    imagens = [os.path.abspath(caminho) for caminho in sys.argv[1:]]
+    if not imagens:
+        docs_dir = os.path.join(BASE_DIR, 'docs')
+        imagens = sorted(
+            os.path.join(docs_dir, nome) for nome in os.listdir(docs_dir)
+            if nome.lower().endswith(('.png', '.jpg', '.jpeg'))
+        )
+        print("📸 Gerando JPEG sintético de 12 MP...")
+        imagens.append(gerar_jpeg_sintetico(diretorio_trabalho))
+
+    print(f"⏱️  Mediana de {REPETICOES} execuções por imagem; RSS medido em subprocesso isolado\n")
+    from service.produto_service import FORMATOS_DISPONIVEIS
+    extras = [extensao.upper() for extensao in FORMATOS_DISPONIVEIS if extensao != 'png']
+    print(f"🖼️  anterior e atual_png: 3 PNGs | atual: PNG{''.join(' + ' + e for e in extras)} "
+          f"({3 * len(FORMATOS_DISPONIVEIS)} arquivos)\n")
+    print(f"{'Imagem':<42} {'Pipeline':<10} {'Tempo (ms)':>11} {'RSS pico (MB)':>14} {'RSS upload (MB)':>16}")
+    print("-" * 97)
+
+    for caminho in imagens:
+        nome = os.path.basename(caminho)
+        nome = nome if len(nome) <= 40 else nome[:37] + '...'
+        resultados = {}
+
+        for pipeline in PIPELINES:
+            resultados[pipeline] = medir(pipeline, caminho, diretorio_trabalho)
+            r = resultados[pipeline]
+            print(f"{nome:<42} {pipeline:<10} {r['tempo_ms']:>11.1f} {r['rss_pico_mb']:>14.1f} {r['rss_upload_mb']:>16.1f}")
+
+        # Mesmo trabalho (3 PNGs) nos dois lados
+        ganho = resultados['anterior']['tempo_ms'] / max(resultados['atual_png']['tempo_ms'], 0.001)
+        print(f"{'':<42} {'ganho PNG':<10} {ganho:>10.1f}x")
+        if extras:
+            custo = resultados['atual']['tempo_ms'] - resultados['atual_png']['tempo_ms']
+            print(f"{'':<42} {'+' + '/'.join(extras):<10} {custo:>11.1f} ms (formatos extras)")
+        print()
+
+    print(f"📂 Arquivos gerados em: {diretorio_trabalho}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == '--executar':
+        executar_medicao(sys.argv[2], sys.argv[3])
+    else:
+        main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Serialização JSON das Respostas
+Compara o provedor padrão do Flask com o ProvedorJSON (service/json_provider.py),
+com orjson e no fallback da biblioteca padrão, em payloads no formato retornado pelos
+DAOs MySQL (Decimal e datetime): listagem de produtos e de pedidos de venda com itens.
+
+Uso:
+  python scripts/benchmark_json.py              # 10.000 linhas por payload
+  python scripts/benchmark_json.py 50000        # quantidade de linhas
+"""
+
+import os
+import sys
+import time
+import statistics
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+# Adicionar o diretório raiz ao path
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import service.json_provider as json_provider
+from service.json_provider import ProvedorJSON
+
+REPETICOES = 7
+LINHAS_PADRAO = 10000
+
+
+def gerar_produtos(quantidade):
+    """Linhas como as de ProdutoDAO.listar_todos (MySQL) já com as URLs de imagem"""
+    return [
+        {
+            'id_produto': i,
+            'nome': f'Filtro de Óleo Modelo {i}',
+            'descricao': 'Filtro para motores 1.0 a 2.0, rosca M20x1,5 - compatível com linha VW/GM',
+            'sku': f'FLT-{i:06d}',
+            'preco_venda': Decimal('45.90') + i % 500,
+            'preco_custo_medio': Decimal('25.00') + i % 300,
+            'estoque_atual': i % 120,
+            'nome_imagem': f'{i:064x}',
+            'imagens': {
+                resolucao: f'http://localhost:5000/static/images/produtos/{i:064x}_{resolucao}.png'
+                for resolucao in ('thumbnail', 'medium', 'large')
+            }
+        }
+        for i in range(1, quantidade + 1)
+    ]
+
+
+def gerar_pedidos(quantidade):
+    """Pedidos como os de PedidoVendaDAO.listar_todos (MySQL) com ?include=itens"""
+    inicio = datetime(2025, 1, 1, 8, 0, 0)
+    return [
+        {
+            'id_pedido_venda': i,
+            'id_cliente': i % 700 + 1,
+            'id_funcionario': i % 12 + 1,
+            'data_pedido': inicio + timedelta(minutes=17 * i),
+            'status': ('Pendente', 'Confirmado', 'Enviado', 'Entregue')[i % 4],
+            'total': Decimal('349.70') + i % 1000,
+            'cliente_nome': f'Cliente {i % 700 + 1}',
+            'funcionario_nome': f'Funcionário {i % 12 + 1}',
+            'itens': [
+                {
+                    'id_item_pedido_venda': i * 3 + n,
+                    'id_pedido_venda': i,
+                    'id_produto': (i * 7 + n) % 5000 + 1,
+                    'quantidade': n + 1,
+                    'preco_unitario_venda': Decimal('99.90') + n,
+                    'subtotal': Decimal('99.90') * (n + 1),
+                    'produto_nome': f'Produto {(i * 7 + n) % 5000 + 1}'
+                }
+                for n in range(3)
+            ]
+        }
+        for i in range(1, quantidade + 1)
+    ]
+
+
+def medir(app, payload):
+    """Mediana (ms) de jsonify(payload) e tamanho do corpo gerado"""
+    tempos = []
+    with app.app_context():
+        for _ in range(REPETICOES):
+            inicio = time.perf_counter()
+            corpo = app.json.response(payload).get_data()
+            tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos), len(corpo)
+
+
+def criar_app(provedor):
+    app = Flask(__name__)
+    app.json = provedor(app)
+    app.json.sort_keys = False  # Como o JSON_SORT_KEYS=False usado antes do ProvedorJSON
+    return app
+
+
+def main():
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else LINHAS_PADRAO
+    orjson_instalado = json_provider.orjson
+
+    cenarios = [('Flask padrão', DefaultJSONProvider, None)]
+    if orjson_instalado is not None:
+        cenarios.append(('ProvedorJSON (orjson)', ProvedorJSON, orjson_instalado))
+    else:
+        print("⚠️  orjson não instalado: medindo apenas o fallback da biblioteca padrão\n")
+    cenarios.append(('ProvedorJSON (json)', ProvedorJSON, None))
+
+    payloads = {
+        'produtos': {'success': True, 'produtos': gerar_produtos(linhas)},
+        'pedidos+itens': {'success': True, 'pedidos': gerar_pedidos(linhas), 'total': linhas}
+    }
+
+    print(f"⏱️  Mediana de {REPETICOES} execuções de jsonify com {linhas} linhas por payload\n")
+    print(f"{'Payload':<15} {'Provedor':<24} {'Tempo (ms)':>11} {'Tamanho (KB)':>13} {'Ganho':>7}")
+    print("-" * 74)
+
+    for nome_payload, payload in payloads.items():
+        referencia = None
+        for nome, provedor, motor in cenarios:
+            json_provider.orjson = motor
+            try:
+                tempo, tamanho = medir(criar_app(provedor), payload)
+            finally:
+                json_provider.orjson = orjson_instalado
+            referencia = referencia or tempo
+            print(f"{nome_payload:<15} {nome:<24} {tempo:>11.1f} {tamanho / 1024:>13.0f} {referencia / tempo:>6.1f}x")
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Script de Manutenção - Imagens Órfãs de Produtos
+Remove de static/images/produtos as variantes cujo nome base não é referenciado por
+nenhum Produto.nome_imagem (ex: sobras de exclusões interrompidas ou nomes antigos
+Produto_{id}_{uuid} substituídos pelo nome por conteúdo {sha256}).
+
+Arquivos modificados dentro do período de carência são mantidos, pois podem pertencer
+a um job de imagem que ainda vai gravar o nome no produto.
+
+Uso:
+  python scripts/limpar_imagens_orfas.py                     # SQLite
+  python scripts/limpar_imagens_orfas.py --mysql             # MySQL
+  python scripts/limpar_imagens_orfas.py --dry-run           # Apenas lista o que seria removido
+  python scripts/limpar_imagens_orfas.py --carencia-horas 6  # Padrão: 1 hora
+"""
+
+import os
+import re
+import sys
+import time
+
+# Adicionar o diretório raiz ao path
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+IMAGENS_DIR = os.path.join(BASE_DIR, 'static', 'images', 'produtos')
+
+_PADRAO_VARIANTE = re.compile(r'^(.+)_(thumbnail|medium|large)\.(png|webp|avif)$')
+
+
+def nomes_referenciados(usar_mysql):
+    """Retorna o conjunto de nome_imagem em uso na tabela Produto"""
+    if usar_mysql:
+        from dao_mysql.db_pythonanywhere import init_db, get_cursor
+    else:
+        from dao_sqlite.db import init_db, get_cursor
+
+    init_db()
+    with get_cursor(commit=False) as cur:
+        cur.execute("SELECT DISTINCT nome_imagem FROM Produto WHERE nome_imagem IS NOT NULL")
+        return {linha['nome_imagem'] for linha in cur.fetchall()}
+
+
+def agrupar_variantes():
+    """Agrupa os arquivos do diretório de imagens pelo nome base"""
+    grupos = {}
+    for nome_arquivo in os.listdir(IMAGENS_DIR):
+        correspondencia = _PADRAO_VARIANTE.match(nome_arquivo)
+        if correspondencia:
+            grupos.setdefault(correspondencia.group(1), []).append(os.path.join(IMAGENS_DIR, nome_arquivo))
+    return grupos
+
+
+def limpar(usar_mysql, dry_run, carencia_horas):
+    if not os.path.isdir(IMAGENS_DIR):
+        print(f"⚠️  Diretório não encontrado: {IMAGENS_DIR}")
+        return True
+
+    referenciados = nomes_referenciados(usar_mysql)
+    limite = time.time() - carencia_horas * 3600
+
+    removidos = 0
+    mantidos_carencia = 0
+    bytes_liberados = 0
+
+    for nome_base, arquivos in sorted(agrupar_variantes().items()):
+        if nome_base in referenciados:
+            continue
+
+        if any(os.path.getmtime(caminho) > limite for caminho in arquivos):
+            mantidos_carencia += 1
+            continue
+
+        for caminho in arquivos:
+            tamanho = os.path.getsize(caminho)
+            if dry_run:
+                print(f"  🔍 Seria removido: {os.path.basename(caminho)}")
+            else:
+                try:
+                    os.remove(caminho)
+                    print(f"  ✅ Removido: {os.path.basename(caminho)}")
+                except OSError as e:
+                    print(f"  ❌ Erro ao remover {os.path.basename(caminho)}: {e}")
+                    continue
+            removidos += 1
+            bytes_liberados += tamanho
+
+    print(f"\n📊 Resultado{' (dry-run)' if dry_run else ''}:")
+    print(f"  - Imagens referenciadas: {len(referenciados)}")
+    print(f"  - Arquivos órfãos {'encontrados' if dry_run else 'removidos'}: {removidos}")
+    print(f"  - Espaço liberado: {bytes_liberados / 1024:.1f} KB")
+    print(f"  - Órfãs mantidas (carência de {carencia_horas}h): {mantidos_carencia}")
+    return True
+
+
+if __name__ == '__main__':
+    print("🧹 Procurando imagens órfãs de produtos...")
+
+    usar_mysql = '--mysql' in sys.argv
+    dry_run = '--dry-run' in sys.argv
+    carencia_horas = 1.0
+    if '--carencia-horas' in sys.argv:
+        carencia_horas = float(sys.argv[sys.argv.index('--carencia-horas') + 1])
+
+    try:
+        if usar_mysql:
+            from dotenv import load_dotenv
+            load_dotenv(os.path.join(BASE_DIR, '.env'))
+        sucesso = limpar(usar_mysql, dry_run, carencia_horas)
+    except Exception as e:
+        print(f"❌ Erro durante a limpeza: {e}")
+        import traceback
+        traceback.print_exc()
+        sucesso = False
+
+    sys.exit(0 if sucesso else 1)
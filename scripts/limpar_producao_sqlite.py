@@ -76,9 +76,12 @@ def resetar_banco_sqlite():
             cur.execute("DROP TABLE IF EXISTS Pedido_Venda")
             cur.execute("DROP TABLE IF EXISTS Pedido_Compra")
             cur.execute("DROP TABLE IF EXISTS Fornecedor")
+            cur.execute("DROP TABLE IF EXISTS Produto_busca")
             cur.execute("DROP TABLE IF EXISTS Produto")
             cur.execute("DROP TABLE IF EXISTS Cliente")
             cur.execute("DROP TABLE IF EXISTS Funcionario")
+            cur.execute("DROP TABLE IF EXISTS Departamento")
+            cur.execute("DROP TABLE IF EXISTS token_blacklist")
             cur.execute("DROP TABLE IF EXISTS usuario")
             cur.execute("DROP TABLE IF EXISTS nivel_acesso")
             print("  ✅ Tabelas removidas")
@@ -102,16 +105,26 @@ def resetar_banco_sqlite():
                 CREATE TABLE usuario (
                     id_usuario INTEGER PRIMARY KEY AUTOINCREMENT,
                     nome TEXT NOT NULL,
+                    cpf TEXT NOT NULL UNIQUE,
                     email TEXT NOT NULL UNIQUE,
                     senha_hash TEXT NOT NULL,
                     telefone TEXT,
+                    cep TEXT,
+                    logradouro TEXT,
+                    numero TEXT,
+                    bairro TEXT,
+                    cidade TEXT,
+                    estado TEXT,
+                    data_nascimento TEXT,
                     ativo INTEGER DEFAULT 1,
                     data_criacao TEXT DEFAULT CURRENT_TIMESTAMP,
+                    ultimo_login TEXT,
                     id_nivel_acesso INTEGER NOT NULL,
                     FOREIGN KEY (id_nivel_acesso) REFERENCES nivel_acesso(id_nivel_acesso)
                         ON DELETE RESTRICT
                 )
             """)
+            cur.execute("CREATE INDEX idx_usuario_cpf ON usuario(cpf)")
             cur.execute("CREATE INDEX idx_usuario_email ON usuario(email)")
             cur.execute("CREATE INDEX idx_usuario_ativo ON usuario(ativo)")
             
@@ -120,13 +133,23 @@ def resetar_banco_sqlite():
                 CREATE TABLE Cliente (
                     id_cliente INTEGER PRIMARY KEY AUTOINCREMENT,
                     id_usuario INTEGER NOT NULL UNIQUE,
-                    cpf TEXT NOT NULL UNIQUE,
-                    endereco TEXT,
+                    data_cadastro TEXT DEFAULT CURRENT_TIMESTAMP,
+                    origem_cadastro TEXT DEFAULT 'loja_fisica',
                     FOREIGN KEY (id_usuario) REFERENCES usuario(id_usuario)
                         ON DELETE CASCADE
                 )
             """)
-            cur.execute("CREATE INDEX idx_cliente_cpf ON Cliente(cpf)")
+            cur.execute("CREATE INDEX idx_cliente_origem ON Cliente(origem_cadastro)")
+            
+            # Tabela Departamento
+            cur.execute("""
+                CREATE TABLE Departamento (
+                    id_departamento INTEGER PRIMARY KEY AUTOINCREMENT,
+                    nome TEXT NOT NULL UNIQUE,
+                    centro_custo TEXT UNIQUE
+                )
+            """)
+            cur.execute("CREATE INDEX idx_departamento_nome ON Departamento(nome)")
             
             # Tabela Funcionario (herda de Usuario - 1-para-1)
             cur.execute("""
@@ -136,11 +159,15 @@ def resetar_banco_sqlite():
                     cargo TEXT,
                     salario REAL,
                     data_contratacao TEXT,
+                    id_departamento INTEGER,
                     FOREIGN KEY (id_usuario) REFERENCES usuario(id_usuario)
-                        ON DELETE CASCADE
+                        ON DELETE CASCADE,
+                    FOREIGN KEY (id_departamento) REFERENCES Departamento(id_departamento)
+                        ON DELETE SET NULL
                 )
             """)
             cur.execute("CREATE INDEX idx_funcionario_cargo ON Funcionario(cargo)")
+            cur.execute("CREATE INDEX idx_funcionario_departamento ON Funcionario(id_departamento)")
             
             # Tabela Produto (com SKU e custo médio)
             cur.execute("""
@@ -153,12 +180,43 @@ def resetar_banco_sqlite():
                     preco_venda REAL NOT NULL,
                     preco_custo_medio REAL DEFAULT 0.0,
                     nome_imagem TEXT,
-                    url TEXT
+                    url TEXT,
+                    versao INTEGER NOT NULL DEFAULT 1
                 )
             """)
             cur.execute("CREATE INDEX idx_produto_sku ON Produto(sku)")
             cur.execute("CREATE INDEX idx_produto_estoque ON Produto(estoque_atual)")
             cur.execute("CREATE INDEX idx_produto_nome ON Produto(nome)")
+            cur.execute("CREATE INDEX idx_produto_preco ON Produto(preco_venda)")
+            
+            # Índice de busca full-text (FTS5, sem acento) sincronizado por triggers
+            cur.execute("""
+                CREATE VIRTUAL TABLE Produto_busca USING fts5(
+                    nome, descricao, sku,
+                    content='Produto', content_rowid='id_produto',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """)
+            cur.execute("""
+                CREATE TRIGGER trg_produto_busca_insert AFTER INSERT ON Produto BEGIN
+                    INSERT INTO Produto_busca(rowid, nome, descricao, sku)
+                    VALUES (new.id_produto, new.nome, new.descricao, new.sku);
+                END
+            """)
+            cur.execute("""
+                CREATE TRIGGER trg_produto_busca_delete AFTER DELETE ON Produto BEGIN
+                    INSERT INTO Produto_busca(Produto_busca, rowid, nome, descricao, sku)
+                    VALUES ('delete', old.id_produto, old.nome, old.descricao, old.sku);
+                END
+            """)
+            cur.execute("""
+                CREATE TRIGGER trg_produto_busca_update AFTER UPDATE OF nome, descricao, sku ON Produto BEGIN
+                    INSERT INTO Produto_busca(Produto_busca, rowid, nome, descricao, sku)
+                    VALUES ('delete', old.id_produto, old.nome, old.descricao, old.sku);
+                    INSERT INTO Produto_busca(rowid, nome, descricao, sku)
+                    VALUES (new.id_produto, new.nome, new.descricao, new.sku);
+                END
+            """)
             
             # Tabela Fornecedor (estrutura melhorada)
             cur.execute("""
@@ -253,6 +311,17 @@ def resetar_banco_sqlite():
             cur.execute("CREATE INDEX idx_item_venda_pedido ON Item_Pedido_Venda(id_pedido_venda)")
             cur.execute("CREATE INDEX idx_item_venda_produto ON Item_Pedido_Venda(id_produto)")
             
+            # Tabela token_blacklist (para logout/invalidação de tokens JWT)
+            cur.execute("""
+                CREATE TABLE token_blacklist (
+                    jti TEXT PRIMARY KEY,
+                    revoked_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    expira_em TEXT NOT NULL
+                )
+            """)
+            cur.execute("CREATE INDEX idx_token_revoked_at ON token_blacklist(revoked_at)")
+            cur.execute("CREATE INDEX idx_token_expira_em ON token_blacklist(expira_em)")
+            
             print("  ✅ Estrutura do banco criada do zero (Nova Modelagem)")
             
             # 3. Inserir dados padrão
@@ -267,26 +336,52 @@ def resetar_banco_sqlite():
             """)
             print("  ✅ Níveis de acesso inseridos")
             
+            # Departamentos padrão
+            cur.execute("""
+                INSERT INTO Departamento (nome, centro_custo) VALUES
+                ('Administrativo', 'CC-001'),
+                ('Vendas', 'CC-002'),
+                ('Compras', 'CC-003')
+            """)
+            print("  ✅ Departamentos padrão inseridos")
+            
             # Criar usuário admin padrão
             senha_padrao = "admin123"
             senha_hash = hashlib.sha256(senha_padrao.encode()).hexdigest()
             
             cur.execute("""
-                INSERT INTO usuario (nome, email, senha_hash, telefone, ativo, id_nivel_acesso)
-                VALUES ('Administrador', 'admin@autopeck.com', ?, '11999999999', 1, 
+                INSERT INTO usuario (nome, cpf, email, senha_hash, telefone, ativo, id_nivel_acesso)
+                VALUES ('Administrador', '000.000.000-00', 'admin@autopeck.com', ?, '11999999999', 1, 
                         (SELECT id_nivel_acesso FROM nivel_acesso WHERE nome = 'admin'))
             """, (senha_hash,))
             
             id_usuario_admin = cur.lastrowid
             
-            # Criar funcionário vinculado ao admin (para pedidos de compra)
+            # Criar funcionário vinculado ao admin (departamento Administrativo)
             cur.execute("""
-                INSERT INTO Funcionario (id_usuario, cargo, salario, data_contratacao)
-                VALUES (?, 'Administrador', 0.0, date('now'))
+                INSERT INTO Funcionario (id_usuario, cargo, salario, data_contratacao, id_departamento)
+                VALUES (?, 'Administrador', 0.0, date('now'),
+                        (SELECT id_departamento FROM Departamento WHERE nome = 'Administrativo'))
             """, (id_usuario_admin,))
             
             print("  ✅ Usuário admin criado (email: admin@autopeck.com, senha: admin123)")
             print("  ✅ Funcionário admin criado (vinculado ao usuário)")
+            
+            # Criar cliente de teste para testes automatizados
+            cur.execute("""
+                INSERT INTO usuario (nome, cpf, email, senha_hash, telefone, ativo, id_nivel_acesso)
+                VALUES ('Cliente Teste', '155.853.159-94', 'cliente@test.com', ?, '11988888888', 1,
+                        (SELECT id_nivel_acesso FROM nivel_acesso WHERE nome = 'cliente'))
+            """, (senha_hash,))
+            
+            id_usuario_cliente = cur.lastrowid
+            
+            cur.execute("""
+                INSERT INTO Cliente (id_usuario, data_cadastro, origem_cadastro)
+                VALUES (?, CURRENT_TIMESTAMP, 'loja_fisica')
+            """, (id_usuario_cliente,))
+            
+            print("  ✅ Cliente de teste criado (email: cliente@test.com, senha: admin123, CPF: 155.853.159-94)")
             print("  ⚠️  IMPORTANTE: Altere a senha do admin após o primeiro login!")
             print("  ℹ️  Todas as outras tabelas estão vazias")
         
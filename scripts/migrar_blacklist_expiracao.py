@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Script de Migração - Expiração da Blacklist de Tokens
+Cria a tabela token_blacklist (se ainda não existir) e adiciona a coluna expira_em,
+usada pela API para remover as revogações de tokens já expirados. A API não cria mais
+a tabela no logout: este script é a inicialização única em bancos já existentes.
+
+Revogações antigas recebem expira_em = revoked_at + 24 horas (validade do token) e as
+que já expiraram são removidas.
+
+Uso:
+  python scripts/migrar_blacklist_expiracao.py           # SQLite
+  python scripts/migrar_blacklist_expiracao.py --mysql   # MySQL
+"""
+
+import os
+import sys
+
+# Adicionar o diretório raiz ao path
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+# Validade dos tokens (JWT_ACCESS_TOKEN_EXPIRES)
+VALIDADE_TOKEN_HORAS = 24
+
+
+def migrar_sqlite():
+    """Cria/atualiza a tabela token_blacklist no SQLite"""
+    from dao_sqlite.db import init_db, get_cursor
+
+    init_db()
+    print("  🔗 Conectado ao SQLite")
+
+    with get_cursor() as cur:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS token_blacklist (
+                jti VARCHAR(255) PRIMARY KEY,
+                revoked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_token_revoked_at ON token_blacklist(revoked_at)")
+
+        cur.execute("PRAGMA table_info(token_blacklist)")
+        if not any(coluna['name'] == 'expira_em' for coluna in cur.fetchall()):
+            print("📝 Adicionando coluna token_blacklist.expira_em...")
+            # SQLite não aceita ADD COLUMN NOT NULL sem default; as linhas são preenchidas abaixo
+            cur.execute("ALTER TABLE token_blacklist ADD COLUMN expira_em TIMESTAMP")
+            cur.execute(
+                "UPDATE token_blacklist SET expira_em = datetime(revoked_at, ?) WHERE expira_em IS NULL",
+                (f'+{VALIDADE_TOKEN_HORAS} hours',)
+            )
+
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_token_expira_em ON token_blacklist(expira_em)")
+        cur.execute("DELETE FROM token_blacklist WHERE expira_em < CURRENT_TIMESTAMP")
+        print(f"  🧹 {cur.rowcount} revogações expiradas removidas")
+
+    print("✅ Tabela token_blacklist pronta!")
+    return True
+
+
+def migrar_mysql():
+    """Cria/atualiza a tabela token_blacklist no MySQL"""
+    from dao_mysql.db_pythonanywhere import init_db, get_cursor
+
+    init_db()
+    print("  🔗 Conectado ao MySQL")
+
+    with get_cursor() as cur:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS token_blacklist (
+                jti VARCHAR(255) PRIMARY KEY COMMENT 'JWT ID do token revogado',
+                revoked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT 'Data/hora da revogação',
+                KEY idx_revoked_at (revoked_at)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """)
+
+        cur.execute("SHOW COLUMNS FROM token_blacklist LIKE 'expira_em'")
+        if not cur.fetchall():
+            print("📝 Adicionando coluna token_blacklist.expira_em...")
+            cur.execute("ALTER TABLE token_blacklist ADD COLUMN expira_em DATETIME NULL")
+            cur.execute(
+                "UPDATE token_blacklist SET expira_em = revoked_at + INTERVAL %s HOUR WHERE expira_em IS NULL",
+                (VALIDADE_TOKEN_HORAS,)
+            )
+            cur.execute(
+                "ALTER TABLE token_blacklist "
+                "MODIFY expira_em DATETIME NOT NULL COMMENT 'Expiração do token (claim exp)', "
+                "ADD KEY idx_expira_em (expira_em)"
+            )
+
+        cur.execute("DELETE FROM token_blacklist WHERE expira_em < NOW()")
+        print(f"  🧹 {cur.rowcount} revogações expiradas removidas")
+
+    print("✅ Tabela token_blacklist pronta!")
+    return True
+
+
+if __name__ == '__main__':
+    print("🔄 Iniciando migração da blacklist de tokens...")
+
+    try:
+        if '--mysql' in sys.argv:
+            from dotenv import load_dotenv
+            load_dotenv(os.path.join(BASE_DIR, '.env'))
+            sucesso = migrar_mysql()
+        else:
+            sucesso = migrar_sqlite()
+    except Exception as e:
+        print(f"❌ Erro durante a migração: {e}")
+        import traceback
+        traceback.print_exc()
+        sucesso = False
+
+    sys.exit(0 if sucesso else 1)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Script de Migração - Índice de Busca de Produtos
+Cria o índice full-text usado por GET /api/produtos/busca em bancos já existentes.
+
+- SQLite: tabela FTS5 Produto_busca + triggers de sincronização, populada com os produtos atuais
+- MySQL:  índice FULLTEXT ft_produto_busca (nome, descricao, sku) na tabela Produto
+
+Uso:
+  python scripts/migrar_busca_produto.py           # SQLite
+  python scripts/migrar_busca_produto.py --mysql   # MySQL
+"""
+
+import os
+import sys
+
+# Adicionar o diretório raiz ao path
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+
+def migrar_sqlite():
+    """Cria a tabela FTS5 e os triggers no SQLite"""
+    from dao_sqlite.db import init_db, get_cursor
+
+    init_db()
+    print("  🔗 Conectado ao SQLite")
+
+    with get_cursor() as cur:
+        cur.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'Produto_busca'")
+        if cur.fetchone():
+            print("✅ Índice de busca já existe!")
+            return True
+
+        print("📝 Criando tabela FTS5 Produto_busca...")
+        cur.execute("""
+            CREATE VIRTUAL TABLE Produto_busca USING fts5(
+                nome, descricao, sku,
+                content='Produto', content_rowid='id_produto',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+
+        print("📝 Criando triggers de sincronização...")
+        cur.execute("""
+            CREATE TRIGGER trg_produto_busca_insert AFTER INSERT ON Produto BEGIN
+                INSERT INTO Produto_busca(rowid, nome, descricao, sku)
+                VALUES (new.id_produto, new.nome, new.descricao, new.sku);
+            END
+        """)
+        cur.execute("""
+            CREATE TRIGGER trg_produto_busca_delete AFTER DELETE ON Produto BEGIN
+                INSERT INTO Produto_busca(Produto_busca, rowid, nome, descricao, sku)
+                VALUES ('delete', old.id_produto, old.nome, old.descricao, old.sku);
+            END
+        """)
+        cur.execute("""
+            CREATE TRIGGER trg_produto_busca_update AFTER UPDATE OF nome, descricao, sku ON Produto BEGIN
+                INSERT INTO Produto_busca(Produto_busca, rowid, nome, descricao, sku)
+                VALUES ('delete', old.id_produto, old.nome, old.descricao, old.sku);
+                INSERT INTO Produto_busca(rowid, nome, descricao, sku)
+                VALUES (new.id_produto, new.nome, new.descricao, new.sku);
+            END
+        """)
+
+        print("📦 Indexando produtos existentes...")
+        cur.execute("INSERT INTO Produto_busca(Produto_busca) VALUES ('rebuild')")
+
+    print("✅ Índice de busca criado com sucesso!")
+    return True
+
+
+def migrar_mysql():
+    """Cria o índice FULLTEXT no MySQL"""
+    from dao_mysql.db_pythonanywhere import init_db, get_cursor
+
+    init_db()
+    print("  🔗 Conectado ao MySQL")
+
+    with get_cursor() as cur:
+        cur.execute("SHOW INDEX FROM Produto WHERE Key_name = 'ft_produto_busca'")
+        if cur.fetchall():
+            print("✅ Índice de busca já existe!")
+            return True
+
+        print("📝 Criando índice FULLTEXT ft_produto_busca (pode levar alguns minutos)...")
+        cur.execute("ALTER TABLE Produto ADD FULLTEXT KEY ft_produto_busca (nome, descricao, sku)")
+
+    print("✅ Índice de busca criado com sucesso!")
+    return True
+
+
+if __name__ == '__main__':
+    print("🔄 Iniciando migração do índice de busca de produtos...")
+
+    try:
+        if '--mysql' in sys.argv:
+            from dotenv import load_dotenv
+            load_dotenv(os.path.join(BASE_DIR, '.env'))
+            sucesso = migrar_mysql()
+        else:
+            sucesso = migrar_sqlite()
+    except Exception as e:
+        print(f"❌ Erro durante a migração: {e}")
+        import traceback
+        traceback.print_exc()
+        sucesso = False
+
+    sys.exit(0 if sucesso else 1)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Script de Migração - Nova Modelagem no SQLite
+Leva um banco SQLite da modelagem antiga (cpf/endereco em Cliente, sem departamentos)
+para a mesma modelagem do MySQL (scripts/limpar_producao_mysql.py), usada pelos DAOs:
+
+- usuario ganha cpf, endereço (cep, logradouro, numero, bairro, cidade, estado),
+  data_nascimento e ultimo_login; o cpf de cada cliente é copiado de Cliente
+  e o endereco antigo vai para logradouro
+- Cliente é recriada com data_cadastro e origem_cadastro (ids preservados)
+- Tabela Departamento (com os departamentos padrão) e coluna Funcionario.id_departamento
+
+Usuários que não são clientes ficam com cpf NULL até serem atualizados.
+
+Uso:
+  python scripts/migrar_sqlite_modelagem.py
+"""
+
+import os
+import sys
+import sqlite3
+
+# Adicionar o diretório raiz ao path
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+COLUNAS_USUARIO = [
+    ('cpf', 'TEXT'),
+    ('cep', 'TEXT'),
+    ('logradouro', 'TEXT'),
+    ('numero', 'TEXT'),
+    ('bairro', 'TEXT'),
+    ('cidade', 'TEXT'),
+    ('estado', 'TEXT'),
+    ('data_nascimento', 'TEXT'),
+    ('ultimo_login', 'TEXT')
+]
+
+
+def _colunas(cur, tabela):
+    cur.execute(f"PRAGMA table_info({tabela})")
+    return [coluna[1] for coluna in cur.fetchall()]
+
+
+def migrar_sqlite():
+    """Aplica a nova modelagem no banco SQLITE_DB"""
+    caminho = os.getenv('SQLITE_DB', 'banco_api.sqlite')
+    if not os.path.exists(caminho):
+        print(f"❌ Banco não encontrado: {caminho}")
+        return False
+
+    # Conexão própria: PRAGMA foreign_keys só vale fora de transação
+    conn = sqlite3.connect(caminho, isolation_level=None)
+    cur = conn.cursor()
+    print(f"  🔗 Conectado ao SQLite ({caminho})")
+
+    try:
+        cur.execute("PRAGMA foreign_keys = OFF")
+        cur.execute("BEGIN")
+
+        # 1. Colunas novas em usuario
+        existentes = _colunas(cur, 'usuario')
+        for coluna, tipo in COLUNAS_USUARIO:
+            if coluna not in existentes:
+                print(f"📝 Adicionando coluna usuario.{coluna}...")
+                cur.execute(f"ALTER TABLE usuario ADD COLUMN {coluna} {tipo}")
+
+        # 2. Cliente: cpf/endereco passam para usuario
+        colunas_cliente = _colunas(cur, 'Cliente')
+        if 'cpf' in colunas_cliente:
+            print("📦 Copiando cpf e endereço dos clientes para usuario...")
+            cur.execute("""
+                UPDATE usuario SET
+                    cpf = (SELECT c.cpf FROM Cliente c WHERE c.id_usuario = usuario.id_usuario),
+                    logradouro = COALESCE(logradouro,
+                        (SELECT c.endereco FROM Cliente c WHERE c.id_usuario = usuario.id_usuario))
+                WHERE id_usuario IN (SELECT id_usuario FROM Cliente)
+            """)
+
+            print("🔄 Recriando tabela Cliente...")
+            cur.execute("""
+                CREATE TABLE Cliente_novo (
+                    id_cliente INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id_usuario INTEGER NOT NULL UNIQUE,
+                    data_cadastro TEXT DEFAULT CURRENT_TIMESTAMP,
+                    origem_cadastro TEXT DEFAULT 'loja_fisica',
+                    FOREIGN KEY (id_usuario) REFERENCES usuario(id_usuario)
+                        ON DELETE CASCADE
+                )
+            """)
+            cur.execute("""
+                INSERT INTO Cliente_novo (id_cliente, id_usuario, data_cadastro, origem_cadastro)
+                SELECT c.id_cliente, c.id_usuario, COALESCE(u.data_criacao, CURRENT_TIMESTAMP), 'loja_fisica'
+                FROM Cliente c
+                JOIN usuario u ON u.id_usuario = c.id_usuario
+            """)
+            print(f"✅ {cur.rowcount} clientes migrados")
+            cur.execute("DROP TABLE Cliente")
+            cur.execute("ALTER TABLE Cliente_novo RENAME TO Cliente")
+            cur.execute("CREATE INDEX idx_cliente_origem ON Cliente(origem_cadastro)")
+        else:
+            print("✅ Tabela Cliente já está atualizada!")
+
+        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_usuario_cpf ON usuario(cpf)")
+
+        # 3. Departamentos
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS Departamento (
+                id_departamento INTEGER PRIMARY KEY AUTOINCREMENT,
+                nome TEXT NOT NULL UNIQUE,
+                centro_custo TEXT UNIQUE
+            )
+        """)
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_departamento_nome ON Departamento(nome)")
+        cur.execute("""
+            INSERT OR IGNORE INTO Departamento (nome, centro_custo) VALUES
+            ('Administrativo', 'CC-001'),
+            ('Vendas', 'CC-002'),
+            ('Compras', 'CC-003')
+        """)
+
+        if 'id_departamento' not in _colunas(cur, 'Funcionario'):
+            print("📝 Adicionando coluna Funcionario.id_departamento...")
+            cur.execute(
+                "ALTER TABLE Funcionario ADD COLUMN id_departamento INTEGER "
+                "REFERENCES Departamento(id_departamento) ON DELETE SET NULL"
+            )
+            cur.execute("CREATE INDEX idx_funcionario_departamento ON Funcionario(id_departamento)")
+
+        cur.execute("PRAGMA foreign_key_check")
+        violacoes = cur.fetchall()
+        if violacoes:
+            raise RuntimeError(f"{len(violacoes)} violações de chave estrangeira após a migração")
+
+        cur.execute("COMMIT")
+
+        cur.execute("SELECT COUNT(*) FROM usuario WHERE cpf IS NULL")
+        sem_cpf = cur.fetchone()[0]
+    except Exception:
+        if conn.in_transaction:
+            cur.execute("ROLLBACK")
+        raise
+    finally:
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.close()
+
+    print("✅ Nova modelagem aplicada com sucesso!")
+    if sem_cpf:
+        print(f"⚠️  {sem_cpf} usuário(s) sem CPF (funcionários/admin): atualize antes de editá-los pela API")
+    return True
+
+
+if __name__ == '__main__':
+    print("🔄 Iniciando migração do SQLite para a nova modelagem...")
+
+    try:
+        sucesso = migrar_sqlite()
+    except Exception as e:
+        print(f"❌ Erro durante a migração: {e}")
+        import traceback
+        traceback.print_exc()
+        sucesso = False
+
+    sys.exit(0 if sucesso else 1)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Script de Migração - Versão dos Produtos
+Adiciona a coluna Produto.versao (concorrência otimista do PATCH /api/produtos/<id>)
+em bancos já existentes. Produtos existentes começam na versão 1.
+
+Uso:
+  python scripts/migrar_versao_produto.py           # SQLite
+  python scripts/migrar_versao_produto.py --mysql   # MySQL
+"""
+
+import os
+import sys
+
+# Adicionar o diretório raiz ao path
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+
+def migrar_sqlite():
+    """Adiciona a coluna versao no SQLite"""
+    from dao_sqlite.db import init_db, get_cursor
+
+    init_db()
+    print("  🔗 Conectado ao SQLite")
+
+    with get_cursor() as cur:
+        cur.execute("PRAGMA table_info(Produto)")
+        if any(coluna['name'] == 'versao' for coluna in cur.fetchall()):
+            print("✅ Coluna versao já existe!")
+            return True
+
+        print("📝 Adicionando coluna Produto.versao...")
+        cur.execute("ALTER TABLE Produto ADD COLUMN versao INTEGER NOT NULL DEFAULT 1")
+
+    print("✅ Coluna versao criada com sucesso!")
+    return True
+
+
+def migrar_mysql():
+    """Adiciona a coluna versao no MySQL"""
+    from dao_mysql.db_pythonanywhere import init_db, get_cursor
+
+    init_db()
+    print("  🔗 Conectado ao MySQL")
+
+    with get_cursor() as cur:
+        cur.execute("SHOW COLUMNS FROM Produto LIKE 'versao'")
+        if cur.fetchall():
+            print("✅ Coluna versao já existe!")
+            return True
+
+        print("📝 Adicionando coluna Produto.versao...")
+        cur.execute(
+            "ALTER TABLE Produto ADD COLUMN versao INT NOT NULL DEFAULT 1 "
+            "COMMENT 'Versão da linha (concorrência otimista)'"
+        )
+
+    print("✅ Coluna versao criada com sucesso!")
+    return True
+
+
+if __name__ == '__main__':
+    print("🔄 Iniciando migração da versão dos produtos...")
+
+    try:
+        if '--mysql' in sys.argv:
+            from dotenv import load_dotenv
+            load_dotenv(os.path.join(BASE_DIR, '.env'))
+            sucesso = migrar_mysql()
+        else:
+            sucesso = migrar_sqlite()
+    except Exception as e:
+        print(f"❌ Erro durante a migração: {e}")
+        import traceback
+        traceback.print_exc()
+        sucesso = False
+
+    sys.exit(0 if sucesso else 1)
@@ -120,7 +120,8 @@ def criar_produto_com_imagem(produto_data, imagem_path):
         # Fechar arquivo
         files['imagem'][1].close()
         
-        if response.status_code == 201:
+        # 202: produto criado, imagem processada em segundo plano
+        if response.status_code in (201, 202):
             data_response = response.json()
             if data_response.get('success'):
                 produto = data_response['produto']
@@ -128,7 +129,12 @@ def criar_produto_com_imagem(produto_data, imagem_path):
                 print_info(f"   Nome: {produto['nome']}")
                 print_info(f"   Preço: R$ {produto['preco_venda']:.2f}")
                 print_info(f"   Estoque: {produto['estoque_atual']} unidades")
-                print_info(f"   Imagem processada: {produto.get('nome_imagem', 'N/A')}")
+                
+                job = data_response.get('imagem_job')
+                if job:
+                    print_info(f"   Imagem em processamento: {job.get('status_url')}")
+                else:
+                    print_info(f"   Imagem processada: {produto.get('nome_imagem', 'N/A')}")
                 
                 # Mostrar URLs das imagens geradas
                 imagens = produto.get('imagens', {})
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Script de Manutenção - Paridade dos DAOs MySQL/SQLite
+Compara, para cada DAO do registro de backend (backend/registro.py), os métodos
+públicos e as assinaturas das versões dao_mysql e dao_sqlite. Não conecta em banco.
+
+Sai com código 1 se houver diferenças, para uso em CI antes de trocar o backend.
+
+Uso:
+  python scripts/verificar_paridade_daos.py
+"""
+
+import os
+import sys
+
+# Adicionar o diretório raiz ao path
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+
+def verificar():
+    """Imprime as diferenças entre os DAOs; retorna True se estiverem em paridade"""
+    from backend import RegistroBackend
+    from backend.registro import DAOS
+
+    diferencas = RegistroBackend.verificar_paridade()
+
+    for nome_dao in DAOS:
+        if nome_dao not in diferencas:
+            print(f"  ✅ {nome_dao}")
+            continue
+
+        dao = diferencas[nome_dao]
+        print(f"  ❌ {nome_dao}")
+        for metodo in dao['somente_mysql']:
+            print(f"     - somente MySQL: {metodo}")
+        for metodo in dao['somente_sqlite']:
+            print(f"     - somente SQLite: {metodo}")
+        for assinatura in dao['assinaturas']:
+            print(f"     - {assinatura['metodo']}: MySQL{assinatura['mysql']} | SQLite{assinatura['sqlite']}")
+
+    print(f"\n📊 {len(DAOS) - len(diferencas)}/{len(DAOS)} DAOs em paridade")
+    return not diferencas
+
+
+if __name__ == '__main__':
+    print("🔍 Verificando paridade dos DAOs MySQL/SQLite...")
+
+    try:
+        sucesso = verificar()
+    except Exception as e:
+        print(f"❌ Erro durante a verificação: {e}")
+        import traceback
+        traceback.print_exc()
+        sucesso = False
+
+    sys.exit(0 if sucesso else 1)
@@ -8,6 +8,8 @@ from .usuario_service import UsuarioService
 from .cliente_service import ClienteService
 from .funcionario_service import FuncionarioService
 from .produto_service import ProdutoService
+from .autocomplete_service import AutocompleteService
+from .imagem_worker import ImagemWorker
 from .fornecedor_service import FornecedorService
 from .pedido_compra_service import PedidoCompraService
 from .pedido_venda_service import PedidoVendaService
@@ -18,6 +20,8 @@ __all__ = [
     'ClienteService',
     'FuncionarioService',
     'ProdutoService',
+    'AutocompleteService',
+    'ImagemWorker',
     'FornecedorService',
     'PedidoCompraService',
     'PedidoVendaService'
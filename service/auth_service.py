@@ -16,40 +16,11 @@ from flask_jwt_extended import (
 )
 from datetime import timedelta
 
+from .revogacao_service import revogacao_tokens
+
 # Configuração de expiração do token (pode ser sobrescrito no app.py)
 TOKEN_EXPIRATION_HOURS = 24
 
-# Blacklist de tokens (usando banco de dados para persistência)
-# Mantemos o set em memória como cache, mas sincronizamos com o banco
-token_blacklist = set()
-
-
-def _get_db_cursor():
-    """Helper para obter cursor do banco ativo (MySQL ou SQLite)"""
-    try:
-        from dao_mysql.db_pythonanywhere import get_cursor
-        return get_cursor
-    except:
-        from dao_sqlite.db import get_cursor
-        return get_cursor
-
-
-def _ensure_blacklist_table():
-    """Garante que a tabela de blacklist existe"""
-    try:
-        get_cursor = _get_db_cursor()
-        with get_cursor() as cursor:
-            # Tenta criar a tabela (ignora se já existir)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS token_blacklist (
-                    jti VARCHAR(255) PRIMARY KEY,
-                    revoked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-    except Exception as e:
-        print(f"⚠️  Erro ao criar tabela de blacklist: {e}")
-
-
 class AuthService:
     """Serviço de autenticação e autorização"""
     
@@ -112,59 +83,33 @@ class AuthService:
         return token
     
     @staticmethod
-    def invalidar_token(jti):
+    def invalidar_token(jti, expira_em=None):
         """
         Adiciona JTI (JWT ID) à blacklist (logout).
-        Persiste no banco de dados para funcionar entre workers/reinicializações.
+        Vale em todos os workers (arquivo local compartilhado) e é persistido no banco
+        até o token expirar.
         
         Args:
             jti (str): JWT ID do token a ser invalidado
+            expira_em (int, optional): Claim exp do token (timestamp Unix)
         """
-        # Adiciona ao cache em memória
-        token_blacklist.add(jti)
-        
-        # Persiste no banco de dados
-        try:
-            _ensure_blacklist_table()
-            get_cursor = _get_db_cursor()
-            with get_cursor() as cursor:
-                cursor.execute(
-                    "INSERT INTO token_blacklist (jti) VALUES (%s) ON DUPLICATE KEY UPDATE jti=jti",
-                    (jti,)
-                )
-        except Exception as e:
-            print(f"⚠️  Erro ao adicionar token à blacklist no banco: {e}")
+        revogacao_tokens.revogar(jti, expira_em)
     
     @staticmethod
-    def token_esta_na_blacklist(jti):
+    def token_esta_na_blacklist(jti, expira_em=None):
         """
         Verifica se o token está na blacklist.
-        Primeiro verifica o cache em memória, depois o banco de dados.
+        Usa a memória do worker e o arquivo local de revogações; o banco só é
+        consultado quando o JTI não está no cache negativo (ver revogacao_service).
         
         Args:
             jti (str): JWT ID do token
+            expira_em (int, optional): Claim exp do token (timestamp Unix)
         
         Returns:
             bool: True se está na blacklist
         """
-        # Verifica cache em memória primeiro
-        if jti in token_blacklist:
-            return True
-        
-        # Verifica no banco de dados
-        try:
-            get_cursor = _get_db_cursor()
-            with get_cursor(commit=False) as cursor:
-                cursor.execute("SELECT 1 FROM token_blacklist WHERE jti = %s", (jti,))
-                result = cursor.fetchone()
-                if result:
-                    # Adiciona ao cache para próximas verificações
-                    token_blacklist.add(jti)
-                    return True
-        except Exception as e:
-            print(f"⚠️  Erro ao verificar blacklist no banco: {e}")
-        
-        return False
+        return revogacao_tokens.esta_revogado(jti, expira_em)
     
     @staticmethod
     def login(usuario_dao, email, senha):
@@ -219,8 +164,8 @@ class AuthService:
             dict: {'success': True, 'message': str}
         """
         # get_jwt() retorna o payload completo do token atual
-        jti = get_jwt()['jti']
-        AuthService.invalidar_token(jti)
+        claims = get_jwt()
+        AuthService.invalidar_token(claims['jti'], claims.get('exp'))
         return {'success': True, 'message': 'Logout realizado com sucesso'}
     
     @staticmethod
@@ -287,11 +232,7 @@ def token_required(f):
     @jwt_required()  # Usa o decorador nativo do flask-jwt-extended
     def decorated(*args, **kwargs):
         try:
-            # Verifica se o token está na blacklist
-            jti = get_jwt()['jti']
-            if AuthService.token_esta_na_blacklist(jti):
-                return jsonify({'message': 'Token foi invalidado (logout)'}), 401
-            
+            # A blacklist já foi verificada pelo jwt_required (token_in_blocklist_loader)
             # Obtém dados do usuário
             usuario_atual = AuthService.obter_usuario_atual()
             
@@ -0,0 +1,225 @@
+"""
+AutocompleteService - Sugestões de Produtos (typeahead)
+Mantém em memória um índice de prefixos sobre nomes e SKUs normalizados,
+respondendo às buscas do PDV/loja sem acessar o banco de dados.
+"""
+
+import re
+import time
+import bisect
+import threading
+
+from .produto_service import ProdutoService
+
+SUGESTOES_LIMITE_PADRAO = 10
+SUGESTOES_LIMITE_MAXIMO = 50
+
+# Máximo de entradas examinadas por consulta (prefixos muito curtos, ex: "a")
+_MAX_ENTRADAS_VARRIDAS = 500
+
+# Pesos: começo do nome/SKU vem antes de uma palavra no meio do nome
+_PESO_INICIO = 0
+_PESO_PALAVRA = 1
+
+_SEPARADORES = re.compile(r'[^a-z0-9]+')
+
+
+def _normalizar(texto):
+    """Remove acentos, converte para minúsculas e troca pontuação por espaço simples"""
+    return _SEPARADORES.sub(' ', ProdutoService.normalizar_texto(texto)).strip()
+
+
+class IndiceAutocomplete:
+    """
+    Índice de prefixos em array ordenado (busca com bisect).
+
+    Cada produto gera entradas (chave, peso, id_produto) para:
+    - o nome completo normalizado
+    - cada sufixo do nome que começa em uma palavra ("brosol 3e opala 6cc")
+    - o SKU normalizado
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entradas = []
+        self._produtos = {}
+        self._chaves_por_produto = {}
+
+    @staticmethod
+    def _gerar_entradas(produto):
+        id_produto = produto['id_produto']
+        entradas = set()
+
+        nome = _normalizar(produto.get('nome'))
+        if nome:
+            entradas.add((nome, _PESO_INICIO, id_produto))
+            palavras = nome.split(' ')
+            for i in range(1, len(palavras)):
+                entradas.add((' '.join(palavras[i:]), _PESO_PALAVRA, id_produto))
+
+        sku = _normalizar(produto.get('sku'))
+        if sku:
+            entradas.add((sku, _PESO_INICIO, id_produto))
+
+        return sorted(entradas)
+
+    @staticmethod
+    def _resumo(produto):
+        return {
+            'id_produto': produto['id_produto'],
+            'nome': produto.get('nome'),
+            'sku': produto.get('sku')
+        }
+
+    def construir(self, produtos):
+        """Reconstrói o índice inteiro a partir de uma lista de produtos"""
+        entradas = []
+        resumos = {}
+        chaves_por_produto = {}
+
+        for produto in produtos:
+            chaves = self._gerar_entradas(produto)
+            entradas.extend(chaves)
+            resumos[produto['id_produto']] = self._resumo(produto)
+            chaves_por_produto[produto['id_produto']] = chaves
+
+        entradas.sort()
+
+        with self._lock:
+            self._entradas = entradas
+            self._produtos = resumos
+            self._chaves_por_produto = chaves_por_produto
+
+    def atualizar(self, produto):
+        """Insere ou substitui um produto no índice"""
+        novas = self._gerar_entradas(produto)
+
+        with self._lock:
+            self._remover_entradas(produto['id_produto'])
+            for entrada in novas:
+                bisect.insort(self._entradas, entrada)
+            self._produtos[produto['id_produto']] = self._resumo(produto)
+            self._chaves_por_produto[produto['id_produto']] = novas
+
+    def remover(self, id_produto):
+        """Remove um produto do índice"""
+        with self._lock:
+            self._remover_entradas(id_produto)
+            self._produtos.pop(id_produto, None)
+
+    def _remover_entradas(self, id_produto):
+        for entrada in self._chaves_por_produto.pop(id_produto, []):
+            i = bisect.bisect_left(self._entradas, entrada)
+            if i < len(self._entradas) and self._entradas[i] == entrada:
+                del self._entradas[i]
+
+    def buscar(self, prefixo, limite):
+        """
+        Retorna até `limite` produtos cujo nome, palavra do nome ou SKU começa com o prefixo.
+        Começo do nome/SKU tem prioridade sobre palavras no meio do nome.
+        """
+        prefixo = _normalizar(prefixo)
+        if not prefixo:
+            return []
+
+        with self._lock:
+            i = bisect.bisect_left(self._entradas, (prefixo,))
+            fim = min(len(self._entradas), i + _MAX_ENTRADAS_VARRIDAS)
+            candidatos = {}
+
+            while i < fim:
+                chave, peso, id_produto = self._entradas[i]
+                if not chave.startswith(prefixo):
+                    break
+                anterior = candidatos.get(id_produto)
+                if anterior is None or (peso, chave) < anterior:
+                    candidatos[id_produto] = (peso, chave)
+                i += 1
+
+            melhores = sorted(candidatos.items(), key=lambda item: (item[1], item[0]))[:limite]
+            return [dict(self._produtos[id_produto]) for id_produto, _ in melhores]
+
+    def __len__(self):
+        return len(self._produtos)
+
+
+_indice = IndiceAutocomplete()
+
+
+class AutocompleteService:
+    """Serviço de sugestões de produtos servido a partir do índice em memória"""
+
+    @staticmethod
+    def construir_indice(produto_dao):
+        """
+        Carrega nomes e SKUs de todos os produtos e reconstrói o índice.
+
+        Args:
+            produto_dao: Instância de ProdutoDAO
+
+        Returns:
+            int: Quantidade de produtos indexados
+        """
+        _indice.construir(produto_dao.listar_nomes_skus())
+        return len(_indice)
+
+    @staticmethod
+    def iniciar_reconstrucao_periodica(produto_dao, intervalo_segundos):
+        """
+        Reconstrói o índice periodicamente em uma thread de fundo.
+        Garante que alterações feitas por outros workers apareçam com atraso limitado.
+
+        Args:
+            produto_dao: Instância de ProdutoDAO
+            intervalo_segundos (int): Intervalo entre reconstruções (0 desativa)
+        """
+        if not intervalo_segundos or intervalo_segundos <= 0:
+            return
+
+        def loop():
+            while True:
+                time.sleep(intervalo_segundos)
+                try:
+                    AutocompleteService.construir_indice(produto_dao)
+                except Exception as e:
+                    print(f"⚠️  Erro ao reconstruir índice de autocomplete: {e}")
+
+        threading.Thread(target=loop, name='autocomplete-reconstrucao', daemon=True).start()
+
+    @staticmethod
+    def atualizar_produto(produto):
+        """Atualiza (ou insere) um produto no índice após criação/edição"""
+        if produto and produto.get('id_produto') is not None:
+            _indice.atualizar(produto)
+
+    @staticmethod
+    def remover_produto(id_produto):
+        """Remove um produto do índice após exclusão"""
+        _indice.remover(id_produto)
+
+    @staticmethod
+    def sugerir(prefixo, limite=None):
+        """
+        Sugere produtos para o texto digitado.
+
+        Args:
+            prefixo (str): Texto digitado (ex: "carb", "BRO-3")
+            limite (int, optional): Máximo de sugestões (padrão 10, máximo 50)
+
+        Returns:
+            dict: {'success': True, 'sugestoes': list} ou {'success': False, 'message': str}
+        """
+        if not prefixo or not prefixo.strip():
+            return {'success': False, 'message': 'Parâmetro "prefix" é obrigatório'}
+
+        try:
+            limite = int(limite) if limite not in (None, '') else SUGESTOES_LIMITE_PADRAO
+        except (ValueError, TypeError):
+            return {'success': False, 'message': 'Parâmetro "limit" deve ser um número inteiro'}
+        if limite < 1 or limite > SUGESTOES_LIMITE_MAXIMO:
+            return {'success': False, 'message': f'Parâmetro "limit" deve estar entre 1 e {SUGESTOES_LIMITE_MAXIMO}'}
+
+        return {
+            'success': True,
+            'sugestoes': _indice.buscar(prefixo, limite)
+        }
@@ -83,19 +83,37 @@ class ClienteService:
             return f"{cpf_numeros[:3]}.{cpf_numeros[3:6]}.{cpf_numeros[6:9]}-{cpf_numeros[9:]}"
         return cpf
     
-    def listar_clientes(self, apenas_ativos=True):
+    def campos_listagem(self):
+        """Campos aceitos em ?fields= (colunas de listagem do DAO)"""
+        return list(self.cliente_dao.COLUNAS_LISTAGEM)
+    
+    def listar_clientes(self, apenas_ativos=True, campos=None):
         """
         Lista todos os clientes.
         
         Args:
             apenas_ativos (bool): Se True, lista apenas clientes ativos
+            campos (list, optional): Projeção de ?fields= (já validada)
         
         Returns:
-            list: Lista de clientes com dados completos
+            list: Lista de clientes com dados completos (ou apenas os campos pedidos)
         """
         if apenas_ativos:
-            return self.cliente_dao.listar_clientes_ativos()
-        return self.cliente_dao.listar_todos()
+            return self.cliente_dao.listar_clientes_ativos(campos)
+        return self.cliente_dao.listar_todos(campos=campos)
+    
+    def iterar_clientes(self, apenas_ativos=True, campos=None):
+        """
+        Gera os clientes um a um, sem carregar a lista inteira (?stream=true).
+        
+        Args:
+            apenas_ativos (bool): Se True, apenas clientes ativos
+            campos (list, optional): Projeção de ?fields= (já validada)
+        
+        Returns:
+            iterator: Clientes (dict)
+        """
+        return self.cliente_dao.iterar_todos(apenas_ativos, campos)
     
     def buscar_cliente(self, id_cliente):
         """
@@ -0,0 +1,131 @@
+"""
+Compressão das Respostas (gzip / brotli)
+Camada after_request registrada em create_app: comprime respostas de texto (JSON,
+HTML, CSS, JS, SVG) conforme o Accept-Encoding do cliente.
+
+- brotli ("br") quando o pacote brotli está instalado e o cliente aceita; senão gzip.
+- Respostas menores que COMPRESSAO_MIN_BYTES (padrão 1024) saem sem compressão.
+- Níveis configuráveis: COMPRESSAO_NIVEL_GZIP (padrão 6) e COMPRESSAO_NIVEL_BROTLI (padrão 5).
+- Respostas em streaming (?stream=true) são comprimidas bloco a bloco.
+- Respostas vindas do cache do catálogo trazem um dicionário `comprimidos`
+  ({codificação: bytes}) guardado junto da entrada do cache: cada codificação é
+  gerada uma vez por entrada, e os acertos seguintes reutilizam os bytes.
+- Arquivos (send_file), respostas parciais (206) e respostas já codificadas não
+  são alteradas.
+"""
+
+import os
+import gzip
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+# Tipos que valem a pena comprimir (imagens PNG/WebP/AVIF já são comprimidas)
+MIMETYPES_COMPRIMIVEIS = (
+    'application/json',
+    'application/javascript',
+    'image/svg+xml',
+    'text/'
+)
+
+
+class Compressao:
+    """Compressão de respostas negociada pelo Accept-Encoding"""
+
+    def __init__(self, min_bytes=1024, nivel_gzip=6, nivel_brotli=5):
+        self.min_bytes = min_bytes
+        self.nivel_gzip = nivel_gzip
+        self.nivel_brotli = nivel_brotli
+
+    @property
+    def codificacoes(self):
+        """Codificações suportadas, na ordem de preferência do servidor"""
+        return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    def init_app(self, app):
+        """Registra a compressão no after_request da aplicação"""
+        app.after_request(self.processar_resposta)
+
+    def comprimir(self, dados, codificacao):
+        """Comprime `dados` (bytes) com a codificação informada ('br' ou 'gzip')"""
+        if codificacao == 'br':
+            return brotli.compress(dados, quality=self.nivel_brotli)
+        return gzip.compress(dados, compresslevel=self.nivel_gzip, mtime=0)
+
+    def _comprimir_stream(self, partes, codificacao):
+        """Comprime uma resposta em streaming bloco a bloco"""
+        if codificacao == 'br':
+            compressor = brotli.Compressor(quality=self.nivel_brotli)
+            comprimir, finalizar = compressor.process, compressor.finish
+        else:
+            # wbits=31: formato gzip (cabeçalho + CRC), igual ao gzip.compress
+            compressor = zlib.compressobj(self.nivel_gzip, zlib.DEFLATED, 31)
+            comprimir, finalizar = compressor.compress, compressor.flush
+
+        try:
+            for parte in partes:
+                if isinstance(parte, str):
+                    parte = parte.encode('utf-8')
+                bloco = comprimir(parte)
+                if bloco:
+                    yield bloco
+            yield finalizar()
+        finally:
+            fechar = getattr(partes, 'close', None)
+            if fechar:
+                fechar()
+
+    @staticmethod
+    def _comprimivel(response):
+        mimetype = response.mimetype or ''
+        return any(mimetype == tipo or (tipo.endswith('/') and mimetype.startswith(tipo))
+                   for tipo in MIMETYPES_COMPRIMIVEIS)
+
+    def processar_resposta(self, response):
+        """after_request: comprime a resposta quando o cliente aceita e compensa"""
+        if (response.status_code != 200
+                or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or not self._comprimivel(response)):
+            return response
+
+        response.vary.add('Accept-Encoding')
+
+        codificacao = request.accept_encodings.best_match(self.codificacoes)
+        if codificacao is None:
+            return response
+
+        if response.is_streamed:
+            response.response = self._comprimir_stream(response.response, codificacao)
+            response.headers.pop('Content-Length', None)
+        else:
+            dados = response.get_data()
+            if len(dados) < self.min_bytes:
+                return response
+
+            comprimidos = getattr(response, 'comprimidos', None)
+            corpo = comprimidos.get(codificacao) if comprimidos is not None else None
+            if corpo is None:
+                corpo = self.comprimir(dados, codificacao)
+                if comprimidos is not None:
+                    comprimidos[codificacao] = corpo
+            response.set_data(corpo)
+
+        response.headers['Content-Encoding'] = codificacao
+        etag, fraca = response.get_etag()
+        if etag:
+            # Cada codificação é uma representação diferente
+            response.set_etag(f'{etag}-{codificacao}', weak=fraca)
+        return response
+
+
+compressao = Compressao(
+    min_bytes=int(os.getenv('COMPRESSAO_MIN_BYTES', 1024)),
+    nivel_gzip=int(os.getenv('COMPRESSAO_NIVEL_GZIP', 6)),
+    nivel_brotli=int(os.getenv('COMPRESSAO_NIVEL_BROTLI', 5))
+)
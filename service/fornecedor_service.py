@@ -178,17 +178,22 @@ class FornecedorService:
                 'message': f'Erro ao buscar fornecedor: {str(e)}'
             }
     
-    def listar_fornecedores(self, apenas_ativos=True):
+    def campos_listagem(self):
+        """Campos aceitos em ?fields= (colunas de listagem do DAO)"""
+        return list(self.fornecedor_dao.COLUNAS_LISTAGEM)
+    
+    def listar_fornecedores(self, apenas_ativos=True, campos=None):
         """
         Lista todos os fornecedores.
         
         Args:
             apenas_ativos (bool): Se True, lista apenas fornecedores ativos
+            campos (list, optional): Projeção de ?fields= (já validada)
         
         Returns:
             list: Lista de fornecedores
         """
-        return self.fornecedor_dao.listar_todos(apenas_ativos)
+        return self.fornecedor_dao.listar_todos(apenas_ativos, campos)
     
     def buscar_por_nome(self, nome, apenas_ativos=True):
         """
@@ -24,17 +24,22 @@ class FuncionarioService:
         self.nivel_acesso_dao = nivel_acesso_dao
         self.usuario_service = UsuarioService(usuario_dao, nivel_acesso_dao)
     
-    def listar_funcionarios(self, apenas_ativos=True):
+    def campos_listagem(self):
+        """Campos aceitos em ?fields= (colunas de listagem do DAO)"""
+        return list(self.funcionario_dao.COLUNAS_LISTAGEM)
+    
+    def listar_funcionarios(self, apenas_ativos=True, campos=None):
         """
         Lista todos os funcionários.
         
         Args:
             apenas_ativos (bool): Se True, lista apenas funcionários ativos
+            campos (list, optional): Projeção de ?fields= (já validada)
         
         Returns:
-            list: Lista de funcionários com dados completos
+            list: Lista de funcionários com dados completos (ou apenas os campos pedidos)
         """
-        return self.funcionario_dao.listar_todos(apenas_ativos)
+        return self.funcionario_dao.listar_todos(apenas_ativos, campos)
     
     def buscar_funcionario(self, id_funcionario):
         """
@@ -0,0 +1,248 @@
+"""
+ImagemWorker - Processamento de Imagens em Segundo Plano
+Recebe o upload bruto, persiste em disco e processa as resoluções em um pool de threads
+limitado, fora da thread da requisição. O nome da imagem (hash do upload) já é gravado
+em Produto.nome_imagem na criação do produto; o worker gera as variantes com esse nome.
+
+O status de cada job é gravado em arquivo JSON ao lado do upload, para que possa ser
+consultado por qualquer worker da aplicação.
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from .produto_service import ProdutoService
+
+# Threads processando imagens simultaneamente
+IMAGEM_WORKERS = int(os.getenv('IMAGEM_WORKERS', 2))
+
+# Máximo de jobs aguardando ou em processamento neste worker (acima disso, recusa o upload)
+IMAGEM_FILA_MAXIMO = int(os.getenv('IMAGEM_FILA_MAXIMO', 32))
+
+# Uploads brutos e status dos jobs (fora de static/, não são servidos diretamente)
+IMAGEM_JOBS_DIR = os.getenv('IMAGEM_JOBS_DIR', 'uploads/imagens')
+
+# Status de jobs finalizados são descartados após este período
+JOBS_RETENCAO_SEGUNDOS = 24 * 3600
+
+STATUS_PENDENTE = 'pendente'
+STATUS_PROCESSANDO = 'processando'
+STATUS_CONCLUIDO = 'concluido'
+STATUS_ERRO = 'erro'
+
+_PADRAO_JOB_ID = re.compile(r'^[0-9a-f]{32}$')
+
+_executor = None
+_lock = threading.Lock()
+_contadores = {'pendentes': 0, 'processando': 0, 'concluidos': 0, 'erros': 0}
+_ultima_limpeza = 0.0
+
+
+def _agora():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def _caminho_status(job_id):
+    return os.path.join(IMAGEM_JOBS_DIR, f"{job_id}.json")
+
+
+def _gravar_status(job):
+    """Grava o status do job de forma atômica (escrita em arquivo temporário + rename)"""
+    job['atualizado_em'] = _agora()
+    temporario = _caminho_status(job['job_id']) + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(job, f)
+    os.replace(temporario, _caminho_status(job['job_id']))
+
+
+def _obter_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=IMAGEM_WORKERS, thread_name_prefix='imagem-worker')
+        return _executor
+
+
+def _limpar_jobs_antigos():
+    """Remove status de jobs antigos (no máximo uma varredura por hora)"""
+    global _ultima_limpeza
+    agora = time.time()
+    if agora - _ultima_limpeza < 3600:
+        return
+    _ultima_limpeza = agora
+
+    for nome in os.listdir(IMAGEM_JOBS_DIR):
+        caminho = os.path.join(IMAGEM_JOBS_DIR, nome)
+        try:
+            if nome.endswith('.json') and agora - os.path.getmtime(caminho) > JOBS_RETENCAO_SEGUNDOS:
+                os.remove(caminho)
+        except OSError:
+            pass
+
+
+def _descartar_referencia(id_produto, nome_imagem, produto_dao):
+    """Variantes não geradas: o produto deixa de apontar para a imagem reservada"""
+    produto = produto_dao.buscar_por_id(id_produto)
+    if produto and produto.get('nome_imagem') == nome_imagem and not ProdutoService.imagem_existe(nome_imagem):
+        produto_dao.atualizar_nome_imagem(id_produto, None)
+
+
+def _processar(job, caminho_upload, nome_imagem, produto_dao):
+    """Executa o job no pool: gera as resoluções com o nome já gravado no produto"""
+    with _lock:
+        _contadores['pendentes'] -= 1
+        _contadores['processando'] += 1
+
+    sucesso = False
+    try:
+        job['status'] = STATUS_PROCESSANDO
+        _gravar_status(job)
+
+        resultado = ProdutoService.gerar_resolucoes_imagem(caminho_upload)
+
+        if not resultado['success']:
+            job['status'] = STATUS_ERRO
+            job['mensagem'] = resultado['message']
+            _descartar_referencia(job['id_produto'], nome_imagem, produto_dao)
+        elif ProdutoService.liberar_imagem(produto_dao, resultado['nome_imagem']):
+            # Nenhum produto referencia a imagem (excluído durante o processamento): variantes descartadas
+            job['status'] = STATUS_ERRO
+            job['mensagem'] = 'Produto não encontrado'
+        else:
+            # A linha já aponta para as variantes desde o INSERT: nada a gravar no banco
+            job['status'] = STATUS_CONCLUIDO
+            job['nome_imagem'] = resultado['nome_imagem']
+            job['mensagem'] = (
+                'Imagem já existente reaproveitada' if resultado.get('reaproveitada')
+                else 'Imagem processada com sucesso'
+            )
+            sucesso = True
+
+    except Exception as e:
+        job['status'] = STATUS_ERRO
+        job['mensagem'] = f'Erro ao processar imagem: {str(e)}'
+        try:
+            _descartar_referencia(job['id_produto'], nome_imagem, produto_dao)
+        except Exception as erro_referencia:
+            print(f"⚠️  Erro ao descartar a imagem do produto {job['id_produto']}: {erro_referencia}")
+
+    finally:
+        try:
+            _gravar_status(job)
+        except OSError as e:
+            print(f"⚠️  Erro ao gravar status do job de imagem {job['job_id']}: {e}")
+        try:
+            os.remove(caminho_upload)
+        except OSError:
+            pass
+        with _lock:
+            _contadores['processando'] -= 1
+            _contadores['concluidos' if sucesso else 'erros'] += 1
+
+
+class ImagemWorker:
+    """Fila de processamento de imagens de produtos"""
+
+    @staticmethod
+    def validar_upload(imagem_file):
+        """
+        Valida o arquivo e a capacidade da fila antes de aceitar o upload.
+
+        Args:
+            imagem_file (FileStorage): Arquivo de imagem do Flask
+
+        Returns:
+            dict: {'valido': bool, 'mensagem': str, 'fila_cheia': bool}
+        """
+        validacao = ProdutoService.validar_arquivo_imagem(imagem_file.filename)
+        if not validacao['valido']:
+            return {'valido': False, 'mensagem': validacao['mensagem'], 'fila_cheia': False}
+
+        with _lock:
+            ocupados = _contadores['pendentes'] + _contadores['processando']
+        if ocupados >= IMAGEM_FILA_MAXIMO:
+            return {
+                'valido': False,
+                'mensagem': 'Fila de processamento de imagens cheia. Tente novamente em instantes',
+                'fila_cheia': True
+            }
+
+        return {'valido': True, 'mensagem': 'Upload aceito', 'fila_cheia': False}
+
+    @staticmethod
+    def enfileirar(imagem_file, id_produto, nome_imagem, produto_dao):
+        """
+        Persiste o upload bruto e agenda o processamento no pool.
+
+        Args:
+            imagem_file (FileStorage): Arquivo de imagem do Flask (já validado)
+            id_produto (int): ID do produto
+            nome_imagem (str): Nome reservado (ProdutoService.nome_imagem_upload), já gravado no produto
+            produto_dao: Instância de ProdutoDAO (usada para descartar a referência se o processamento falhar)
+
+        Returns:
+            dict: {'success': True, 'job': dict} ou {'success': False, 'message': str}
+        """
+        try:
+            os.makedirs(IMAGEM_JOBS_DIR, exist_ok=True)
+            _limpar_jobs_antigos()
+
+            job_id = uuid.uuid4().hex
+            extensao = imagem_file.filename.rsplit('.', 1)[1].lower()
+            caminho_upload = os.path.join(IMAGEM_JOBS_DIR, f"{job_id}.{extensao}")
+            imagem_file.save(caminho_upload)
+
+            job = {
+                'job_id': job_id,
+                'id_produto': id_produto,
+                'status': STATUS_PENDENTE,
+                'nome_imagem': None,
+                'mensagem': 'Aguardando processamento',
+                'criado_em': _agora()
+            }
+            _gravar_status(job)
+
+            with _lock:
+                _contadores['pendentes'] += 1
+            _obter_executor().submit(_processar, dict(job), caminho_upload, nome_imagem, produto_dao)
+
+            return {'success': True, 'job': job}
+
+        except Exception as e:
+            return {'success': False, 'message': f'Erro ao enfileirar imagem: {str(e)}'}
+
+    @staticmethod
+    def consultar_job(job_id):
+        """
+        Consulta o status de um job de imagem.
+
+        Args:
+            job_id (str): ID do job retornado na criação do produto
+
+        Returns:
+            dict: Dados do job ou None se não encontrado
+        """
+        if not _PADRAO_JOB_ID.match(job_id or ''):
+            return None
+
+        try:
+            with open(_caminho_status(job_id), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def estatisticas():
+        """Profundidade da fila e contadores de jobs deste worker"""
+        with _lock:
+            return {
+                'workers': IMAGEM_WORKERS,
+                'capacidade': IMAGEM_FILA_MAXIMO,
+                **_contadores
+            }
@@ -0,0 +1,231 @@
+"""
+ImportacaoProdutoService - Importação em Massa de Produtos
+Lê um arquivo CSV ou NDJSON em streaming (linha a linha, sem carregá-lo inteiro),
+valida cada linha com as regras do ProdutoService e grava em lotes de
+IMPORTACAO_LOTE linhas, cada lote em uma transação (ProdutoDAO.importar_lote).
+
+Colunas (CSV com cabeçalho, ou chaves de cada objeto NDJSON):
+- sku (identifica o produto: existente é atualizado, novo é inserido; vazio gera um SKU)
+- nome, preco (ou preco_venda), estoque (ou estoque_atual): obrigatórios
+- descricao, preco_custo (ou preco_custo_medio): opcionais; ausentes mantêm o valor atual
+"""
+
+import csv
+import json
+import uuid
+
+from .produto_service import ProdutoService
+
+# Linhas gravadas por transação
+IMPORTACAO_LOTE = 500
+
+# Máximo de erros detalhados no relatório (os demais são apenas contados)
+IMPORTACAO_MAX_ERROS = 1000
+
+FORMATOS_IMPORTACAO = ('csv', 'ndjson')
+
+# Nomes aceitos para cada campo (o primeiro é o usado no POST /api/produtos)
+_ALIASES = {
+    'preco': ('preco', 'preco_venda'),
+    'estoque': ('estoque', 'estoque_atual'),
+    'preco_custo': ('preco_custo', 'preco_custo_medio')
+}
+
+
+def _decodificar_linhas(arquivo):
+    """Gera as linhas de um arquivo binário como texto UTF-8 (remove BOM do início)"""
+    primeira = True
+    for linha in arquivo:
+        texto = linha.decode('utf-8-sig' if primeira else 'utf-8')
+        primeira = False
+        yield texto
+
+
+def _numero(valor):
+    """Aceita vírgula decimal (planilhas em pt-BR): '45,90' -> '45.90'"""
+    if isinstance(valor, str):
+        valor = valor.strip()
+        if ',' in valor and '.' not in valor:
+            valor = valor.replace(',', '.')
+    return valor
+
+
+class ImportacaoProdutoService:
+    """Importação de catálogo (CSV/NDJSON) com validação por linha e gravação em lotes"""
+
+    @staticmethod
+    def detectar_formato(formato=None, nome_arquivo=None, content_type=None):
+        """
+        Define o formato do arquivo: parâmetro explícito, extensão ou Content-Type.
+
+        Returns:
+            str: 'csv', 'ndjson' ou None se não for possível identificar
+        """
+        if formato:
+            formato = formato.lower()
+            if formato == 'jsonl':
+                return 'ndjson'
+            return formato if formato in FORMATOS_IMPORTACAO else None
+
+        nome_arquivo = (nome_arquivo or '').lower()
+        if nome_arquivo.endswith('.csv'):
+            return 'csv'
+        if nome_arquivo.endswith(('.ndjson', '.jsonl')):
+            return 'ndjson'
+
+        content_type = (content_type or '').lower()
+        if 'csv' in content_type:
+            return 'csv'
+        if 'ndjson' in content_type or 'jsonl' in content_type:
+            return 'ndjson'
+        return None
+
+    @staticmethod
+    def ler_csv(arquivo):
+        """
+        Gera (número da linha, dict) de um CSV com cabeçalho.
+        O separador (',' ou ';') é escolhido pelo cabeçalho.
+        """
+        linhas = _decodificar_linhas(arquivo)
+        cabecalho = next(linhas, '')
+        separador = ';' if cabecalho.count(';') > cabecalho.count(',') else ','
+        colunas = [coluna.strip().lower() for coluna in next(csv.reader([cabecalho], delimiter=separador), [])]
+
+        leitor = csv.reader(linhas, delimiter=separador)
+        for valores in leitor:
+            if not any(valor.strip() for valor in valores):
+                continue
+            # +1: o cabeçalho já foi consumido fora do leitor
+            yield leitor.line_num + 1, dict(zip(colunas, valores))
+
+    @staticmethod
+    def ler_ndjson(arquivo):
+        """Gera (número da linha, dict) de um arquivo com um objeto JSON por linha"""
+        for numero, linha in enumerate(_decodificar_linhas(arquivo), start=1):
+            if not linha.strip():
+                continue
+            try:
+                dados = json.loads(linha)
+            except ValueError as e:
+                yield numero, {'_erro': f'JSON inválido: {e}'}
+                continue
+            yield numero, dados if isinstance(dados, dict) else {'_erro': 'Cada linha deve ser um objeto JSON'}
+
+    @staticmethod
+    def _campo(dados, campo):
+        for nome in _ALIASES.get(campo, (campo,)):
+            if nome in dados and dados[nome] not in (None, ''):
+                return dados[nome]
+        return None
+
+    @staticmethod
+    def validar_linha(dados):
+        """
+        Valida uma linha com as regras de criação de produto.
+
+        Returns:
+            tuple: (produto pronto para ProdutoDAO.importar_lote, lista de erros)
+        """
+        if '_erro' in dados:
+            return None, [dados['_erro']]
+
+        erros = []
+        nome = ImportacaoProdutoService._campo(dados, 'nome')
+        validacao_nome = ProdutoService.validar_nome(nome)
+        if not validacao_nome['valido']:
+            erros.append(validacao_nome['mensagem'])
+
+        validacao_preco = ProdutoService.validar_preco(_numero(ImportacaoProdutoService._campo(dados, 'preco')))
+        if not validacao_preco['valido']:
+            erros.append(validacao_preco['mensagem'])
+
+        validacao_estoque = ProdutoService.validar_estoque(_numero(ImportacaoProdutoService._campo(dados, 'estoque')))
+        if not validacao_estoque['valido']:
+            erros.append(validacao_estoque['mensagem'])
+
+        preco_custo = None
+        custo_informado = ImportacaoProdutoService._campo(dados, 'preco_custo')
+        if custo_informado is not None:
+            validacao_custo = ProdutoService.validar_preco(_numero(custo_informado))
+            if validacao_custo['valido']:
+                preco_custo = validacao_custo['preco']
+            else:
+                erros.append(f"Preço de custo: {validacao_custo['mensagem']}")
+
+        sku = str(ImportacaoProdutoService._campo(dados, 'sku') or '').strip()
+        if len(sku) > 100:
+            erros.append('SKU deve ter no máximo 100 caracteres')
+
+        if erros:
+            return None, erros
+
+        descricao = ImportacaoProdutoService._campo(dados, 'descricao')
+        return {
+            'sku': sku or f"SKU-{uuid.uuid4().hex[:8].upper()}",
+            'nome': nome.strip(),
+            'descricao': str(descricao).strip() if descricao is not None else None,
+            'preco_venda': validacao_preco['preco'],
+            'preco_custo_medio': preco_custo,
+            'estoque_atual': validacao_estoque['estoque']
+        }, []
+
+    @staticmethod
+    def importar(produto_dao, linhas):
+        """
+        Valida e grava as linhas em lotes de IMPORTACAO_LOTE (uma transação por lote).
+
+        Args:
+            produto_dao: Instância de ProdutoDAO
+            linhas (iterable): Pares (número da linha, dict) de ler_csv/ler_ndjson
+
+        Returns:
+            dict: Relatório {'success': True, 'total_linhas', 'inseridos', 'atualizados',
+                  'com_erro', 'erros': [{'linha', 'sku', 'erros'}], 'erros_omitidos'}
+        """
+        relatorio = {
+            'success': True,
+            'total_linhas': 0,
+            'inseridos': 0,
+            'atualizados': 0,
+            'com_erro': 0,
+            'erros': [],
+            'erros_omitidos': 0
+        }
+
+        def registrar_erro(numero, sku, erros):
+            relatorio['com_erro'] += 1
+            if len(relatorio['erros']) < IMPORTACAO_MAX_ERROS:
+                relatorio['erros'].append({'linha': numero, 'sku': sku, 'erros': erros})
+            else:
+                relatorio['erros_omitidos'] += 1
+
+        def gravar(lote):
+            try:
+                inseridos, atualizados = produto_dao.importar_lote([produto for _, produto in lote])
+                relatorio['inseridos'] += inseridos
+                relatorio['atualizados'] += atualizados
+            except Exception as e:
+                # Transação do lote desfeita: todas as linhas dele ficam com erro
+                for numero, produto in lote:
+                    registrar_erro(numero, produto['sku'], [f'Lote não gravado: {str(e)}'])
+
+        lote = []
+        for numero, dados in linhas:
+            relatorio['total_linhas'] += 1
+            produto, erros = ImportacaoProdutoService.validar_linha(dados)
+            if erros:
+                registrar_erro(numero, dados.get('sku') or None, erros)
+                continue
+
+            lote.append((numero, produto))
+            if len(lote) >= IMPORTACAO_LOTE:
+                gravar(lote)
+                lote = []
+        gravar(lote)
+
+        if relatorio['inseridos'] or relatorio['atualizados']:
+            # Índice de autocomplete reconstruído uma vez, não por produto
+            from .autocomplete_service import AutocompleteService
+            AutocompleteService.construir_indice(produto_dao)
+
+        return relatorio
@@ -0,0 +1,84 @@
+"""
+Provedor JSON da API
+Substitui o provedor padrão do Flask (registrado em create_app).
+
+- Usa orjson quando instalado (serialização em C, bytes UTF-8 direto na resposta);
+  sem ele, usa o json da biblioteca padrão com as mesmas regras.
+- Decimal (preco_venda, total, preco_custo_medio...) vira número JSON.
+- date/datetime/time viram ISO 8601 ("2025-11-09", "2025-11-09T14:30:00"), não o
+  formato HTTP (RFC 822) do Flask.
+- Chaves na ordem em que foram inseridas (sem ordenação).
+"""
+
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+
+def _padrao(obj):
+    """Converte os tipos que o json (ou o orjson) não serializa sozinho"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    # uuid, dataclass, Markup: regras do Flask
+    return DefaultJSONProvider.default(obj)
+
+
+class ProvedorJSON(DefaultJSONProvider):
+    """Provedor JSON com orjson opcional e Decimal/datas consistentes"""
+
+    default = staticmethod(_padrao)
+    sort_keys = False
+
+    @property
+    def motor(self):
+        """Biblioteca usada na serialização ('orjson' ou 'json')"""
+        return 'orjson' if orjson is not None else 'json'
+
+    def _opcoes_orjson(self, indentar=False):
+        opcoes = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            opcoes |= orjson.OPT_SORT_KEYS
+        if indentar:
+            opcoes |= orjson.OPT_INDENT_2
+        return opcoes
+
+    def dumps_bytes(self, obj, indentar=False):
+        """Serializa direto para bytes UTF-8 (evita decodificar e codificar de novo)"""
+        if orjson is not None:
+            return orjson.dumps(obj, default=_padrao, option=self._opcoes_orjson(indentar))
+        if indentar:
+            return self.dumps(obj, indent=2).encode('utf-8')
+        return self.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        """
+        Serializa para str. Com orjson, apenas `indent` é considerado (a saída já é
+        compacta); os demais argumentos do json.dumps são ignorados.
+        """
+        if orjson is not None:
+            return orjson.dumps(obj, default=_padrao, option=self._opcoes_orjson(bool(kwargs.get('indent')))).decode('utf-8')
+
+        kwargs.setdefault('default', self.default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        """jsonify: mesma assinatura do Flask, com o corpo gerado em bytes"""
+        obj = self._prepare_response_obj(args, kwargs)
+        indentar = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(self.dumps_bytes(obj, indentar), mimetype=self.mimetype)
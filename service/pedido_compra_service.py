@@ -3,11 +3,14 @@ PedidoCompraService - Serviço de Pedidos de Compra
 Lógica de negócio para operações com pedidos de compra (entrada de estoque).
 """
 
+from .unidade_de_trabalho import transacional, resolver_unidade_de_trabalho
+
 
 class PedidoCompraService:
     """Serviço de lógica de negócio para pedidos de compra"""
     
-    def __init__(self, pedido_compra_dao, item_pedido_compra_dao, fornecedor_dao, produto_dao):
+    def __init__(self, pedido_compra_dao, item_pedido_compra_dao, fornecedor_dao, produto_dao,
+                 unidade_de_trabalho=None):
         """
         Inicializa o serviço.
         
@@ -16,12 +19,17 @@ class PedidoCompraService:
             item_pedido_compra_dao: Instância de ItemPedidoCompraDAO
             fornecedor_dao: Instância de FornecedorDAO
             produto_dao: Instância de ProdutoDAO
+            unidade_de_trabalho: Context manager de unidade de trabalho do backend
+                (ex: backend.unidade_de_trabalho); os fluxos de
+                escrita rodam em uma única conexão e transação
         """
         self.pedido_dao = pedido_compra_dao
         self.item_dao = item_pedido_compra_dao
         self.fornecedor_dao = fornecedor_dao
         self.produto_dao = produto_dao
+        self.unidade_de_trabalho = resolver_unidade_de_trabalho(unidade_de_trabalho)
     
+    @transacional
     def criar_pedido_compra(self, id_fornecedor, id_funcionario, itens=None):
         """
         Cria um novo pedido de compra com itens.
@@ -60,8 +68,7 @@ class PedidoCompraService:
             if itens:
                 resultado_itens = self.adicionar_itens(id_pedido, itens)
                 if not resultado_itens['success']:
-                    # Se falhar ao adicionar itens, deletar pedido
-                    self.pedido_dao.deletar(id_pedido)
+                    # A unidade de trabalho desfaz o pedido criado acima
                     return resultado_itens
             
             # Atualizar total
@@ -82,6 +89,7 @@ class PedidoCompraService:
                 'message': f'Erro ao criar pedido de compra: {str(e)}'
             }
     
+    @transacional
     def adicionar_itens(self, id_pedido_compra, itens):
         """
         Adiciona múltiplos itens a um pedido de compra.
@@ -187,6 +195,7 @@ class PedidoCompraService:
                 'message': f'Erro ao adicionar itens: {str(e)}'
             }
     
+    @transacional
     def atualizar_status(self, id_pedido_compra, novo_status):
         """
         Atualiza o status de um pedido de compra.
@@ -250,6 +259,7 @@ class PedidoCompraService:
                 'message': f'Erro ao atualizar status: {str(e)}'
             }
     
+    @transacional
     def receber_pedido(self, id_pedido_compra):
         """
         Marca pedido como recebido e atualiza estoque.
@@ -310,6 +320,7 @@ class PedidoCompraService:
                 'message': f'Erro ao receber pedido: {str(e)}'
             }
     
+    @transacional
     def cancelar_pedido(self, id_pedido_compra):
         """
         Cancela um pedido de compra.
@@ -341,17 +352,31 @@ class PedidoCompraService:
                 'message': f'Erro ao cancelar pedido: {str(e)}'
             }
     
-    def listar_pedidos(self, status=None):
+    def campos_listagem(self):
+        """Campos aceitos em ?fields= na listagem de pedidos"""
+        return list(self.pedido_dao.COLUNAS_LISTAGEM)
+    
+    def listar_pedidos(self, status=None, campos=None, incluir_itens=False):
         """
         Lista pedidos de compra.
         
         Args:
             status (str, optional): Filtrar por status
+            campos (list, optional): Campos a retornar (None = todos)
+            incluir_itens (bool): Embute os itens de cada pedido (?include=itens)
         
         Returns:
             list: Lista de pedidos
         """
-        return self.pedido_dao.listar_todos(status)
+        pedidos = self.pedido_dao.listar_todos(status, campos)
+        if not pedidos or not incluir_itens:
+            return pedidos
+        
+        # Itens de todos os pedidos em uma consulta, em vez de uma por pedido
+        itens = self.item_dao.listar_por_pedidos([p['id_pedido_compra'] for p in pedidos])
+        for pedido in pedidos:
+            pedido['itens'] = itens.get(pedido['id_pedido_compra'], [])
+        return pedidos
     
     def buscar_pedido(self, id_pedido_compra):
         """
@@ -3,11 +3,14 @@ PedidoVendaService - Serviço de Pedidos de Venda
 Lógica de negócio para operações com pedidos de venda (saída de estoque).
 """
 
+from .unidade_de_trabalho import transacional, resolver_unidade_de_trabalho
+
 
 class PedidoVendaService:
     """Serviço de lógica de negócio para pedidos de venda"""
     
-    def __init__(self, pedido_venda_dao, item_pedido_venda_dao, cliente_dao, produto_dao):
+    def __init__(self, pedido_venda_dao, item_pedido_venda_dao, cliente_dao, produto_dao,
+                 unidade_de_trabalho=None):
         """
         Inicializa o serviço.
         
@@ -16,12 +19,17 @@ class PedidoVendaService:
             item_pedido_venda_dao: Instância de ItemPedidoVendaDAO
             cliente_dao: Instância de ClienteDAO
             produto_dao: Instância de ProdutoDAO
+            unidade_de_trabalho: Context manager de unidade de trabalho do backend
+                (ex: backend.unidade_de_trabalho); os fluxos de
+                escrita rodam em uma única conexão e transação
         """
         self.pedido_dao = pedido_venda_dao
         self.item_dao = item_pedido_venda_dao
         self.cliente_dao = cliente_dao
         self.produto_dao = produto_dao
+        self.unidade_de_trabalho = resolver_unidade_de_trabalho(unidade_de_trabalho)
     
+    @transacional
     def criar_pedido_venda(self, id_cliente, id_funcionario, itens=None):
         """
         Cria um novo pedido de venda com itens.
@@ -60,8 +68,7 @@ class PedidoVendaService:
             if itens:
                 resultado_itens = self.adicionar_itens(id_pedido, itens)
                 if not resultado_itens['success']:
-                    # Se falhar ao adicionar itens, deletar pedido
-                    self.pedido_dao.deletar(id_pedido)
+                    # A unidade de trabalho desfaz o pedido criado acima
                     return resultado_itens
             
             # Atualizar total
@@ -82,6 +89,7 @@ class PedidoVendaService:
                 'message': f'Erro ao criar pedido de venda: {str(e)}'
             }
     
+    @transacional
     def adicionar_itens(self, id_pedido_venda, itens):
         """
         Adiciona múltiplos itens a um pedido de venda.
@@ -201,6 +209,7 @@ class PedidoVendaService:
                 'message': f'Erro ao adicionar itens: {str(e)}'
             }
     
+    @transacional
     def atualizar_status(self, id_pedido_venda, novo_status):
         """
         Atualiza o status de um pedido de venda.
@@ -264,6 +273,7 @@ class PedidoVendaService:
                 'message': f'Erro ao atualizar status: {str(e)}'
             }
     
+    @transacional
     def confirmar_pedido(self, id_pedido_venda):
         """
         Confirma pedido e deduz estoque.
@@ -333,6 +343,7 @@ class PedidoVendaService:
                 'message': f'Erro ao confirmar pedido: {str(e)}'
             }
     
+    @transacional
     def cancelar_pedido(self, id_pedido_venda, devolver_estoque=True):
         """
         Cancela um pedido de venda.
@@ -433,17 +444,62 @@ class PedidoVendaService:
                 'message': f'Erro ao calcular lucro: {str(e)}'
             }
     
-    def listar_pedidos(self, status=None):
+    def campos_listagem(self):
+        """Campos aceitos em ?fields= na listagem de pedidos"""
+        return list(self.pedido_dao.COLUNAS_LISTAGEM)
+    
+    def listar_pedidos(self, status=None, campos=None, incluir_itens=False):
         """
         Lista pedidos de venda.
         
         Args:
             status (str, optional): Filtrar por status
+            campos (list, optional): Campos a retornar (None = todos)
+            incluir_itens (bool): Embute os itens de cada pedido (?include=itens)
         
         Returns:
             list: Lista de pedidos
         """
-        return self.pedido_dao.listar_todos(status)
+        pedidos = self.pedido_dao.listar_todos(status, campos)
+        if not pedidos or not incluir_itens:
+            return pedidos
+        
+        # Itens carregados em lote (IN), em vez de uma consulta por pedido
+        return self._anexar_itens(pedidos)
+    
+    def iterar_pedidos(self, status=None, campos=None, incluir_itens=False):
+        """
+        Gera os pedidos de venda um a um, sem carregar a lista inteira (?stream=true).
+        
+        Args:
+            status (str, optional): Filtrar por status
+            campos (list, optional): Campos a retornar (None = todos)
+            incluir_itens (bool): Embute os itens (carregados a cada LOTE_IN pedidos)
+        
+        Yields:
+            dict: Pedido
+        """
+        pedidos = self.pedido_dao.iterar_todos(status, campos)
+        if not incluir_itens:
+            yield from pedidos
+            return
+        
+        lote = []
+        for pedido in pedidos:
+            lote.append(pedido)
+            if len(lote) >= self.item_dao.LOTE_IN:
+                yield from self._anexar_itens(lote)
+                lote = []
+        yield from self._anexar_itens(lote)
+    
+    def _anexar_itens(self, pedidos):
+        """Embute os itens de um lote de pedidos (uma consulta para o lote)"""
+        if not pedidos:
+            return pedidos
+        itens = self.item_dao.listar_por_pedidos([p['id_pedido_venda'] for p in pedidos])
+        for pedido in pedidos:
+            pedido['itens'] = itens.get(pedido['id_pedido_venda'], [])
+        return pedidos
     
     def buscar_pedido(self, id_pedido_venda):
         """
@@ -3,9 +3,18 @@ ProdutoService - Serviço de Produtos
 Responsável pela lógica de negócio de produtos, incluindo validações e processamento de imagens.
 """
 
+import io
 import os
+import re
+import json
+import math
 import uuid
-from PIL import Image
+import base64
+import hashlib
+import unicodedata
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageOps, features
 
 # Configuração de resoluções de imagem
 IMAGE_RESOLUTIONS = {
@@ -14,6 +23,48 @@ IMAGE_RESOLUTIONS = {
     'large': (800, 800)
 }
 
+# Diretório das variantes: {hash}_{resolução}.{formato} (conteúdo endereçado pelo SHA-256 do upload)
+IMAGENS_PRODUTOS_DIR = 'static/images/produtos'
+
+# Formatos gravados para cada resolução, em ordem de preferência na negociação (Accept)
+FORMATOS_IMAGEM = {
+    'avif': {'formato': 'AVIF', 'mimetype': 'image/avif', 'opcoes': {'quality': 60, 'speed': 8}},
+    'webp': {'formato': 'WEBP', 'mimetype': 'image/webp', 'opcoes': {'quality': 80, 'method': 4}},
+    'png': {'formato': 'PNG', 'mimetype': 'image/png', 'opcoes': {'optimize': True}}
+}
+
+# AVIF/WebP só quando o Pillow instalado suporta (PNG sempre, compatível com URLs antigas)
+FORMATOS_DISPONIVEIS = [
+    extensao for extensao in FORMATOS_IMAGEM
+    if extensao == 'png' or (extensao in features.modules and features.check_module(extensao))
+]
+
+# Redimensionamento sob demanda (GET /api/produtos/<id>/imagem): derivado do PNG "large",
+# com dimensões arredondadas para cima em passos de IMAGEM_DIMENSAO_PASSO (limita as variantes)
+IMAGEM_MASTER_RESOLUCAO = 'large'
+IMAGEM_DIMENSAO_MINIMA = 16
+IMAGEM_DIMENSAO_PASSO = 10
+
+# Paginação da listagem de produtos
+PAGINACAO_LIMITE_PADRAO = 20
+PAGINACAO_LIMITE_MAXIMO = 100
+ORDENACOES_PERMITIDAS = ('nome', 'preco_venda', 'estoque_atual')
+
+# Campos aceitos em ?fields= (os de imagem são derivados de id_produto/nome_imagem)
+CAMPOS_IMAGEM = ('imagens', 'imagens_negociadas', 'formatos_imagem')
+CAMPOS_PRODUTO = (
+    'id_produto', 'nome', 'descricao', 'sku', 'preco_venda', 'preco_custo_medio',
+    'estoque_atual', 'nome_imagem', 'versao'
+) + CAMPOS_IMAGEM
+
+# Ajuste em massa de preço/estoque (POST /api/produtos/bulk)
+AJUSTE_MAX_PRODUTOS = 5000
+AJUSTE_PERCENTUAL_MAXIMO = 1000
+
+# Busca full-text
+BUSCA_MAX_TERMOS = 8
+_PADRAO_TERMO = re.compile(r'[a-z0-9]+')
+
 # Verificar compatibilidade da versão do Pillow
 try:
     RESAMPLE_FILTER = Image.Resampling.LANCZOS
@@ -21,6 +72,43 @@ except AttributeError:
     # Pillow < 10.0
     RESAMPLE_FILTER = Image.LANCZOS
 
+# Resoluções da maior para a menor: cada nível é derivado do anterior
+_RESOLUCOES_DECRESCENTES = sorted(
+    IMAGE_RESOLUTIONS.items(), key=lambda item: item[1][0] * item[1][1], reverse=True
+)
+
+# Threads para codificar as variantes em paralelo (o encoder do Pillow libera o GIL)
+_executor_codificacao = ThreadPoolExecutor(
+    max_workers=len(IMAGE_RESOLUTIONS) + 1, thread_name_prefix='imagem-codificacao'
+)
+
+
+def _valor_cursor_valido(ordenar_por, valor):
+    """Confere o tipo do valor do cursor com a coluna de ordenação (ver codificar_cursor)"""
+    if ordenar_por == 'nome':
+        return isinstance(valor, str)
+    if ordenar_por == 'estoque_atual':
+        return isinstance(valor, int) and not isinstance(valor, bool)
+    # preco_venda: texto do Decimal/float (ou número)
+    if isinstance(valor, bool) or not isinstance(valor, (str, int, float)):
+        return False
+    try:
+        return math.isfinite(float(valor))
+    except ValueError:
+        return False
+
+
+def _gravar_atomico(imagem, caminho, formato, opcoes):
+    """Grava a imagem em arquivo temporário e renomeia para o destino final"""
+    temporario = f"{caminho}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        imagem.save(temporario, formato, **opcoes)
+        os.replace(temporario, caminho)
+    except Exception:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
 
 class ProdutoService:
     """Serviço de produtos com validações e processamento de imagens"""
@@ -124,7 +212,309 @@ class ProdutoService:
             return {'valido': False, 'mensagem': 'Nome deve ter no máximo 200 caracteres'}
         
         return {'valido': True, 'mensagem': 'Nome válido'}
+
+    @staticmethod
+    def normalizar_texto(texto):
+        """
+        Normaliza texto para busca: remove acentos (ç→c, ã→a...) e converte para minúsculas.
+
+        Args:
+            texto (str): Texto original
+
+        Returns:
+            str: Texto normalizado
+        """
+        if not texto:
+            return ''
+        decomposto = unicodedata.normalize('NFKD', texto)
+        sem_acento = ''.join(c for c in decomposto if not unicodedata.combining(c))
+        return sem_acento.lower()
+
+    @staticmethod
+    def extrair_termos(texto):
+        """
+        Quebra o texto em termos de busca normalizados (apenas letras e dígitos).
+
+        Args:
+            texto (str): Texto digitado pelo usuário
+
+        Returns:
+            list: Termos únicos, na ordem em que aparecem
+        """
+        termos = _PADRAO_TERMO.findall(ProdutoService.normalizar_texto(texto))
+        return list(dict.fromkeys(termos))
+
+    @staticmethod
+    def buscar_produtos(produto_dao, q, limite=None, offset=None, campos=None, request_host=None):
+        """
+        Busca full-text nos produtos (nome, descrição e SKU), sem acento e em qualquer ordem,
+        com resultados ordenados por relevância.
+
+        Args:
+            produto_dao: Instância de ProdutoDAO
+            q (str): Texto da busca (ex: "carburador brosol")
+            limite (int, optional): Tamanho da página (padrão 20, máximo 100)
+            offset (int, optional): Deslocamento (padrão 0)
+            campos (list, optional): Projeção de ?fields= (já validada)
+            request_host (str, optional): Host da requisição para URLs completas
+
+        Returns:
+            dict: {'success': True, 'produtos': list, 'next_offset': int|None, 'limit': int}
+                  ou {'success': False, 'message': str}
+        """
+        termos = ProdutoService.extrair_termos(q)
+        if not termos:
+            return {'success': False, 'message': 'Parâmetro "q" é obrigatório'}
+        termos = termos[:BUSCA_MAX_TERMOS]
+
+        try:
+            limite = int(limite) if limite not in (None, '') else PAGINACAO_LIMITE_PADRAO
+            offset = int(offset) if offset not in (None, '') else 0
+        except (ValueError, TypeError):
+            return {'success': False, 'message': 'Parâmetros "limit" e "offset" devem ser números inteiros'}
+        if limite < 1 or limite > PAGINACAO_LIMITE_MAXIMO:
+            return {'success': False, 'message': f'Parâmetro "limit" deve estar entre 1 e {PAGINACAO_LIMITE_MAXIMO}'}
+        if offset < 0:
+            return {'success': False, 'message': 'Parâmetro "offset" não pode ser negativo'}
+
+        # Buscar uma linha a mais para saber se existe próxima página
+        produtos = produto_dao.buscar_texto(termos, limite + 1, offset)
+
+        next_offset = None
+        if len(produtos) > limite:
+            produtos = produtos[:limite]
+            next_offset = offset + limite
+
+        produtos_saida = ProdutoService.preparar_listagem(produtos, campos, request_host)
+        if campos is not None:
+            # A relevância acompanha a busca mesmo com projeção
+            for saida, produto in zip(produtos_saida, produtos):
+                saida['relevancia'] = produto['relevancia']
+
+        return {
+            'success': True,
+            'produtos': produtos_saida,
+            'next_offset': next_offset,
+            'limit': limite
+        }
+
+    @staticmethod
+    def codificar_cursor(ordenar_por, ordem, produto):
+        """
+        Gera o cursor opaco que aponta para a posição após o produto informado.
+
+        Args:
+            ordenar_por (str): Coluna de ordenação
+            ordem (str): 'asc' ou 'desc'
+            produto (dict): Última linha da página atual
+
+        Returns:
+            str: Cursor em base64 (url-safe)
+        """
+        valor = produto[ordenar_por]
+        if ordenar_por == 'preco_venda':
+            valor = str(valor)  # Decimal (MySQL) / float (SQLite)
+
+        payload = json.dumps(
+            {'o': ordenar_por, 'd': ordem, 'v': valor, 'id': produto['id_produto']},
+            separators=(',', ':')
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decodificar_cursor(cursor):
+        """
+        Decodifica um cursor gerado por codificar_cursor.
+
+        Args:
+            cursor (str): Cursor opaco recebido do cliente
+
+        Returns:
+            dict: {'o': str, 'd': str, 'v': valor, 'id': int} ou None se inválido
+        """
+        try:
+            padding = '=' * (-len(cursor) % 4)
+            dados = json.loads(base64.urlsafe_b64decode(cursor + padding))
+            if not isinstance(dados, dict):
+                return None
+            if dados.get('o') not in ORDENACOES_PERMITIDAS or dados.get('d') not in ('asc', 'desc'):
+                return None
+            if not isinstance(dados.get('id'), int) or isinstance(dados['id'], bool):
+                return None
+            if not _valor_cursor_valido(dados['o'], dados.get('v')):
+                return None
+            return dados
+        except (ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def colunas_projecao(campos, extras=()):
+        """
+        Colunas a selecionar no banco para uma projeção de ?fields=.
+        
+        Args:
+            campos (list): Campos pedidos (None = todos)
+            extras (iterable): Colunas usadas internamente (ex: coluna do cursor)
+        
+        Returns:
+            list: Colunas do DAO ou None (todas)
+        """
+        if campos is None:
+            return None
+        
+        colunas = ['id_produto']
+        if any(campo in CAMPOS_IMAGEM for campo in campos):
+            colunas.append('nome_imagem')
+        for campo in list(campos) + list(extras):
+            if campo not in CAMPOS_IMAGEM and campo not in colunas:
+                colunas.append(campo)
+        return colunas
+    
+    @staticmethod
+    def preparar_listagem(produtos, campos=None, request_host=None):
+        """
+        Monta as URLs de imagem e aplica a projeção de ?fields= nas linhas do DAO.
+        As URLs só são geradas quando algum campo de imagem foi pedido.
+        
+        Args:
+            produtos (list): Linhas retornadas pelo DAO
+            campos (list, optional): Campos pedidos (None = todos)
+            request_host (str, optional): Host da requisição para URLs completas
+        
+        Returns:
+            list: Produtos prontos para a resposta
+        """
+        if campos is None:
+            return [ProdutoService.process_product_images(p, request_host) for p in produtos]
+        
+        if any(campo in CAMPOS_IMAGEM for campo in campos):
+            produtos = [ProdutoService.process_product_images(p, request_host) for p in produtos]
+        return [{campo: p[campo] for campo in campos if campo in p} for p in produtos]
     
+    @staticmethod
+    def listar_produtos(produto_dao, campos=None, request_host=None):
+        """
+        Lista todos os produtos (sem paginação).
+        
+        Args:
+            produto_dao: Instância de ProdutoDAO
+            campos (list, optional): Projeção de ?fields= (já validada)
+            request_host (str, optional): Host da requisição para URLs completas
+        
+        Returns:
+            dict: {'success': True, 'produtos': list}
+        """
+        produtos = produto_dao.listar_todos(ProdutoService.colunas_projecao(campos))
+        return {
+            'success': True,
+            'produtos': ProdutoService.preparar_listagem(produtos, campos, request_host)
+        }
+    
+    @staticmethod
+    def iterar_produtos(produto_dao, campos=None, request_host=None):
+        """
+        Gera os produtos prontos para a resposta, um a um (listagem em streaming).
+        
+        Args:
+            produto_dao: Instância de ProdutoDAO
+            campos (list, optional): Projeção de ?fields= (já validada)
+            request_host (str, optional): Host da requisição para URLs completas
+        
+        Yields:
+            dict: Produto com URLs de imagem (e apenas os campos pedidos)
+        """
+        for produto in produto_dao.iterar_produtos(ProdutoService.colunas_projecao(campos)):
+            yield from ProdutoService.preparar_listagem([produto], campos, request_host)
+    
+    @staticmethod
+    def listar_produtos_paginado(produto_dao, limite=None, cursor=None, ordenar_por=None, ordem=None,
+                                 preco_min=None, preco_max=None, estoque_min=None, estoque_max=None,
+                                 campos=None, request_host=None):
+        """
+        Lista produtos com paginação por cursor, ordenação e filtros de faixa.
+
+        Args:
+            produto_dao: Instância de ProdutoDAO
+            limite (int, optional): Tamanho da página (padrão 20, máximo 100)
+            cursor (str, optional): next_cursor retornado pela página anterior
+            ordenar_por (str, optional): 'nome', 'preco_venda' ou 'estoque_atual'
+            ordem (str, optional): 'asc' ou 'desc'
+            preco_min, preco_max, estoque_min, estoque_max (optional): Filtros de faixa
+            campos (list, optional): Projeção de ?fields= (já validada)
+            request_host (str, optional): Host da requisição para URLs completas
+
+        Returns:
+            dict: {'success': True, 'produtos': list, 'next_cursor': str|None, 'limit': int}
+                  ou {'success': False, 'message': str}
+        """
+        # Validar limite
+        if limite is None:
+            limite = PAGINACAO_LIMITE_PADRAO
+        try:
+            limite = int(limite)
+        except (ValueError, TypeError):
+            return {'success': False, 'message': 'Parâmetro "limit" deve ser um número inteiro'}
+        if limite < 1 or limite > PAGINACAO_LIMITE_MAXIMO:
+            return {'success': False, 'message': f'Parâmetro "limit" deve estar entre 1 e {PAGINACAO_LIMITE_MAXIMO}'}
+
+        # Validar faixas
+        filtros = {}
+        for nome, valor, validar, chave in (
+            ('preco_min', preco_min, ProdutoService.validar_preco, 'preco'),
+            ('preco_max', preco_max, ProdutoService.validar_preco, 'preco'),
+            ('estoque_min', estoque_min, ProdutoService.validar_estoque, 'estoque'),
+            ('estoque_max', estoque_max, ProdutoService.validar_estoque, 'estoque'),
+        ):
+            if valor is None or valor == '':
+                filtros[nome] = None
+                continue
+            validacao = validar(valor)
+            if not validacao['valido']:
+                return {'success': False, 'message': f'{nome}: {validacao["mensagem"]}'}
+            filtros[nome] = validacao[chave]
+
+        # Cursor define ordenação; parâmetros explícitos precisam ser coerentes com ele
+        apos = None
+        if cursor:
+            dados_cursor = ProdutoService.decodificar_cursor(cursor)
+            if not dados_cursor:
+                return {'success': False, 'message': 'Cursor inválido'}
+            if (ordenar_por and ordenar_por != dados_cursor['o']) or (ordem and ordem != dados_cursor['d']):
+                return {'success': False, 'message': 'Cursor não corresponde à ordenação solicitada'}
+            ordenar_por = dados_cursor['o']
+            ordem = dados_cursor['d']
+            apos = (dados_cursor['v'], dados_cursor['id'])
+
+        ordenar_por = ordenar_por or 'nome'
+        ordem = (ordem or 'asc').lower()
+
+        if ordenar_por not in ORDENACOES_PERMITIDAS:
+            return {'success': False, 'message': f'Ordenação inválida. Use: {", ".join(ORDENACOES_PERMITIDAS)}'}
+        if ordem not in ('asc', 'desc'):
+            return {'success': False, 'message': 'Ordem inválida. Use: asc, desc'}
+
+        # Buscar uma linha a mais para saber se existe próxima página
+        produtos = produto_dao.listar_paginado(
+            limite + 1,
+            ordenar_por=ordenar_por,
+            ordem=ordem,
+            apos=apos,
+            campos=ProdutoService.colunas_projecao(campos, extras=(ordenar_por,)),
+            **filtros
+        )
+
+        next_cursor = None
+        if len(produtos) > limite:
+            produtos = produtos[:limite]
+            next_cursor = ProdutoService.codificar_cursor(ordenar_por, ordem, produtos[-1])
+
+        return {
+            'success': True,
+            'produtos': ProdutoService.preparar_listagem(produtos, campos, request_host),
+            'next_cursor': next_cursor,
+            'limit': limite
+        }
+
     @staticmethod
     def criar_produto(produto_dao, nome, preco, estoque, descricao=None, sku=None, imagem=None, request_host=None):
         """
@@ -137,11 +527,12 @@ class ProdutoService:
             estoque (int): Quantidade em estoque
             descricao (str, optional): Descrição do produto
             sku (str, optional): SKU do produto (gerado automaticamente se não fornecido)
-            imagem (FileStorage, optional): Arquivo de imagem do produto
+            imagem (FileStorage, optional): Arquivo de imagem do produto (processado em segundo plano)
             request_host (str, optional): Host da requisição para URLs completas
         
         Returns:
-            dict: {'success': True, 'produto': dict} ou {'success': False, 'message': str}
+            dict: {'success': True, 'produto': dict, 'imagem_job': dict (se houver imagem)}
+                  ou {'success': False, 'message': str}
         """
         # Validar nome
         validacao_nome = ProdutoService.validar_nome(nome)
@@ -158,19 +549,31 @@ class ProdutoService:
         if not validacao_estoque['valido']:
             return {'success': False, 'message': validacao_estoque['mensagem']}
         
+        # Validar imagem antes de criar o produto (o processamento é feito em segundo plano)
+        if imagem:
+            from .imagem_worker import ImagemWorker
+            validacao_imagem = ImagemWorker.validar_upload(imagem)
+            if not validacao_imagem['valido']:
+                resultado = {'success': False, 'message': validacao_imagem['mensagem']}
+                if validacao_imagem.get('fila_cheia'):
+                    resultado['fila_cheia'] = True
+                return resultado
+        
         # Gerar SKU se não fornecido
         if not sku:
             sku = f"SKU-{uuid.uuid4().hex[:8].upper()}"
         
-        # Criar produto sem imagem primeiro (para obter ID)
+        # Nome da imagem reservado antes do INSERT (hash do upload): a linha é gravada uma vez só
+        nome_imagem = ProdutoService.nome_imagem_upload(imagem) if imagem else None
+        
         produto_data = {
             'nome': nome.strip(),
             'descricao': descricao.strip() if descricao else '',
             'sku': sku,
             'preco_venda': validacao_preco['preco'],
-            'preco_custo_medio': validacao_preco['preco'] * 0.7,  # Estimativa: 70% do preço de venda
+            'preco_custo_medio': round(validacao_preco['preco'] * 0.7, 2),  # Estimativa: 70% do preço de venda
             'estoque_atual': validacao_estoque['estoque'],
-            'nome_imagem': None  # Será atualizado após processar imagem
+            'nome_imagem': nome_imagem
         }
         
         produto_criado = produto_dao.criar_produto(produto_data)
@@ -178,39 +581,37 @@ class ProdutoService:
         if not produto_criado:
             return {'success': False, 'message': 'Erro ao criar produto no banco de dados'}
         
-        # Processar imagem se fornecida
-        if imagem:
-            resultado_imagem = ProdutoService.processar_e_salvar_imagem(
-                imagem, 
-                produto_criado['id_produto']
-            )
-            
-            if resultado_imagem['success']:
-                # Atualizar produto com nome da imagem
-                produto_criado['nome_imagem'] = resultado_imagem['nome_imagem']
-                
-                # Atualizar no banco
-                produto_dao.atualizar_produto(
-                    produto_criado['id_produto'],
-                    produto_criado['nome'],
-                    produto_criado['descricao'],
-                    produto_criado['sku'],
-                    produto_criado['preco_venda'],
-                    produto_criado['preco_custo_medio'],
-                    produto_criado['estoque_atual'],
-                    resultado_imagem['nome_imagem']
-                )
-                
-                produto_criado = produto_dao.buscar_por_id(produto_criado['id_produto'])
+        # Imagem nova: o worker gera as resoluções com o nome já gravado no produto.
+        # Mesmo conteúdo já em disco (outro produto usa a foto): nada a processar.
+        job = None
+        if imagem and not ProdutoService.imagem_existe(nome_imagem):
+            job = ImagemWorker.enfileirar(imagem, produto_criado['id_produto'], nome_imagem, produto_dao)
+            if not job['success']:
+                produto_dao.atualizar_nome_imagem(produto_criado['id_produto'], None)
+                produto_criado['nome_imagem'] = None
+        
+        # Atualizar índice de autocomplete (em memória)
+        from .autocomplete_service import AutocompleteService
+        AutocompleteService.atualizar_produto(produto_criado)
         
         # Processar URLs de imagem com host da requisição
         produto_processado = ProdutoService.process_product_images(produto_criado, request_host)
         
-        return {
+        resultado = {
             'success': True,
             'message': 'Produto criado com sucesso',
             'produto': produto_processado
         }
+        
+        if job and job['success']:
+            resultado['message'] = 'Produto criado com sucesso. Imagem em processamento'
+            resultado['imagem_job'] = job['job']
+        elif job:
+            resultado['message'] = f"Produto criado, mas a imagem não foi processada: {job['message']}"
+        elif imagem:
+            resultado['message'] = 'Produto criado com sucesso. Imagem já existente reaproveitada'
+        
+        return resultado
     
     @staticmethod
     def atualizar_produto(produto_dao, id_produto, request_host=None, **kwargs):
@@ -274,6 +675,14 @@ class ProdutoService:
             if not produto_atualizado:
                 return {'success': False, 'message': 'Erro ao atualizar produto no banco de dados'}
             
+            # Imagem trocada: remove a anterior se nenhum outro produto a usa
+            if produto.get('nome_imagem') != produto_atualizado.get('nome_imagem'):
+                ProdutoService.liberar_imagem(produto_dao, produto.get('nome_imagem'))
+            
+            # Atualizar índice de autocomplete (em memória)
+            from .autocomplete_service import AutocompleteService
+            AutocompleteService.atualizar_produto(produto_atualizado)
+            
             # Processar URLs de imagem com host da requisição
             produto_processado = ProdutoService.process_product_images(produto_atualizado, request_host)
             
@@ -288,90 +697,414 @@ class ProdutoService:
             traceback.print_exc()
             return {'success': False, 'message': f'Erro ao processar atualização: {str(e)}'}
     
+    @staticmethod
+    def atualizar_produto_parcial(produto_dao, id_produto, dados, request_host=None):
+        """
+        Atualização parcial (PATCH): grava apenas os campos enviados, com controle de
+        concorrência otimista pelo campo "versao" do produto.
+        
+        Args:
+            produto_dao: Instância de ProdutoDAO
+            id_produto (int): ID do produto
+            dados (dict): Campos a alterar (nome, descricao, sku, preco, preco_custo, estoque)
+                          e "versao" (a versão lida pelo cliente, obrigatória)
+            request_host (str, optional): Host da requisição para URLs completas
+        
+        Returns:
+            dict: {'success': True, 'produto': dict} ou {'success': False, 'message': str}
+                  (com 'conflito': True e 'versao_atual' quando o produto mudou desde a leitura)
+        """
+        dados = dict(dados)
+        versao = ProdutoService._inteiro(dados.pop('versao', None))
+        if versao is None or versao < 1:
+            return {'success': False, 'message': 'Informe a versão do produto (campo "versao")'}
+        
+        # Nome do campo na API -> coluna (os nomes das colunas também são aceitos)
+        aliases = {
+            'preco': 'preco_venda',
+            'estoque': 'estoque_atual',
+            'preco_custo': 'preco_custo_medio'
+        }
+        campos = {}
+        for campo, valor in dados.items():
+            coluna = aliases.get(campo, campo)
+            if coluna not in produto_dao.COLUNAS_ATUALIZAVEIS:
+                return {'success': False, 'message': f'Campo não pode ser alterado: {campo}'}
+            campos[coluna] = valor
+        
+        if not campos:
+            return {'success': False, 'message': 'Nenhum campo para atualizar'}
+        
+        if 'nome' in campos:
+            validacao = ProdutoService.validar_nome(campos['nome'])
+            if not validacao['valido']:
+                return {'success': False, 'message': validacao['mensagem']}
+            campos['nome'] = campos['nome'].strip()
+        
+        if 'preco_venda' in campos:
+            validacao = ProdutoService.validar_preco(campos['preco_venda'])
+            if not validacao['valido']:
+                return {'success': False, 'message': validacao['mensagem']}
+            campos['preco_venda'] = validacao['preco']
+        
+        if 'preco_custo_medio' in campos:
+            validacao = ProdutoService.validar_preco(campos['preco_custo_medio'])
+            if not validacao['valido']:
+                return {'success': False, 'message': f"Preço de custo: {validacao['mensagem']}"}
+            campos['preco_custo_medio'] = validacao['preco']
+        
+        if 'estoque_atual' in campos:
+            validacao = ProdutoService.validar_estoque(campos['estoque_atual'])
+            if not validacao['valido']:
+                return {'success': False, 'message': validacao['mensagem']}
+            campos['estoque_atual'] = validacao['estoque']
+        
+        if 'sku' in campos:
+            sku = str(campos['sku'] or '').strip()
+            if not sku or len(sku) > 100:
+                return {'success': False, 'message': 'SKU deve ter entre 1 e 100 caracteres'}
+            campos['sku'] = sku
+        
+        if 'descricao' in campos:
+            campos['descricao'] = str(campos['descricao'] or '').strip()
+        
+        produto, versao_atual = produto_dao.atualizar_parcial(id_produto, campos, versao)
+        
+        if produto is None and versao_atual is None:
+            return {'success': False, 'message': 'Produto não encontrado'}
+        if produto is None:
+            return {
+                'success': False,
+                'conflito': True,
+                'versao_atual': versao_atual,
+                'message': f'Produto alterado por outra requisição (versão atual: {versao_atual}). Recarregue e tente novamente'
+            }
+        
+        # Nome/SKU mudaram: atualizar índice de autocomplete (em memória)
+        if 'nome' in campos or 'sku' in campos:
+            from .autocomplete_service import AutocompleteService
+            AutocompleteService.atualizar_produto(produto)
+        
+        return {
+            'success': True,
+            'message': 'Produto atualizado com sucesso',
+            'produto': ProdutoService.process_product_images(produto, request_host)
+        }
+    
+    @staticmethod
+    def _inteiro(valor):
+        """Retorna o valor como int, ou None se não for um inteiro (bool não conta)"""
+        if isinstance(valor, bool):
+            return None
+        if isinstance(valor, int):
+            return valor
+        if isinstance(valor, str) and valor.strip().lstrip('+-').isdigit():
+            return int(valor)
+        return None
+    
+    @staticmethod
+    def validar_ajustes(itens):
+        """
+        Valida a lista de ajustes por produto do POST /api/produtos/bulk.
+        
+        Args:
+            itens (list): [{'id_produto', 'preco_venda'?, 'estoque_atual'?, 'delta_estoque'?}]
+        
+        Returns:
+            dict: {'valido': bool, 'mensagem': str, 'ajustes': list}
+        """
+        if not isinstance(itens, list) or not itens:
+            return {'valido': False, 'mensagem': 'Informe uma lista de produtos não vazia'}
+        if len(itens) > AJUSTE_MAX_PRODUTOS:
+            return {'valido': False, 'mensagem': f'Máximo de {AJUSTE_MAX_PRODUTOS} produtos por requisição'}
+        
+        ajustes = []
+        vistos = set()
+        for indice, item in enumerate(itens, start=1):
+            if not isinstance(item, dict):
+                return {'valido': False, 'mensagem': f'Item {indice}: deve ser um objeto'}
+            
+            id_produto = ProdutoService._inteiro(item.get('id_produto'))
+            if id_produto is None or id_produto <= 0:
+                return {'valido': False, 'mensagem': f'Item {indice}: id_produto inválido'}
+            if id_produto in vistos:
+                return {'valido': False, 'mensagem': f'Item {indice}: produto {id_produto} repetido na lista'}
+            vistos.add(id_produto)
+            
+            ajuste = {'id_produto': id_produto}
+            if item.get('preco_venda') is not None:
+                validacao = ProdutoService.validar_preco(item['preco_venda'])
+                if not validacao['valido']:
+                    return {'valido': False, 'mensagem': f"Item {indice}: {validacao['mensagem']}"}
+                ajuste['preco_venda'] = validacao['preco']
+            
+            if item.get('estoque_atual') is not None and item.get('delta_estoque') is not None:
+                return {'valido': False, 'mensagem': f'Item {indice}: use estoque_atual ou delta_estoque, não ambos'}
+            
+            if item.get('estoque_atual') is not None:
+                validacao = ProdutoService.validar_estoque(item['estoque_atual'])
+                if not validacao['valido']:
+                    return {'valido': False, 'mensagem': f"Item {indice}: {validacao['mensagem']}"}
+                ajuste['estoque_atual'] = validacao['estoque']
+            
+            if item.get('delta_estoque') is not None:
+                delta = ProdutoService._inteiro(item['delta_estoque'])
+                if delta is None:
+                    return {'valido': False, 'mensagem': f'Item {indice}: delta_estoque deve ser um número inteiro'}
+                ajuste['delta_estoque'] = delta
+            
+            if len(ajuste) == 1:
+                return {'valido': False, 'mensagem': f'Item {indice}: informe preco_venda, estoque_atual ou delta_estoque'}
+            ajustes.append(ajuste)
+        
+        return {'valido': True, 'mensagem': 'Ajustes válidos', 'ajustes': ajustes}
+    
+    @staticmethod
+    def validar_regra_ajuste(regra):
+        """
+        Valida a regra de ajuste do POST /api/produtos/bulk (ex: +8% onde sku LIKE 'BRO-%').
+        
+        Args:
+            regra (dict): {'sku': padrão LIKE, 'preco_percentual'?: número, 'delta_estoque'?: inteiro}
+        
+        Returns:
+            dict: {'valido': bool, 'mensagem': str, 'sku', 'fator_preco', 'delta_estoque'}
+        """
+        if not isinstance(regra, dict):
+            return {'valido': False, 'mensagem': 'Regra deve ser um objeto'}
+        
+        sku = regra.get('sku')
+        if not isinstance(sku, str) or not sku.strip():
+            return {'valido': False, 'mensagem': "Regra exige o filtro 'sku' (padrão LIKE, ex: 'BRO-%')"}
+        
+        fator_preco = None
+        if regra.get('preco_percentual') is not None:
+            try:
+                percentual = float(regra['preco_percentual'])
+            except (ValueError, TypeError):
+                return {'valido': False, 'mensagem': 'preco_percentual deve ser um número'}
+            if percentual <= -100 or percentual > AJUSTE_PERCENTUAL_MAXIMO:
+                return {'valido': False, 'mensagem': f'preco_percentual deve estar entre -100 e {AJUSTE_PERCENTUAL_MAXIMO}'}
+            fator_preco = 1 + percentual / 100
+        
+        delta_estoque = None
+        if regra.get('delta_estoque') is not None:
+            delta_estoque = ProdutoService._inteiro(regra['delta_estoque'])
+            if delta_estoque is None:
+                return {'valido': False, 'mensagem': 'delta_estoque deve ser um número inteiro'}
+        
+        if fator_preco is None and delta_estoque is None:
+            return {'valido': False, 'mensagem': 'Regra deve informar preco_percentual e/ou delta_estoque'}
+        
+        return {
+            'valido': True,
+            'mensagem': 'Regra válida',
+            'sku': sku.strip(),
+            'fator_preco': fator_preco,
+            'delta_estoque': delta_estoque
+        }
+    
+    @staticmethod
+    def ajustar_em_massa(produto_dao, dados, request_host=None):
+        """
+        Ajusta preço e/ou estoque de vários produtos em uma única transação, com
+        UPDATEs em conjunto no banco (sem ler e regravar produto a produto).
+        
+        Args:
+            produto_dao: Instância de ProdutoDAO
+            dados: Lista de ajustes (ou {'produtos': [...]}) ou {'regra': {...}}
+            request_host (str, optional): Host da requisição para URLs completas
+        
+        Returns:
+            dict: {'success': True, 'message', 'total', 'produtos', 'nao_encontrados'}
+                  ou {'success': False, 'message': str}
+        """
+        if isinstance(dados, dict) and 'regra' in dados:
+            validacao = ProdutoService.validar_regra_ajuste(dados['regra'])
+            if not validacao['valido']:
+                return {'success': False, 'message': validacao['mensagem']}
+            ids = None
+        else:
+            itens = dados.get('produtos') if isinstance(dados, dict) else dados
+            validacao = ProdutoService.validar_ajustes(itens)
+            if not validacao['valido']:
+                return {'success': False, 'message': validacao['mensagem']}
+            ids = [ajuste['id_produto'] for ajuste in validacao['ajustes']]
+        
+        try:
+            if ids is None:
+                produtos = produto_dao.ajustar_por_regra(
+                    validacao['sku'], validacao['fator_preco'], validacao['delta_estoque']
+                )
+            else:
+                produtos = produto_dao.ajustar_lote(validacao['ajustes'])
+        except ValueError as e:
+            # Limite violado: a transação foi desfeita, nenhum produto alterado
+            return {'success': False, 'message': str(e)}
+        
+        encontrados = {produto['id_produto'] for produto in produtos}
+        return {
+            'success': True,
+            'message': f'{len(produtos)} produto(s) ajustado(s)',
+            'total': len(produtos),
+            'produtos': ProdutoService.preparar_listagem(produtos, request_host=request_host),
+            'nao_encontrados': [id_produto for id_produto in ids if id_produto not in encontrados] if ids else []
+        }
+    
+    @staticmethod
+    def validar_arquivo_imagem(nome_arquivo):
+        """
+        Valida o nome/extensão do arquivo de imagem enviado.
+        
+        Args:
+            nome_arquivo (str): Nome do arquivo enviado
+        
+        Returns:
+            dict: {'valido': bool, 'mensagem': str, 'extensao': str}
+        """
+        extensoes_permitidas = {'png', 'jpg', 'jpeg'}
+        nome_arquivo = (nome_arquivo or '').lower()
+        
+        if not nome_arquivo or '.' not in nome_arquivo:
+            return {'valido': False, 'mensagem': 'Nome de arquivo inválido'}
+        
+        extensao = nome_arquivo.rsplit('.', 1)[1]
+        if extensao not in extensoes_permitidas:
+            return {
+                'valido': False,
+                'mensagem': f'Extensão não permitida. Use: {", ".join(extensoes_permitidas)}'
+            }
+        
+        return {'valido': True, 'mensagem': 'Arquivo válido', 'extensao': extensao}
+    
     @staticmethod
     def processar_e_salvar_imagem(imagem_file, produto_id):
         """
-        Processa e salva imagem em múltiplas resoluções.
-        Padrão de nome: Produto_{id}_{uuid}_{resolução}.png
+        Processa e salva imagem em múltiplas resoluções (de forma síncrona).
+        Padrão de nome: {sha256}_{resolução}.png
         
         Args:
             imagem_file (FileStorage): Arquivo de imagem do Flask
-            produto_id (int): ID do produto
+            produto_id (int): ID do produto (mantido por compatibilidade; o nome vem do conteúdo)
         
         Returns:
             dict: {'success': True, 'nome_imagem': str, 'paths': dict} ou {'success': False, 'message': str}
         """
+        validacao = ProdutoService.validar_arquivo_imagem(imagem_file.filename)
+        if not validacao['valido']:
+            return {'success': False, 'message': validacao['mensagem']}
+        
+        return ProdutoService.gerar_resolucoes_imagem(imagem_file.stream)
+    
+    @staticmethod
+    def caminhos_imagem(nome_imagem):
+        """
+        Lista os arquivos de todas as resoluções e formatos de uma imagem.
+        
+        Args:
+            nome_imagem (str): Nome base (hash do conteúdo)
+        
+        Returns:
+            list: Tuplas (resolução, extensão, Path)
+        """
+        base_dir = Path(IMAGENS_PRODUTOS_DIR)
+        return [
+            (resolucao, extensao, base_dir / f"{nome_imagem}_{resolucao}.{extensao}")
+            for resolucao in IMAGE_RESOLUTIONS
+            for extensao in FORMATOS_IMAGEM
+        ]
+    
+    @staticmethod
+    def imagem_existe(nome_imagem):
+        """Verifica se todas as variantes dos formatos disponíveis já estão em disco"""
+        return all(
+            caminho.is_file()
+            for _, extensao, caminho in ProdutoService.caminhos_imagem(nome_imagem)
+            if extensao in FORMATOS_DISPONIVEIS
+        )
+    
+    @staticmethod
+    def nome_imagem_upload(imagem_file):
+        """
+        Calcula o nome base da imagem (SHA-256 do arquivo enviado) sem consumir o upload,
+        o mesmo nome que gerar_resolucoes_imagem dará às variantes.
+        
+        Args:
+            imagem_file (FileStorage): Arquivo de imagem do Flask
+        
+        Returns:
+            str: Hash hexadecimal do conteúdo
+        """
+        stream = imagem_file.stream
+        inicio = stream.tell()
+        sha256 = hashlib.sha256()
+        for bloco in iter(lambda: stream.read(64 * 1024), b''):
+            sha256.update(bloco)
+        stream.seek(inicio)
+        return sha256.hexdigest()
+    
+    @staticmethod
+    def gerar_resolucoes_imagem(origem):
+        """
+        Gera e salva as resoluções de uma imagem já validada.
+        Usado pelo processamento síncrono e pelo worker de imagens.
+        
+        O nome das variantes é o SHA-256 do arquivo enviado: a mesma foto enviada de novo
+        (ou usada em vários produtos) é processada e armazenada uma única vez.
+        
+        A imagem é decodificada uma única vez já reduzida ao tamanho da maior resolução
+        (JPEG via draft), e as variantes são codificadas em paralelo.
+        
+        Args:
+            origem: Caminho do arquivo ou stream da imagem original
+        
+        Returns:
+            dict: {'success': True, 'nome_imagem': str, 'paths': dict (URLs PNG), 'reaproveitada': bool}
+                  ou {'success': False, 'message': str}
+        """
         try:
-            # Validar extensão do arquivo
-            extensoes_permitidas = {'png', 'jpg', 'jpeg'}
-            nome_arquivo = imagem_file.filename.lower()
+            if isinstance(origem, (str, Path)):
+                with open(origem, 'rb') as f:
+                    dados = f.read()
+            else:
+                dados = origem.read()
             
-            if not nome_arquivo or '.' not in nome_arquivo:
-                return {'success': False, 'message': 'Nome de arquivo inválido'}
+            # Nome base = hash do conteúdo
+            nome_base = hashlib.sha256(dados).hexdigest()
             
-            extensao = nome_arquivo.rsplit('.', 1)[1]
-            if extensao not in extensoes_permitidas:
-                return {
-                    'success': False, 
-                    'message': f'Extensão não permitida. Use: {", ".join(extensoes_permitidas)}'
-                }
+            Path(IMAGENS_PRODUTOS_DIR).mkdir(parents=True, exist_ok=True)
             
-            # Gerar UUID único para este conjunto de imagens
-            unique_id = uuid.uuid4().hex[:8]
-            
-            # Diretório de destino
-            from pathlib import Path
-            base_dir = Path('static/images/produtos')
-            base_dir.mkdir(parents=True, exist_ok=True)
+            paths = {
+                resolucao: f"/{IMAGENS_PRODUTOS_DIR}/{nome_base}_{resolucao}.png"
+                for resolucao in IMAGE_RESOLUTIONS
+            }
             
-            # Abrir imagem original
-            imagem = Image.open(imagem_file.stream)
+            # Mesmo conteúdo já processado: nada a decodificar
+            if ProdutoService.imagem_existe(nome_base):
+                return {
+                    'success': True,
+                    'nome_imagem': nome_base,
+                    'paths': paths,
+                    'reaproveitada': True
+                }
             
-            # Converter para RGB se necessário (para salvar como PNG)
-            if imagem.mode in ('RGBA', 'LA', 'P'):
-                # Criar fundo branco
-                background = Image.new('RGB', imagem.size, (255, 255, 255))
-                if imagem.mode == 'P':
-                    imagem = imagem.convert('RGBA')
-                background.paste(imagem, mask=imagem.split()[-1] if imagem.mode == 'RGBA' else None)
-                imagem = background
-            elif imagem.mode != 'RGB':
-                imagem = imagem.convert('RGB')
+            # Decodificar uma vez, já no tamanho da maior resolução
+            imagem = ProdutoService.abrir_imagem_rgb(io.BytesIO(dados), _RESOLUCOES_DECRESCENTES[0][1])
+            variantes = ProdutoService.gerar_piramide_imagem(imagem)
             
-            # Salvar em múltiplas resoluções
-            paths = {}
-            
-            # 1. Thumbnail (150x150)
-            thumbnail = imagem.copy()
-            thumbnail.thumbnail(IMAGE_RESOLUTIONS['thumbnail'], RESAMPLE_FILTER)
-            thumbnail_name = f"Produto_{produto_id}_{unique_id}_thumbnail.png"
-            thumbnail_path = base_dir / thumbnail_name
-            thumbnail.save(thumbnail_path, 'PNG', optimize=True)
-            paths['thumbnail'] = f"/static/images/produtos/{thumbnail_name}"
-            
-            # 2. Medium (400x400)
-            medium = imagem.copy()
-            medium.thumbnail(IMAGE_RESOLUTIONS['medium'], RESAMPLE_FILTER)
-            medium_name = f"Produto_{produto_id}_{unique_id}_medium.png"
-            medium_path = base_dir / medium_name
-            medium.save(medium_path, 'PNG', optimize=True)
-            paths['medium'] = f"/static/images/produtos/{medium_name}"
-            
-            # 3. Large (800x800)
-            large = imagem.copy()
-            large.thumbnail(IMAGE_RESOLUTIONS['large'], RESAMPLE_FILTER)
-            large_name = f"Produto_{produto_id}_{unique_id}_large.png"
-            large_path = base_dir / large_name
-            large.save(large_path, 'PNG', optimize=True)
-            paths['large'] = f"/static/images/produtos/{large_name}"
-            
-            # Nome base para armazenar no banco (sem resolução)
-            nome_base = f"Produto_{produto_id}_{unique_id}"
+            # Salvar em múltiplas resoluções e formatos: {hash}_{resolução}.{png,webp,avif}
+            arquivos = [
+                (variantes[resolucao], caminho, FORMATOS_IMAGEM[extensao]['formato'], FORMATOS_IMAGEM[extensao]['opcoes'])
+                for resolucao, extensao, caminho in ProdutoService.caminhos_imagem(nome_base)
+                if extensao in FORMATOS_DISPONIVEIS
+            ]
+            ProdutoService.codificar_variantes(arquivos)
             
             return {
                 'success': True,
                 'nome_imagem': nome_base,
-                'paths': paths
+                'paths': paths,
+                'reaproveitada': False
             }
         
         except Exception as e:
@@ -380,6 +1113,179 @@ class ProdutoService:
                 'message': f'Erro ao processar imagem: {str(e)}'
             }
     
+    @staticmethod
+    def validar_dimensoes_imagem(largura=None, altura=None):
+        """
+        Valida as dimensões pedidas para o redimensionamento sob demanda.
+        Valores são arredondados para cima em passos de IMAGEM_DIMENSAO_PASSO e limitados
+        ao tamanho da imagem master; a dimensão omitida assume o limite da master.
+        
+        Args:
+            largura (optional): Largura máxima (parâmetro "w")
+            altura (optional): Altura máxima (parâmetro "h")
+        
+        Returns:
+            dict: {'valido': bool, 'mensagem': str, 'largura': int, 'altura': int}
+        """
+        if largura is None and altura is None:
+            return {'valido': False, 'mensagem': 'Informe ao menos um dos parâmetros "w" ou "h"'}
+        
+        maximo = IMAGE_RESOLUTIONS[IMAGEM_MASTER_RESOLUCAO]
+        dimensoes = []
+        for parametro, valor, limite in (('w', largura, maximo[0]), ('h', altura, maximo[1])):
+            if valor is None:
+                dimensoes.append(limite)
+                continue
+            try:
+                valor = int(valor)
+            except (ValueError, TypeError):
+                return {'valido': False, 'mensagem': f'Parâmetro "{parametro}" deve ser um número inteiro'}
+            if valor < IMAGEM_DIMENSAO_MINIMA or valor > limite:
+                return {
+                    'valido': False,
+                    'mensagem': f'Parâmetro "{parametro}" deve estar entre {IMAGEM_DIMENSAO_MINIMA} e {limite}'
+                }
+            passos = -(-valor // IMAGEM_DIMENSAO_PASSO)
+            dimensoes.append(min(passos * IMAGEM_DIMENSAO_PASSO, limite))
+        
+        return {
+            'valido': True,
+            'mensagem': 'Dimensões válidas',
+            'largura': dimensoes[0],
+            'altura': dimensoes[1]
+        }
+    
+    @staticmethod
+    def caminho_imagem_master(nome_imagem):
+        """Caminho do PNG usado como origem do redimensionamento sob demanda (ou None)"""
+        caminho = Path(IMAGENS_PRODUTOS_DIR) / f"{nome_imagem}_{IMAGEM_MASTER_RESOLUCAO}.png"
+        return caminho if caminho.is_file() else None
+    
+    @staticmethod
+    def redimensionar_imagem(caminho_master, largura, altura, extensao, destino):
+        """
+        Gera uma variante que cabe em largura x altura a partir da imagem master.
+        
+        Args:
+            caminho_master (Path): PNG de origem
+            largura (int): Largura máxima
+            altura (int): Altura máxima
+            extensao (str): Chave de FORMATOS_IMAGEM ('avif', 'webp' ou 'png')
+            destino (str): Caminho do arquivo a gravar
+        """
+        formato = FORMATOS_IMAGEM[extensao]
+        imagem = ProdutoService.abrir_imagem_rgb(caminho_master, (largura, altura))
+        imagem.save(destino, formato['formato'], **formato['opcoes'])
+    
+    @staticmethod
+    def liberar_imagem(produto_dao, nome_imagem):
+        """
+        Remove as variantes de uma imagem quando nenhum produto a referencia mais.
+        A contagem de referências é feita no banco (produtos com o mesmo nome_imagem).
+        
+        Args:
+            produto_dao: Instância de ProdutoDAO
+            nome_imagem (str): Nome base da imagem que deixou de ser usada
+        
+        Returns:
+            bool: True se os arquivos foram removidos
+        """
+        if not nome_imagem or produto_dao.contar_referencias_imagem(nome_imagem) > 0:
+            return False
+        
+        for _, _, caminho in ProdutoService.caminhos_imagem(nome_imagem):
+            try:
+                caminho.unlink()
+            except OSError:
+                pass
+        
+        return True
+    
+    @staticmethod
+    def abrir_imagem_rgb(origem, tamanho_maximo=None):
+        """
+        Abre e decodifica a imagem uma única vez, convertendo para RGB.
+        
+        Com tamanho_maximo, JPEGs são decodificados em escala reduzida (draft/DCT) e os
+        demais formatos reduzidos por fator inteiro antes do filtro LANCZOS, evitando
+        manter a imagem inteira (ex: 12 MP) em memória. Transparência vira fundo branco.
+        
+        Args:
+            origem: Caminho do arquivo ou stream da imagem
+            tamanho_maximo (tuple, optional): (largura, altura) máximas
+        
+        Returns:
+            PIL.Image.Image: Imagem RGB carregada
+        """
+        imagem = Image.open(origem)
+        
+        if tamanho_maximo:
+            # JPEG: escolhe a menor escala de decodificação >= tamanho_maximo (no-op nos demais)
+            imagem.draft('RGB', tamanho_maximo)
+            if imagem.mode == 'P':
+                # Paleta não suporta LANCZOS
+                imagem = imagem.convert('RGBA')
+            imagem.thumbnail(tamanho_maximo, RESAMPLE_FILTER, reducing_gap=3.0)
+        else:
+            imagem.load()
+        
+        # Converter para RGB se necessário (fundo branco para transparência)
+        if imagem.mode in ('RGBA', 'LA', 'P'):
+            background = Image.new('RGB', imagem.size, (255, 255, 255))
+            if imagem.mode != 'RGBA':
+                imagem = imagem.convert('RGBA')
+            background.paste(imagem, mask=imagem.split()[-1])
+            imagem = background
+        elif imagem.mode != 'RGB':
+            imagem = imagem.convert('RGB')
+        
+        return imagem
+    
+    @staticmethod
+    def gerar_piramide_imagem(imagem):
+        """
+        Gera as resoluções de IMAGE_RESOLUTIONS em cascata (large → medium → thumbnail),
+        cada uma derivada da anterior em vez da imagem original.
+        
+        Args:
+            imagem (PIL.Image.Image): Imagem RGB de origem
+        
+        Returns:
+            dict: {resolução: PIL.Image.Image}
+        """
+        variantes = {}
+        atual = imagem
+        
+        for resolucao, dimensoes in _RESOLUCOES_DECRESCENTES:
+            if atual.width > dimensoes[0] or atual.height > dimensoes[1]:
+                atual = ImageOps.contain(atual, dimensoes, RESAMPLE_FILTER)
+            else:
+                # Objetos distintos: as variantes são gravadas em paralelo
+                atual = atual.copy()
+            variantes[resolucao] = atual
+        
+        return variantes
+    
+    @staticmethod
+    def codificar_variantes(arquivos):
+        """
+        Codifica e grava as variantes em paralelo.
+        
+        Args:
+            arquivos (list): Tuplas (imagem, caminho, formato, opções de save)
+        
+        Cada arquivo é gravado em um temporário e renomeado, para que uploads simultâneos
+        da mesma imagem nunca exponham um arquivo pela metade.
+        """
+        futuros = [
+            _executor_codificacao.submit(_gravar_atomico, imagem, caminho, formato, opcoes)
+            for imagem, caminho, formato, opcoes in arquivos
+        ]
+        
+        # Propaga o primeiro erro de gravação
+        for futuro in futuros:
+            futuro.result()
+    
     @staticmethod
     def process_product_images(produto, request_host=None):
         """
@@ -390,7 +1296,8 @@ class ProdutoService:
             request_host (str, optional): Host da requisição (ex: http://localhost:5000)
         
         Returns:
-            dict: Produto com URLs completas de imagens
+            dict: Produto com URLs completas de imagens ("imagens" em PNG; "imagens_negociadas"
+                  escolhem AVIF/WebP/PNG pelo header Accept; "formatos_imagem" lista os formatos gerados)
         """
         # Usar host fornecido ou fallback para localhost
         if not request_host:
@@ -409,6 +1316,12 @@ class ProdutoService:
                 'medium': f"{request_host}/static/images/produtos/{nome_imagem}_medium.png",
                 'large': f"{request_host}/static/images/produtos/{nome_imagem}_large.png"
             }
+            # URLs com negociação de formato (AVIF/WebP/PNG conforme o header Accept)
+            produto['imagens_negociadas'] = {
+                resolucao: f"{request_host}/api/imagens/produtos/{nome_imagem}/{resolucao}"
+                for resolucao in IMAGE_RESOLUTIONS
+            }
+            produto['formatos_imagem'] = FORMATOS_DISPONIVEIS
         else:
             # Fallback: URLs genéricas (mantém compatibilidade com produtos antigos)
             produto['imagens'] = {
@@ -443,32 +1356,28 @@ class ProdutoService:
                     'message': f'Extensão inválida. Permitidas: {", ".join(extensoes_permitidas)}'
                 }
             
-            # Abrir imagem original
-            imagem = Image.open(file.stream)
-            
-            # Converter RGBA para RGB se necessário
-            if imagem.mode == 'RGBA':
-                imagem = imagem.convert('RGB')
+            # Abrir imagem original (decodificada uma única vez, em tamanho integral para o original)
+            imagem = ProdutoService.abrir_imagem_rgb(file.stream)
+            variantes = ProdutoService.gerar_piramide_imagem(imagem)
             
             imagens_salvas = {}
+            arquivos = []
             
             # Salvar original
             nome_original = f'produto_{produto_id}_original.jpg'
-            caminho_original = os.path.join(upload_folder, nome_original)
-            imagem.save(caminho_original, 'JPEG', quality=95)
+            arquivos.append((imagem, os.path.join(upload_folder, nome_original), 'JPEG', {'quality': 95}))
             imagens_salvas['original'] = nome_original
             
             # Salvar em múltiplas resoluções
-            for resolucao_nome, dimensoes in IMAGE_RESOLUTIONS.items():
-                imagem_redimensionada = imagem.copy()
-                imagem_redimensionada.thumbnail(dimensoes, RESAMPLE_FILTER)
-                
+            for resolucao_nome in IMAGE_RESOLUTIONS:
                 nome_arquivo = f'produto_{produto_id}_{resolucao_nome}.jpg'
                 caminho = os.path.join(upload_folder, nome_arquivo)
-                imagem_redimensionada.save(caminho, 'JPEG', quality=85)
+                arquivos.append((variantes[resolucao_nome], caminho, 'JPEG', {'quality': 85}))
                 
                 imagens_salvas[resolucao_nome] = nome_arquivo
             
+            ProdutoService.codificar_variantes(arquivos)
+            
             return {
                 'success': True,
                 'message': 'Imagens salvas com sucesso',
@@ -0,0 +1,86 @@
+"""
+ProjecaoService - Campos Esparsos (?fields=) e Relações Embutidas (?include=)
+Valida os parâmetros de projeção das listagens e detalhes contra os campos expostos
+por cada recurso. A lista validada é repassada ao DAO, que seleciona apenas essas
+colunas no SELECT.
+"""
+
+
+class ProjecaoService:
+    """Leitura e aplicação de ?fields= e ?include="""
+
+    @staticmethod
+    def _separar(valor):
+        return [item.strip() for item in valor.split(',') if item.strip()]
+
+    @staticmethod
+    def ler_campos(valor, disponiveis, obrigatorios=()):
+        """
+        Lê o parâmetro "fields" (lista separada por vírgulas).
+
+        Args:
+            valor (str): Valor de ?fields= (None ou vazio = todos os campos)
+            disponiveis (iterable): Campos aceitos pelo recurso
+            obrigatorios (iterable): Campos sempre devolvidos (ex: o ID)
+
+        Returns:
+            dict: {'success': True, 'campos': list|None} ou {'success': False, 'message': str}
+        """
+        if valor is None or not valor.strip():
+            return {'success': True, 'campos': None}
+
+        pedidos = ProjecaoService._separar(valor)
+        invalidos = [campo for campo in pedidos if campo not in disponiveis]
+        if invalidos:
+            return {
+                'success': False,
+                'message': f'Campo(s) inválido(s) em "fields": {", ".join(invalidos)}. '
+                           f'Disponíveis: {", ".join(disponiveis)}'
+            }
+
+        campos = list(obrigatorios)
+        campos.extend(campo for campo in pedidos if campo not in campos)
+        return {'success': True, 'campos': campos}
+
+    @staticmethod
+    def ler_includes(valor, disponiveis):
+        """
+        Lê o parâmetro "include" (relações embutidas, separadas por vírgulas).
+
+        Args:
+            valor (str): Valor de ?include= (None ou vazio = nenhuma)
+            disponiveis (iterable): Relações aceitas pelo recurso
+
+        Returns:
+            dict: {'success': True, 'includes': set} ou {'success': False, 'message': str}
+        """
+        if valor is None or not valor.strip():
+            return {'success': True, 'includes': set()}
+
+        includes = ProjecaoService._separar(valor)
+        invalidos = [include for include in includes if include not in disponiveis]
+        if invalidos:
+            return {
+                'success': False,
+                'message': f'Relação(ões) inválida(s) em "include": {", ".join(invalidos)}. '
+                           f'Disponíveis: {", ".join(disponiveis)}'
+            }
+
+        return {'success': True, 'includes': set(includes)}
+
+    @staticmethod
+    def projetar(registro, campos, manter=()):
+        """
+        Mantém apenas os campos pedidos de um registro já carregado (ex: detalhe).
+
+        Args:
+            registro (dict): Registro completo
+            campos (list): Campos pedidos (None = registro inteiro)
+            manter (iterable): Chaves preservadas mesmo fora de `campos` (ex: 'itens')
+
+        Returns:
+            dict: Registro projetado
+        """
+        if campos is None or registro is None:
+            return registro
+        return {chave: valor for chave, valor in registro.items() if chave in campos or chave in manter}
@@ -0,0 +1,312 @@
+"""
+RevogacaoTokens - Revogação de Tokens JWT (logout)
+Verifica se o JTI de um token foi revogado sem consultar o banco a cada requisição.
+
+Três camadas, da mais barata para a mais cara:
+- Memória do processo: JTIs revogados conhecidos e um cache negativo ("não revogado")
+  com validade de REVOGACAO_CACHE_TTL_SEGUNDOS (padrão 30; 0 desativa o cache negativo).
+- Arquivo SQLite local (REVOGACAO_ARQUIVO, padrão uploads/revogacoes.sqlite), compartilhado
+  pelos workers da mesma máquina: cada worker lê as revogações novas no máximo a cada
+  REVOGACAO_SINCRONIZAR_SEGUNDOS (padrão 1). Vazio desativa o arquivo.
+- Tabela token_blacklist no banco: persistência e revogações feitas em outras máquinas.
+
+Um logout vale em qualquer worker da mesma máquina após no máximo
+REVOGACAO_SINCRONIZAR_SEGUNDOS, e nas demais máquinas após REVOGACAO_CACHE_TTL_SEGUNDOS.
+
+Cada revogação guarda o exp do token: depois dele o token já é recusado pela
+validação do JWT, então a entrada pode sair. A cada REVOGACAO_LIMPEZA_SEGUNDOS
+(padrão 600) as revogações expiradas são removidas da memória e, em segundo plano,
+do arquivo local e do banco; o tamanho acompanha as sessões ativas, não todos os
+logouts já feitos. A tabela token_blacklist é criada por scripts/migrar_blacklist_expiracao.py
+(ou pelos scripts de limpeza), não a cada logout.
+"""
+
+import os
+import time
+import uuid
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# Máximo de JTIs no cache negativo; os mais antigos saem primeiro
+NEGATIVOS_MAXIMO_PADRAO = 10000
+
+# Validade assumida quando o exp do token não é informado (mesma do JWT_ACCESS_TOKEN_EXPIRES)
+VALIDADE_PADRAO_SEGUNDOS = 24 * 3600
+
+
+def _blacklist_dao():
+    """TokenBlacklistDAO do backend ativo (MySQL ou SQLite)"""
+    from backend import backend
+    return backend.dao('TokenBlacklistDAO')
+
+
+def _chave(jti):
+    """
+    Forma compacta do JTI em memória: os JTIs do flask-jwt-extended são UUIDs,
+    guardados como os 16 bytes do UUID em vez do texto de 36 caracteres.
+    """
+    try:
+        return uuid.UUID(jti).bytes
+    except (ValueError, TypeError, AttributeError):
+        return jti
+
+
+class RevogacaoTokens:
+    """
+    Blacklist de JTIs com cache negativo em memória e arquivo local entre workers.
+
+    O arquivo guarda as revogações em ordem de inserção (seq); cada worker lembra a
+    última seq lida e busca apenas as posteriores. Em memória, cada JTI revogado
+    aponta para o exp do token (segundos desde a época).
+    """
+
+    def __init__(self, arquivo=None, cache_ttl_segundos=30, sincronizar_segundos=1,
+                 limpeza_segundos=600, negativos_maximo=NEGATIVOS_MAXIMO_PADRAO):
+        self.arquivo = arquivo or None
+        self.cache_ttl_segundos = cache_ttl_segundos
+        self.sincronizar_segundos = sincronizar_segundos
+        self.limpeza_segundos = limpeza_segundos
+        self.negativos_maximo = negativos_maximo
+        self._lock = threading.Lock()
+        self._lock_arquivo = threading.Lock()
+        self._revogados = {}             # chave compacta do jti -> exp
+        self._negativos = OrderedDict()  # jti -> expira_em (time.monotonic)
+        self._conexao = None
+        self._pid = None
+        self._ultima_seq = 0
+        self._ultima_sincronizacao = 0.0
+        self._ultima_limpeza = time.monotonic()
+        self._limpando = False
+        self._removidos = 0
+        self._hits = 0
+        self._misses = 0
+        self._consultas_banco = 0
+
+    # ---------- Arquivo local (compartilhado entre workers) ----------
+
+    def _conectar(self):
+        """
+        Conexão com o arquivo local, aberta sob demanda e reaberta após fork
+        (a conexão de um processo não pode ser usada por outro).
+        Deve ser chamado com _lock_arquivo.
+        """
+        if self.arquivo is None:
+            return None
+        if self._conexao is not None and self._pid == os.getpid():
+            return self._conexao
+
+        try:
+            diretorio = os.path.dirname(self.arquivo)
+            if diretorio:
+                os.makedirs(diretorio, exist_ok=True)
+            conexao = sqlite3.connect(self.arquivo, timeout=5, isolation_level=None, check_same_thread=False)
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            conexao.execute("""
+                CREATE TABLE IF NOT EXISTS revogacao (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    jti TEXT NOT NULL UNIQUE,
+                    expira_em REAL NOT NULL
+                )
+            """)
+            conexao.execute("CREATE INDEX IF NOT EXISTS idx_revogacao_expira_em ON revogacao(expira_em)")
+        except sqlite3.Error as e:
+            print(f"⚠️  Arquivo de revogações indisponível ({self.arquivo}): {e}")
+            self.arquivo = None
+            return None
+
+        self._conexao = conexao
+        self._pid = os.getpid()
+        self._ultima_seq = 0
+        return conexao
+
+    def _gravar_arquivo(self, jti, expira_em):
+        with self._lock_arquivo:
+            conexao = self._conectar()
+            if conexao is None:
+                return
+            try:
+                conexao.execute(
+                    "INSERT OR IGNORE INTO revogacao (jti, expira_em) VALUES (?, ?)",
+                    (jti, expira_em)
+                )
+            except sqlite3.Error as e:
+                print(f"⚠️  Erro ao gravar revogação no arquivo local: {e}")
+
+    def _sincronizar(self, agora):
+        """Traz para a memória as revogações gravadas por outros workers"""
+        if agora - self._ultima_sincronizacao < self.sincronizar_segundos:
+            return
+        self._ultima_sincronizacao = agora
+
+        with self._lock_arquivo:
+            conexao = self._conectar()
+            if conexao is None:
+                return
+            try:
+                linhas = conexao.execute(
+                    "SELECT seq, jti, expira_em FROM revogacao WHERE seq > ? AND expira_em > ? ORDER BY seq",
+                    (self._ultima_seq, time.time())
+                ).fetchall()
+            except sqlite3.Error as e:
+                print(f"⚠️  Erro ao ler revogações do arquivo local: {e}")
+                return
+            if not linhas:
+                return
+            self._ultima_seq = linhas[-1][0]
+
+        with self._lock:
+            for _, jti, expira_em in linhas:
+                self._revogados[_chave(jti)] = expira_em
+                self._negativos.pop(jti, None)
+
+    # ---------- Limpeza das revogações expiradas ----------
+
+    def _limpar(self, agora):
+        """
+        Remove da memória as revogações cujo token já expirou e dispara a limpeza do
+        arquivo local e do banco em segundo plano (no máximo uma a cada limpeza_segundos).
+        """
+        if agora - self._ultima_limpeza < self.limpeza_segundos:
+            return
+        self._ultima_limpeza = agora
+
+        limite = time.time()
+        with self._lock:
+            expirados = [chave for chave, expira_em in self._revogados.items() if expira_em <= limite]
+            for chave in expirados:
+                del self._revogados[chave]
+            self._removidos += len(expirados)
+            for jti in [jti for jti, expira_em in self._negativos.items() if expira_em <= agora]:
+                del self._negativos[jti]
+            if self._limpando:
+                return
+            self._limpando = True
+
+        threading.Thread(target=self._limpar_persistencia, args=(limite,),
+                         name='revogacao-limpeza', daemon=True).start()
+
+    def _limpar_persistencia(self, limite):
+        try:
+            with self._lock_arquivo:
+                conexao = self._conectar()
+                if conexao is not None:
+                    try:
+                        conexao.execute("DELETE FROM revogacao WHERE expira_em <= ?", (limite,))
+                    except sqlite3.Error as e:
+                        print(f"⚠️  Erro ao limpar revogações do arquivo local: {e}")
+            self._limpar_banco()
+        finally:
+            with self._lock:
+                self._limpando = False
+
+    # ---------- Banco de dados (persistência) ----------
+
+    @staticmethod
+    def _gravar_banco(jti, expira_em):
+        try:
+            _blacklist_dao().inserir(jti, expira_em)
+        except Exception as e:
+            print(f"⚠️  Erro ao adicionar token à blacklist no banco: {e}")
+
+    @staticmethod
+    def _consultar_banco(jti):
+        try:
+            return _blacklist_dao().existe(jti)
+        except Exception as e:
+            print(f"⚠️  Erro ao verificar blacklist no banco: {e}")
+            return False
+
+    @staticmethod
+    def _limpar_banco():
+        """Remove da tabela token_blacklist as revogações de tokens já expirados"""
+        try:
+            _blacklist_dao().deletar_expirados()
+        except Exception as e:
+            print(f"⚠️  Erro ao limpar blacklist no banco: {e}")
+
+    # ---------- API ----------
+
+    def revogar(self, jti, expira_em=None):
+        """
+        Revoga o JTI: vale na hora neste worker, e é gravado no arquivo local
+        (demais workers da máquina) e no banco (persistência e outras máquinas).
+
+        Args:
+            jti (str): JWT ID do token
+            expira_em (int, optional): exp do token; sem ele, assume VALIDADE_PADRAO_SEGUNDOS
+        """
+        if expira_em is None:
+            expira_em = time.time() + VALIDADE_PADRAO_SEGUNDOS
+        with self._lock:
+            self._revogados[_chave(jti)] = expira_em
+            self._negativos.pop(jti, None)
+        self._gravar_arquivo(jti, expira_em)
+        self._gravar_banco(jti, expira_em)
+
+    def esta_revogado(self, jti, expira_em=None):
+        """
+        True se o JTI foi revogado. O banco só é consultado quando o JTI não está
+        em memória nem no cache negativo (no máximo uma vez por TTL por token).
+
+        Args:
+            jti (str): JWT ID do token
+            expira_em (int, optional): exp do token, guardado se o banco indicar revogação
+        """
+        agora = time.monotonic()
+        self._sincronizar(agora)
+        self._limpar(agora)
+
+        with self._lock:
+            if _chave(jti) in self._revogados:
+                self._hits += 1
+                return True
+            negativo_ate = self._negativos.get(jti)
+            if negativo_ate is not None and negativo_ate > agora:
+                self._hits += 1
+                return False
+            self._misses += 1
+            self._consultas_banco += 1
+
+        revogado = self._consultar_banco(jti)
+
+        if revogado:
+            if expira_em is None:
+                expira_em = time.time() + VALIDADE_PADRAO_SEGUNDOS
+            with self._lock:
+                self._revogados[_chave(jti)] = expira_em
+                self._negativos.pop(jti, None)
+            # Os outros workers da máquina não precisam consultar o banco
+            self._gravar_arquivo(jti, expira_em)
+        elif self.cache_ttl_segundos > 0:
+            with self._lock:
+                self._negativos[jti] = agora + self.cache_ttl_segundos
+                self._negativos.move_to_end(jti)
+                while len(self._negativos) > self.negativos_maximo:
+                    self._negativos.popitem(last=False)
+        return revogado
+
+    def estatisticas(self):
+        """Contadores de uso das camadas de revogação"""
+        with self._lock:
+            consultas = self._hits + self._misses
+            return {
+                'arquivo': self.arquivo,
+                'cache_ttl_segundos': self.cache_ttl_segundos,
+                'hits': self._hits,
+                'misses': self._misses,
+                'taxa_acerto': round(self._hits / consultas, 4) if consultas else 0.0,
+                'consultas_banco': self._consultas_banco,
+                'revogados': len(self._revogados),
+                'negativos': len(self._negativos),
+                'removidos_limpeza': self._removidos
+            }
+
+
+revogacao_tokens = RevogacaoTokens(
+    arquivo=os.getenv('REVOGACAO_ARQUIVO', 'uploads/revogacoes.sqlite'),
+    cache_ttl_segundos=int(os.getenv('REVOGACAO_CACHE_TTL_SEGUNDOS', 30)),
+    sincronizar_segundos=float(os.getenv('REVOGACAO_SINCRONIZAR_SEGUNDOS', 1)),
+    limpeza_segundos=int(os.getenv('REVOGACAO_LIMPEZA_SEGUNDOS', 600))
+)
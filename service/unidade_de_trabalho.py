@@ -0,0 +1,45 @@
+"""
+Unidade de Trabalho nos Serviços
+Serviços com fluxos de várias etapas (criar pedido, adicionar itens, confirmar...)
+recebem no construtor o context manager `unidade_de_trabalho` do backend
+(ex: backend.unidade_de_trabalho). Os métodos marcados com
+@transacional rodam inteiros dentro dele: todas as chamadas de DAO usam uma única
+conexão do pool e uma única transação, confirmada ou desfeita no fim.
+
+Os serviços informam erros retornando {'success': False, ...} em vez de lançar
+exceção: esse retorno também desfaz a unidade (nada do fluxo fica gravado).
+
+Sem unidade de trabalho informada, cada chamada de DAO continua com sua própria transação.
+"""
+
+from contextlib import nullcontext
+from functools import wraps
+
+
+class _FluxoFalhou(Exception):
+    """Levada para fora da unidade de trabalho para desfazê-la; carrega o retorno do método"""
+
+    def __init__(self, resultado):
+        super().__init__(resultado.get('message'))
+        self.resultado = resultado
+
+
+def resolver_unidade_de_trabalho(unidade_de_trabalho=None):
+    """Context manager informado pelo backend, ou um que não faz nada"""
+    return unidade_de_trabalho or nullcontext
+
+
+def transacional(metodo):
+    """Executa o método do serviço dentro de self.unidade_de_trabalho()
+    (rollback se lançar exceção ou retornar success=False)"""
+    @wraps(metodo)
+    def executar(self, *args, **kwargs):
+        try:
+            with self.unidade_de_trabalho():
+                resultado = metodo(self, *args, **kwargs)
+                if isinstance(resultado, dict) and resultado.get('success') is False:
+                    raise _FluxoFalhou(resultado)
+                return resultado
+        except _FluxoFalhou as e:
+            return e.resultado
+    return executar
@@ -19,7 +19,10 @@ ENDPOINTS = {
     },
     'produtos': {
         'base': f"{API_BASE_URL}/api/produtos",
-        'buscar': f"{API_BASE_URL}/api/produtos/buscar"
+        'buscar': f"{API_BASE_URL}/api/produtos/buscar",
+        'busca': f"{API_BASE_URL}/api/produtos/busca",
+        'autocomplete': f"{API_BASE_URL}/api/produtos/autocomplete",
+        'cache': f"{API_BASE_URL}/api/produtos/cache"
     },
     'clientes': {
         'base': f"{API_BASE_URL}/api/clientes",
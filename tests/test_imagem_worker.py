@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Testes do Worker de Imagens
+Testa: falha inesperada na geração das variantes (ex: upload truncado) descarta a
+referência gravada em Produto.nome_imagem e marca o job com erro.
+
+Não precisa da API rodando: usa um diretório temporário e um ProdutoDAO em memória.
+"""
+
+import os
+import sys
+import tempfile
+sys.path.append('.')
+
+# Diretório de jobs temporário antes de importar o worker
+_TMP = tempfile.mkdtemp(prefix='autopek_imagem_worker_')
+os.environ['IMAGEM_JOBS_DIR'] = _TMP
+
+from tests.utils import *
+from service import imagem_worker
+from service.produto_service import ProdutoService
+
+
+class ProdutoDAOMemoria:
+    """ProdutoDAO mínimo com um produto, para observar as escritas do worker"""
+
+    def __init__(self, id_produto, nome_imagem):
+        self.produtos = {id_produto: {'id_produto': id_produto, 'nome_imagem': nome_imagem}}
+
+    def buscar_por_id(self, id_produto):
+        produto = self.produtos.get(id_produto)
+        return dict(produto) if produto else None
+
+    def atualizar_nome_imagem(self, id_produto, nome_imagem):
+        self.produtos[id_produto]['nome_imagem'] = nome_imagem
+
+
+def test_erro_inesperado_descarta_referencia():
+    """Exceção ao gerar as variantes: o produto deixa de apontar para elas"""
+    print_separador("1. ERRO INESPERADO NO PROCESSAMENTO")
+
+    contador = TestResultCounter()
+
+    nome_imagem = 'f' * 64
+    produto_dao = ProdutoDAOMemoria(1, nome_imagem)
+    caminho_upload = os.path.join(_TMP, 'upload.png')
+    with open(caminho_upload, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+    job = {'job_id': 'a' * 32, 'id_produto': 1, 'status': imagem_worker.STATUS_PENDENTE}
+
+    def gerar_com_erro(origem):
+        raise OSError('image file is truncated')
+
+    print_info("Testando _processar com gerar_resolucoes_imagem lançando exceção")
+    original = ProdutoService.gerar_resolucoes_imagem
+    ProdutoService.gerar_resolucoes_imagem = staticmethod(gerar_com_erro)
+    try:
+        with imagem_worker._lock:
+            imagem_worker._contadores['pendentes'] += 1
+        imagem_worker._processar(job, caminho_upload, nome_imagem, produto_dao)
+    finally:
+        ProdutoService.gerar_resolucoes_imagem = original
+
+    if produto_dao.produtos[1]['nome_imagem'] is None:
+        contador.registrar_sucesso("Referência à imagem descartada após exceção")
+    else:
+        contador.registrar_falha(
+            "Referência à imagem", f"Produto ainda aponta para {produto_dao.produtos[1]['nome_imagem']}"
+        )
+
+    status = imagem_worker.ImagemWorker.consultar_job(job['job_id'])
+    if status and status['status'] == imagem_worker.STATUS_ERRO and 'truncated' in status['mensagem']:
+        contador.registrar_sucesso("Job marcado com erro")
+    else:
+        contador.registrar_falha("Status do job", f"Status inesperado: {status}")
+
+    if not os.path.exists(caminho_upload):
+        contador.registrar_sucesso("Upload bruto removido")
+    else:
+        contador.registrar_falha("Upload bruto", "Arquivo não foi removido")
+
+    return contador
+
+
+def run_all_imagem_worker_tests():
+    """Executa todos os testes do worker de imagens"""
+    print("\n" + "🖼️ "*35)
+    print("   TESTES DO WORKER DE IMAGENS - API AutoPek")
+    print("🖼️ "*35 + "\n")
+
+    contador = test_erro_inesperado_descarta_referencia()
+    return contador.imprimir_resumo()
+
+
+if __name__ == '__main__':
+    sucesso = run_all_imagem_worker_tests()
+    sys.exit(0 if sucesso else 1)
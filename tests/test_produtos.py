@@ -5,6 +5,10 @@ Testa: criar, listar, buscar, atualizar, deletar produtos
 """
 
 import sys
+import json
+import time
+import base64
+import hashlib
 sys.path.append('.')
 
 from tests.config import *
@@ -13,6 +17,8 @@ from tests.utils import *
 
 # Variável para armazenar ID do produto criado nos testes
 PRODUTO_ID = None
+# ID do "Filtro de Óleo Teste Automatizado" (PRODUTO_ID passa a ser o produto com imagem)
+PRODUTO_FILTRO_ID = None
 
 
 def setup():
@@ -63,9 +69,187 @@ def test_listar_produtos():
     return contador
 
 
+def test_listar_produtos_paginado():
+    """Testa listagem paginada por cursor (ordenação + filtros)"""
+    print_separador("1B. LISTAR PRODUTOS PAGINADO (CURSOR)")
+    
+    contador = TestResultCounter()
+    
+    print_info("Testando GET /api/produtos/?limit=2&ordenar_por=preco_venda&ordem=desc")
+    
+    params = {'limit': 2, 'ordenar_por': 'preco_venda', 'ordem': 'desc'}
+    ids_vistos = []
+    cursor = None
+    paginas = 0
+    
+    while True:
+        if cursor:
+            params['cursor'] = cursor
+        
+        sucesso, response, erro = fazer_request('GET', f"{ENDPOINTS['produtos']['base']}/", params=params)
+        
+        if not sucesso:
+            contador.registrar_falha("Listar produtos paginado", erro)
+            return contador
+        
+        valido, mensagem, data = validar_response_success(response, 200)
+        
+        if not (valido and data.get('success')):
+            contador.registrar_falha("Listar produtos paginado", mensagem)
+            return contador
+        
+        produtos = data.get('produtos', [])
+        if len(produtos) > 2:
+            contador.registrar_falha("Listar produtos paginado", "Página maior que o limite")
+            return contador
+        
+        ids_vistos.extend(p['id_produto'] for p in produtos)
+        paginas += 1
+        cursor = data.get('next_cursor')
+        
+        if not cursor or paginas > 1000:
+            break
+    
+    if len(ids_vistos) == len(set(ids_vistos)):
+        contador.registrar_sucesso(f"Paginação por cursor ({paginas} páginas, {len(ids_vistos)} produtos, sem repetição)")
+    else:
+        contador.registrar_falha("Paginação por cursor", "Produtos repetidos entre páginas")
+    
+    # Teste: cursor inválido
+    print_info("\nTestando cursor inválido (deve falhar)")
+    
+    sucesso, response, erro = fazer_request(
+        'GET',
+        f"{ENDPOINTS['produtos']['base']}/",
+        params={'cursor': 'cursor-invalido'}
+    )
+    
+    if sucesso and response.status_code == 400:
+        contador.registrar_sucesso("Validação: cursor inválido rejeitado")
+    else:
+        contador.registrar_falha("Validação: cursor inválido", "Deveria retornar 400")
+    
+    # Teste: cursor forjado (JSON válido, mas com payload ou valor do tipo errado)
+    print_info("\nTestando cursores forjados (devem falhar com 400)")
+    
+    forjados = [
+        [],
+        {'o': 'preco_venda', 'd': 'asc', 'v': [1], 'id': 1},
+        {'o': 'preco_venda', 'd': 'asc', 'v': 'abc', 'id': 1},
+        {'o': 'estoque_atual', 'd': 'desc', 'v': {'x': 1}, 'id': 1},
+        {'o': 'nome', 'd': 'asc', 'v': 10, 'id': 1}
+    ]
+    status = []
+    for payload in forjados:
+        cursor_forjado = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+        sucesso, response, erro = fazer_request(
+            'GET',
+            f"{ENDPOINTS['produtos']['base']}/",
+            params={'cursor': cursor_forjado}
+        )
+        status.append(response.status_code if sucesso else None)
+    
+    if all(codigo == 400 for codigo in status):
+        contador.registrar_sucesso("Validação: cursores forjados rejeitados")
+    else:
+        contador.registrar_falha("Validação: cursores forjados", f"Status recebidos: {status} (esperado 400)")
+    
+    return contador
+
+
+def test_listar_produtos_campos():
+    """Testa campos esparsos (?fields=) na listagem de produtos"""
+    print_separador("1C. LISTAR PRODUTOS COM CAMPOS ESPARSOS")
+    
+    contador = TestResultCounter()
+    
+    print_info("Testando GET /api/produtos/?fields=nome,preco_venda&limit=5")
+    
+    sucesso, response, erro = fazer_request(
+        'GET',
+        f"{ENDPOINTS['produtos']['base']}/",
+        params={'fields': 'nome,preco_venda', 'limit': 5}
+    )
+    
+    if not sucesso:
+        contador.registrar_falha("Listar produtos com fields", erro)
+        return contador
+    
+    valido, mensagem, data = validar_response_success(response, 200)
+    
+    if valido and data.get('success'):
+        esperados = {'id_produto', 'nome', 'preco_venda'}
+        extras = [p for p in data.get('produtos', []) if set(p) - esperados]
+        if extras:
+            contador.registrar_falha("Listar produtos com fields", f"Campos extras: {sorted(set(extras[0]) - esperados)}")
+        else:
+            contador.registrar_sucesso("Listagem retorna apenas id_produto, nome e preco_venda")
+    else:
+        contador.registrar_falha("Listar produtos com fields", mensagem)
+    
+    # Teste: projeção sem paginação (snapshot completo)
+    print_info("\nTestando GET /api/produtos/?fields=nome,preco_venda (sem paginação)")
+    
+    sucesso, response, erro = fazer_request(
+        'GET',
+        f"{ENDPOINTS['produtos']['base']}/",
+        params={'fields': 'nome,preco_venda'}
+    )
+    
+    if sucesso and response.status_code == 200:
+        produtos = response.json().get('produtos', [])
+        extras = [p for p in produtos if set(p) - {'id_produto', 'nome', 'preco_venda'}]
+        if extras:
+            contador.registrar_falha("Listar produtos com fields (sem limit)", f"Campos extras: {sorted(set(extras[0]) - {'id_produto', 'nome', 'preco_venda'})}")
+        else:
+            contador.registrar_sucesso("Listagem sem paginação respeita fields")
+    else:
+        contador.registrar_falha("Listar produtos com fields (sem limit)", erro or f"Status {response.status_code}")
+    
+    # Teste: campo inexistente
+    print_info("\nTestando campo inexistente (deve falhar)")
+    
+    sucesso, response, erro = fazer_request(
+        'GET',
+        f"{ENDPOINTS['produtos']['base']}/",
+        params={'fields': 'nome,campo_inexistente'}
+    )
+    
+    if sucesso and response.status_code == 400:
+        contador.registrar_sucesso("Validação: campo inexistente rejeitado")
+    else:
+        contador.registrar_falha("Validação: campo inexistente", "Deveria retornar 400")
+    
+    return contador
+
+
+def test_listar_produtos_stream():
+    """Testa a listagem em streaming (?stream=true)"""
+    print_separador("1D. LISTAR PRODUTOS EM STREAMING")
+    
+    contador = TestResultCounter()
+    
+    print_info("Testando GET /api/produtos/?stream=true")
+    
+    sucesso, response, erro = fazer_request('GET', f"{ENDPOINTS['produtos']['base']}/", params={'stream': 'true'})
+    
+    if not sucesso:
+        contador.registrar_falha("Listar produtos em streaming", erro)
+        return contador
+    
+    valido, mensagem, data = validar_response_success(response, 200)
+    
+    if valido and data.get('success') and data.get('total') == len(data.get('produtos', [])):
+        contador.registrar_sucesso(f"Streaming retornou {data['total']} produtos")
+    else:
+        contador.registrar_falha("Listar produtos em streaming", mensagem or "Total não confere com a lista")
+    
+    return contador
+
+
 def test_criar_produto():
     """Testa criação de produto"""
-    global PRODUTO_ID
+    global PRODUTO_ID, PRODUTO_FILTRO_ID
     
     print_separador("2. CRIAR PRODUTO (SEM IMAGEM)")
     
@@ -102,6 +286,7 @@ def test_criar_produto():
     if valido and data.get('success'):
         produto = data.get('produto')
         PRODUTO_ID = produto.get('id_produto')
+        PRODUTO_FILTRO_ID = PRODUTO_ID
         contador.registrar_sucesso(f"Criar produto (ID: {PRODUTO_ID})")
         print_json(produto, "Produto Criado")
     else:
@@ -176,7 +361,10 @@ def test_criar_produto_com_imagem():
                 headers={"Authorization": f"Bearer {get_token()}"}
             )
         
-        valido, mensagem, data = validar_response_success(response, 201)
+        # Imagem nova: 202, as resoluções são geradas em segundo plano.
+        # Imagem já em disco (mesmo conteúdo usado por outro produto): 201, sem job.
+        codigo_esperado = 201 if response.status_code == 201 else 202
+        valido, mensagem, data = validar_response_success(response, codigo_esperado)
         
         if valido and data.get('success'):
             produto = data.get('produto')
@@ -184,6 +372,34 @@ def test_criar_produto_com_imagem():
             
             contador.registrar_sucesso(f"Criar produto com imagem (ID: {PRODUTO_ID})")
             
+            # Imagens são armazenadas pelo hash do conteúdo, reservado já na criação do produto
+            hash_arquivo = hashlib.sha256(imagem_path.read_bytes()).hexdigest()
+            if produto.get('nome_imagem') == hash_arquivo:
+                contador.registrar_sucesso("Nome da imagem é o SHA-256 do arquivo")
+            else:
+                contador.registrar_falha("Nome da imagem", f"Esperado {hash_arquivo}")
+            
+            if codigo_esperado == 201:
+                contador.registrar_sucesso("Imagem já existente reaproveitada (sem processamento)")
+            else:
+                # Acompanhar o job até concluir
+                status_url = data.get('imagem_job', {}).get('status_url')
+                print_info(f"Acompanhando processamento: {status_url}")
+                
+                job = {}
+                for _ in range(60):
+                    sucesso, response, erro = fazer_request('GET', status_url, headers=get_headers())
+                    job = response.json().get('job', {}) if sucesso and response.status_code == 200 else {}
+                    if job.get('status') in ('concluido', 'erro'):
+                        break
+                    time.sleep(0.5)
+                
+                if job.get('status') == 'concluido':
+                    contador.registrar_sucesso(f"Imagem processada em segundo plano ({job.get('nome_imagem')})")
+                    produto['imagens'] = job.get('imagens', produto.get('imagens', {}))
+                else:
+                    contador.registrar_falha("Processar imagem", job.get('mensagem', 'Job não concluído'))
+            
             # Mostrar estrutura do JSON de retorno
             print("\n" + "="*70)
             print("📋 ESTRUTURA DO JSON DE RETORNO:")
@@ -220,17 +436,21 @@ BODY (form-data):
 
 PROCESSAMENTO:
 1. API recebe arquivo e dados
-2. Cria produto no banco (gera ID)
-3. Processa imagem em 3 resoluções:
+2. Calcula o SHA-256 do arquivo (nome da imagem) e cria o produto
+   no banco já com esse nome (um único INSERT)
+3. Salva o upload bruto e enfileira o job de imagem
+4. Retorna 202 com o produto e "imagem_job.status_url"
+   (201 sem job se a mesma imagem já estiver salva)
+5. Em segundo plano, processa a imagem em 3 resoluções:
    - Thumbnail: 150x150px
    - Medium: 400x400px
    - Large: 800x800px
-4. Salva em: static/images/produtos/Produto_{id}_{uuid}_{resolução}.png
-5. Atualiza campo 'nome_imagem' no banco
-6. Retorna produto com URLs das imagens
+6. Salva em: static/images/produtos/{sha256}_{resolução}.png (+ .webp/.avif)
+   (imagem com o mesmo conteúdo já salva é reaproveitada, sem reprocessar)
+7. Job fica "concluido" (o banco não é alterado de novo)
 
-PADRÃO DE NOME: Produto_{id}_{uuid}_{resolução}.png
-Exemplo: Produto_1_5b65ee75_thumbnail.png
+PADRÃO DE NOME: {sha256 do arquivo}_{resolução}.png
+Exemplo: 3f2c9a...e81b_thumbnail.png
             """)
             
         else:
@@ -242,6 +462,130 @@ Exemplo: Produto_1_5b65ee75_thumbnail.png
     return contador
 
 
+def test_imagem_negociada():
+    """Testa entrega de imagem com negociação de formato (Accept)"""
+    print_separador("2C. IMAGEM COM NEGOCIAÇÃO DE FORMATO")
+    
+    contador = TestResultCounter()
+    
+    if not PRODUTO_ID:
+        contador.registrar_falha("Imagem negociada", "ID do produto não disponível")
+        return contador
+    
+    sucesso, response, erro = fazer_request('GET', f"{ENDPOINTS['produtos']['base']}/{PRODUTO_ID}")
+    produto = response.json().get('produto', {}) if sucesso else {}
+    url = produto.get('imagens_negociadas', {}).get('medium')
+    
+    if not url:
+        contador.registrar_falha("Imagem negociada", "Produto sem 'imagens_negociadas'")
+        return contador
+    
+    print_info(f"Formatos anunciados: {produto.get('formatos_imagem')}")
+    
+    # Navegador moderno: recebe o formato mais eficiente anunciado
+    preferido = next((f for f in produto.get('formatos_imagem', []) if f != 'png'), 'png')
+    sucesso, response, erro = fazer_request('GET', url, headers={'Accept': 'image/avif,image/webp,*/*'})
+    
+    if sucesso and response.status_code == 200 and response.headers.get('Content-Type') == f"image/{preferido}":
+        contador.registrar_sucesso(f"Accept moderno recebe image/{preferido}")
+    else:
+        contador.registrar_falha("Imagem negociada", f"Esperado image/{preferido}")
+    
+    # Cliente sem suporte declarado: PNG
+    sucesso, response, erro = fazer_request('GET', url, headers={'Accept': '*/*'})
+    
+    if sucesso and response.status_code == 200 and response.headers.get('Content-Type') == 'image/png':
+        contador.registrar_sucesso("Accept genérico recebe image/png")
+    else:
+        contador.registrar_falha("Imagem negociada", "Esperado image/png")
+    
+    return contador
+
+
+def test_imagem_redimensionada():
+    """Testa redimensionamento sob demanda (?w=&h=&fmt=) com cache em disco"""
+    print_separador("2D. IMAGEM REDIMENSIONADA SOB DEMANDA")
+    
+    contador = TestResultCounter()
+    
+    if not PRODUTO_ID:
+        contador.registrar_falha("Imagem redimensionada", "ID do produto não disponível")
+        return contador
+    
+    url = f"{ENDPOINTS['produtos']['base']}/{PRODUTO_ID}/imagem?w=300&fmt=png"
+    
+    # Primeira requisição gera (ou reaproveita) a variante; a segunda vem do cache
+    fazer_request('GET', url)
+    sucesso, response, erro = fazer_request('GET', url)
+    
+    if sucesso and response.status_code == 200 and response.headers.get('Content-Type') == 'image/png':
+        contador.registrar_sucesso("Imagem 300px gerada em PNG")
+    else:
+        contador.registrar_falha("Imagem redimensionada", erro or "Esperado image/png")
+        return contador
+    
+    if response.headers.get('X-Cache') == 'HIT':
+        contador.registrar_sucesso("Segunda requisição servida do cache (X-Cache: HIT)")
+    else:
+        contador.registrar_falha("Cache de imagens", f"X-Cache: {response.headers.get('X-Cache')}")
+    
+    # Dimensão fora do permitido
+    sucesso, response, erro = fazer_request('GET', f"{ENDPOINTS['produtos']['base']}/{PRODUTO_ID}/imagem?w=5000")
+    
+    if sucesso and response.status_code == 400:
+        contador.registrar_sucesso("Dimensão inválida retorna 400")
+    else:
+        contador.registrar_falha("Validação de dimensões", "Esperado 400")
+    
+    return contador
+
+
+def test_importar_produtos():
+    """Testa a importação em massa (CSV) com uma linha inválida"""
+    print_separador("2E. IMPORTAR PRODUTOS EM MASSA (CSV)")
+    
+    contador = TestResultCounter()
+    
+    if not get_token():
+        contador.registrar_falha("Importar produtos", "Token não disponível")
+        return contador
+    
+    print_info("Testando POST /api/produtos/import")
+    
+    # SKUs fixos: a segunda execução atualiza os mesmos produtos
+    csv_conteudo = (
+        "sku;nome;preco;estoque\n"
+        "TESTE-IMP-001;Pastilha de Freio Importada;89,90;12\n"
+        "TESTE-IMP-002;Disco de Freio Importado;159,90;4\n"
+        "TESTE-IMP-003;;10,00;1\n"
+    )
+    
+    sucesso, response, erro = fazer_request(
+        'POST',
+        f"{ENDPOINTS['produtos']['base']}/import",
+        files={'arquivo': ('produtos.csv', csv_conteudo.encode('utf-8'), 'text/csv')},
+        headers={"Authorization": f"Bearer {get_token()}"}
+    )
+    
+    if not sucesso:
+        contador.registrar_falha("Importar produtos", erro)
+        return contador
+    
+    valido, mensagem, data = validar_response_success(response, 200)
+    
+    if valido and data.get('inseridos', 0) + data.get('atualizados', 0) == 2:
+        contador.registrar_sucesso(f"Importação: {data['inseridos']} inseridos, {data['atualizados']} atualizados")
+    else:
+        contador.registrar_falha("Importar produtos", mensagem or f"Relatório inesperado: {data}")
+    
+    if valido and data.get('com_erro') == 1 and data['erros'][0].get('linha') == 4:
+        contador.registrar_sucesso("Linha inválida reportada com o número da linha")
+    else:
+        contador.registrar_falha("Importar produtos: linha inválida", "Deveria reportar erro na linha 4")
+    
+    return contador
+
+
 def test_buscar_produto_por_id():
     """Testa busca de produto por ID"""
     print_separador("3. BUSCAR PRODUTO POR ID")
@@ -319,6 +663,123 @@ def test_buscar_produtos_por_nome():
     return contador
 
 
+def test_busca_full_text():
+    """Testa busca full-text (sem acento, qualquer ordem de palavras)"""
+    print_separador("4B. BUSCA FULL-TEXT")
+    
+    contador = TestResultCounter()
+    
+    # Produto criado em test_criar_produto: "Filtro de Óleo Teste Automatizado"
+    print_info("Testando GET /api/produtos/busca?q=oleo filtro")
+    
+    sucesso, response, erro = fazer_request(
+        'GET',
+        ENDPOINTS['produtos']['busca'],
+        params={'q': 'oleo filtro'}
+    )
+    
+    if not sucesso:
+        contador.registrar_falha("Busca full-text", erro)
+        return contador
+    
+    valido, mensagem, data = validar_response_success(response, 200)
+    
+    if valido and data.get('success'):
+        produtos = data.get('produtos', [])
+        ids = [p['id_produto'] for p in produtos]
+        
+        if not PRODUTO_FILTRO_ID or PRODUTO_FILTRO_ID in ids:
+            contador.registrar_sucesso(f"Busca sem acento e fora de ordem ({len(produtos)} encontrados)")
+        else:
+            contador.registrar_falha("Busca full-text", "Produto criado não encontrado")
+    else:
+        contador.registrar_falha("Busca full-text", mensagem)
+    
+    # Teste: termo curto (menos de 3 caracteres) também filtra
+    print_info("\nTestando GET /api/produtos/busca?q=filtro de")
+    
+    sucesso, response, erro = fazer_request(
+        'GET',
+        ENDPOINTS['produtos']['busca'],
+        params={'q': 'filtro de'}
+    )
+    
+    if sucesso and response.status_code == 200:
+        ids = [p['id_produto'] for p in response.json().get('produtos', [])]
+        if not PRODUTO_FILTRO_ID or PRODUTO_FILTRO_ID in ids:
+            contador.registrar_sucesso("Busca com termo curto")
+        else:
+            contador.registrar_falha("Busca com termo curto", "Produto criado não encontrado")
+    else:
+        contador.registrar_falha("Busca com termo curto", erro or f"Status {response.status_code}")
+    
+    # Teste: busca com campos esparsos
+    print_info("\nTestando GET /api/produtos/busca?q=oleo&fields=nome,preco_venda&limit=5")
+    
+    sucesso, response, erro = fazer_request(
+        'GET',
+        ENDPOINTS['produtos']['busca'],
+        params={'q': 'oleo', 'fields': 'nome,preco_venda', 'limit': 5}
+    )
+    
+    if sucesso and response.status_code == 200:
+        esperados = {'id_produto', 'nome', 'preco_venda', 'relevancia'}
+        extras = [p for p in response.json().get('produtos', []) if set(p) - esperados]
+        if extras:
+            contador.registrar_falha("Busca com fields", f"Campos extras: {sorted(set(extras[0]) - esperados)}")
+        else:
+            contador.registrar_sucesso("Busca retorna apenas os campos pedidos e a relevância")
+    else:
+        contador.registrar_falha("Busca com fields", erro or f"Status {response.status_code}")
+    
+    # Teste: busca sem termo
+    print_info("\nTestando busca sem parâmetro q (deve falhar)")
+    
+    sucesso, response, erro = fazer_request('GET', ENDPOINTS['produtos']['busca'])
+    
+    if sucesso and response.status_code == 400:
+        contador.registrar_sucesso("Validação: busca sem termo rejeitada")
+    else:
+        contador.registrar_falha("Validação: busca sem termo", "Deveria retornar 400")
+    
+    return contador
+
+
+def test_autocomplete():
+    """Testa sugestões de produtos (typeahead em memória)"""
+    print_separador("4C. AUTOCOMPLETE")
+    
+    contador = TestResultCounter()
+    
+    # Produto criado em test_criar_produto: "Filtro de Óleo Teste Automatizado"
+    print_info("Testando GET /api/produtos/autocomplete?prefix=filt")
+    
+    sucesso, response, erro = fazer_request(
+        'GET',
+        ENDPOINTS['produtos']['autocomplete'],
+        params={'prefix': 'filt'}
+    )
+    
+    if not sucesso:
+        contador.registrar_falha("Autocomplete", erro)
+        return contador
+    
+    valido, mensagem, data = validar_response_success(response, 200)
+    
+    if valido and data.get('success'):
+        sugestoes = data.get('sugestoes', [])
+        ids = [s['id_produto'] for s in sugestoes]
+        
+        if not PRODUTO_FILTRO_ID or PRODUTO_FILTRO_ID in ids:
+            contador.registrar_sucesso(f"Autocomplete por prefixo ({len(sugestoes)} sugestões)")
+        else:
+            contador.registrar_falha("Autocomplete", "Produto criado não sugerido")
+    else:
+        contador.registrar_falha("Autocomplete", mensagem)
+    
+    return contador
+
+
 def test_atualizar_produto():
     """Testa atualização de produto"""
     print_separador("5. ATUALIZAR PRODUTO")
@@ -364,6 +825,167 @@ def test_atualizar_produto():
     return contador
 
 
+def test_cache_catalogo():
+    """Testa o cache do catálogo (resposta em cache e invalidação após atualização)"""
+    print_separador("5B. CACHE DO CATÁLOGO")
+    
+    contador = TestResultCounter()
+    
+    if not PRODUTO_ID or not get_token():
+        contador.registrar_falha("Cache do catálogo", "ID do produto ou token não disponível")
+        return contador
+    
+    url = f"{ENDPOINTS['produtos']['base']}/{PRODUTO_ID}"
+    print_info(f"Testando GET {url} duas vezes")
+    
+    fazer_request('GET', url)
+    sucesso, response, erro = fazer_request('GET', url)
+    
+    if not sucesso:
+        contador.registrar_falha("Cache do catálogo", erro)
+        return contador
+    
+    valido, mensagem, data = validar_response_success(response, 200)
+    
+    # test_atualizar_produto alterou o nome: o cache não pode devolver o nome antigo
+    if valido and data['produto']['nome'] == "Filtro de Óleo ATUALIZADO":
+        contador.registrar_sucesso("Cache invalidado após atualização")
+    else:
+        contador.registrar_falha("Cache do catálogo", mensagem or "Produto desatualizado no cache")
+    
+    if response.headers.get('X-Cache') == 'HIT':
+        contador.registrar_sucesso("Segunda leitura servida do cache")
+    else:
+        contador.registrar_falha("Cache do catálogo", "Segunda leitura não veio do cache")
+    
+    print_info("Testando GET /api/produtos/cache (estatísticas)")
+    
+    sucesso, response, erro = fazer_request(
+        'GET',
+        ENDPOINTS['produtos']['cache'],
+        headers=get_headers()
+    )
+    
+    if not sucesso:
+        contador.registrar_falha("Estatísticas do cache", erro)
+        return contador
+    
+    valido, mensagem, data = validar_response_success(response, 200)
+    
+    if valido and data.get('cache', {}).get('hits', 0) > 0:
+        contador.registrar_sucesso("Estatísticas do cache")
+        print_json(data.get('cache'), "Cache")
+    else:
+        contador.registrar_falha("Estatísticas do cache", mensagem)
+    
+    return contador
+
+
+def test_ajustar_produtos_em_massa():
+    """Testa o ajuste em massa de preço/estoque"""
+    print_separador("5C. AJUSTE EM MASSA DE PREÇO/ESTOQUE")
+    
+    contador = TestResultCounter()
+    
+    if not PRODUTO_ID:
+        contador.registrar_falha("Ajuste em massa", "ID do produto não disponível")
+        return contador
+    
+    print_info("Testando POST /api/produtos/bulk")
+    
+    sucesso, response, erro = fazer_request(
+        'POST',
+        f"{ENDPOINTS['produtos']['base']}/bulk",
+        json={'produtos': [{'id_produto': PRODUTO_ID, 'preco_venda': 64.90, 'estoque_atual': 30}]},
+        headers=get_headers()
+    )
+    
+    if not sucesso:
+        contador.registrar_falha("Ajuste em massa", erro)
+        return contador
+    
+    valido, mensagem, data = validar_response_success(response, 200)
+    produtos = data.get('produtos', []) if valido else []
+    
+    if valido and len(produtos) == 1 and produtos[0].get('estoque_atual') == 30 and float(produtos[0].get('preco_venda')) == 64.90:
+        contador.registrar_sucesso("Ajuste em massa retornou o produto com os novos valores")
+    else:
+        contador.registrar_falha("Ajuste em massa", mensagem or f"Resposta inesperada: {data}")
+    
+    # Baixa maior que o estoque: nada deve ser gravado
+    print_info("\nTestando delta_estoque que deixaria o estoque negativo (deve falhar)")
+    
+    sucesso, response, erro = fazer_request(
+        'POST',
+        f"{ENDPOINTS['produtos']['base']}/bulk",
+        json={'produtos': [{'id_produto': PRODUTO_ID, 'delta_estoque': -31}]},
+        headers=get_headers()
+    )
+    
+    if sucesso and response.status_code == 400:
+        contador.registrar_sucesso("Validação: estoque negativo rejeitado")
+    else:
+        contador.registrar_falha("Validação: estoque negativo", "Deveria retornar 400")
+    
+    return contador
+
+
+def test_atualizar_produto_parcial():
+    """Testa o PATCH com controle de versão (concorrência otimista)"""
+    print_separador("5D. ATUALIZAÇÃO PARCIAL (PATCH) COM VERSÃO")
+    
+    contador = TestResultCounter()
+    
+    if not PRODUTO_ID:
+        contador.registrar_falha("Atualização parcial", "ID do produto não disponível")
+        return contador
+    
+    sucesso, response, erro = fazer_request('GET', f"{ENDPOINTS['produtos']['base']}/{PRODUTO_ID}")
+    versao = response.json().get('produto', {}).get('versao') if sucesso and response.status_code == 200 else None
+    
+    if not versao:
+        contador.registrar_falha("Atualização parcial", "Produto sem campo versao")
+        return contador
+    
+    print_info(f"Testando PATCH /api/produtos/{PRODUTO_ID} (versão {versao})")
+    
+    sucesso, response, erro = fazer_request(
+        'PATCH',
+        f"{ENDPOINTS['produtos']['base']}/{PRODUTO_ID}",
+        json={'versao': versao, 'estoque': 12},
+        headers=get_headers()
+    )
+    
+    if not sucesso:
+        contador.registrar_falha("Atualização parcial", erro)
+        return contador
+    
+    valido, mensagem, data = validar_response_success(response, 200)
+    produto = data.get('produto', {}) if valido else {}
+    
+    if valido and produto.get('estoque_atual') == 12 and produto.get('versao') == versao + 1:
+        contador.registrar_sucesso(f"PATCH gravou o estoque (versão {versao} -> {produto['versao']})")
+    else:
+        contador.registrar_falha("Atualização parcial", mensagem or f"Resposta inesperada: {data}")
+    
+    # Mesma versão de novo: o produto já mudou, deve ser rejeitado
+    print_info("\nTestando PATCH com versão desatualizada (deve retornar 409)")
+    
+    sucesso, response, erro = fazer_request(
+        'PATCH',
+        f"{ENDPOINTS['produtos']['base']}/{PRODUTO_ID}",
+        json={'versao': versao, 'preco': 1.00},
+        headers=get_headers()
+    )
+    
+    if sucesso and response.status_code == 409 and response.json().get('versao_atual') == versao + 1:
+        contador.registrar_sucesso("Versão desatualizada rejeitada com 409")
+    else:
+        contador.registrar_falha("Conflito de versão", "Deveria retornar 409 com versao_atual")
+    
+    return contador
+
+
 def test_deletar_produto():
     """Testa exclusão de produto"""
     print_separador("6. DELETAR PRODUTO")
@@ -433,19 +1055,33 @@ def run_all_produto_tests():
     
     # Executar testes na ordem
     contador_listar = test_listar_produtos()
+    contador_paginado = test_listar_produtos_paginado()
+    contador_campos = test_listar_produtos_campos()
+    contador_stream = test_listar_produtos_stream()
     contador_criar = test_criar_produto()
     contador_criar_imagem = test_criar_produto_com_imagem()
+    contador_imagem = test_imagem_negociada()
+    contador_redimensionada = test_imagem_redimensionada()
+    contador_importar = test_importar_produtos()
     contador_buscar_id = test_buscar_produto_por_id()
     contador_buscar_nome = test_buscar_produtos_por_nome()
+    contador_busca = test_busca_full_text()
+    contador_autocomplete = test_autocomplete()
     contador_atualizar = test_atualizar_produto()
+    contador_cache = test_cache_catalogo()
+    contador_bulk = test_ajustar_produtos_em_massa()
+    contador_patch = test_atualizar_produto_parcial()
     contador_deletar = test_deletar_produto()
     
     # Consolidar resultados
     resultado_geral = TestResultCounter()
     
-    for contador in [contador_listar, contador_criar, contador_criar_imagem,
-                     contador_buscar_id, contador_buscar_nome, 
-                     contador_atualizar, contador_deletar]:
+    for contador in [contador_listar, contador_paginado, contador_campos, contador_stream, contador_criar, contador_criar_imagem, contador_imagem,
+                     contador_redimensionada, contador_importar,
+                     contador_buscar_id, contador_buscar_nome, contador_busca,
+                     contador_autocomplete,
+                     contador_atualizar, contador_cache, contador_bulk, contador_patch,
+                     contador_deletar]:
         if isinstance(contador, TestResultCounter):
             resultado_geral.total += contador.total
             resultado_geral.sucessos += contador.sucessos
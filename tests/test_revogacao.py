@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Testes da Revogação de Tokens
+Testa: exp guardado quando o banco confirma a revogação (com e sem cache negativo)
+e a propagação da revogação para outro worker pelo arquivo local.
+
+Não precisa da API rodando: usa um banco SQLite temporário.
+"""
+
+import os
+import sys
+import time
+import uuid
+import tempfile
+sys.path.append('.')
+
+# Banco temporário antes de importar o registro de backend
+_TMP = tempfile.mkdtemp(prefix='autopek_revogacao_')
+os.environ['DB_BACKEND'] = 'sqlite'
+os.environ['SQLITE_DB'] = os.path.join(_TMP, 'banco.sqlite')
+
+from tests.utils import *
+from backend import backend
+from service.revogacao_service import RevogacaoTokens, _chave
+
+
+def setup():
+    """Cria a tabela token_blacklist no banco temporário"""
+    backend.modulo_db().init_db()
+    with backend.get_cursor() as cur:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS token_blacklist (
+                jti TEXT PRIMARY KEY,
+                revoked_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                expira_em TEXT NOT NULL
+            )
+        """)
+
+
+def _revogacao(nome_arquivo='rev.sqlite'):
+    return RevogacaoTokens(arquivo=os.path.join(_TMP, nome_arquivo), cache_ttl_segundos=30,
+                           sincronizar_segundos=0)
+
+
+def _exp_no_arquivo(revogacao, jti):
+    with revogacao._lock_arquivo:
+        linha = revogacao._conectar().execute(
+            "SELECT expira_em FROM revogacao WHERE jti = ?", (jti,)
+        ).fetchone()
+    return linha[0] if linha else None
+
+
+def test_exp_revogado_no_banco():
+    """Revogação achada no banco guarda o exp do token"""
+    print_separador("1. REVOGAÇÃO CONFIRMADA PELO BANCO")
+
+    contador = TestResultCounter()
+    dao = backend.dao('TokenBlacklistDAO')
+    revogacao = _revogacao()
+
+    # Sem entrada no cache negativo
+    jti = str(uuid.uuid4())
+    exp = int(time.time()) + 3600
+    dao.inserir(jti, exp)
+
+    print_info("Testando esta_revogado(jti, exp) com o JTI só no banco")
+    if not revogacao.esta_revogado(jti, exp):
+        contador.registrar_falha("Revogação no banco", "JTI revogado não reconhecido")
+    elif revogacao._revogados.get(_chave(jti)) != exp or _exp_no_arquivo(revogacao, jti) != exp:
+        contador.registrar_falha(
+            "Revogação no banco",
+            f"exp guardado {revogacao._revogados.get(_chave(jti))} / arquivo "
+            f"{_exp_no_arquivo(revogacao, jti)}, esperado {exp}"
+        )
+    else:
+        contador.registrar_sucesso("Revogação no banco guarda o exp do token")
+
+    # Com entrada (vencida) no cache negativo: o banco é consultado de novo
+    jti = str(uuid.uuid4())
+    exp = int(time.time()) + 7200
+    revogacao.esta_revogado(jti, exp)
+    dao.inserir(jti, exp)
+    revogacao._negativos[jti] = time.monotonic() - 1
+
+    print_info("Testando esta_revogado(jti, exp) após cache negativo vencido")
+    if not revogacao.esta_revogado(jti, exp):
+        contador.registrar_falha("Revogação após cache negativo", "JTI revogado não reconhecido")
+    elif revogacao._revogados.get(_chave(jti)) != exp or _exp_no_arquivo(revogacao, jti) != exp:
+        contador.registrar_falha(
+            "Revogação após cache negativo",
+            f"exp guardado {revogacao._revogados.get(_chave(jti))} / arquivo "
+            f"{_exp_no_arquivo(revogacao, jti)}, esperado {exp}"
+        )
+    else:
+        contador.registrar_sucesso("Revogação após cache negativo guarda o exp do token")
+
+    # Outro worker da máquina enxerga a revogação pelo arquivo, sem o banco
+    with backend.get_cursor() as cur:
+        cur.execute("DELETE FROM token_blacklist WHERE jti = ?", (jti,))
+    outro_worker = _revogacao()
+
+    print_info("Testando a revogação em outro worker (arquivo local)")
+    if outro_worker.esta_revogado(jti, exp):
+        contador.registrar_sucesso("Revogação propagada pelo arquivo local")
+    else:
+        contador.registrar_falha("Revogação no arquivo local", "Outro worker não viu a revogação")
+
+    return contador
+
+
+def run_all_revogacao_tests():
+    """Executa todos os testes de revogação"""
+    print("\n" + "🔒"*35)
+    print("   TESTES DE REVOGAÇÃO DE TOKENS - API AutoPek")
+    print("🔒"*35 + "\n")
+
+    setup()
+    contador = test_exp_revogado_no_banco()
+    return contador.imprimir_resumo()
+
+
+if __name__ == '__main__':
+    sucesso = run_all_revogacao_tests()
+    sys.exit(0 if sucesso else 1)